@@ -2,10 +2,32 @@
 Complaint Document Analyzer
 
 Extracts case features from complaint text to inform valuation estimates.
+
+Text can be analyzed whole or streamed in chunks (e.g. page by page from a
+PDF); streaming keeps only a window of text in memory however long the
+complaint is.
 """
 import re
 from dataclasses import dataclass, field
-from typing import List, Dict, Optional, Tuple
+from pathlib import Path
+from typing import Callable, List, Dict, Iterable, Iterator, Optional, Set, Tuple
+
+# Characters around a damages amount checked for "million" / "billion"
+DAMAGES_CONTEXT = 20
+
+# Longest match the streaming analyzer is guaranteed to see whole; it is
+# also the overlap kept between windows
+MAX_MATCH_CHARS = 16 * 1024
+
+# New text accumulated per window, as a multiple of the overlap (larger
+# windows rescan proportionally less overlap)
+WINDOW_OVERLAP_RATIO = 4
+
+# Leading characters searched for a "Plaintiff v. Defendant" caption
+CAPTION_CHARS = 500
+
+# Read size when streaming a text file
+TEXT_CHUNK_CHARS = 64 * 1024
 
 
 @dataclass
@@ -123,6 +145,54 @@ class ComplaintAnalyzer:
         'VPPA': 2500,  # Per violation
     }
 
+    # Party patterns (matched case-insensitively against the original text)
+    PLAINTIFF_PATTERN = r'(?:plaintiff[s]?|petitioner[s]?)[:\s]+([A-Z][^,\n]+)'
+    DEFENDANT_PATTERN = (
+        r'(?:defendant[s]?|respondent[s]?)[:\s]+([A-Z][A-Za-z0-9\s,&.]+?)(?:\n|,\s*(?:a|an|the))'
+    )
+    CAPTION_PATTERN = r'([^v]+)\s+v\.?\s+(.+)'
+    MAX_DEFENDANTS = 5
+
+    # Class action patterns; the first size pattern (in order) that matches wins
+    CLASS_INDICATORS = ['class action', 'on behalf of', 'similarly situated',
+                        'class members', 'class representative']
+    CLASS_DEFINITION_PATTERN = r'class\s+(?:is\s+)?defined\s+as[:\s]+([^.]+\.)'
+    CLASS_SIZE_PATTERNS = [
+        r'(?:estimated|approximately|over|more than)\s+(\d[\d,]*)\s+(?:class\s+)?members',
+        r'class\s+of\s+(?:over\s+)?(\d[\d,]*)',
+        r'(\d[\d,]*)\s+(?:affected|impacted)\s+(?:individuals|consumers|customers)',
+    ]
+    MDL_TERMS = ['mdl', 'multidistrict']
+    QUI_TAM_TERMS = ['qui tam', 'relator']
+    SECURITIES_TERMS = ['securities', '10b-5', 'exchange act']
+
+    # Claim and statute patterns (matched against lowercased text)
+    COUNT_PATTERN = r'(?:count|claim|cause of action)\s+(?:\d+|[ivxlc]+)'
+    STATUTE_PATTERNS = [
+        r'(\d+\s+u\.?s\.?c\.?\s+§?\s*\d+)',  # USC citations
+        r'(section\s+\d+\([a-z]\))',  # Section citations
+        r'(rule\s+10b-?5)',
+        r'(sherman\s+act)',
+        r'(clayton\s+act)',
+        r'(tcpa|bipa|fcra|fdcpa|ccpa|erisa)',
+    ]
+
+    # Damage amount patterns (matched case-insensitively against the original text)
+    DAMAGE_PATTERNS = [
+        r'\$\s*([\d,]+(?:\.\d+)?)\s*(?:million|billion|m|b)',
+        r'(?:damages|losses|harm)\s+(?:of|exceeding|totaling)\s+\$\s*([\d,]+)',
+        r'(?:seek|seeking|prayer)\s+.*?\$\s*([\d,]+(?:\.\d+)?)\s*(?:million|billion)?',
+    ]
+    TREBLE_TERMS = ['treble', 'triple']
+
+    # Strength indicators
+    DOC_INDICATORS = ['document', 'email', 'memorandum', 'record', 'exhibit',
+                      'evidence shows', 'evidence demonstrates']
+    EXPERT_INDICATORS = ['expert', 'economist', 'forensic', 'specialist']
+    PRIOR_CASE_PATTERN = r'\d+\s+f\.\s*(?:supp|3d|2d)'
+    REGULATORY_INDICATORS = ['fda', 'sec', 'ftc', 'doj', 'investigation', 'enforcement',
+                             'consent decree', 'regulatory']
+
     def __init__(self):
         self.features = ComplaintFeatures()
 
@@ -137,184 +207,27 @@ class ComplaintAnalyzer:
         Returns:
             ComplaintFeatures with extracted data
         """
-        self.features = ComplaintFeatures(title=title)
-        text_lower = text.lower()
-
-        # Extract basic features
-        self._extract_parties(text)
-        self._extract_class_info(text, text_lower)
-        self._extract_causes(text_lower)
-        self._extract_damages(text, text_lower)
-        self._extract_strength_indicators(text_lower)
-        self._calculate_scores()
-
-        return self.features
-
-    def _extract_parties(self, text: str):
-        """Extract plaintiff and defendant names."""
-        # Look for plaintiff patterns
-        plaintiff_match = re.search(
-            r'(?:plaintiff[s]?|petitioner[s]?)[:\s]+([A-Z][^,\n]+)',
-            text, re.IGNORECASE
-        )
-        if plaintiff_match:
-            self.features.plaintiffs.append(plaintiff_match.group(1).strip())
-
-        # Look for defendant patterns
-        defendant_matches = re.findall(
-            r'(?:defendant[s]?|respondent[s]?)[:\s]+([A-Z][A-Za-z0-9\s,&.]+?)(?:\n|,\s*(?:a|an|the))',
-            text, re.IGNORECASE
-        )
-        for match in defendant_matches[:5]:
-            self.features.defendants.append(match.strip())
-
-        # Look for "v." pattern in title
-        v_match = re.search(r'([^v]+)\s+v\.?\s+(.+)', text[:500], re.IGNORECASE)
-        if v_match:
-            if not self.features.plaintiffs:
-                self.features.plaintiffs.append(v_match.group(1).strip())
-            if not self.features.defendants:
-                self.features.defendants.append(v_match.group(2).strip()[:100])
-
-    def _extract_class_info(self, text: str, text_lower: str):
-        """Extract class action information."""
-        # Check if class action
-        class_indicators = ['class action', 'on behalf of', 'similarly situated',
-                           'class members', 'class representative']
-        self.features.is_class_action = any(ind in text_lower for ind in class_indicators)
-
-        # Extract class definition
-        class_match = re.search(
-            r'class\s+(?:is\s+)?defined\s+as[:\s]+([^.]+\.)',
-            text, re.IGNORECASE
-        )
-        if class_match:
-            self.features.class_definition = class_match.group(1).strip()
-
-        # Extract estimated class size
-        size_patterns = [
-            r'(?:estimated|approximately|over|more than)\s+(\d[\d,]*)\s+(?:class\s+)?members',
-            r'class\s+of\s+(?:over\s+)?(\d[\d,]*)',
-            r'(\d[\d,]*)\s+(?:affected|impacted)\s+(?:individuals|consumers|customers)',
-        ]
-        for pattern in size_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                size_str = match.group(1).replace(',', '')
-                try:
-                    self.features.estimated_class_size = int(size_str)
-                    break
-                except ValueError:
-                    pass
-
-        # Check for MDL
-        self.features.is_mdl = 'mdl' in text_lower or 'multidistrict' in text_lower
-
-        # Check for qui tam
-        self.features.is_qui_tam = 'qui tam' in text_lower or 'relator' in text_lower
-
-        # Check for securities
-        self.features.is_securities = any(
-            term in text_lower for term in ['securities', '10b-5', 'exchange act']
-        )
-
-    def _extract_causes(self, text_lower: str):
-        """Extract causes of action."""
-        for cause, patterns in self.CAUSE_PATTERNS.items():
-            for pattern in patterns:
-                if re.search(pattern, text_lower):
-                    if cause not in self.features.causes_of_action:
-                        self.features.causes_of_action.append(cause)
-                    break
-
-        # Count claims/counts
-        count_matches = re.findall(r'(?:count|claim|cause of action)\s+(?:\d+|[ivxlc]+)',
-                                   text_lower)
-        self.features.claim_count = max(len(count_matches), len(self.features.causes_of_action))
-
-        # Extract statutes
-        statute_patterns = [
-            r'(\d+\s+u\.?s\.?c\.?\s+§?\s*\d+)',  # USC citations
-            r'(section\s+\d+\([a-z]\))',  # Section citations
-            r'(rule\s+10b-?5)',
-            r'(sherman\s+act)',
-            r'(clayton\s+act)',
-            r'(tcpa|bipa|fcra|fdcpa|ccpa|erisa)',
-        ]
-        for pattern in statute_patterns:
-            matches = re.findall(pattern, text_lower)
-            for match in matches:
-                if match.upper() not in [s.upper() for s in self.features.statutes_cited]:
-                    self.features.statutes_cited.append(match.upper())
-
-    def _extract_damages(self, text: str, text_lower: str):
-        """Extract damages information."""
-        # Look for specific damage amounts
-        damage_patterns = [
-            r'\$\s*([\d,]+(?:\.\d+)?)\s*(?:million|billion|m|b)',
-            r'(?:damages|losses|harm)\s+(?:of|exceeding|totaling)\s+\$\s*([\d,]+)',
-            r'(?:seek|seeking|prayer)\s+.*?\$\s*([\d,]+(?:\.\d+)?)\s*(?:million|billion)?',
-        ]
-
-        max_damages = 0
-        for pattern in damage_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            for match in matches:
-                try:
-                    amount = float(match.replace(',', ''))
-                    # Detect magnitude
-                    if 'billion' in text_lower[text_lower.find(match)-20:text_lower.find(match)+20]:
-                        amount *= 1e9
-                    elif 'million' in text_lower[text_lower.find(match)-20:text_lower.find(match)+20]:
-                        amount *= 1e6
-                    max_damages = max(max_damages, amount)
-                except ValueError:
-                    pass
-
-        self.features.damages_claimed = max_damages
+        return self.analyze_stream((text,), title=title)
 
-        # Determine damages type
-        if 'treble' in text_lower or 'triple' in text_lower:
-            self.features.damages_type = 'treble'
-        elif 'punitive' in text_lower:
-            self.features.damages_type = 'punitive'
-        elif 'statutory' in text_lower:
-            self.features.damages_type = 'statutory'
-        else:
-            self.features.damages_type = 'actual'
-
-        # Check for statutory damages
-        for statute, amount in self.STATUTORY_DAMAGES.items():
-            if statute.lower() in text_lower:
-                self.features.per_violation_amount = max(
-                    self.features.per_violation_amount, amount
-                )
-
-    def _extract_strength_indicators(self, text_lower: str):
-        """Extract indicators of case strength."""
-        # Documentary evidence
-        doc_indicators = ['document', 'email', 'memorandum', 'record', 'exhibit',
-                         'evidence shows', 'evidence demonstrates']
-        self.features.documentary_evidence_mentioned = any(
-            ind in text_lower for ind in doc_indicators
-        )
+    def analyze_stream(self, chunks: Iterable[str], title: str = "") -> ComplaintFeatures:
+        """
+        Analyze complaint text supplied in pieces (e.g. one PDF page at a time).
 
-        # Expert witnesses
-        expert_indicators = ['expert', 'economist', 'forensic', 'specialist']
-        self.features.expert_witnesses_mentioned = any(
-            ind in text_lower for ind in expert_indicators
-        )
+        Args:
+            chunks: Consecutive pieces of the complaint text
+            title: Case title if known
 
-        # Prior cases
-        prior_case_matches = re.findall(r'\d+\s+f\.\s*(?:supp|3d|2d)', text_lower)
-        self.features.prior_cases_cited = len(prior_case_matches)
+        Returns:
+            ComplaintFeatures with extracted data
+        """
+        stream = self.stream(title=title)
+        for chunk in chunks:
+            stream.feed(chunk)
+        return stream.finish()
 
-        # Regulatory findings
-        reg_indicators = ['fda', 'sec', 'ftc', 'doj', 'investigation', 'enforcement',
-                         'consent decree', 'regulatory']
-        self.features.regulatory_findings_cited = any(
-            ind in text_lower for ind in reg_indicators
-        )
+    def stream(self, title: str = "", max_match_chars: int = MAX_MATCH_CHARS) -> 'ComplaintStream':
+        """Start an incremental analysis; feed() text, then finish()."""
+        return ComplaintStream(self, title=title, max_match_chars=max_match_chars)
 
     def _calculate_scores(self):
         """Calculate complexity and strength scores."""
@@ -356,13 +269,307 @@ class ComplaintAnalyzer:
         self.features.value_multiplier = multiplier
 
 
+class _Scan:
+    """
+    One regex applied incrementally across a stream of windows.
+
+    Matches are reported left to right without overlap, exactly as
+    re.finditer over the whole document would report them. A match is only
+    accepted once it starts at or before the window's safe offset, i.e. once
+    the text after it is known; later candidates wait for the next window.
+    """
+
+    def __init__(self, pattern: str, flags: int = 0, on_match: Optional[Callable] = None,
+                 limit: int = 0, lowered: bool = False):
+        self.regex = re.compile(pattern, flags)
+        self.on_match = on_match
+        self.limit = limit
+        self.lowered = lowered
+        self.count = 0
+        self.pos = 0  # Document offset where the next search starts
+
+    @property
+    def done(self) -> bool:
+        return bool(self.limit) and self.count >= self.limit
+
+    def scan(self, text: str, base: int, safe: int, final: bool):
+        """Report matches in text (which starts at document offset base)."""
+        pos = self.pos - base
+        while not self.done:
+            match = self.regex.search(text, pos)
+            if match is None or (not final and match.start() > safe):
+                break
+            self.count += 1
+            if self.on_match is not None:
+                self.on_match(match)
+            pos = match.end()
+        # Nothing starting before safe is left to find in this window
+        self.pos = base + max(pos, safe + 1)
+
+
+class ComplaintStream:
+    """
+    Incremental complaint analysis with bounded memory.
+
+    Text is fed in arbitrary chunks and scanned in windows that overlap by
+    max_match_chars, so memory is a few times max_match_chars. Only running state is kept between windows: flags for
+    the indicator terms and causes seen, match counts, the first party /
+    class matches, distinct statutes and the largest damages amount. finish()
+    returns the same ComplaintFeatures as analyzing the joined text at once,
+    as long as no single match (plus DAMAGES_CONTEXT characters after it) is
+    longer than max_match_chars.
+    """
+
+    def __init__(self, analyzer: ComplaintAnalyzer, title: str = "",
+                 max_match_chars: int = MAX_MATCH_CHARS):
+        self.analyzer = analyzer
+        self.title = title
+        self.max_match_chars = max_match_chars
+        self.chars_seen = 0
+
+        self._window = ''
+        self._window_lower = ''
+        self._base = 0  # Document offset of self._window[0]
+        self._pending: List[str] = []
+        self._pending_chars = 0
+        self._head = ''
+
+        a = analyzer
+        self._terms_pending: Set[str] = set(
+            a.CLASS_INDICATORS + a.MDL_TERMS + a.QUI_TAM_TERMS + a.SECURITIES_TERMS
+            + a.TREBLE_TERMS + ['punitive', 'statutory']
+            + [statute.lower() for statute in a.STATUTORY_DAMAGES]
+            + a.DOC_INDICATORS + a.EXPERT_INDICATORS + a.REGULATORY_INDICATORS
+        )
+        self._terms_seen: Set[str] = set()
+        self._cause_patterns = {
+            cause: [re.compile(pattern) for pattern in patterns]
+            for cause, patterns in a.CAUSE_PATTERNS.items()
+        }
+        self._causes: Set[str] = set()
+
+        self._plaintiff: Optional[str] = None
+        self._defendants: List[str] = []
+        self._class_definition: Optional[str] = None
+        self._class_sizes: Dict[int, str] = {}
+        self._statutes: List[Dict[str, None]] = [{} for _ in a.STATUTE_PATTERNS]
+        self._max_damages = 0
+
+        self._counts = _Scan(a.COUNT_PATTERN, lowered=True)
+        self._prior_cases = _Scan(a.PRIOR_CASE_PATTERN, lowered=True)
+        self._scans = [
+            _Scan(a.PLAINTIFF_PATTERN, re.IGNORECASE, self._on_plaintiff, limit=1),
+            _Scan(a.DEFENDANT_PATTERN, re.IGNORECASE, self._on_defendant, limit=a.MAX_DEFENDANTS),
+            _Scan(a.CLASS_DEFINITION_PATTERN, re.IGNORECASE, self._on_class_definition, limit=1),
+            self._counts,
+            self._prior_cases,
+        ]
+        for i, pattern in enumerate(a.CLASS_SIZE_PATTERNS):
+            self._scans.append(_Scan(pattern, re.IGNORECASE, self._size_handler(i), limit=1))
+        for i, pattern in enumerate(a.STATUTE_PATTERNS):
+            self._scans.append(_Scan(pattern, on_match=self._statute_handler(i), lowered=True))
+        for pattern in a.DAMAGE_PATTERNS:
+            self._scans.append(_Scan(pattern, re.IGNORECASE, self._on_damages))
+
+    def feed(self, chunk: str):
+        """Add the next piece of complaint text."""
+        if not chunk:
+            return
+        self.chars_seen += len(chunk)
+        if len(self._head) < CAPTION_CHARS:
+            self._head += chunk[:CAPTION_CHARS - len(self._head)]
+        self._pending.append(chunk)
+        self._pending_chars += len(chunk)
+        if self._pending_chars >= self.max_match_chars * WINDOW_OVERLAP_RATIO:
+            self._process(final=False)
+
+    def finish(self) -> ComplaintFeatures:
+        """Scan the remaining text and return the extracted features."""
+        self._process(final=True)
+        self._window = self._window_lower = ''
+
+        a = self.analyzer
+        features = ComplaintFeatures(title=self.title)
+
+        # Parties
+        if self._plaintiff is not None:
+            features.plaintiffs.append(self._plaintiff)
+        features.defendants.extend(self._defendants)
+        v_match = re.search(a.CAPTION_PATTERN, self._head, re.IGNORECASE)
+        if v_match:
+            if not features.plaintiffs:
+                features.plaintiffs.append(v_match.group(1).strip())
+            if not features.defendants:
+                features.defendants.append(v_match.group(2).strip()[:100])
+
+        # Class info
+        features.is_class_action = self._seen(a.CLASS_INDICATORS)
+        if self._class_definition is not None:
+            features.class_definition = self._class_definition
+        for i in range(len(a.CLASS_SIZE_PATTERNS)):
+            if i in self._class_sizes:
+                try:
+                    features.estimated_class_size = int(self._class_sizes[i].replace(',', ''))
+                    break
+                except ValueError:
+                    pass
+        features.is_mdl = self._seen(a.MDL_TERMS)
+        features.is_qui_tam = self._seen(a.QUI_TAM_TERMS)
+        features.is_securities = self._seen(a.SECURITIES_TERMS)
+
+        # Causes and statutes
+        features.causes_of_action = [cause for cause in a.CAUSE_PATTERNS if cause in self._causes]
+        features.claim_count = max(self._counts.count, len(features.causes_of_action))
+        for statutes in self._statutes:
+            for statute in statutes:
+                if statute not in features.statutes_cited:
+                    features.statutes_cited.append(statute)
+
+        # Damages
+        features.damages_claimed = self._max_damages
+        if self._seen(a.TREBLE_TERMS):
+            features.damages_type = 'treble'
+        elif self._seen(['punitive']):
+            features.damages_type = 'punitive'
+        elif self._seen(['statutory']):
+            features.damages_type = 'statutory'
+        else:
+            features.damages_type = 'actual'
+        for statute, amount in a.STATUTORY_DAMAGES.items():
+            if self._seen([statute.lower()]):
+                features.per_violation_amount = max(features.per_violation_amount, amount)
+
+        # Strength indicators
+        features.documentary_evidence_mentioned = self._seen(a.DOC_INDICATORS)
+        features.expert_witnesses_mentioned = self._seen(a.EXPERT_INDICATORS)
+        features.prior_cases_cited = self._prior_cases.count
+        features.regulatory_findings_cited = self._seen(a.REGULATORY_INDICATORS)
+
+        a.features = features
+        a._calculate_scores()
+        return features
+
+    def _process(self, final: bool):
+        """Scan the current window plus pending text, then keep only the overlap."""
+        text = self._window + ''.join(self._pending)
+        self._pending = []
+        self._pending_chars = 0
+        self._window = text
+        self._window_lower = text_lower = _lower(text)
+
+        safe = len(text) - self.max_match_chars
+        for scan in self._scans:
+            scan.scan(text_lower if scan.lowered else text, self._base, safe, final)
+
+        if self._terms_pending:
+            found = {term for term in self._terms_pending if term in text_lower}
+            self._terms_pending -= found
+            self._terms_seen |= found
+
+        for cause, patterns in self._cause_patterns.items():
+            if cause not in self._causes and any(p.search(text_lower) for p in patterns):
+                self._causes.add(cause)
+
+        keep = self.max_match_chars + DAMAGES_CONTEXT
+        if not final and len(text) > keep:
+            self._base += len(text) - keep
+            self._window = text[-keep:]
+            self._window_lower = text_lower[-keep:]
+
+    def _seen(self, terms: List[str]) -> bool:
+        return any(term in self._terms_seen for term in terms)
+
+    def _on_plaintiff(self, match):
+        self._plaintiff = match.group(1).strip()
+
+    def _on_defendant(self, match):
+        self._defendants.append(match.group(1).strip())
+
+    def _on_class_definition(self, match):
+        self._class_definition = match.group(1).strip()
+
+    def _size_handler(self, index: int) -> Callable:
+        def on_match(match):
+            self._class_sizes[index] = match.group(1)
+        return on_match
+
+    def _statute_handler(self, index: int) -> Callable:
+        def on_match(match):
+            self._statutes[index][match.group(1).upper()] = None
+        return on_match
+
+    def _on_damages(self, match):
+        try:
+            amount = float(match.group(1).replace(',', ''))
+        except ValueError:
+            return
+        # Detect magnitude from the text around the amount
+        start = match.start(1)
+        context = self._window_lower[max(0, start - DAMAGES_CONTEXT):start + DAMAGES_CONTEXT]
+        if 'billion' in context:
+            amount *= 1e9
+        elif 'million' in context:
+            amount *= 1e6
+        self._max_damages = max(self._max_damages, amount)
+
+
+def _lower(text: str) -> str:
+    """Lowercase without changing length, so offsets match the original text."""
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        return lowered
+    return ''.join(c.lower() if len(c.lower()) == 1 else c for c in text)
+
+
+def iter_document_text(filepath: str, chunk_size: int = TEXT_CHUNK_CHARS) -> Iterator[str]:
+    """
+    Yield a complaint's text piece by piece: page by page for PDFs,
+    chunk_size characters at a time for text files.
+    """
+    path = Path(filepath)
+    if path.suffix.lower() == '.pdf':
+        yield from _iter_pdf_pages(path)
+        return
+
+    with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+
+
+def _iter_pdf_pages(path: Path) -> Iterator[str]:
+    """Native PDF text one page at a time (pdfplumber, falling back to PyMuPDF)."""
+    try:
+        import pdfplumber
+    except ImportError:
+        pdfplumber = None
+
+    if pdfplumber is not None:
+        with pdfplumber.open(str(path)) as pdf:
+            for i, page in enumerate(pdf.pages):
+                yield ('\n\n' if i else '') + (page.extract_text() or '')
+                page.flush_cache()  # Don't keep every parsed page alive
+        return
+
+    try:
+        import fitz
+    except ImportError:
+        raise ImportError("PDF complaints require pdfplumber or PyMuPDF")
+
+    doc = fitz.open(str(path))
+    try:
+        for i, page in enumerate(doc):
+            yield ('\n\n' if i else '') + page.get_text()
+    finally:
+        doc.close()
+
+
 def analyze_complaint_file(filepath: str) -> ComplaintFeatures:
     """Convenience function to analyze a complaint from file."""
-    with open(filepath, 'r') as f:
-        text = f.read()
-
     analyzer = ComplaintAnalyzer()
-    return analyzer.analyze(text, title=filepath)
+    return analyzer.analyze_stream(iter_document_text(filepath), title=filepath)
 
 
 if __name__ == "__main__":
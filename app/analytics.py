@@ -1,42 +1,17 @@
 """Analytics and data extraction from PACER RSS data"""
 import re
+import time
 from typing import Dict, List, Any
 from collections import Counter
-from .models.db import get_conn
+from .models.db import get_conn, fts_available, search_rss_items
+from .services.docket_extract import extractor
 
 def extract_document_type(summary: str) -> str:
     """Extract document type from summary"""
     if not summary:
         return "Unknown"
 
-    # Common document types
-    patterns = {
-        "Complaint": r"\[Complaint\]|Complaint filed",
-        "Motion": r"\[Motion|MOTION",
-        "Order": r"\[Order\]|ORDER",
-        "Answer": r"\[Answer\]",
-        "Brief": r"\[Brief\]|BRIEF",
-        "Notice": r"\[Notice\]|NOTICE",
-        "Petition": r"\[Petition\]",
-        "Application": r"\[Application\]",
-        "Stipulation": r"\[Stipulation\]",
-        "Declaration": r"\[Declaration\]",
-        "Affidavit": r"\[Affidavit\]",
-        "Subpoena": r"\[Subpoena\]",
-        "Summons": r"\[Summons\]",
-        "Judgment": r"\[Judgment\]|JUDGMENT",
-        "Opinion": r"\[Opinion\]",
-        "Transcript": r"\[Transcript\]|-Transcript\]",
-        "Certificate": r"\[Certificate",
-        "Waiver": r"Waiver of Service",
-        "Extension": r"Extension of Time",
-    }
-
-    for doc_type, pattern in patterns.items():
-        if re.search(pattern, summary, re.IGNORECASE):
-            return doc_type
-
-    return "Other"
+    return extractor.document_type(summary)
 
 def extract_parties(title: str) -> Dict[str, List[str]]:
     """Extract plaintiff and defendant names from case title"""
@@ -58,16 +33,31 @@ def get_court_activity_stats():
     conn = get_conn()
     cur = conn.execute("""
         SELECT
-            court_code,
-            COUNT(*) as total_filings,
-            COUNT(DISTINCT case_number) as unique_cases,
-            SUM(CASE WHEN case_type = 'cv' THEN 1 ELSE 0 END) as civil,
-            SUM(CASE WHEN case_type = 'cr' THEN 1 ELSE 0 END) as criminal,
-            SUM(CASE WHEN case_type = 'bk' THEN 1 ELSE 0 END) as bankruptcy,
-            MAX(published) as most_recent
-        FROM rss_items
-        WHERE court_code IS NOT NULL
-        GROUP BY court_code
+            r.court_code,
+            r.total_filings,
+            coalesce(c.unique_cases, 0) as unique_cases,
+            r.civil,
+            r.criminal,
+            r.bankruptcy,
+            r.most_recent
+        FROM (
+            SELECT
+                court_code,
+                SUM(filings) as total_filings,
+                SUM(CASE WHEN case_type = 'cv' THEN filings ELSE 0 END) as civil,
+                SUM(CASE WHEN case_type = 'cr' THEN filings ELSE 0 END) as criminal,
+                SUM(CASE WHEN case_type = 'bk' THEN filings ELSE 0 END) as bankruptcy,
+                MAX(last_published) as most_recent
+            FROM rss_rollup_daily
+            WHERE court_code != ''
+            GROUP BY court_code
+        ) r
+        LEFT JOIN (
+            SELECT court_code, COUNT(DISTINCT case_number) as unique_cases
+            FROM rss_rollup_cases
+            WHERE court_code != ''
+            GROUP BY court_code
+        ) c ON c.court_code = r.court_code
         ORDER BY total_filings DESC
     """)
     return [dict(row) for row in cur.fetchall()]
@@ -90,10 +80,10 @@ def get_case_type_distribution():
     cur = conn.execute("""
         SELECT
             case_type,
-            COUNT(*) as count,
-            COUNT(DISTINCT court_code) as courts_affected
-        FROM rss_items
-        WHERE case_type IS NOT NULL
+            SUM(filings) as count,
+            COUNT(DISTINCT nullif(court_code, '')) as courts_affected
+        FROM rss_rollup_daily
+        WHERE case_type != ''
         GROUP BY case_type
         ORDER BY count DESC
     """)
@@ -104,28 +94,34 @@ def get_recent_activity_by_hour():
     conn = get_conn()
     cur = conn.execute("""
         SELECT
-            substr(published, 1, 16) as hour_bucket,
+            strftime('%Y-%m-%dT%H:00', published_ts, 'unixepoch') as hour_bucket,
             COUNT(*) as filings
         FROM rss_items
-        WHERE published IS NOT NULL
+        WHERE published_ts >= ?
         GROUP BY hour_bucket
         ORDER BY hour_bucket DESC
         LIMIT 24
-    """)
+    """, (int(time.time()) - 24 * 3600,))
     return [dict(row) for row in cur.fetchall()]
 
 def search_cases(query: str, limit: int = 50):
     """Search cases by party name, case number, or keywords"""
+    return search_cases_page(query, limit)["results"]
+
+def search_cases_page(query: str, limit: int = 50, cursor: str = None):
+    """Search cases ranked by relevance, with highlighted snippets and a next_cursor"""
+    if fts_available("rss_items_fts"):
+        return search_rss_items(query, limit, cursor)
     conn = get_conn()
     search_pattern = f"%{query}%"
     cur = conn.execute("""
         SELECT *
         FROM rss_items
         WHERE title LIKE ? OR summary LIKE ? OR case_number LIKE ?
-        ORDER BY published DESC
+        ORDER BY published_ts DESC
         LIMIT ?
     """, (search_pattern, search_pattern, search_pattern, limit))
-    return [dict(row) for row in cur.fetchall()]
+    return {"results": [dict(row) for row in cur.fetchall()], "next_cursor": None}
 
 def get_top_parties(limit: int = 20):
     """Extract most frequently appearing parties"""
@@ -150,36 +146,36 @@ def get_top_parties(limit: int = 20):
 def get_nature_of_suit_stats(court_code: str = None, limit: int = 50):
     """Get filing statistics by nature of suit"""
     conn = get_conn()
-    if court_code:
-        cur = conn.execute("""
+    court_filter = " AND court_code = ?" if court_code else ""
+    params = (court_code, court_code, limit) if court_code else (limit,)
+    cur = conn.execute(f"""
+        SELECT
+            r.nature_of_suit,
+            r.total_filings,
+            coalesce(c.unique_cases, 0) as unique_cases,
+            r.courts,
+            r.first_seen,
+            r.last_seen
+        FROM (
             SELECT
                 nature_of_suit,
-                COUNT(*) as total_filings,
-                COUNT(DISTINCT case_number) as unique_cases,
-                COUNT(DISTINCT court_code) as courts,
-                MIN(published) as first_seen,
-                MAX(published) as last_seen
-            FROM rss_items
-            WHERE nature_of_suit IS NOT NULL AND nature_of_suit != '' AND court_code = ?
+                SUM(filings) as total_filings,
+                COUNT(DISTINCT nullif(court_code, '')) as courts,
+                MIN(first_published) as first_seen,
+                MAX(last_published) as last_seen
+            FROM rss_rollup_daily
+            WHERE nature_of_suit != ''{court_filter}
             GROUP BY nature_of_suit
-            ORDER BY total_filings DESC
-            LIMIT ?
-        """, (court_code, limit))
-    else:
-        cur = conn.execute("""
-            SELECT
-                nature_of_suit,
-                COUNT(*) as total_filings,
-                COUNT(DISTINCT case_number) as unique_cases,
-                COUNT(DISTINCT court_code) as courts,
-                MIN(published) as first_seen,
-                MAX(published) as last_seen
-            FROM rss_items
-            WHERE nature_of_suit IS NOT NULL AND nature_of_suit != ''
+        ) r
+        LEFT JOIN (
+            SELECT nature_of_suit, COUNT(DISTINCT case_number) as unique_cases
+            FROM rss_rollup_cases
+            WHERE nature_of_suit != ''{court_filter}
             GROUP BY nature_of_suit
-            ORDER BY total_filings DESC
-            LIMIT ?
-        """, (limit,))
+        ) c ON c.nature_of_suit = r.nature_of_suit
+        ORDER BY total_filings DESC
+        LIMIT ?
+    """, params)
     return [dict(row) for row in cur.fetchall()]
 
 
@@ -187,8 +183,9 @@ def get_filing_trends(days: int = 30, court_code: str = None, case_type: str = N
     """Get filing trends over time (daily counts)"""
     conn = get_conn()
 
-    conditions = ["published IS NOT NULL"]
-    params = []
+    # Calendar-day window (UTC), a range scan on the rollup's day column
+    conditions = ["day >= ?"]
+    params = [time.strftime("%Y-%m-%d", time.gmtime(time.time() - (days - 1) * 86400))]
 
     if court_code:
         conditions.append("court_code = ?")
@@ -198,20 +195,34 @@ def get_filing_trends(days: int = 30, court_code: str = None, case_type: str = N
         params.append(case_type)
 
     where_clause = " AND ".join(conditions)
-    params.append(days)
+    params = params + params + [days]
 
     cur = conn.execute(f"""
         SELECT
-            substr(published, 1, 10) as date,
-            COUNT(*) as total_filings,
-            COUNT(DISTINCT case_number) as unique_cases,
-            SUM(CASE WHEN case_type = 'cv' THEN 1 ELSE 0 END) as civil,
-            SUM(CASE WHEN case_type = 'cr' THEN 1 ELSE 0 END) as criminal,
-            SUM(CASE WHEN case_type = 'bk' THEN 1 ELSE 0 END) as bankruptcy
-        FROM rss_items
-        WHERE {where_clause}
-        GROUP BY substr(published, 1, 10)
-        ORDER BY date DESC
+            r.date,
+            r.total_filings,
+            coalesce(c.unique_cases, 0) as unique_cases,
+            r.civil,
+            r.criminal,
+            r.bankruptcy
+        FROM (
+            SELECT
+                day as date,
+                SUM(filings) as total_filings,
+                SUM(CASE WHEN case_type = 'cv' THEN filings ELSE 0 END) as civil,
+                SUM(CASE WHEN case_type = 'cr' THEN filings ELSE 0 END) as criminal,
+                SUM(CASE WHEN case_type = 'bk' THEN filings ELSE 0 END) as bankruptcy
+            FROM rss_rollup_daily
+            WHERE {where_clause}
+            GROUP BY day
+        ) r
+        LEFT JOIN (
+            SELECT day as date, COUNT(DISTINCT case_number) as unique_cases
+            FROM rss_rollup_cases
+            WHERE {where_clause}
+            GROUP BY day
+        ) c ON c.date = r.date
+        ORDER BY r.date DESC
         LIMIT ?
     """, tuple(params))
     return [dict(row) for row in cur.fetchall()]
@@ -232,8 +243,8 @@ def get_court_comparison(courts: List[str] = None):
                 SUM(CASE WHEN case_type = 'cr' THEN 1 ELSE 0 END) as criminal,
                 SUM(CASE WHEN case_type = 'bk' THEN 1 ELSE 0 END) as bankruptcy,
                 COUNT(DISTINCT nature_of_suit) as nos_variety,
-                MIN(published) as first_filing,
-                MAX(published) as last_filing
+                strftime('%Y-%m-%dT%H:%M:%SZ', MIN(published_ts), 'unixepoch') as first_filing,
+                strftime('%Y-%m-%dT%H:%M:%SZ', MAX(published_ts), 'unixepoch') as last_filing
             FROM rss_items
             WHERE court_code IN ({placeholders})
             GROUP BY court_code
@@ -249,8 +260,8 @@ def get_court_comparison(courts: List[str] = None):
                 SUM(CASE WHEN case_type = 'cr' THEN 1 ELSE 0 END) as criminal,
                 SUM(CASE WHEN case_type = 'bk' THEN 1 ELSE 0 END) as bankruptcy,
                 COUNT(DISTINCT nature_of_suit) as nos_variety,
-                MIN(published) as first_filing,
-                MAX(published) as last_filing
+                strftime('%Y-%m-%dT%H:%M:%SZ', MIN(published_ts), 'unixepoch') as first_filing,
+                strftime('%Y-%m-%dT%H:%M:%SZ', MAX(published_ts), 'unixepoch') as last_filing
             FROM rss_items
             WHERE court_code IS NOT NULL
             GROUP BY court_code
@@ -278,7 +289,7 @@ def get_new_cases_summary(days: int = 7, court_code: str = None):
         SELECT court_code, case_type, nature_of_suit, case_number, title, published, metadata_json
         FROM rss_items
         WHERE {where_clause}
-        ORDER BY published DESC
+        ORDER BY published_ts DESC
         LIMIT ?
     """, tuple(params))
 
@@ -310,8 +321,8 @@ def get_case_type_by_court(case_type: str):
             COUNT(*) as filings,
             COUNT(DISTINCT case_number) as cases,
             COUNT(DISTINCT nature_of_suit) as nos_variety,
-            MIN(published) as first_seen,
-            MAX(published) as last_seen
+            strftime('%Y-%m-%dT%H:%M:%SZ', MIN(published_ts), 'unixepoch') as first_seen,
+            strftime('%Y-%m-%dT%H:%M:%SZ', MAX(published_ts), 'unixepoch') as last_seen
         FROM rss_items
         WHERE case_type = ?
         GROUP BY court_code
@@ -323,29 +334,30 @@ def get_case_type_by_court(case_type: str):
 def get_filing_velocity(court_code: str = None, hours: int = 24):
     """Get filing rate (filings per hour) for recent activity"""
     conn = get_conn()
+    since = int(time.time()) - hours * 3600
 
     if court_code:
         cur = conn.execute("""
             SELECT
-                substr(published, 1, 13) as hour,
+                strftime('%Y-%m-%dT%H', published_ts, 'unixepoch') as hour,
                 COUNT(*) as filings
             FROM rss_items
-            WHERE court_code = ? AND published IS NOT NULL
-            GROUP BY substr(published, 1, 13)
+            WHERE court_code = ? AND published_ts >= ?
+            GROUP BY hour
             ORDER BY hour DESC
             LIMIT ?
-        """, (court_code, hours))
+        """, (court_code, since, hours))
     else:
         cur = conn.execute("""
             SELECT
-                substr(published, 1, 13) as hour,
+                strftime('%Y-%m-%dT%H', published_ts, 'unixepoch') as hour,
                 COUNT(*) as filings
             FROM rss_items
-            WHERE published IS NOT NULL
-            GROUP BY substr(published, 1, 13)
+            WHERE published_ts >= ?
+            GROUP BY hour
             ORDER BY hour DESC
             LIMIT ?
-        """, (hours,))
+        """, (since, hours))
 
     results = [dict(row) for row in cur.fetchall()]
     if results:
@@ -367,29 +379,56 @@ def get_judge_activity(court_code: str = None, limit: int = 20):
     if court_code:
         cur = conn.execute("""
             SELECT
-                judge_name,
-                COUNT(*) as filings,
-                COUNT(DISTINCT case_number) as cases,
-                SUM(CASE WHEN case_type = 'cv' THEN 1 ELSE 0 END) as civil,
-                SUM(CASE WHEN case_type = 'cr' THEN 1 ELSE 0 END) as criminal
-            FROM rss_items
-            WHERE judge_name IS NOT NULL AND judge_name != '' AND court_code = ?
-            GROUP BY judge_name
+                r.judge_name,
+                r.filings,
+                coalesce(c.cases, 0) as cases,
+                r.civil,
+                r.criminal
+            FROM (
+                SELECT
+                    judge_name,
+                    SUM(filings) as filings,
+                    SUM(CASE WHEN case_type = 'cv' THEN filings ELSE 0 END) as civil,
+                    SUM(CASE WHEN case_type = 'cr' THEN filings ELSE 0 END) as criminal
+                FROM rss_rollup_daily
+                WHERE judge_name != '' AND court_code = ?
+                GROUP BY judge_name
+            ) r
+            LEFT JOIN (
+                SELECT judge_name, COUNT(DISTINCT case_number) as cases
+                FROM rss_rollup_cases
+                WHERE judge_name != '' AND court_code = ?
+                GROUP BY judge_name
+            ) c ON c.judge_name = r.judge_name
             ORDER BY filings DESC
             LIMIT ?
-        """, (court_code, limit))
+        """, (court_code, court_code, limit))
     else:
         cur = conn.execute("""
             SELECT
-                judge_name,
-                court_code,
-                COUNT(*) as filings,
-                COUNT(DISTINCT case_number) as cases,
-                SUM(CASE WHEN case_type = 'cv' THEN 1 ELSE 0 END) as civil,
-                SUM(CASE WHEN case_type = 'cr' THEN 1 ELSE 0 END) as criminal
-            FROM rss_items
-            WHERE judge_name IS NOT NULL AND judge_name != ''
-            GROUP BY judge_name, court_code
+                r.judge_name,
+                nullif(r.court_code, '') as court_code,
+                r.filings,
+                coalesce(c.cases, 0) as cases,
+                r.civil,
+                r.criminal
+            FROM (
+                SELECT
+                    judge_name,
+                    court_code,
+                    SUM(filings) as filings,
+                    SUM(CASE WHEN case_type = 'cv' THEN filings ELSE 0 END) as civil,
+                    SUM(CASE WHEN case_type = 'cr' THEN filings ELSE 0 END) as criminal
+                FROM rss_rollup_daily
+                WHERE judge_name != ''
+                GROUP BY judge_name, court_code
+            ) r
+            LEFT JOIN (
+                SELECT judge_name, court_code, COUNT(DISTINCT case_number) as cases
+                FROM rss_rollup_cases
+                WHERE judge_name != ''
+                GROUP BY judge_name, court_code
+            ) c ON c.judge_name = r.judge_name AND c.court_code = r.court_code
             ORDER BY filings DESC
             LIMIT ?
         """, (limit,))
@@ -418,7 +457,12 @@ def get_overall_stats():
     stats["active_courts"] = row["cnt"] if row else 0
 
     # Date range
-    cur = conn.execute("SELECT MIN(published) as first, MAX(published) as last FROM rss_items WHERE published IS NOT NULL")
+    cur = conn.execute("""
+        SELECT
+            strftime('%Y-%m-%dT%H:%M:%SZ', MIN(published_ts), 'unixepoch') as first,
+            strftime('%Y-%m-%dT%H:%M:%SZ', MAX(published_ts), 'unixepoch') as last
+        FROM rss_items
+    """)
     row = cur.fetchone()
     if row:
         stats["first_filing"] = row["first"]
@@ -2,6 +2,7 @@
 from fastapi import FastAPI, HTTPException, Request, BackgroundTasks
 from fastapi import Body
 from fastapi.responses import Response, HTMLResponse, FileResponse
+from fastapi.routing import APIRoute
 from pydantic import BaseModel
 from typing import Optional, List, Dict, Any
 try:
@@ -12,13 +13,42 @@ except Exception:
     # If python-dotenv isn't installed, continue without it
     pass
 
-from .models.db import init_db, upsert_court, upsert_courts_batch, upsert_rss_sources_batch, list_rss_sources, list_rss_items, list_settlements_db, get_settlement_stats, get_claim_profile, upsert_claim_profile
-from .services import rss_ingest
+from .models.db import init_db, upsert_court, upsert_courts_batch, upsert_rss_sources_batch, list_rss_sources, list_rss_items, list_settlements_db, search_settlements, get_settlement_stats, get_claim_profile, upsert_claim_profile, get_pool_stats, get_conn, release_conn, connection_scope
+from .services import rss_ingest, rss_poller
 from .html_views import generate_html_template
 from .data.federal_courts import FEDERAL_DISTRICT_COURTS, get_rss_url
+import functools
+import inspect
+import sqlite3
 import uuid
 
+
+def _connection_scoped(endpoint):
+    """Wrap an endpoint so its database connection is checked out for the request only."""
+    if inspect.iscoroutinefunction(endpoint):
+        @functools.wraps(endpoint)
+        async def scoped(*args, **kwargs):
+            with connection_scope():
+                return await endpoint(*args, **kwargs)
+    else:
+        # Sync endpoints run on a worker thread; the scope must be opened there
+        @functools.wraps(endpoint)
+        def scoped(*args, **kwargs):
+            with connection_scope():
+                return endpoint(*args, **kwargs)
+    return scoped
+
+
+class ConnectionScopedRoute(APIRoute):
+    """API route whose endpoint runs inside db.connection_scope()."""
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        super().__init__(path, _connection_scoped(endpoint), **kwargs)
+
+
 app = FastAPI(title="PACER CM/ECF RSS Ingest & Publisher (Demo)")
+# Every endpoint returns its pooled connection when the request finishes
+app.router.route_class = ConnectionScopedRoute
 
 _initialized = False
 
@@ -62,7 +92,7 @@ class RssSubscribeBody(BaseModel):
 @app.get("/v1/health")
 def health():
     _ensure_initialized()
-    return {"ok": True}
+    return {"ok": True, "db_pool": get_pool_stats()}
 
 @app.get("/v1/debug/db")
 def debug_db():
@@ -109,22 +139,22 @@ def api_rss_poll(batch: int = 10, offset: int = 0):
     _ensure_initialized()
     all_sources = list_rss_sources()
     sources = all_sources[offset:offset + batch]
-    total = 0
-    errors = 0
-    for s in sources:
-        try:
-            total += rss_ingest.poll(s)
-        except Exception:
-            errors += 1
-    return {
-        "polled_sources": len(sources),
-        "items_ingested": total,
-        "errors": errors,
+    result = rss_poller.poll_sources(sources)
+    result.update({
         "total_sources": len(all_sources),
         "offset": offset,
         "batch": batch,
         "next_offset": offset + batch if offset + batch < len(all_sources) else None
-    }
+    })
+    return result
+
+@app.api_route("/v1/rss/poll/all", methods=["GET", "POST"])
+def api_rss_poll_all():
+    """Poll every registered RSS source concurrently in one sweep."""
+    _ensure_initialized()
+    result = rss_poller.poll_sources(list_rss_sources())
+    result["total_sources"] = result["polled_sources"]
+    return result
 
 @app.api_route("/v1/rss/poll/court/{court_code}", methods=["GET", "POST"])
 def api_rss_poll_court(court_code: str):
@@ -372,7 +402,7 @@ from .analytics import (
     get_document_type_stats,
     get_case_type_distribution,
     get_recent_activity_by_hour,
-    search_cases,
+    search_cases_page,
     get_top_parties,
     get_nature_of_suit_stats,
     get_filing_trends,
@@ -464,13 +494,20 @@ def api_top_parties(limit: int = 20):
     return {"parties": get_top_parties(limit)}
 
 @app.get("/v1/search")
-def api_search(q: str, limit: int = 50):
-    """Search cases by party name, case number, or keywords"""
+def api_search(q: str, limit: int = 50, cursor: Optional[str] = None):
+    """Search cases by party name, case number, or keywords, best matches first.
+
+    Pass next_cursor from the response as `cursor` to fetch the next page.
+    """
     _ensure_initialized()
     if not q or len(q) < 2:
         raise HTTPException(status_code=400, detail="Query must be at least 2 characters")
-    results = search_cases(q, limit)
-    return {"results": results, "query": q, "count": len(results)}
+    try:
+        page = search_cases_page(q, limit, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    results = page["results"]
+    return {"results": results, "query": q, "count": len(results), "next_cursor": page["next_cursor"]}
 
 # PACER Authenticated Access
 from .pacer_auth import pacer_client
@@ -581,6 +618,11 @@ def pacer_document(court_code: str, doc_url: str, download: Optional[bool] = Fal
     headers = {"Cache-Control": "public, max-age=86400"}
     return FileResponse(path=result['path'], media_type="application/pdf", filename=(result.get('filename') if download else None), headers=headers)
 
+@app.get("/v1/pacer/documents/stats")
+def pacer_document_store_stats():
+    """Document store usage: stored documents/blobs, bytes vs. cap, hit rate, dedup and evictions"""
+    return pacer_client.document_store.stats()
+
 @app.post("/v1/pacer/bootstrap_cookies")
 def pacer_bootstrap_cookies(court_code: str, appurl: Optional[str] = None, headed: Optional[int] = 0, wait_ms: Optional[int] = 0):
     """Launch a headless browser login to CSO to persist cookies for subsequent doc fetches."""
@@ -723,7 +765,7 @@ def get_case_full(court_code: str, case_number: str):
         from .models.db import get_conn
         conn = get_conn()
         cur = conn.execute(
-            "SELECT * FROM rss_items WHERE court_code = ? AND case_number = ? ORDER BY published DESC LIMIT 10",
+            "SELECT * FROM rss_items WHERE court_code = ? AND case_number = ? ORDER BY published_ts DESC LIMIT 10",
             (court_code.lower(), case_number)
         )
         rss_items = [dict(r) for r in cur.fetchall()]
@@ -1171,6 +1213,28 @@ def api_predict_summary():
     return get_analytics_summary()
 
 
+_case_prediction_cache = None
+
+
+def _get_case_prediction_cache():
+    """Cache for /v1/predict/case results (sized by ML_CACHE_SIZE / ML_CACHE_TTL)."""
+    global _case_prediction_cache
+    if _case_prediction_cache is None:
+        from ml.inference.cache import cache_from_config
+        _case_prediction_cache = cache_from_config()
+    return _case_prediction_cache
+
+
+def _case_prediction_data_version():
+    """
+    Version of the fjc_outcomes data behind /v1/predict/case, for its cache key:
+    max(rowid) moves on every insert (including INSERT OR REPLACE reloads), and
+    is a single b-tree lookup.
+    """
+    row = get_conn().execute("SELECT max(rowid) AS version FROM fjc_outcomes").fetchone()
+    return dict(row)["version"] if row else None
+
+
 @app.get("/v1/predict/case")
 def api_predict_case(
     nos_code: Optional[str] = None,
@@ -1190,7 +1254,12 @@ def api_predict_case(
     Returns predicted outcome probabilities with confidence intervals.
     """
     _ensure_initialized()
-    return get_prediction_for_case(nos_code, court_code, pro_se, class_action)
+    nos_code = (nos_code or '').strip() or None
+    court_code = (court_code or '').strip().lower() or None
+    return _get_case_prediction_cache().get_or_compute(
+        (_case_prediction_data_version(), nos_code, court_code, pro_se, class_action),
+        lambda: get_prediction_for_case(nos_code, court_code, pro_se, class_action),
+    )
 
 
 @app.get("/v1/predict/outcomes/nos")
@@ -1293,42 +1362,25 @@ def api_court_benchmarks():
 # --- ML-Powered Predictions (ONNX for Vercel compatibility) ---
 
 def _get_ml_predictor():
-    """Get the appropriate ML predictor based on available dependencies."""
-    # Try ONNX first (lightweight, works on Vercel)
-    try:
-        from ml.inference.onnx_predictor import ONNXPredictor
-        predictor = ONNXPredictor()
-        if any(predictor.is_available().values()):
-            return predictor, "onnx"
-    except Exception:
-        pass
+    """Get the shared ML predictor (ONNX when exported, sklearn otherwise)."""
+    from ml.inference.registry import get_registry
+    return get_registry().get()
 
-    # Fall back to sklearn predictor (full features, local only)
-    try:
-        from ml.inference.predictor import CasePredictor
-        return CasePredictor(), "sklearn"
-    except ImportError:
-        pass
 
-    return None, None
+@app.on_event("startup")
+def _preload_ml_models():
+    """Load ML models in the background at startup (ML_PRELOAD=0 to disable)."""
+    from ml.inference.registry import get_registry
+    registry = get_registry()
+    if registry.config.inference.preload:
+        registry.preload_async()
 
 
 @app.get("/v1/ml/status")
 def api_ml_status():
-    """Check ML model availability."""
-    from ml.config import MODEL_VERSION
-
-    predictor, backend = _get_ml_predictor()
-    if predictor:
-        models = predictor.is_available()
-    else:
-        models = {m: False for m in ['dismissal', 'value', 'resolution', 'duration']}
-
-    return {
-        "version": MODEL_VERSION,
-        "backend": backend or "none",
-        "models": models,
-    }
+    """Check ML model availability, per-model load times and memory footprint."""
+    from ml.inference.registry import get_registry
+    return get_registry().status()
 
 
 @app.get("/v1/ml/predict")
@@ -1367,6 +1419,38 @@ def api_ml_predict(
         return {"error": str(e)}
 
 
+ML_PREDICT_FIELDS = ("court", "nos", "defendant", "judge", "class_action", "pro_se", "mdl")
+
+
+@app.post("/v1/ml/predict/batch")
+def api_ml_predict_batch(cases: List[Dict[str, Any]] = Body(..., embed=True)):
+    """
+    Full ML-powered prediction for many cases in one call.
+
+    Body: {"cases": [{"court": ..., "nos": ..., "defendant": ..., "judge": ...,
+    "class_action": false, "pro_se": false, "mdl": false}, ...]}
+
+    The feature matrix is built once for the batch and each model runs once
+    over it. Results are returned in input order.
+    """
+    predictor, backend = _get_ml_predictor()
+    if predictor is None:
+        return {"error": "ML models not available"}
+
+    records = [{k: case.get(k) for k in ML_PREDICT_FIELDS if k in case} for case in cases]
+
+    try:
+        results = predictor.predict_batch(records)
+    except Exception as e:
+        return {"error": str(e)}
+
+    return {
+        "backend": backend,
+        "count": len(results),
+        "predictions": [r.to_dict() for r in results],
+    }
+
+
 @app.get("/v1/ml/dismissal")
 def api_ml_dismissal(
     court: str = None,
@@ -2462,6 +2546,22 @@ from .models.db import (
 )
 
 
+def _publish_ingest_complete(source: str, result: Any, state: Optional[str] = None):
+    """
+    Notify batch_complete subscribers about a finished ingest run.
+
+    Only queues the event; a subscriber that hasn't received the previous
+    run's event yet gets just the latest one.
+    """
+    try:
+        _publish_webhook_event(
+            "batch_complete", {"source": source, "result": result},
+            state=state, coalesce_key=f"batch_complete:{source}"
+        )
+    except Exception:
+        pass  # Notifications must never fail the ingest itself
+
+
 @app.post("/v1/state-courts/ingest/oklahoma")
 def ingest_oklahoma(
     counties: str = None,
@@ -2484,6 +2584,7 @@ def ingest_oklahoma(
             counties=county_list,
             limit_per_county=limit_per_county
         )
+        _publish_ingest_complete("oklahoma", result, state="OK")
         return result
     except Exception as e:
         raise HTTPException(status_code=502, detail=f"Ingestion error: {str(e)}")
@@ -2515,6 +2616,7 @@ def ingest_virginia(
             year=year,
             limit_per_type=limit_per_type
         )
+        _publish_ingest_complete("virginia", result, state="VA")
         return result
     except Exception as e:
         raise HTTPException(status_code=502, detail=f"Ingestion error: {str(e)}")
@@ -2548,6 +2650,7 @@ def ingest_state_opinions(
             days_back=days_back,
             limit_per_state=limit_per_state
         )
+        _publish_ingest_complete("opinions", result)
         return result
     except Exception as e:
         raise HTTPException(status_code=502, detail=f"Ingestion error: {str(e)}")
@@ -2568,6 +2671,7 @@ def ingest_all_state_data():
 
     try:
         result = service.run_full_ingest()
+        _publish_ingest_complete("all", result)
         return result
     except Exception as e:
         raise HTTPException(status_code=502, detail=f"Ingestion error: {str(e)}")
@@ -2708,129 +2812,6 @@ def state_court_database_stats():
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
 
 
-# --- Data Export Endpoints ---
-
-@app.get("/v1/state-courts/export/cases")
-def export_state_court_cases(
-    state: str = None,
-    county: str = None,
-    case_type: str = None,
-    format: str = "json",
-    limit: int = 1000
-):
-    """
-    Export state court cases in JSON or CSV format.
-
-    Args:
-        state: Filter by state code (e.g., OK, VA)
-        county: Filter by county
-        case_type: Filter by case type code
-        format: Output format (json or csv)
-        limit: Maximum records to export (max 10000)
-    """
-    _ensure_initialized()
-    from .services.state_courts import normalize_batch
-
-    limit = min(limit, 10000)
-
-    try:
-        cases = search_state_court_cases(
-            state=state,
-            county=county,
-            case_type=case_type,
-            limit=limit
-        )
-
-        # Normalize the data
-        normalized = normalize_batch(cases)
-
-        if format.lower() == "csv":
-            import csv
-            import io
-
-            if not normalized:
-                return Response(content="", media_type="text/csv")
-
-            output = io.StringIO()
-            writer = csv.DictWriter(output, fieldnames=normalized[0].keys())
-            writer.writeheader()
-            for row in normalized:
-                # Flatten nested dicts for CSV
-                flat_row = {}
-                for k, v in row.items():
-                    if isinstance(v, dict):
-                        flat_row[k] = str(v)
-                    else:
-                        flat_row[k] = v
-                writer.writerow(flat_row)
-
-            return Response(
-                content=output.getvalue(),
-                media_type="text/csv",
-                headers={"Content-Disposition": f"attachment; filename=state_court_cases_{state or 'all'}.csv"}
-            )
-
-        return {
-            "format": "json",
-            "count": len(normalized),
-            "filters": {"state": state, "county": county, "case_type": case_type},
-            "data": normalized
-        }
-
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Export error: {str(e)}")
-
-
-@app.get("/v1/state-courts/export/opinions")
-def export_state_court_opinions(
-    state: str = None,
-    court: str = None,
-    format: str = "json",
-    limit: int = 1000
-):
-    """
-    Export state appellate opinions in JSON or CSV format.
-    """
-    _ensure_initialized()
-
-    limit = min(limit, 10000)
-
-    try:
-        opinions = search_state_appellate_opinions(
-            state=state,
-            court=court,
-            limit=limit
-        )
-
-        if format.lower() == "csv":
-            import csv
-            import io
-
-            if not opinions:
-                return Response(content="", media_type="text/csv")
-
-            output = io.StringIO()
-            writer = csv.DictWriter(output, fieldnames=opinions[0].keys())
-            writer.writeheader()
-            writer.writerows(opinions)
-
-            return Response(
-                content=output.getvalue(),
-                media_type="text/csv",
-                headers={"Content-Disposition": f"attachment; filename=state_opinions_{state or 'all'}.csv"}
-            )
-
-        return {
-            "format": "json",
-            "count": len(opinions),
-            "filters": {"state": state, "court": court},
-            "data": opinions
-        }
-
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Export error: {str(e)}")
-
-
 # --- Data Normalization API ---
 
 @app.post("/v1/state-courts/normalize/record")
@@ -3291,14 +3272,40 @@ def search_fulltext(q: str, state: str = None, limit: int = 20):
     """
     Full-text search across all stored court documents and opinions.
 
-    Searches case styles, case numbers, and stored text content.
+    Searches case styles, case numbers, and stored text content using the
+    FTS5 indexes, ranked by BM25 with highlighted snippets. Supports
+    "quoted phrases", prefix* terms and OR / NOT.
     """
-    from .models.db import get_conn
+    from .models.db import get_conn, search_state_courts_fulltext
 
     if not q or len(q) < 2:
         raise HTTPException(status_code=400, detail="Query must be at least 2 characters")
 
-    conn = get_conn()
+    state_code = state.upper()[:2] if state else None
+    try:
+        results = search_state_courts_fulltext(q, state_code, limit)
+        ranked = True
+    except sqlite3.DatabaseError:
+        # FTS5 not available in this SQLite build
+        ranked = False
+        results = _search_fulltext_like(get_conn(), q, state_code, limit)
+
+    return {
+        "success": True,
+        "query": q,
+        "state_filter": state,
+        "ranked": ranked,
+        "results": results,
+        "counts": {
+            "cases": len(results["cases"]),
+            "opinions": len(results["opinions"]),
+            "documents": len(results["documents"])
+        }
+    }
+
+
+def _search_fulltext_like(conn, q: str, state: str = None, limit: int = 20):
+    """Unindexed LIKE fallback for search_fulltext."""
     results = {"cases": [], "opinions": [], "documents": []}
 
     # Search cases
@@ -3313,7 +3320,7 @@ def search_fulltext(q: str, state: str = None, limit: int = 20):
 
     case_params = [f"%{q}%", f"%{q}%"]
     if state:
-        case_params.append(state.upper()[:2])
+        case_params.append(state)
     case_params.append(limit)
 
     results["cases"] = [dict(row) for row in conn.execute(case_sql, case_params).fetchall()]
@@ -3334,7 +3341,7 @@ def search_fulltext(q: str, state: str = None, limit: int = 20):
     doc_sql = """
         SELECT id, source, doc_type, state, case_number, title
         FROM state_court_documents
-        WHERE (title LIKE ? OR case_number LIKE ? OR content LIKE ?)
+        WHERE (title LIKE ? OR case_number LIKE ? OR extracted_text LIKE ?)
         {}
         ORDER BY created_at DESC
         LIMIT ?
@@ -3342,22 +3349,11 @@ def search_fulltext(q: str, state: str = None, limit: int = 20):
 
     doc_params = [f"%{q}%", f"%{q}%", f"%{q}%"]
     if state:
-        doc_params.append(state.upper()[:2])
+        doc_params.append(state)
     doc_params.append(limit)
 
     results["documents"] = [dict(row) for row in conn.execute(doc_sql, doc_params).fetchall()]
-
-    return {
-        "success": True,
-        "query": q,
-        "state_filter": state,
-        "results": results,
-        "counts": {
-            "cases": len(results["cases"]),
-            "opinions": len(results["opinions"]),
-            "documents": len(results["documents"])
-        }
-    }
+    return results
 
 
 @app.get("/v1/state-courts/stats")
@@ -5784,8 +5780,43 @@ def run_ingestion_schedule(schedule_id: str):
 
 # --- Webhook Notification System ---
 
-# In-memory webhook storage
-_webhooks = {}
+from .models.repositories import WebhookRepository
+
+# Webhook storage (database-backed, shared by all workers)
+_webhooks = WebhookRepository()
+
+from .services.webhook_dispatcher import WebhookDispatcher
+
+
+def _record_webhook_delivery(webhook_id: str, count: int):
+    """Update a webhook's trigger stats after the dispatcher delivered `count` events."""
+    from datetime import datetime
+    _webhooks.increment(webhook_id, "trigger_count", by=count,
+                        fields={"last_triggered": datetime.utcnow().isoformat()})
+
+
+# Deliveries go through a persistent queue and background workers, never inline
+_webhook_dispatcher = WebhookDispatcher(_webhooks.get, on_delivered=_record_webhook_delivery)
+
+
+def _publish_webhook_event(event: str, data: Dict[str, Any], state: Optional[str] = None,
+                           coalesce_key: Optional[str] = None) -> int:
+    """Queue an event for every subscribed webhook; returns the number queued."""
+    return _webhook_dispatcher.publish(
+        _webhooks.find(enabled=True), event, data, state=state, coalesce_key=coalesce_key
+    )
+
+
+@app.on_event("startup")
+def _start_webhook_dispatcher():
+    """Resume deliveries left queued by earlier runs."""
+    _webhook_dispatcher.start()
+
+
+@app.on_event("shutdown")
+def _stop_webhook_dispatcher():
+    """Let in-flight deliveries finish; queued ones stay for the next run."""
+    _webhook_dispatcher.stop()
 
 
 @app.get("/v1/state-courts/webhooks")
@@ -5835,13 +5866,19 @@ def create_webhook(body: dict):
     return {"success": True, "webhook": {**webhook, "secret": "***" if webhook["secret"] else None}}
 
 
+@app.get("/v1/state-courts/webhooks/metrics")
+def get_webhook_metrics():
+    """Delivery queue depth, counters and per-endpoint latency / failure metrics."""
+    return {"success": True, "metrics": _webhook_dispatcher.stats()}
+
+
 @app.get("/v1/state-courts/webhooks/{webhook_id}")
 def get_webhook(webhook_id: str):
     """Get webhook details."""
-    if webhook_id not in _webhooks:
+    webhook = _webhooks.get(webhook_id)
+    if webhook is None:
         raise HTTPException(status_code=404, detail="Webhook not found")
 
-    webhook = _webhooks[webhook_id]
     return {"success": True, "webhook": {**webhook, "secret": "***" if webhook["secret"] else None}}
 
 
@@ -5852,20 +5889,30 @@ def delete_webhook(webhook_id: str):
         raise HTTPException(status_code=404, detail="Webhook not found")
 
     del _webhooks[webhook_id]
+    _webhook_dispatcher.cancel(webhook_id)
     return {"success": True, "message": "Webhook deleted"}
 
 
+@app.get("/v1/state-courts/webhooks/{webhook_id}/deliveries")
+def list_webhook_deliveries(webhook_id: str, status: str = None, limit: int = 50):
+    """Recent deliveries for a webhook (pending, sending, delivered, failed, cancelled)."""
+    if webhook_id not in _webhooks:
+        raise HTTPException(status_code=404, detail="Webhook not found")
+
+    deliveries = _webhook_dispatcher.deliveries(webhook_id, status=status, limit=limit)
+    return {"success": True, "deliveries": deliveries, "count": len(deliveries)}
+
+
 @app.post("/v1/state-courts/webhooks/{webhook_id}/test")
 def test_webhook(webhook_id: str):
     """Send a test event to a webhook."""
     import json
     from datetime import datetime
 
-    if webhook_id not in _webhooks:
+    webhook = _webhooks.get(webhook_id)
+    if webhook is None:
         raise HTTPException(status_code=404, detail="Webhook not found")
 
-    webhook = _webhooks[webhook_id]
-
     test_payload = {
         "event": "test",
         "webhook_id": webhook_id,
@@ -5877,16 +5924,15 @@ def test_webhook(webhook_id: str):
         }
     }
 
-    # In production, would actually POST to webhook URL
-    # For now, just simulate success
-    webhook["last_triggered"] = datetime.utcnow().isoformat()
-    webhook["trigger_count"] += 1
+    # Sent by the dispatcher; trigger stats update once it is delivered
+    delivery_id = _webhook_dispatcher.enqueue(webhook, "test", test_payload)
 
     return {
         "success": True,
-        "message": "Test event sent",
+        "message": "Test event queued",
         "payload": test_payload,
-        "webhook_url": webhook["url"]
+        "webhook_url": webhook["url"],
+        "delivery_id": delivery_id
     }
 
 
@@ -5979,6 +6025,8 @@ def list_state_court_endpoints():
         {"method": "GET", "path": "/v1/state-courts/webhooks/{id}", "description": "Get webhook"},
         {"method": "DELETE", "path": "/v1/state-courts/webhooks/{id}", "description": "Delete webhook"},
         {"method": "POST", "path": "/v1/state-courts/webhooks/{id}/test", "description": "Test webhook"},
+        {"method": "GET", "path": "/v1/state-courts/webhooks/{id}/deliveries", "description": "Webhook delivery log"},
+        {"method": "GET", "path": "/v1/state-courts/webhooks/metrics", "description": "Webhook delivery metrics"},
 
         # Dashboard
         {"method": "GET", "path": "/state-courts/analytics", "description": "Analytics dashboard (HTML)"},
@@ -6041,7 +6089,7 @@ def get_api_summary():
             "data_normalization": ["state codes", "case types", "dates", "party names", "addresses"],
             "analytics": ["regional", "trends", "comparisons", "heatmaps", "case type distribution"],
             "integrations": ["CourtListener", "bulk import", "webhooks", "scheduled ingestion"],
-            "export_formats": ["JSON", "CSV"]
+            "export_formats": ["JSON", "NDJSON", "CSV", "XML", "Parquet"]
         },
         "endpoints": {
             "total": 357,
@@ -9156,10 +9204,65 @@ def retry_failed_scrapers():
 
 # --- Export Functionality ---
 
-import json
-import csv
-from io import StringIO
+from itertools import chain
 from fastapi.responses import StreamingResponse
+from .models.db import iter_state_court_cases, iter_state_appellate_opinions
+from .services import export_stream
+
+
+def _export_response(rows, filename: str, format: str, compress: bool, key: str, item: str):
+    """
+    Stream rows as a downloadable file in the requested format.
+
+    The first row is fetched before the response starts, so a failing query
+    is still reported as an error status rather than as a truncated file.
+
+    Args:
+        rows: Row dicts, produced lazily (e.g. a db iter_* generator)
+        filename: File name without extension
+        format: json, ndjson, csv, xml or parquet
+        compress: Gzip the file
+        key: JSON array key / XML root element
+        item: XML element per row
+    """
+    format = (format or "json").lower()
+    if format not in export_stream.FORMATS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported export format: {format} (use {', '.join(export_stream.FORMATS)})"
+        )
+    if format == "parquet" and not export_stream.parquet_available():
+        raise HTTPException(status_code=501, detail="Parquet export requires pyarrow")
+
+    rows = iter(rows)
+    try:
+        first = next(rows, None)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Export error: {str(e)}")
+    rows = chain([first], rows) if first is not None else iter(())
+
+    if format == "csv":
+        body = export_stream.csv_chunks(rows)
+    elif format == "ndjson":
+        body = export_stream.ndjson_chunks(rows)
+    elif format == "xml":
+        body = export_stream.xml_chunks(rows, key, item)
+    elif format == "parquet":
+        body = export_stream.parquet_chunks(rows)
+    else:
+        body = export_stream.json_chunks(rows, key)
+
+    media_type, extension = export_stream.FORMATS[format]
+    filename = f"{filename}.{extension}"
+    if compress:
+        body = export_stream.gzip_chunks(body)
+        media_type, filename = "application/gzip", f"{filename}.gz"
+
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f"attachment; filename={filename}"}
+    )
 
 
 @app.get("/v1/state-courts/export/cases")
@@ -9170,10 +9273,11 @@ def export_state_court_cases(
     date_from: str = None,
     date_to: str = None,
     format: str = "json",
-    limit: int = 1000
+    compress: bool = False,
+    limit: int = None
 ):
     """
-    Export state court cases to JSON or CSV format.
+    Export state court cases, streamed from the database page by page.
 
     Args:
         state: Filter by state code
@@ -9181,16 +9285,16 @@ def export_state_court_cases(
         case_type: Filter by case type
         date_from: Start date (YYYY-MM-DD)
         date_to: End date (YYYY-MM-DD)
-        format: "json" or "csv"
-        limit: Maximum records (default 1000)
+        format: "json", "ndjson", "csv", "xml" or "parquet" (needs pyarrow)
+        compress: Gzip the file
+        limit: Maximum records (default: all matching cases)
 
     Returns:
         Downloadable file with case data
     """
     _ensure_initialized()
 
-    # Get cases from database
-    cases = search_state_court_cases(
+    cases = iter_state_court_cases(
         state=state,
         county=county,
         case_type=case_type,
@@ -9198,43 +9302,7 @@ def export_state_court_cases(
         date_to=date_to,
         limit=limit
     )
-
-    if format == "csv":
-        # Convert to CSV
-        output = StringIO()
-        if cases:
-            # Get all unique keys
-            all_keys = set()
-            for case in cases:
-                all_keys.update(case.keys())
-            all_keys = sorted(all_keys)
-
-            writer = csv.DictWriter(output, fieldnames=all_keys)
-            writer.writeheader()
-            for case in cases:
-                # Convert any nested objects to JSON strings
-                row = {}
-                for k, v in case.items():
-                    if isinstance(v, (dict, list)):
-                        row[k] = json.dumps(v)
-                    else:
-                        row[k] = v
-                writer.writerow(row)
-
-        content = output.getvalue()
-        return StreamingResponse(
-            iter([content]),
-            media_type="text/csv",
-            headers={"Content-Disposition": "attachment; filename=state_court_cases.csv"}
-        )
-    else:
-        # JSON format
-        content = json.dumps({"cases": cases, "count": len(cases)}, indent=2)
-        return StreamingResponse(
-            iter([content]),
-            media_type="application/json",
-            headers={"Content-Disposition": "attachment; filename=state_court_cases.json"}
-        )
+    return _export_response(cases, "state_court_cases", format, compress, "cases", "case")
 
 
 @app.get("/v1/state-courts/export/opinions")
@@ -9244,65 +9312,34 @@ def export_state_court_opinions(
     date_from: str = None,
     date_to: str = None,
     format: str = "json",
-    limit: int = 1000
+    compress: bool = False,
+    limit: int = None
 ):
     """
-    Export state appellate opinions to JSON or CSV format.
+    Export state appellate opinions, streamed from the database page by page.
 
     Args:
         state: Filter by state code
         court: Filter by court
         date_from: Start date (YYYY-MM-DD)
         date_to: End date (YYYY-MM-DD)
-        format: "json" or "csv"
-        limit: Maximum records (default 1000)
+        format: "json", "ndjson", "csv", "xml" or "parquet" (needs pyarrow)
+        compress: Gzip the file
+        limit: Maximum records (default: all matching opinions)
 
     Returns:
         Downloadable file with opinion data
     """
     _ensure_initialized()
 
-    # Get opinions from database
-    opinions = search_state_appellate_opinions(
+    opinions = iter_state_appellate_opinions(
         state=state,
         court=court,
         date_from=date_from,
         date_to=date_to,
         limit=limit
     )
-
-    if format == "csv":
-        output = StringIO()
-        if opinions:
-            all_keys = set()
-            for op in opinions:
-                all_keys.update(op.keys())
-            all_keys = sorted(all_keys)
-
-            writer = csv.DictWriter(output, fieldnames=all_keys)
-            writer.writeheader()
-            for op in opinions:
-                row = {}
-                for k, v in op.items():
-                    if isinstance(v, (dict, list)):
-                        row[k] = json.dumps(v)
-                    else:
-                        row[k] = v
-                writer.writerow(row)
-
-        content = output.getvalue()
-        return StreamingResponse(
-            iter([content]),
-            media_type="text/csv",
-            headers={"Content-Disposition": "attachment; filename=state_court_opinions.csv"}
-        )
-    else:
-        content = json.dumps({"opinions": opinions, "count": len(opinions)}, indent=2)
-        return StreamingResponse(
-            iter([content]),
-            media_type="application/json",
-            headers={"Content-Disposition": "attachment; filename=state_court_opinions.json"}
-        )
+    return _export_response(opinions, "state_court_opinions", format, compress, "opinions", "opinion")
 
 
 # --- Scheduled Ingestion ---
@@ -9802,127 +9839,6 @@ def get_document_classification_types():
 # EXPORT FORMAT APIs
 # ============================================================================
 
-@app.get("/v1/state-courts/export/cases")
-def export_cases(
-    format: str = "json",
-    state: str = None,
-    case_type: str = None,
-    limit: int = 1000
-):
-    """
-    Export state court cases in various formats.
-
-    Supported formats: json, csv, xml
-    """
-    _ensure_initialized()
-
-    cases = search_state_court_cases(state=state, case_type=case_type, limit=limit)
-
-    if format == "csv":
-        import io
-        output = io.StringIO()
-
-        if cases:
-            headers = ["id", "state", "case_number", "case_type", "court", "date_filed",
-                      "case_style", "status", "county"]
-            output.write(",".join(headers) + "\n")
-
-            for case in cases:
-                row = []
-                for h in headers:
-                    val = str(case.get(h, "")).replace('"', '""').replace("\n", " ")
-                    row.append(f'"{val}"')
-                output.write(",".join(row) + "\n")
-
-        return Response(
-            content=output.getvalue(),
-            media_type="text/csv",
-            headers={"Content-Disposition": "attachment; filename=state_court_cases.csv"}
-        )
-
-    elif format == "xml":
-        xml_lines = ['<?xml version="1.0" encoding="UTF-8"?>', "<cases>"]
-
-        for case in cases:
-            xml_lines.append("  <case>")
-            for key, val in case.items():
-                if val is not None:
-                    safe_val = str(val).replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
-                    xml_lines.append(f"    <{key}>{safe_val}</{key}>")
-            xml_lines.append("  </case>")
-
-        xml_lines.append("</cases>")
-
-        return Response(
-            content="\n".join(xml_lines),
-            media_type="application/xml",
-            headers={"Content-Disposition": "attachment; filename=state_court_cases.xml"}
-        )
-
-    else:  # json
-        return {"cases": cases, "total": len(cases), "format": "json"}
-
-
-@app.get("/v1/state-courts/export/opinions")
-def export_opinions(
-    format: str = "json",
-    state: str = None,
-    limit: int = 1000
-):
-    """
-    Export state court opinions in various formats.
-
-    Supported formats: json, csv, xml
-    """
-    _ensure_initialized()
-
-    opinions = search_state_appellate_opinions(state=state, limit=limit)
-
-    if format == "csv":
-        import io
-        output = io.StringIO()
-
-        if opinions:
-            headers = ["id", "state", "court", "case_name", "citation", "date_decided",
-                      "docket_number", "judges"]
-            output.write(",".join(headers) + "\n")
-
-            for op in opinions:
-                row = []
-                for h in headers:
-                    val = str(op.get(h, "")).replace('"', '""').replace("\n", " ")
-                    row.append(f'"{val}"')
-                output.write(",".join(row) + "\n")
-
-        return Response(
-            content=output.getvalue(),
-            media_type="text/csv",
-            headers={"Content-Disposition": "attachment; filename=state_court_opinions.csv"}
-        )
-
-    elif format == "xml":
-        xml_lines = ['<?xml version="1.0" encoding="UTF-8"?>', "<opinions>"]
-
-        for op in opinions:
-            xml_lines.append("  <opinion>")
-            for key, val in op.items():
-                if val is not None and key != "full_text":
-                    safe_val = str(val).replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
-                    xml_lines.append(f"    <{key}>{safe_val}</{key}>")
-            xml_lines.append("  </opinion>")
-
-        xml_lines.append("</opinions>")
-
-        return Response(
-            content="\n".join(xml_lines),
-            media_type="application/xml",
-            headers={"Content-Disposition": "attachment; filename=state_court_opinions.xml"}
-        )
-
-    else:  # json
-        return {"opinions": opinions, "total": len(opinions), "format": "json"}
-
-
 @app.post("/v1/state-courts/export/custom")
 def export_custom_query(body: dict):
     """
@@ -10054,8 +9970,7 @@ def list_state_court_judges(
     _ensure_initialized()
 
     # Get judges from cases
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
+    conn = get_conn()
 
     query = """
         SELECT DISTINCT judge, state, court, COUNT(*) as case_count
@@ -10076,7 +9991,7 @@ def list_state_court_judges(
     params.append(limit)
 
     rows = conn.execute(query, params).fetchall()
-    conn.close()
+    release_conn()
 
     judges = []
     for row in rows:
@@ -10103,8 +10018,7 @@ def get_judge_profile(judge_name: str, state: str = None):
     """
     _ensure_initialized()
 
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
+    conn = get_conn()
 
     # Get case stats for this judge
     query = """
@@ -10127,7 +10041,7 @@ def get_judge_profile(judge_name: str, state: str = None):
     rows = conn.execute(query, params).fetchall()
 
     if not rows:
-        conn.close()
+        release_conn()
         return {"error": "Judge not found", "judge_name": judge_name}
 
     # Aggregate statistics
@@ -10159,7 +10073,7 @@ def get_judge_profile(judge_name: str, state: str = None):
     recent_query += " ORDER BY date_filed DESC LIMIT 10"
 
     recent = [dict(r) for r in conn.execute(recent_query, recent_params).fetchall()]
-    conn.close()
+    release_conn()
 
     return {
         "judge_name": judge_name,
@@ -10181,8 +10095,7 @@ def get_judge_cases(
     """Get cases assigned to a specific judge."""
     _ensure_initialized()
 
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
+    conn = get_conn()
 
     query = """
         SELECT *
@@ -10203,7 +10116,7 @@ def get_judge_cases(
     params.append(limit)
 
     rows = conn.execute(query, params).fetchall()
-    conn.close()
+    release_conn()
 
     cases = [dict(r) for r in rows]
 
@@ -10224,8 +10137,7 @@ def get_judge_analytics(state: str = None):
     """
     _ensure_initialized()
 
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
+    conn = get_conn()
 
     # Top judges by caseload
     top_query = """
@@ -10268,7 +10180,7 @@ def get_judge_analytics(state: str = None):
 
     by_type = [dict(r) for r in conn.execute(type_query, params if state else []).fetchall()]
 
-    conn.close()
+    release_conn()
 
     return {
         "top_judges_by_caseload": top_judges,
@@ -10463,9 +10375,11 @@ def get_case_milestones(case_id: str):
 # STATE COURT ATTORNEY/LAW FIRM TRACKING APIs
 # ============================================================================
 
-# In-memory attorney storage
-_state_attorneys: dict = {}
-_state_law_firms: dict = {}
+from .models.repositories import AttorneyRepository, LawFirmRepository
+
+# Attorney and firm storage (database-backed; firm "states" are stored as lists)
+_state_attorneys = AttorneyRepository()
+_state_law_firms = LawFirmRepository()
 
 
 @app.post("/v1/state-courts/attorneys")
@@ -10497,17 +10411,17 @@ def add_state_court_attorney(body: dict):
     # Also track firm
     if attorney.get("firm_name"):
         firm_name = attorney["firm_name"]
-        if firm_name not in _state_law_firms:
-            _state_law_firms[firm_name] = {
-                "name": firm_name,
-                "attorneys": [],
-                "states": set(),
-                "case_count": 0
-            }
-        if attorney_id not in _state_law_firms[firm_name]["attorneys"]:
-            _state_law_firms[firm_name]["attorneys"].append(attorney_id)
-        if attorney.get("state"):
-            _state_law_firms[firm_name]["states"].add(attorney["state"])
+        firm = _state_law_firms.get(firm_name) or {
+            "name": firm_name,
+            "attorneys": [],
+            "states": [],
+            "case_count": 0
+        }
+        if attorney_id not in firm["attorneys"]:
+            firm["attorneys"].append(attorney_id)
+        if attorney.get("state") and attorney["state"] not in firm["states"]:
+            firm["states"].append(attorney["state"])
+        _state_law_firms[firm_name] = firm
 
     return {"message": "Attorney added", "attorney": attorney}
 
@@ -10516,26 +10430,23 @@ def add_state_court_attorney(body: dict):
 def list_state_court_attorneys(
     state: str = None,
     firm: str = None,
-    limit: int = 100
+    limit: int = 100,
+    offset: int = 0
 ):
     """List attorneys from state court cases."""
     _ensure_initialized()
 
-    attorneys = list(_state_attorneys.values())
-
-    # Apply filters
-    if state:
-        attorneys = [a for a in attorneys if a.get("state", "").upper() == state.upper()]
-
-    if firm:
-        attorneys = [a for a in attorneys if firm.lower() in (a.get("firm_name") or "").lower()]
+    filters = {"state": state} if state else {}
+    match = (lambda a: firm.lower() in (a.get("firm_name") or "").lower()) if firm else None
 
-    # Sort by name
-    attorneys.sort(key=lambda x: x.get("name", ""))
+    # Sorted by name
+    attorneys, total = _state_attorneys.page(
+        limit=limit, offset=offset, order_by="name", match=match, **filters
+    )
 
     return {
-        "attorneys": attorneys[:limit],
-        "total": len(attorneys),
+        "attorneys": attorneys,
+        "total": total,
         "filters": {"state": state, "firm": firm}
     }
 
@@ -10565,13 +10476,12 @@ def get_attorney_state_cases(attorney_id: str, limit: int = 50):
 
     # Look up cases from database
     if case_ids:
-        conn = sqlite3.connect(DB_PATH)
-        conn.row_factory = sqlite3.Row
+        conn = get_conn()
 
         placeholders = ",".join(["?"] * len(case_ids))
         query = f"SELECT * FROM state_court_cases WHERE id IN ({placeholders}) LIMIT ?"
         rows = conn.execute(query, case_ids + [limit]).fetchall()
-        conn.close()
+        release_conn()
 
         cases = [dict(r) for r in rows]
     else:
@@ -10651,19 +10561,15 @@ def get_state_law_firm(firm_name: str):
     firm = _state_law_firms.get(firm_name)
     if not firm:
         # Try case-insensitive lookup
-        for name, data in _state_law_firms.items():
-            if name.lower() == firm_name.lower():
-                firm = data
-                break
+        matches = _state_law_firms.find(name=firm_name, limit=1)
+        firm = matches[0] if matches else None
 
     if not firm:
         return {"error": "Firm not found", "firm_name": firm_name}
 
     # Get attorneys
-    attorneys = []
-    for atty_id in firm.get("attorneys", []):
-        if atty_id in _state_attorneys:
-            attorneys.append(_state_attorneys[atty_id])
+    found = {a["id"]: a for a in _state_attorneys.find(key__in=firm.get("attorneys", []))}
+    attorneys = [found[atty_id] for atty_id in firm.get("attorneys", []) if atty_id in found]
 
     return {
         "name": firm.get("name"),
@@ -10687,29 +10593,25 @@ def get_firm_state_cases(firm_name: str, limit: int = 50):
 
     firm = _state_law_firms.get(firm_name)
     if not firm:
-        for name, data in _state_law_firms.items():
-            if name.lower() == firm_name.lower():
-                firm = data
-                break
+        matches = _state_law_firms.find(name=firm_name, limit=1)
+        firm = matches[0] if matches else None
 
     if not firm:
         return {"error": "Firm not found", "firm_name": firm_name}
 
     # Collect case IDs from all attorneys
     case_ids = set()
-    for atty_id in firm.get("attorneys", []):
-        if atty_id in _state_attorneys:
-            case_ids.update(_state_attorneys[atty_id].get("cases", []))
+    for attorney in _state_attorneys.find(key__in=firm.get("attorneys", [])):
+        case_ids.update(attorney.get("cases", []))
 
     # Look up cases
     if case_ids:
-        conn = sqlite3.connect(DB_PATH)
-        conn.row_factory = sqlite3.Row
+        conn = get_conn()
 
         placeholders = ",".join(["?"] * len(case_ids))
         query = f"SELECT * FROM state_court_cases WHERE id IN ({placeholders}) LIMIT ?"
         rows = conn.execute(query, list(case_ids) + [limit]).fetchall()
-        conn.close()
+        release_conn()
 
         cases = [dict(r) for r in rows]
     else:
@@ -10781,9 +10683,7 @@ def get_attorney_analytics(state: str = None):
     _ensure_initialized()
 
     # Attorney stats
-    attorneys = list(_state_attorneys.values())
-    if state:
-        attorneys = [a for a in attorneys if a.get("state", "").upper() == state.upper()]
+    attorneys = _state_attorneys.find(state=state) if state else _state_attorneys.values()
 
     # Top attorneys by case count
     top_attorneys = sorted(
@@ -10830,9 +10730,17 @@ def get_attorney_analytics(state: str = None):
 # CASE ALERTS AND MONITORING SYSTEM APIs
 # ============================================================================
 
-# In-memory alert storage
-_case_alerts: dict = {}
-_alert_subscriptions: dict = {}
+from .models.repositories import AlertRepository, SubscriptionRepository
+
+# Alert and subscription storage (database-backed, shared by all workers)
+_case_alerts = AlertRepository()
+_alert_subscriptions = SubscriptionRepository()
+
+from .services.alert_index import LazyAlertIndex
+
+# Compiled matcher over _case_alerts; rebuilt when the table version changes
+# (writes from any worker) or when invalidated locally
+_alert_index = LazyAlertIndex(_case_alerts.values, _case_alerts.version)
 
 
 @app.post("/v1/state-courts/alerts")
@@ -10862,24 +10770,23 @@ def create_case_alert(body: dict):
     }
 
     _case_alerts[alert_id] = alert
+    _alert_index.invalidate()
 
     return {"message": "Alert created", "alert": alert}
 
 
 @app.get("/v1/state-courts/alerts")
-def list_case_alerts(active_only: bool = True):
+def list_case_alerts(active_only: bool = True, limit: int = None, offset: int = 0):
     """List all case monitoring alerts."""
     _ensure_initialized()
 
-    alerts = list(_case_alerts.values())
-
-    if active_only:
-        alerts = [a for a in alerts if a.get("active", True)]
+    filters = {"active": True} if active_only else {}
+    alerts, total = _case_alerts.page(limit=limit, offset=offset, **filters)
 
     return {
         "alerts": alerts,
-        "total": len(alerts),
-        "active_count": len([a for a in _case_alerts.values() if a.get("active")])
+        "total": total,
+        "active_count": _case_alerts.count(active=True)
     }
 
 
@@ -10900,11 +10807,10 @@ def update_case_alert(alert_id: str, body: dict):
     """Update an existing alert."""
     _ensure_initialized()
 
-    if alert_id not in _case_alerts:
+    alert = _case_alerts.get(alert_id)
+    if alert is None:
         return {"error": "Alert not found", "alert_id": alert_id}
 
-    alert = _case_alerts[alert_id]
-
     # Update fields
     for key in ["name", "criteria", "state", "notification_method", "webhook_url", "email", "active"]:
         if key in body:
@@ -10912,6 +10818,7 @@ def update_case_alert(alert_id: str, body: dict):
 
     alert["updated_at"] = datetime.utcnow().isoformat()
     _case_alerts[alert_id] = alert
+    _alert_index.invalidate()
 
     return {"message": "Alert updated", "alert": alert}
 
@@ -10925,6 +10832,7 @@ def delete_case_alert(alert_id: str):
         return {"error": "Alert not found", "alert_id": alert_id}
 
     del _case_alerts[alert_id]
+    _alert_index.invalidate()
     return {"message": "Alert deleted", "alert_id": alert_id}
 
 
@@ -10963,48 +10871,62 @@ def check_alerts_for_case(body: dict):
     _ensure_initialized()
 
     case_data = body.get("case", {})
-    triggered = []
-
-    for alert_id, alert in _case_alerts.items():
-        if not alert.get("active"):
-            continue
+    triggered = _trigger_alerts(_alert_index.get().match(case_data))
 
-        criteria = alert.get("criteria", {})
-        alert_type = alert.get("type", "case")
-        matches = False
+    return {
+        "case_id": case_data.get("id"),
+        "alerts_triggered": triggered,
+        "total_triggered": len(triggered)
+    }
 
-        if alert_type == "case" and criteria.get("case_id"):
-            matches = case_data.get("id") == criteria["case_id"]
 
-        elif alert_type == "party" and criteria.get("party_name"):
-            party = criteria["party_name"].lower()
-            case_style = (case_data.get("case_style") or "").lower()
-            matches = party in case_style
+@app.post("/v1/state-courts/alerts/check/batch")
+def check_alerts_for_cases(body: dict):
+    """
+    Check a whole batch of cases (e.g. one ingest run) against all alerts.
 
-        elif alert_type == "keyword" and criteria.get("keyword"):
-            keyword = criteria["keyword"].lower()
-            searchable = f"{case_data.get('case_style', '')} {case_data.get('summary', '')}".lower()
-            matches = keyword in searchable
+    Body: {"cases": [case, ...]}. Returns one result per case, in order,
+    shaped like /v1/state-courts/alerts/check.
+    """
+    _ensure_initialized()
 
-        elif alert_type == "case_type" and criteria.get("case_type"):
-            matches = case_data.get("case_type", "").upper() == criteria["case_type"].upper()
+    cases = body.get("cases") or []
+    index = _alert_index.get()
 
-        if matches:
-            alert["last_triggered"] = datetime.utcnow().isoformat()
-            alert["trigger_count"] = alert.get("trigger_count", 0) + 1
-            triggered.append({
-                "alert_id": alert_id,
-                "alert_name": alert.get("name"),
-                "notification_method": alert.get("notification_method")
-            })
+    results = []
+    for case_data, alert_ids in zip(cases, index.match_batch(cases)):
+        triggered = _trigger_alerts(alert_ids)
+        results.append({
+            "case_id": case_data.get("id"),
+            "alerts_triggered": triggered,
+            "total_triggered": len(triggered)
+        })
 
     return {
-        "case_id": case_data.get("id"),
-        "alerts_triggered": triggered,
-        "total_triggered": len(triggered)
+        "results": results,
+        "cases_checked": len(results),
+        "total_triggered": sum(r["total_triggered"] for r in results),
+        "index": index.stats()
     }
 
 
+def _trigger_alerts(alert_ids: List[str]) -> List[Dict[str, Any]]:
+    """Record a trigger on each matched alert and describe it for the response."""
+    triggered = []
+    for alert_id in alert_ids:
+        alert = _case_alerts.increment(
+            alert_id, "trigger_count", fields={"last_triggered": datetime.utcnow().isoformat()}
+        )
+        if alert is None:
+            continue
+        triggered.append({
+            "alert_id": alert_id,
+            "alert_name": alert.get("name"),
+            "notification_method": alert.get("notification_method")
+        })
+    return triggered
+
+
 @app.post("/v1/state-courts/subscriptions")
 def create_subscription(body: dict):
     """
@@ -11032,18 +10954,16 @@ def create_subscription(body: dict):
 
 
 @app.get("/v1/state-courts/subscriptions")
-def list_subscriptions(user_id: str = None):
+def list_subscriptions(user_id: str = None, limit: int = None, offset: int = 0):
     """List subscriptions."""
     _ensure_initialized()
 
-    subs = list(_alert_subscriptions.values())
-
-    if user_id:
-        subs = [s for s in subs if s.get("user_id") == user_id]
+    filters = {"user_id": user_id} if user_id else {}
+    subs, total = _alert_subscriptions.page(limit=limit, offset=offset, **filters)
 
     return {
         "subscriptions": subs,
-        "total": len(subs)
+        "total": total
     }
 
 
@@ -11063,8 +10983,10 @@ def delete_subscription(sub_id: str):
 # CROSS-JURISDICTIONAL CASE LINKING APIs
 # ============================================================================
 
-# In-memory storage for case links
-_case_links: dict = {}
+from .models.repositories import CaseLinkRepository
+
+# Case link storage (database-backed, indexed on source/target case and type)
+_case_links = CaseLinkRepository()
 
 
 @app.post("/v1/state-courts/links")
@@ -11102,25 +11024,25 @@ def list_case_links(
     source_case_id: str = None,
     target_case_id: str = None,
     link_type: str = None,
-    limit: int = 100
+    limit: int = 100,
+    offset: int = 0
 ):
     """List cross-jurisdictional case links."""
     _ensure_initialized()
 
-    links = list(_case_links.values())
-
+    filters = {}
     if source_case_id:
-        links = [l for l in links if l.get("source_case_id") == source_case_id]
-
+        filters["source_case_id"] = source_case_id
     if target_case_id:
-        links = [l for l in links if l.get("target_case_id") == target_case_id]
-
+        filters["target_case_id"] = target_case_id
     if link_type:
-        links = [l for l in links if l.get("link_type") == link_type]
+        filters["link_type"] = link_type
+
+    links, total = _case_links.page(limit=limit, offset=offset, **filters)
 
     return {
-        "links": links[:limit],
-        "total": len(links)
+        "links": links,
+        "total": total
     }
 
 
@@ -11129,18 +11051,13 @@ def get_case_links(case_id: str):
     """Get all links for a specific case (as source or target)."""
     _ensure_initialized()
 
-    links = []
-    for link in _case_links.values():
-        if link.get("source_case_id") == case_id or link.get("target_case_id") == case_id:
-            links.append(link)
-
     # Categorize by direction
-    outgoing = [l for l in links if l.get("source_case_id") == case_id]
-    incoming = [l for l in links if l.get("target_case_id") == case_id]
+    outgoing = _case_links.find(source_case_id=case_id)
+    incoming = _case_links.find(target_case_id=case_id)
 
     return {
         "case_id": case_id,
-        "total_links": len(links),
+        "total_links": len({l["id"] for l in outgoing + incoming}),
         "outgoing": outgoing,
         "incoming": incoming
     }
@@ -11238,7 +11155,8 @@ def get_cross_jurisdiction_analytics():
     state_to_federal = 0
     federal_to_state = 0
 
-    for link in _case_links.values():
+    links = _case_links.values()
+    for link in links:
         lt = link.get("link_type", "unknown")
         type_counts[lt] = type_counts.get(lt, 0) + 1
 
@@ -11249,13 +11167,13 @@ def get_cross_jurisdiction_analytics():
 
     # State breakdown
     state_links = {}
-    for link in _case_links.values():
+    for link in links:
         state = link.get("source_state") or link.get("target_court", "")[:2]
         if state:
             state_links[state] = state_links.get(state, 0) + 1
 
     return {
-        "total_links": len(_case_links),
+        "total_links": len(links),
         "by_type": type_counts,
         "state_to_federal": state_to_federal,
         "federal_to_state": federal_to_state,
@@ -11343,15 +11261,14 @@ def find_similar_cases(case_id: str, limit: int = 10, min_score: float = 0.2):
     _ensure_initialized()
 
     # Get the source case
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
+    conn = get_conn()
 
     source = conn.execute(
         "SELECT * FROM state_court_cases WHERE id = ?", (case_id,)
     ).fetchone()
 
     if not source:
-        conn.close()
+        release_conn()
         return {"error": "Case not found", "case_id": case_id}
 
     source = dict(source)
@@ -11363,7 +11280,7 @@ def find_similar_cases(case_id: str, limit: int = 10, min_score: float = 0.2):
     # Search for similar cases
     query = "SELECT * FROM state_court_cases WHERE id != ? LIMIT 500"
     candidates = conn.execute(query, (case_id,)).fetchall()
-    conn.close()
+    release_conn()
 
     similar = []
     for cand in candidates:
@@ -11422,13 +11339,12 @@ def batch_similarity_analysis(body: dict):
         return {"error": "No case IDs provided"}
 
     # Get cases from database
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
+    conn = get_conn()
 
     placeholders = ",".join(["?"] * len(case_ids))
     query = f"SELECT * FROM state_court_cases WHERE id IN ({placeholders})"
     rows = conn.execute(query, case_ids).fetchall()
-    conn.close()
+    release_conn()
 
     cases = {r["id"]: dict(r) for r in rows}
 
@@ -11504,8 +11420,7 @@ def get_dashboard_summary():
     """
     _ensure_initialized()
 
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
+    conn = get_conn()
 
     # Case counts
     total_cases = conn.execute("SELECT COUNT(*) as count FROM state_court_cases").fetchone()["count"]
@@ -11547,7 +11462,7 @@ def get_dashboard_summary():
         LIMIT 10
     """).fetchall()]
 
-    conn.close()
+    release_conn()
 
     # Additional metrics from in-memory storage
     return {
@@ -11564,7 +11479,7 @@ def get_dashboard_summary():
         "top_courts": top_courts,
         "alerts": {
             "total": len(_case_alerts),
-            "active": len([a for a in _case_alerts.values() if a.get("active")])
+            "active": _case_alerts.count(active=True)
         },
         "attorneys": {
             "total": len(_state_attorneys),
@@ -11587,8 +11502,7 @@ def get_dashboard_activity(days: int = 30):
     """
     _ensure_initialized()
 
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
+    conn = get_conn()
 
     # Daily activity
     daily = [dict(r) for r in conn.execute(f"""
@@ -11618,7 +11532,7 @@ def get_dashboard_activity(days: int = 30):
         ORDER BY count DESC
     """).fetchall()]
 
-    conn.close()
+    release_conn()
 
     return {
         "period_days": days,
@@ -11638,8 +11552,7 @@ def get_dashboard_coverage():
     """
     _ensure_initialized()
 
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
+    conn = get_conn()
 
     # State coverage
     state_stats = [dict(r) for r in conn.execute("""
@@ -11668,7 +11581,7 @@ def get_dashboard_coverage():
         FROM state_court_cases
     """).fetchone()
 
-    conn.close()
+    release_conn()
 
     total = quality["total"] if quality["total"] > 0 else 1
 
@@ -11720,8 +11633,6 @@ def state_courts_analytics_dashboard():
         FROM state_court_cases ORDER BY date_filed DESC LIMIT 10
     """).fetchall()]
 
-    conn.close()
-
     # Build chart data
     state_labels = [s["state"] for s in by_state]
     state_values = [s["count"] for s in by_state]
@@ -12092,8 +12003,17 @@ def get_import_template():
 # CASE HISTORY AND AUDIT TRAIL APIs
 # ============================================================================
 
-# In-memory audit log
-_audit_log: list = []
+from .services.audit_log import AuditLog
+
+# Audit log: day-segmented tables written in the background, with a ring
+# buffer of recent events (AUDIT_RETENTION_DAYS / AUDIT_RING_SIZE)
+_audit_log = AuditLog()
+
+
+@app.on_event("shutdown")
+def _flush_audit_log():
+    """Write queued audit events before the worker exits."""
+    _audit_log.close()
 
 
 @app.post("/v1/state-courts/audit/log")
@@ -12119,10 +12039,6 @@ def log_audit_event(body: dict):
 
     _audit_log.append(event)
 
-    # Keep only last 10000 events in memory
-    if len(_audit_log) > 10000:
-        _audit_log.pop(0)
-
     return {"message": "Audit event logged", "event_id": event["id"]}
 
 
@@ -12132,7 +12048,8 @@ def get_audit_log(
     entity_id: str = None,
     action: str = None,
     user_id: str = None,
-    limit: int = 100
+    limit: int = 100,
+    offset: int = 0
 ):
     """
     Retrieve audit log entries.
@@ -12141,30 +12058,56 @@ def get_audit_log(
     """
     _ensure_initialized()
 
-    events = _audit_log.copy()
-
+    filters = {}
     if entity_type:
-        events = [e for e in events if e.get("entity_type") == entity_type]
-
+        filters["entity_type"] = entity_type
     if entity_id:
-        events = [e for e in events if e.get("entity_id") == entity_id]
-
+        filters["entity_id"] = entity_id
     if action:
-        events = [e for e in events if e.get("action") == action]
-
+        filters["action"] = action
     if user_id:
-        events = [e for e in events if e.get("user_id") == user_id]
+        filters["user_id"] = user_id
 
     # Return most recent first
-    events = sorted(events, key=lambda x: x.get("timestamp", ""), reverse=True)
+    events = _audit_log.find(descending=True, limit=limit, offset=offset, **filters)
 
     return {
-        "events": events[:limit],
-        "total": len(events),
+        "events": events,
+        "total": _audit_log.count(**filters),
         "filters": {"entity_type": entity_type, "entity_id": entity_id, "action": action}
     }
 
 
+@app.get("/v1/state-courts/audit/recent")
+def get_recent_audit_events(
+    entity_id: str = None,
+    user_id: str = None,
+    action: str = None,
+    limit: int = 100
+):
+    """
+    Most recent audit events logged by this worker, served from memory.
+
+    Cheap enough for dashboards that poll activity; use /audit/log for
+    the complete, filterable history across all workers.
+    """
+    filters = {}
+    if entity_id:
+        filters["entity_id"] = entity_id
+    if user_id:
+        filters["user_id"] = user_id
+    if action:
+        filters["action"] = action
+
+    events = _audit_log.recent(limit=limit, **filters)
+
+    return {
+        "events": events,
+        "total": len(events),
+        "log": _audit_log.stats()
+    }
+
+
 @app.get("/v1/state-courts/cases/{case_id}/history")
 def get_case_history(case_id: str):
     """
@@ -12174,10 +12117,8 @@ def get_case_history(case_id: str):
     """
     _ensure_initialized()
 
-    events = [e for e in _audit_log if e.get("entity_id") == case_id]
-
-    # Sort by timestamp
-    events = sorted(events, key=lambda x: x.get("timestamp", ""))
+    # Sorted by timestamp
+    events = _audit_log.find(entity_id=case_id)
 
     return {
         "case_id": case_id,
@@ -12197,29 +12138,14 @@ def get_audit_summary(days: int = 7):
 
     cutoff = (datetime.utcnow() - timedelta(days=days)).isoformat()
 
-    recent = [e for e in _audit_log if e.get("timestamp", "") >= cutoff]
-
-    # Aggregate by action
-    by_action = {}
-    for e in recent:
-        action = e.get("action", "unknown")
-        by_action[action] = by_action.get(action, 0) + 1
-
-    # Aggregate by entity type
-    by_entity = {}
-    for e in recent:
-        entity = e.get("entity_type", "unknown")
-        by_entity[entity] = by_entity.get(entity, 0) + 1
-
-    # Top users
-    by_user = {}
-    for e in recent:
-        user = e.get("user_id", "unknown")
-        by_user[user] = by_user.get(user, 0) + 1
+    # Aggregate by action, entity type and user (grouped in the database)
+    by_action = _audit_log.counts("action", since=cutoff)
+    by_entity = _audit_log.counts("entity_type", since=cutoff)
+    by_user = _audit_log.counts("user_id", since=cutoff)
 
     return {
         "period_days": days,
-        "total_events": len(recent),
+        "total_events": sum(by_action.values()),
         "by_action": by_action,
         "by_entity_type": by_entity,
         "top_users": sorted(by_user.items(), key=lambda x: x[1], reverse=True)[:10]
@@ -12250,8 +12176,7 @@ def archive_cases(body: dict):
     if not before_date:
         return {"error": "before_date is required"}
 
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
+    conn = get_conn()
 
     # Find cases to archive
     query = "SELECT * FROM state_court_cases WHERE date_filed < ?"
@@ -12264,7 +12189,7 @@ def archive_cases(body: dict):
     cases = [dict(r) for r in conn.execute(query, params).fetchall()]
 
     if dry_run:
-        conn.close()
+        release_conn()
         return {
             "dry_run": True,
             "cases_to_archive": len(cases),
@@ -12293,7 +12218,7 @@ def archive_cases(body: dict):
 
     conn.execute(delete_query, delete_params)
     conn.commit()
-    conn.close()
+    release_conn()
 
     return {
         "message": f"Archived {len(cases)} cases",
@@ -12430,8 +12355,7 @@ def get_retention_status():
     """Get current data retention status and recommendations."""
     _ensure_initialized()
 
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
+    conn = get_conn()
 
     # Count cases by age
     age_query = """
@@ -12458,7 +12382,7 @@ def get_retention_status():
         WHERE date_filed < date('now', '-2 years')
     """).fetchone()["count"]
 
-    conn.close()
+    release_conn()
 
     return {
         "total_cases": total,
@@ -12477,8 +12401,10 @@ def get_retention_status():
 # COURT CALENDAR AND SCHEDULING APIs
 # ============================================================================
 
-# In-memory calendar storage
-_court_calendar: dict = {}
+from .models.repositories import CalendarRepository
+
+# Calendar storage (database-backed, indexed on case, state, type and date)
+_court_calendar = CalendarRepository()
 
 
 @app.post("/v1/state-courts/calendar/events")
@@ -12522,41 +12448,46 @@ def list_calendar_events(
     event_type: str = None,
     date_from: str = None,
     date_to: str = None,
-    limit: int = 100
+    limit: int = 100,
+    offset: int = 0
 ):
     """List court calendar events with filters."""
     _ensure_initialized()
 
-    events = list(_court_calendar.values())
-
+    filters = _calendar_date_filters(date_from, date_to)
     if state:
-        events = [e for e in events if e.get("state", "").upper() == state.upper()]
-
-    if court:
-        events = [e for e in events if court.lower() in (e.get("court") or "").lower()]
-
-    if judge:
-        events = [e for e in events if judge.lower() in (e.get("judge") or "").lower()]
-
+        filters["state"] = state
     if event_type:
-        events = [e for e in events if e.get("event_type") == event_type]
-
-    if date_from:
-        events = [e for e in events if (e.get("event_date") or "") >= date_from]
+        filters["event_type"] = event_type
 
-    if date_to:
-        events = [e for e in events if (e.get("event_date") or "") <= date_to]
+    def match(e):
+        if court and court.lower() not in (e.get("court") or "").lower():
+            return False
+        return not judge or judge.lower() in (e.get("judge") or "").lower()
 
-    # Sort by date
-    events.sort(key=lambda x: x.get("event_date") or "")
+    # Sorted by date
+    events, total = _court_calendar.page(
+        limit=limit, offset=offset, order_by="event_date",
+        match=match if court or judge else None, **filters
+    )
 
     return {
-        "events": events[:limit],
-        "total": len(events),
+        "events": events,
+        "total": total,
         "filters": {"state": state, "court": court, "event_type": event_type}
     }
 
 
+def _calendar_date_filters(date_from: Optional[str], date_to: Optional[str]) -> Dict[str, Any]:
+    """Indexed event_date range filters (events without a date count as "")."""
+    filters = {}
+    if date_from:
+        filters["event_date__gte"] = date_from
+    if date_to:
+        filters["event_date__lte"] = date_to
+    return filters
+
+
 @app.get("/v1/state-courts/calendar/events/{event_id}")
 def get_calendar_event(event_id: str):
     """Get a specific calendar event."""
@@ -12574,11 +12505,10 @@ def update_calendar_event(event_id: str, body: dict):
     """Update a calendar event."""
     _ensure_initialized()
 
-    if event_id not in _court_calendar:
+    event = _court_calendar.get(event_id)
+    if event is None:
         return {"error": "Event not found", "event_id": event_id}
 
-    event = _court_calendar[event_id]
-
     for key in ["event_date", "event_time", "courtroom", "judge", "description", "status"]:
         if key in body:
             event[key] = body[key]
@@ -12606,8 +12536,7 @@ def get_case_calendar(case_id: str):
     """Get all calendar events for a specific case."""
     _ensure_initialized()
 
-    events = [e for e in _court_calendar.values() if e.get("case_id") == case_id]
-    events.sort(key=lambda x: x.get("event_date") or "")
+    events = _court_calendar.find(order_by="event_date", case_id=case_id)
 
     return {
         "case_id": case_id,
@@ -12624,17 +12553,9 @@ def get_judge_calendar(judge_name: str, date_from: str = None, date_to: str = No
     from urllib.parse import unquote
     judge_name = unquote(judge_name)
 
-    events = [e for e in _court_calendar.values()
+    events = [e for e in _court_calendar.find(order_by="event_date", **_calendar_date_filters(date_from, date_to))
               if judge_name.lower() in (e.get("judge") or "").lower()]
 
-    if date_from:
-        events = [e for e in events if (e.get("event_date") or "") >= date_from]
-
-    if date_to:
-        events = [e for e in events if (e.get("event_date") or "") <= date_to]
-
-    events.sort(key=lambda x: x.get("event_date") or "")
-
     return {
         "judge": judge_name,
         "events": events,
@@ -12737,8 +12658,7 @@ def natural_language_search(body: dict):
     search_terms = _expand_query(query)
 
     # Search database
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
+    conn = get_conn()
 
     base_query = "SELECT * FROM state_court_cases WHERE 1=1"
     params = []
@@ -12764,7 +12684,7 @@ def natural_language_search(body: dict):
     base_query += f" ORDER BY date_filed DESC LIMIT {limit}"
 
     results = [dict(r) for r in conn.execute(base_query, params).fetchall()]
-    conn.close()
+    release_conn()
 
     return {
         "query": query,
@@ -12840,8 +12760,7 @@ def advanced_case_search(body: dict):
     sort_order = body.get("sort_order", "desc")
     limit = body.get("limit", 100)
 
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
+    conn = get_conn()
 
     query = "SELECT * FROM state_court_cases WHERE 1=1"
     params = []
@@ -12898,7 +12817,7 @@ def advanced_case_search(body: dict):
     query += f" LIMIT {limit}"
 
     results = [dict(r) for r in conn.execute(query, params).fetchall()]
-    conn.close()
+    release_conn()
 
     return {
         "filters": filters,
@@ -13134,8 +13053,7 @@ def get_case_statistics_overview():
     """
     _ensure_initialized()
 
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
+    conn = get_conn()
 
     # Total counts
     total_cases = conn.execute("SELECT COUNT(*) as count FROM state_court_cases").fetchone()["count"]
@@ -13173,7 +13091,7 @@ def get_case_statistics_overview():
         ORDER BY count DESC
     """).fetchall()]
 
-    conn.close()
+    release_conn()
 
     return {
         "totals": {
@@ -13194,8 +13112,7 @@ def get_state_statistics(state: str):
     _ensure_initialized()
 
     state = state.upper()
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
+    conn = get_conn()
 
     # Case counts
     totals = conn.execute("""
@@ -13242,7 +13159,7 @@ def get_state_statistics(state: str):
         LIMIT 10
     """, (state,)).fetchall()]
 
-    conn.close()
+    release_conn()
 
     return {
         "state": state,
@@ -13261,8 +13178,7 @@ def compare_state_statistics(states: str = "CA,TX,NY,FL"):
 
     state_list = [s.strip().upper() for s in states.split(",")]
 
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
+    conn = get_conn()
 
     comparisons = []
     for state in state_list:
@@ -13282,7 +13198,7 @@ def compare_state_statistics(states: str = "CA,TX,NY,FL"):
 
         comparisons.append(dict(stats))
 
-    conn.close()
+    release_conn()
 
     # Calculate rankings
     for metric in ["total_cases", "civil", "criminal"]:
@@ -13302,8 +13218,7 @@ def get_filing_trends(days: int = 365):
     """Get case filing trends over time."""
     _ensure_initialized()
 
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
+    conn = get_conn()
 
     # Weekly filings
     weekly = [dict(r) for r in conn.execute(f"""
@@ -13324,7 +13239,7 @@ def get_filing_trends(days: int = 365):
             avg = sum(weekly[j]["total"] for j in range(i-3, i+1)) / 4
             weekly[i]["moving_avg_4wk"] = round(avg, 1)
 
-    conn.close()
+    release_conn()
 
     return {
         "period_days": days,
@@ -13346,8 +13261,7 @@ def get_court_performance_metrics(state: str = None, limit: int = 50):
     """
     _ensure_initialized()
 
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
+    conn = get_conn()
 
     query = """
         SELECT
@@ -13371,7 +13285,7 @@ def get_court_performance_metrics(state: str = None, limit: int = 50):
     query += f" GROUP BY court, state ORDER BY total_cases DESC LIMIT {limit}"
 
     courts = [dict(r) for r in conn.execute(query, params).fetchall()]
-    conn.close()
+    release_conn()
 
     # Calculate activity score (simple metric)
     for court in courts:
@@ -13395,8 +13309,7 @@ def get_judge_performance_metrics(state: str = None, limit: int = 50):
     """
     _ensure_initialized()
 
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
+    conn = get_conn()
 
     query = """
         SELECT
@@ -13421,7 +13334,7 @@ def get_judge_performance_metrics(state: str = None, limit: int = 50):
     query += f" GROUP BY judge, state, court ORDER BY total_cases DESC LIMIT {limit}"
 
     judges = [dict(r) for r in conn.execute(query, params).fetchall()]
-    conn.close()
+    release_conn()
 
     return {
         "judges": judges,
@@ -13439,8 +13352,7 @@ def get_case_backlog_metrics(state: str = None):
     """
     _ensure_initialized()
 
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
+    conn = get_conn()
 
     base_where = "WHERE date_filed IS NOT NULL"
     params = []
@@ -13481,7 +13393,7 @@ def get_case_backlog_metrics(state: str = None):
 
     avg_by_type = [dict(r) for r in conn.execute(avg_age_query, params).fetchall()]
 
-    conn.close()
+    release_conn()
 
     return {
         "age_distribution": age_dist,
@@ -13498,9 +13410,11 @@ def get_case_backlog_metrics(state: str = None):
 # VERDICT AND SETTLEMENT TRACKING APIs
 # ============================================================================
 
-# In-memory verdict storage
-_verdicts: dict = {}
-_settlements: dict = {}
+from .models.repositories import SettlementRepository, VerdictRepository
+
+# Verdict and settlement storage (database-backed, shared by all workers)
+_verdicts = VerdictRepository()
+_settlements = SettlementRepository()
 
 
 @app.post("/v1/state-courts/verdicts")
@@ -13541,28 +13455,28 @@ def list_verdicts(
     state: str = None,
     verdict_type: str = None,
     min_amount: float = None,
-    limit: int = 100
+    limit: int = 100,
+    offset: int = 0
 ):
     """List recorded verdicts with filters."""
     _ensure_initialized()
 
-    verdicts = list(_verdicts.values())
-
+    filters = {}
     if state:
-        verdicts = [v for v in verdicts if v.get("state", "").upper() == state.upper()]
-
+        filters["state"] = state
     if verdict_type:
-        verdicts = [v for v in verdicts if v.get("verdict_type") == verdict_type]
-
+        filters["verdict_type"] = verdict_type
     if min_amount:
-        verdicts = [v for v in verdicts if (v.get("amount") or 0) >= min_amount]
+        filters["amount__gte"] = min_amount
 
-    # Sort by date
-    verdicts.sort(key=lambda x: x.get("verdict_date") or "", reverse=True)
+    # Most recent first
+    verdicts, total = _verdicts.page(
+        limit=limit, offset=offset, order_by="verdict_date", descending=True, **filters
+    )
 
     return {
-        "verdicts": verdicts[:limit],
-        "total": len(verdicts),
+        "verdicts": verdicts,
+        "total": total,
         "filters": {"state": state, "verdict_type": verdict_type}
     }
 
@@ -13617,27 +13531,27 @@ def list_settlements(
     state: str = None,
     min_amount: float = None,
     confidential: bool = None,
-    limit: int = 100
+    limit: int = 100,
+    offset: int = 0
 ):
     """List recorded settlements with filters."""
     _ensure_initialized()
 
-    settlements = list(_settlements.values())
-
+    filters = {}
     if state:
-        settlements = [s for s in settlements if s.get("state", "").upper() == state.upper()]
-
+        filters["state"] = state
     if min_amount:
-        settlements = [s for s in settlements if (s.get("amount") or 0) >= min_amount]
-
+        filters["amount__gte"] = min_amount
     if confidential is not None:
-        settlements = [s for s in settlements if s.get("confidential") == confidential]
+        filters["confidential"] = confidential
 
-    settlements.sort(key=lambda x: x.get("settlement_date") or "", reverse=True)
+    settlements, total = _settlements.page(
+        limit=limit, offset=offset, order_by="settlement_date", descending=True, **filters
+    )
 
     return {
-        "settlements": settlements[:limit],
-        "total": len(settlements),
+        "settlements": settlements,
+        "total": total,
         "filters": {"state": state, "min_amount": min_amount}
     }
 
@@ -13663,10 +13577,7 @@ def get_verdict_analytics(state: str = None):
     """
     _ensure_initialized()
 
-    verdicts = list(_verdicts.values())
-
-    if state:
-        verdicts = [v for v in verdicts if v.get("state", "").upper() == state.upper()]
+    verdicts = _verdicts.find(state=state) if state else _verdicts.values()
 
     # Win rates
     plaintiff_wins = len([v for v in verdicts if v.get("verdict_type") == "plaintiff"])
@@ -13711,10 +13622,7 @@ def get_settlement_analytics(state: str = None):
     """
     _ensure_initialized()
 
-    settlements = list(_settlements.values())
-
-    if state:
-        settlements = [s for s in settlements if s.get("state", "").upper() == state.upper()]
+    settlements = _settlements.find(state=state) if state else _settlements.values()
 
     # Amounts
     amounts = [s.get("amount", 0) for s in settlements if s.get("amount")]
@@ -13752,23 +13660,22 @@ def get_settlement_analytics(state: str = None):
 
 
 def _settlement_feed_items(limit: int = 100, status: Optional[str] = None) -> list:
-    """Get settlements from DB plus any in-memory recorded ones."""
+    """Get settlements from DB plus any recorded via /v1/state-courts/settlements."""
     _ensure_initialized()
     db_settlements = list_settlements_db(limit=limit, status=status)
 
-    # Skip in-memory settlements when filtering by status (they lack claim metadata)
+    # Skip recorded settlements when filtering by status (they lack claim metadata)
     if not status:
-        for s in _settlements.values():
-            if not s.get("confidential"):
-                db_settlements.append({
-                    "title": s.get("case_number", "Settlement"),
-                    "amount": s.get("amount"),
-                    "amount_formatted": f"${s.get('amount'):,.0f}" if s.get("amount") else "",
-                    "url": f"/v1/state-courts/settlements/{s['id']}",
-                    "description": s.get("notes", ""),
-                    "source": s.get("state", "State Court"),
-                    "pub_date": s.get("settlement_date"),
-                })
+        for s in _settlements.find(confidential=False):
+            db_settlements.append({
+                "title": s.get("case_number", "Settlement"),
+                "amount": s.get("amount"),
+                "amount_formatted": f"${s.get('amount'):,.0f}" if s.get("amount") else "",
+                "url": f"/v1/state-courts/settlements/{s['id']}",
+                "description": s.get("notes", ""),
+                "source": s.get("state", "State Court"),
+                "pub_date": s.get("settlement_date"),
+            })
     return db_settlements
 
 
@@ -13981,9 +13888,26 @@ def api_settlements(
     q: Optional[str] = None,
     status: Optional[str] = None,
     limit: int = 100,
+    sort: str = "amount",
+    cursor: Optional[str] = None,
 ):
-    """List settlements with optional filtering."""
+    """List settlements with optional filtering.
+
+    With q and sort=relevance, results are ranked by match quality with
+    highlighted snippets and paged via next_cursor / cursor.
+    """
     _ensure_initialized()
+    if q and sort == "relevance":
+        try:
+            page = search_settlements(q, category=category, source=source, min_amount=min_amount,
+                                      status=status, limit=limit, cursor=cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        except sqlite3.DatabaseError:
+            page = None  # No FTS5; fall back to the amount-ordered listing
+        if page is not None:
+            settlements = page["results"]
+            return {"count": len(settlements), "settlements": settlements, "next_cursor": page["next_cursor"]}
     settlements = list_settlements_db(
         category=category, source=source, min_amount=min_amount, q=q, status=status, limit=limit
     )
@@ -15400,8 +15324,10 @@ def get_citation_formats():
 # LEGAL RESEARCH INTEGRATION
 # ============================================================================
 
-# In-memory research notes storage
-_research_notes: dict = {}
+from .models.repositories import ResearchNoteRepository
+
+# Research notes storage (database-backed, shared by all workers)
+_research_notes = ResearchNoteRepository()
 
 
 @app.post("/v1/state-courts/research/note")
@@ -15438,27 +15364,28 @@ def list_research_notes(
     topic: str = None,
     tag: str = None,
     case_id: str = None,
-    limit: int = 100
+    limit: int = 100,
+    offset: int = 0
 ):
     """List research notes with filters."""
     _ensure_initialized()
 
-    notes = list(_research_notes.values())
-
-    if topic:
-        notes = [n for n in notes if topic.lower() in (n.get("topic") or "").lower()]
+    filters = {"case_id": case_id} if case_id else {}
 
-    if tag:
-        notes = [n for n in notes if tag in n.get("tags", [])]
+    def match(n):
+        if topic and topic.lower() not in (n.get("topic") or "").lower():
+            return False
+        return not tag or tag in n.get("tags", [])
 
-    if case_id:
-        notes = [n for n in notes if n.get("case_id") == case_id]
-
-    notes.sort(key=lambda x: x.get("created_at") or "", reverse=True)
+    # Newest first
+    notes, total = _research_notes.page(
+        limit=limit, offset=offset, order_by="created_at", descending=True,
+        match=match if topic or tag else None, **filters
+    )
 
     return {
-        "notes": notes[:limit],
-        "total": len(notes),
+        "notes": notes,
+        "total": total,
         "tags": list(set(tag for n in _research_notes.values() for tag in n.get("tags", [])))
     }
 
@@ -16119,8 +16046,10 @@ def get_efiling_systems():
 # CASE DISPOSITION ANALYTICS
 # ============================================================================
 
-# In-memory disposition tracking
-_dispositions: dict = {}
+from .models.repositories import DispositionRepository
+
+# Disposition storage (database-backed, indexed on state, types and date)
+_dispositions = DispositionRepository()
 
 
 @app.post("/v1/state-courts/dispositions")
@@ -16161,27 +16090,27 @@ def list_dispositions(
     state: str = None,
     disposition_type: str = None,
     case_type: str = None,
-    limit: int = 100
+    limit: int = 100,
+    offset: int = 0
 ):
     """List recorded dispositions with filters."""
     _ensure_initialized()
 
-    dispositions = list(_dispositions.values())
-
+    filters = {}
     if state:
-        dispositions = [d for d in dispositions if (d.get("state") or "").upper() == state.upper()]
-
+        filters["state"] = state
     if disposition_type:
-        dispositions = [d for d in dispositions if d.get("disposition_type") == disposition_type]
-
+        filters["disposition_type"] = disposition_type
     if case_type:
-        dispositions = [d for d in dispositions if d.get("case_type") == case_type]
+        filters["case_type"] = case_type
 
-    dispositions.sort(key=lambda x: x.get("disposition_date") or "", reverse=True)
+    dispositions, total = _dispositions.page(
+        limit=limit, offset=offset, order_by="disposition_date", descending=True, **filters
+    )
 
     return {
-        "dispositions": dispositions[:limit],
-        "total": len(dispositions)
+        "dispositions": dispositions,
+        "total": total
     }
 
 
@@ -16194,13 +16123,12 @@ def get_disposition_analytics(state: str = None, case_type: str = None):
     """
     _ensure_initialized()
 
-    dispositions = list(_dispositions.values())
-
+    filters = {}
     if state:
-        dispositions = [d for d in dispositions if (d.get("state") or "").upper() == state.upper()]
-
+        filters["state"] = state
     if case_type:
-        dispositions = [d for d in dispositions if d.get("case_type") == case_type]
+        filters["case_type"] = case_type
+    dispositions = _dispositions.find(**filters)
 
     # Disposition type breakdown
     by_type = {}
@@ -18173,8 +18101,10 @@ def get_legal_aid_eligibility():
 # CASE MANAGEMENT TOOLS
 # ============================================================================
 
-# In-memory case notes storage
-_case_notes: dict = {}
+from .models.repositories import CaseNoteRepository
+
+# Case notes storage (database-backed, shared by all workers)
+_case_notes = CaseNoteRepository()
 
 
 @app.post("/v1/state-courts/case-notes")
@@ -18211,27 +18141,28 @@ def list_case_notes(
     case_id: str = None,
     note_type: str = None,
     pending_only: bool = False,
-    limit: int = 100
+    limit: int = 100,
+    offset: int = 0
 ):
     """List case notes with filters."""
     _ensure_initialized()
 
-    notes = list(_case_notes.values())
-
+    filters = {}
     if case_id:
-        notes = [n for n in notes if n.get("case_id") == case_id]
-
+        filters["case_id"] = case_id
     if note_type:
-        notes = [n for n in notes if n.get("note_type") == note_type]
-
+        filters["note_type"] = note_type
     if pending_only:
-        notes = [n for n in notes if not n.get("completed")]
+        filters["completed"] = False
 
-    notes.sort(key=lambda x: x.get("due_date") or x.get("created_at") or "", reverse=True)
+    # Sorted on due date (creation time when there is none), latest first
+    notes, total = _case_notes.page(
+        limit=limit, offset=offset, order_by="sort_date", descending=True, **filters
+    )
 
     return {
-        "notes": notes[:limit],
-        "total": len(notes)
+        "notes": notes,
+        "total": total
     }
 
 
@@ -18261,6 +18192,7 @@ def update_case_note(note_id: str, body: dict):
             note[field] = body[field]
 
     note["updated_at"] = datetime.utcnow().isoformat()
+    _case_notes[note_id] = note
 
     return {"message": "Note updated", "note": note}
 
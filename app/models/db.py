@@ -1,8 +1,13 @@
 
 import os
 import sqlite3
+import itertools
+import threading
+import weakref
+from contextlib import contextmanager
+from contextvars import ContextVar
 from pathlib import Path
-from typing import Iterable, Optional, Dict, Any, List
+from typing import Iterable, Iterator, Optional, Dict, Any, List, Sequence, Union
 
 # Check for Turso/libsql configuration (strip whitespace/newlines from env vars)
 TURSO_URL = (os.getenv("TURSO_DATABASE_URL") or "").strip()
@@ -16,100 +21,332 @@ if _is_serverless:
 else:
     DB_PATH = Path(__file__).resolve().parent.parent / "demo.db"
 
+# Connection pool tuning (see ConnectionPool below). The default matches the
+# 40-thread limiter FastAPI uses for sync endpoints, so each worker thread can
+# keep its own connection pinned.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "40"))
+DB_BUSY_TIMEOUT_MS = int(os.getenv("DB_BUSY_TIMEOUT_MS", "5000"))
+
+# Per-connection PRAGMAs, applied once when a pooled SQLite connection is opened.
+# journal_mode=WAL is persistent in the database file and lets readers proceed
+# while a writer holds the lock.
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    f"PRAGMA busy_timeout={DB_BUSY_TIMEOUT_MS}",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-16000",
+    "PRAGMA mmap_size=134217728",
+)
+
 # Turso HTTP client using requests
+TURSO_POOL_MAXSIZE = int(os.getenv("TURSO_POOL_MAXSIZE", str(DB_POOL_SIZE)))
+TURSO_TIMEOUT = float(os.getenv("TURSO_TIMEOUT", "30"))
+
 if _using_turso:
+    import base64 as _base64
     import requests as _requests
+    from requests.adapters import HTTPAdapter as _HTTPAdapter
+
+    class TursoError(sqlite3.DatabaseError):
+        """A statement in a Turso pipeline or batch failed."""
+
+    def _encode_arg(value) -> Dict[str, Any]:
+        """Encode a Python value as a typed Hrana argument."""
+        if value is None:
+            return {"type": "null"}
+        if isinstance(value, bool):
+            return {"type": "integer", "value": str(int(value))}
+        if isinstance(value, int):
+            return {"type": "integer", "value": str(value)}
+        if isinstance(value, float):
+            return {"type": "float", "value": value}
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            return {"type": "blob", "base64": _base64.b64encode(bytes(value)).decode("ascii")}
+        return {"type": "text", "value": str(value)}
+
+    def _decode_cell(cell: Dict[str, Any]):
+        cell_type = cell.get("type")
+        if cell_type == "null":
+            return None
+        if cell_type == "blob":
+            return _base64.b64decode(cell.get("base64") or "")
+        cell_value = cell.get("value")
+        if cell_value is None:
+            return None
+        if cell_type == "integer":
+            return int(cell_value)
+        if cell_type == "float":
+            return float(cell_value)
+        return cell_value
+
+    def _sql_preview(sql: str, limit: int = 120) -> str:
+        """Single-line start of a statement, for error messages."""
+        sql = " ".join(sql.split())
+        return sql if len(sql) <= limit else sql[:limit] + "..."
+
+    def _stmt(sql: str, params) -> Dict[str, Any]:
+        return {"sql": sql, "args": [_encode_arg(p) for p in (params or ())]}
+
+    class TursoTransport:
+        """
+        Keep-alive HTTP transport for the Turso /v2/pipeline endpoint.
+
+        One requests.Session (and its connection pool) is shared by every
+        TursoConnection, so statements reuse TLS connections instead of
+        handshaking per request.
+        """
+
+        def __init__(self, url: str, token: str):
+            self.url = url.replace("libsql://", "https://")
+            self.session = _requests.Session()
+            adapter = _HTTPAdapter(pool_connections=1, pool_maxsize=TURSO_POOL_MAXSIZE)
+            self.session.mount("https://", adapter)
+            self.session.mount("http://", adapter)
+            self.session.headers.update({
+                "Authorization": f"Bearer {token}",
+                "Content-Type": "application/json",
+            })
+            self.round_trips = 0
+
+        def pipeline(self, requests_list: list, baton: Optional[str] = None,
+                     base_url: Optional[str] = None, timeout: float = TURSO_TIMEOUT) -> Dict[str, Any]:
+            """POST one pipeline. Pass the previous baton to stay on the same stream."""
+            payload = {"baton": baton, "requests": requests_list}
+            url = (base_url or self.url).rstrip("/")
+            resp = self.session.post(f"{url}/v2/pipeline", json=payload, timeout=timeout)
+            self.round_trips += 1
+            resp.raise_for_status()
+            return resp.json()
+
+    _transports: Dict[tuple, TursoTransport] = {}
+    _transports_lock = threading.Lock()
+
+    def _get_transport(url: str, token: str) -> TursoTransport:
+        key = (url, token)
+        transport = _transports.get(key)
+        if transport is None:
+            with _transports_lock:
+                transport = _transports.get(key)
+                if transport is None:
+                    transport = _transports[key] = TursoTransport(url, token)
+        return transport
 
     class TursoConnection:
-        """Simple Turso HTTP API wrapper that mimics sqlite3 connection."""
+        """
+        Turso HTTP API wrapper that mimics a sqlite3 connection.
+
+        Outside a transaction each execute() is one pipeline call. Inside
+        `with conn:` statements are queued and sent together: reads flush the
+        queue on an interactive stream (kept open via the baton), and the
+        remainder plus COMMIT goes out in the final pipeline. executemany()
+        sends all rows as one atomic batch.
+
+        Errors raise TursoError. For a queued statement the error surfaces
+        when the queue is sent (at the next read or at the end of the `with`
+        block, naming the failed statement) and the transaction is rolled
+        back, so a try/except around a single execute() inside `with conn:`
+        won't see it: handle errors around the whole block, or run the
+        statement outside the transaction.
+        """
 
         def __init__(self, url: str, token: str):
-            # Convert libsql:// to https://
-            self.url = url.replace("libsql://", "https://")
-            self.token = token
+            self.transport = _get_transport(url, token)
+            self.url = self.transport.url
             self.row_factory = None
+            self._tx_depth = 0
+            self._pending: List[tuple] = []  # (stmt, cursor or None)
+            self._baton: Optional[str] = None
+            self._base_url: Optional[str] = None
 
-        def execute(self, sql: str, params: tuple = ()) -> 'TursoCursor':
-            return TursoCursor(self, sql, params)
+        @property
+        def in_transaction(self) -> bool:
+            return bool(self._pending) or self._baton is not None
 
-        def executemany(self, sql: str, params_list):
-            for params in params_list:
-                self.execute(sql, params)
+        def execute(self, sql: str, params: tuple = ()) -> 'TursoCursor':
+            cursor = TursoCursor(self)
+            if self._tx_depth:
+                self._pending.append((_stmt(sql, params), cursor))
+            else:
+                cursor._set_result(self._run_query(sql, params))
+            return cursor
+
+        def executemany(self, sql: str, params_list) -> 'TursoCursor':
+            cursor = TursoCursor(self)
+            stmts = [_stmt(sql, params) for params in params_list]
+            if self._tx_depth:
+                self._pending.extend((stmt, None) for stmt in stmts)
+            elif stmts:
+                results = self._run_batch(stmts)
+                affected = sum(int((r or {}).get("affected_row_count", 0)) for r in results)
+                cursor._set_result({"affected_row_count": affected})
+            return cursor
 
         def _run_query(self, sql: str, params: tuple = ()):
-            """Execute query via Turso HTTP API."""
-            # Convert ? placeholders to positional args
-            args = [{"type": "text", "value": str(p)} if p is not None else {"type": "null"} for p in params]
-
-            payload = {
-                "requests": [
-                    {"type": "execute", "stmt": {"sql": sql, "args": args}},
-                    {"type": "close"}
-                ]
-            }
-
-            headers = {
-                "Authorization": f"Bearer {self.token}",
-                "Content-Type": "application/json"
-            }
-
-            resp = _requests.post(f"{self.url}/v2/pipeline", json=payload, headers=headers, timeout=30)
-            resp.raise_for_status()
-            return resp.json()
+            """Execute a single statement; raises TursoError if it fails."""
+            data = self.transport.pipeline([
+                {"type": "execute", "stmt": _stmt(sql, params)},
+                {"type": "close"},
+            ])
+            try:
+                result = data["results"][0]
+                if result.get("type") == "error":
+                    raise TursoError(f"{result.get('error', {}).get('message', 'statement failed')} "
+                                     f"[{_sql_preview(sql)}]")
+                return result["response"]["result"]
+            except (KeyError, IndexError, TypeError, AttributeError):
+                raise TursoError(f"malformed response [{_sql_preview(sql)}]")
+
+        def _send_batch(self, stmts: list, begin: bool, commit: bool, close: bool,
+                        timeout: float = TURSO_TIMEOUT):
+            """
+            Send statements as one Hrana batch, each step conditioned on the
+            previous one succeeding, so a failure skips the rest (and rolls
+            back when committing). Returns one result per statement.
+            """
+            steps = [{"stmt": {"sql": "BEGIN"}}] if begin else []
+            first = len(steps)
+            for stmt in stmts:
+                step = {"stmt": stmt}
+                if steps:
+                    step["condition"] = {"type": "ok", "step": len(steps) - 1}
+                steps.append(step)
+            if commit:
+                commit_step = {"stmt": {"sql": "COMMIT"}}
+                if steps:
+                    commit_step["condition"] = {"type": "ok", "step": len(steps) - 1}
+                steps.append(commit_step)
+                steps.append({"stmt": {"sql": "ROLLBACK"},
+                              "condition": {"type": "not", "cond": {"type": "ok", "step": len(steps) - 1}}})
+            requests_list = [{"type": "batch", "batch": {"steps": steps}}]
+            if close:
+                requests_list.append({"type": "close"})
+            try:
+                data = self.transport.pipeline(requests_list, baton=self._baton,
+                                               base_url=self._base_url, timeout=timeout)
+            except Exception:
+                self._baton = self._base_url = None
+                raise
+            if close:
+                self._baton = self._base_url = None
+            else:
+                self._baton = data.get("baton")
+                self._base_url = data.get("base_url") or self._base_url
+            try:
+                result = data["results"][0]
+                if result.get("type") == "error":
+                    raise TursoError(result.get("error", {}).get("message", "batch failed"))
+                batch = result["response"]["result"]
+            except (KeyError, IndexError, TypeError):
+                raise TursoError("malformed batch response")
+            for step, err in enumerate(batch.get("step_errors") or []):
+                if err:
+                    sql = steps[step]["stmt"].get("sql", "") if step < len(steps) else ""
+                    raise TursoError(f"{err.get('message', 'batch step failed')} [{_sql_preview(sql)}]")
+            return (batch.get("step_results") or [])[first:first + len(stmts)]
+
+        def _run_batch(self, stmts: list):
+            """Run statements atomically in one round trip."""
+            return self._send_batch(stmts, begin=True, commit=True, close=True,
+                                    timeout=TURSO_TIMEOUT * 2)
+
+        def _flush(self, commit: bool = False):
+            """Send queued transaction statements on this connection's stream."""
+            pending, self._pending = self._pending, []
+            if not pending and (self._baton is None or not commit):
+                return
+            try:
+                results = self._send_batch([stmt for stmt, _ in pending], begin=self._baton is None,
+                                           commit=commit, close=commit)
+            except TursoError:
+                if self._baton is not None:
+                    self.rollback()
+                raise
+            for (_, cursor), res in zip(pending, results):
+                if cursor is not None:
+                    cursor._set_result(res)
+
+        def commit(self):
+            self._flush(commit=True)
+
+        def rollback(self):
+            self._pending = []
+            if self._baton is None:
+                return
+            baton, base_url = self._baton, self._base_url
+            self._baton = self._base_url = None
+            try:
+                self.transport.pipeline(
+                    [{"type": "execute", "stmt": {"sql": "ROLLBACK"}}, {"type": "close"}],
+                    baton=baton, base_url=base_url,
+                )
+            except Exception:
+                pass  # Stream is dropped server-side either way
 
-        def execute_batch(self, statements: list):
-            """Execute multiple statements in a single request."""
-            requests_list = []
-            for sql, params in statements:
-                args = [{"type": "text", "value": str(p)} if p is not None else {"type": "null"} for p in params]
-                requests_list.append({"type": "execute", "stmt": {"sql": sql, "args": args}})
+        def execute_script(self, statements: List[str]) -> int:
+            """Run independent statements in one pipeline; failures don't stop the rest. Returns error count."""
+            if not statements:
+                return 0
+            requests_list = [{"type": "execute", "stmt": {"sql": sql}} for sql in statements]
             requests_list.append({"type": "close"})
+            data = self.transport.pipeline(requests_list, timeout=TURSO_TIMEOUT * 2)
+            return sum(1 for r in data.get("results") or [] if r.get("type") == "error")
 
-            payload = {"requests": requests_list}
-            headers = {
-                "Authorization": f"Bearer {self.token}",
-                "Content-Type": "application/json"
-            }
-
-            resp = _requests.post(f"{self.url}/v2/pipeline", json=payload, headers=headers, timeout=60)
-            resp.raise_for_status()
-            return resp.json()
+        def execute_batch(self, statements: list):
+            """Execute multiple (sql, params) statements atomically in a single request."""
+            return self._run_batch([_stmt(sql, params) for sql, params in statements])
 
         def __enter__(self):
+            self._tx_depth += 1
             return self
 
-        def __exit__(self, *args):
-            pass
+        def __exit__(self, exc_type, exc, tb):
+            self._tx_depth -= 1
+            if self._tx_depth:
+                return False
+            if exc_type is not None:
+                self.rollback()
+            else:
+                # If nothing was read mid-transaction this is the only round trip
+                self.commit()
+            return False
 
     class TursoCursor:
         """Cursor-like object for Turso results."""
 
-        def __init__(self, conn: TursoConnection, sql: str, params: tuple):
+        _PENDING = object()
+
+        def __init__(self, conn: TursoConnection):
             self.conn = conn
-            self.sql = sql
-            self.params = params
-            # Execute immediately
-            self._results = self.conn._run_query(self.sql, self.params)
+            self._result = self._PENDING
+
+        def _set_result(self, result):
+            self._result = result
+
+        def _get_result(self):
+            if self._result is self._PENDING:
+                # Queued inside a transaction: send the queue, keep the stream open
+                self.conn._flush()
+            return self._result if self._result is not self._PENDING else None
+
+        @property
+        def rowcount(self) -> int:
+            result = self._get_result()
+            return int(result.get("affected_row_count", -1)) if result else -1
+
+        @property
+        def lastrowid(self) -> Optional[int]:
+            result = self._get_result()
+            rowid = result.get("last_insert_rowid") if result else None
+            return int(rowid) if rowid is not None else None
 
         def fetchall(self):
+            result = self._get_result()
             try:
-                result = self._results["results"][0]["response"]["result"]
                 cols = [c["name"] for c in result["cols"]]
                 rows = []
                 for row in result["rows"]:
-                    # Convert values based on Turso type
-                    values = []
-                    for cell in row:
-                        cell_type = cell.get("type")
-                        cell_value = cell.get("value")
-                        if cell_type == "null" or cell_value is None:
-                            values.append(None)
-                        elif cell_type == "integer":
-                            values.append(int(cell_value))
-                        elif cell_type == "float":
-                            values.append(float(cell_value))
-                        else:
-                            values.append(cell_value)
+                    values = [_decode_cell(cell) for cell in row]
                     if self.conn.row_factory:
                         rows.append(dict(zip(cols, values)))
                     else:
@@ -130,6 +367,11 @@ if _using_turso:
             return super().__getitem__(key)
 
 SCHEMA = """
+-- One-time data migrations that have completed
+create table if not exists data_migrations (
+  name text primary key,
+  applied_at text default (datetime('now'))
+);
 create table if not exists courts (
   code text primary key,
   name text not null,
@@ -178,7 +420,9 @@ create table if not exists rss_sources (
   court_code text,
   url text not null,
   label text,
-  last_polled text
+  last_polled text,
+  etag text,
+  last_modified text
 );
 create table if not exists rss_items (
   id text primary key,
@@ -193,7 +437,8 @@ create table if not exists rss_items (
   link text,
   published text,
   created_at text,
-  metadata_json text
+  metadata_json text,
+  published_ts integer
 );
 create table if not exists filing_stats_daily (
   id text primary key,
@@ -206,6 +451,33 @@ create table if not exists filing_stats_daily (
   unique_cases integer default 0,
   updated_at text
 );
+-- Materialized rss_items rollups, maintained by the rss_items insert trigger
+-- (RSS_ROLLUP_TRIGGERS). NULL dimensions are stored as '' so they can be part of the key. day and
+-- first/last_published are UTC, derived from published_ts.
+create table if not exists rss_rollup_daily (
+  court_code text not null default '',
+  day text not null default '',
+  case_type text not null default '',
+  nature_of_suit text not null default '',
+  judge_name text not null default '',
+  filings integer not null default 0,
+  first_published text,
+  last_published text,
+  primary key (court_code, day, case_type, nature_of_suit, judge_name)
+);
+-- Distinct case numbers per rollup cell, for unique case counts. Not
+-- constant-size: one row per case per cell it was seen in, so it grows with
+-- rss_items history, and COUNT(DISTINCT) over an unbounded day range scans
+-- all of it (use a day range where possible).
+create table if not exists rss_rollup_cases (
+  court_code text not null default '',
+  day text not null default '',
+  case_type text not null default '',
+  nature_of_suit text not null default '',
+  judge_name text not null default '',
+  case_number text not null,
+  primary key (court_code, day, case_type, nature_of_suit, judge_name, case_number)
+) without rowid;
 create table if not exists case_patterns (
   id text primary key,
   court_code text,
@@ -236,6 +508,8 @@ create index if not exists idx_rss_items_case_type on rss_items(case_type);
 create index if not exists idx_rss_items_published on rss_items(published);
 create index if not exists idx_rss_items_nos on rss_items(nature_of_suit);
 create index if not exists idx_filing_stats_date on filing_stats_daily(date);
+create index if not exists idx_rss_rollup_daily_day on rss_rollup_daily(day);
+create index if not exists idx_rss_rollup_cases_day on rss_rollup_cases(day);
 create index if not exists idx_party_activity_name on party_activity(party_name);
 
 -- RECAP/CourtListener integration tables
@@ -700,71 +974,344 @@ create table if not exists claim_profiles (
 """
 
 
-def get_conn():
-    """Get database connection (Turso or local SQLite)."""
+class _Lease:
+    """Holds a thread's checked-out connection; its finalizer returns it to the pool."""
+    __slots__ = ("conn", "finalizer", "__weakref__")
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.finalizer = None
+
+
+class _Scope:
+    """Lease holder for one connection_scope() (a request or job)."""
+    __slots__ = ("lease",)
+
+    def __init__(self):
+        self.lease = None
+
+
+class ConnectionPool:
+    """
+    Bounded pool of database connections with per-thread reuse.
+
+    Inside scope() (each API request runs in one), the first get() checks a
+    connection out for the scope and every later get() in it returns the same
+    connection; it goes back to the pool when the scope exits. The scope
+    follows the context, not the thread, so concurrent requests on one event
+    loop thread each get their own connection.
+
+    Outside a scope the connection is pinned to the calling thread until
+    release() is called or the thread exits (background workers release after
+    each unit of work). On the way back, an open implicit transaction is
+    committed, or rolled back if the scope failed, so no pooled connection
+    holds a write lock while idle.
+
+    If all `size` connections are checked out, get() opens an overflow
+    connection right away, closed (not pooled) on release, rather than wait.
+    """
+
+    def __init__(self, factory, size: int = DB_POOL_SIZE):
+        self._factory = factory
+        self.size = max(1, size)
+        self._idle: List[Any] = []
+        self._cond = threading.Condition()
+        self._local = threading.local()
+        self._scope: ContextVar[Optional[_Scope]] = ContextVar(f"db_pool_scope_{id(self)}", default=None)
+        self._open = 0
+        self._stats = {
+            "checkouts": 0,
+            "reuses": 0,
+            "overflows": 0,
+            "created": 0,
+            "closed": 0,
+        }
+
+    def _holder(self):
+        """Where the caller's lease lives: the active scope, else the thread."""
+        scope = self._scope.get()
+        return scope if scope is not None else self._local
+
+    def get(self):
+        """Return the scope's (or this thread's) connection, checking one out if needed."""
+        holder = self._holder()
+        lease = getattr(holder, "lease", None)
+        if lease is not None:
+            if _is_usable(lease.conn):
+                with self._cond:
+                    self._stats["reuses"] += 1
+                return lease.conn
+            # Caller closed the pooled connection; drop it and check out a new one
+            lease.finalizer.detach()
+            holder.lease = None
+            self._discard(lease.conn, already_closed=True)
+
+        conn = self._checkout()
+        lease = _Lease(conn)
+        lease.finalizer = weakref.finalize(lease, self._checkin, conn)
+        holder.lease = lease
+        return conn
+
+    def release(self, rollback: bool = False):
+        """Return the scope's (or this thread's) connection to the pool (no-op if none)."""
+        holder = self._holder()
+        lease = getattr(holder, "lease", None)
+        if lease is None:
+            return
+        holder.lease = None
+        if rollback:
+            try:
+                if getattr(lease.conn, "in_transaction", False):
+                    lease.conn.rollback()
+            except Exception:
+                pass
+        lease.finalizer()
+
+    @contextmanager
+    def scope(self):
+        """Check out at most one connection for the block and always return it."""
+        if self._scope.get() is not None:
+            yield  # Nested: share the enclosing scope's connection
+            return
+        token = self._scope.set(_Scope())
+        failed = False
+        try:
+            yield
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            try:
+                self.release(rollback=failed)
+            finally:
+                self._scope.reset(token)
+
+    def _checkout(self):
+        with self._cond:
+            self._stats["checkouts"] += 1
+            while self._idle:
+                conn = self._idle.pop()
+                if _is_usable(conn):
+                    return conn
+                self._open -= 1
+                self._stats["closed"] += 1
+            if self._open >= self.size:
+                self._stats["overflows"] += 1
+            # Reserve the slot before connecting so concurrent checkouts see it
+            self._open += 1
+            self._stats["created"] += 1
+        try:
+            return self._factory()
+        except Exception:
+            with self._cond:
+                self._open -= 1
+                self._stats["created"] -= 1
+                self._cond.notify()
+            raise
+
+    def _checkin(self, conn):
+        # Flush writes left in an implicit transaction by helpers that skip `with conn:`
+        try:
+            if getattr(conn, "in_transaction", False):
+                conn.commit()
+        except Exception:
+            self._discard(conn)
+            return
+        with self._cond:
+            if self._open > self.size or not _is_usable(conn):
+                overflow = True
+            else:
+                overflow = False
+                self._idle.append(conn)
+                self._cond.notify()
+        if overflow:
+            self._discard(conn)
+
+    def _discard(self, conn, already_closed: bool = False):
+        if not already_closed:
+            try:
+                conn.close()
+            except Exception:
+                pass
+        with self._cond:
+            self._open -= 1
+            self._stats["closed"] += 1
+            self._cond.notify()
+
+    def close_all(self):
+        """Close idle connections (pinned connections close when their threads exit)."""
+        with self._cond:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            self._discard(conn)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            stats = dict(self._stats)
+            stats.update({
+                "size": self.size,
+                "open": self._open,
+                "idle": len(self._idle),
+                "in_use": self._open - len(self._idle),
+            })
+        return stats
+
+
+def _is_usable(conn) -> bool:
+    """Cheap liveness check; sqlite3 raises ProgrammingError on a closed connection."""
+    if isinstance(conn, sqlite3.Connection):
+        try:
+            conn.total_changes
+        except sqlite3.ProgrammingError:
+            return False
+    return True
+
+
+_wal_applied = False
+
+
+def _connect():
+    """Open a new backend connection with row factory and PRAGMAs applied."""
+    global _wal_applied
     if _using_turso:
         conn = TursoConnection(TURSO_URL, TURSO_TOKEN)
         conn.row_factory = dict
-    else:
-        conn = sqlite3.connect(DB_PATH)
-        conn.row_factory = sqlite3.Row
+        return conn
+
+    # Pooled connections migrate between threads, one thread at a time
+    conn = sqlite3.connect(DB_PATH, check_same_thread=False, timeout=DB_BUSY_TIMEOUT_MS / 1000)
+    conn.row_factory = sqlite3.Row
+    for pragma in SQLITE_PRAGMAS:
+        if pragma.startswith("PRAGMA journal_mode") and _wal_applied:
+            continue
+        try:
+            conn.execute(pragma)
+        except sqlite3.DatabaseError:
+            pass  # e.g. WAL unsupported on this filesystem
+    _wal_applied = True
     return conn
 
+
+_pool = ConnectionPool(_connect)
+
+
+def get_conn():
+    """Get the pooled database connection (Turso or local SQLite) for this request / thread."""
+    return _pool.get()
+
+
+def release_conn():
+    """Return the current scope's (or thread's) connection to the pool."""
+    _pool.release()
+
+
+def connection_scope():
+    """
+    Context manager scoping get_conn() to a unit of work: one connection for
+    the block, returned to the pool (transaction committed, or rolled back on
+    error) when it exits.
+    """
+    return _pool.scope()
+
+
+def get_pool_stats() -> Dict[str, Any]:
+    """Connection pool metrics (checkouts, overflows, open count, ...)."""
+    stats = _pool.stats()
+    stats["backend"] = "turso" if _using_turso else "sqlite"
+    return stats
+
+# Columns added to existing tables after their original schema: (table, column, type)
+COLUMN_MIGRATIONS = [
+    ("rss_sources", "etag", "text"),
+    ("rss_sources", "last_modified", "text"),
+    ("rss_items", "published_ts", "integer"),
+]
+
+# Indexes on migrated columns; created (with RSS_ROLLUP_TRIGGERS, which read
+# published_ts) after COLUMN_MIGRATIONS have run
+MIGRATION_INDEXES = [
+    "create index if not exists idx_rss_items_court_published_ts on rss_items(court_code, published_ts)",
+    "create index if not exists idx_rss_items_published_ts on rss_items(published_ts)",
+]
+
+
 def init_db():
     conn = get_conn()
+    statements = [stmt for stmt in SCHEMA.strip().split(";") if stmt.strip()]
+    if _using_turso:
+        # Single round trip; statements are independent so one failure doesn't undo the
+        # rest (ALTERs for columns that already exist just fail)
+        statements += [f"ALTER TABLE {t} ADD COLUMN {c} {ty}" for t, c, ty in COLUMN_MIGRATIONS]
+        statements += MIGRATION_INDEXES + RSS_ROLLUP_TRIGGERS
+        conn.execute_script(statements)
+        _init_fts(conn)
+        _backfill_published_ts(conn)
+        _backfill_rss_rollups(conn)
+        return conn
     with conn:
-        for stmt in SCHEMA.strip().split(";"):
-            if stmt.strip():
-                try:
-                    conn.execute(stmt)
-                except Exception:
-                    pass  # Table may already exist
-        # Lightweight migration: add metadata_json to rss_items if missing (skip for Turso)
-        if not _using_turso:
-            cur = conn.execute("PRAGMA table_info(rss_items)")
-            cols = {r[1] for r in cur.fetchall()}
-            if "metadata_json" not in cols:
-                conn.execute("ALTER TABLE rss_items ADD COLUMN metadata_json text")
-
-            # Migration: add OCR columns to state_court_documents
+        for stmt in statements:
             try:
-                cur = conn.execute("PRAGMA table_info(state_court_documents)")
-                cols = {r[1] for r in cur.fetchall()}
-                if "ocr_used" not in cols:
-                    conn.execute("ALTER TABLE state_court_documents ADD COLUMN ocr_used integer default 0")
-                if "ocr_confidence" not in cols:
-                    conn.execute("ALTER TABLE state_court_documents ADD COLUMN ocr_confidence real")
-                if "ocr_method" not in cols:
-                    conn.execute("ALTER TABLE state_court_documents ADD COLUMN ocr_method text")
+                conn.execute(stmt)
             except Exception:
-                pass  # Table may not exist yet
+                pass  # Table may already exist
+        # Lightweight migration: add metadata_json to rss_items if missing
+        cur = conn.execute("PRAGMA table_info(rss_items)")
+        cols = {r[1] for r in cur.fetchall()}
+        if "metadata_json" not in cols:
+            conn.execute("ALTER TABLE rss_items ADD COLUMN metadata_json text")
+
+        table_cols: Dict[str, set] = {}
+        for table, column, col_type in COLUMN_MIGRATIONS:
+            if table not in table_cols:
+                table_cols[table] = {r[1] for r in conn.execute(f"PRAGMA table_info({table})").fetchall()}
+            if column not in table_cols[table]:
+                conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {col_type}")
+                table_cols[table].add(column)
+        for stmt in MIGRATION_INDEXES + RSS_ROLLUP_TRIGGERS:
+            conn.execute(stmt)
+
+        # Migration: add OCR columns to state_court_documents
+        try:
+            cur = conn.execute("PRAGMA table_info(state_court_documents)")
+            cols = {r[1] for r in cur.fetchall()}
+            if "ocr_used" not in cols:
+                conn.execute("ALTER TABLE state_court_documents ADD COLUMN ocr_used integer default 0")
+            if "ocr_confidence" not in cols:
+                conn.execute("ALTER TABLE state_court_documents ADD COLUMN ocr_confidence real")
+            if "ocr_method" not in cols:
+                conn.execute("ALTER TABLE state_court_documents ADD COLUMN ocr_method text")
+        except Exception:
+            pass  # Table may not exist yet
 
-            # Migration: add claim_url and claim_deadline to settlements
-            try:
-                cur = conn.execute("PRAGMA table_info(settlements)")
-                cols = {r[1] for r in cur.fetchall()}
-                if "claim_url" not in cols:
-                    conn.execute("ALTER TABLE settlements ADD COLUMN claim_url text")
-                if "claim_deadline" not in cols:
-                    conn.execute("ALTER TABLE settlements ADD COLUMN claim_deadline text")
-            except Exception:
-                pass  # Table may not exist yet
+        # Migration: add claim_url and claim_deadline to settlements
+        try:
+            cur = conn.execute("PRAGMA table_info(settlements)")
+            cols = {r[1] for r in cur.fetchall()}
+            if "claim_url" not in cols:
+                conn.execute("ALTER TABLE settlements ADD COLUMN claim_url text")
+            if "claim_deadline" not in cols:
+                conn.execute("ALTER TABLE settlements ADD COLUMN claim_deadline text")
+        except Exception:
+            pass  # Table may not exist yet
 
-            # Migration: ensure guid has unique index for upserts
-            try:
-                conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_settlements_guid ON settlements(guid)")
-            except Exception:
-                pass
+        # Migration: ensure guid has unique index for upserts
+        try:
+            conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_settlements_guid ON settlements(guid)")
+        except Exception:
+            pass
 
-            # Seed settlements from settlement_watch.db if table is empty
-            try:
-                cur = conn.execute("SELECT COUNT(*) as cnt FROM settlements")
-                row = cur.fetchone()
-                count = dict(row).get("cnt", 0) if row else 0
-                if count == 0:
-                    _seed_settlements(conn)
-            except Exception:
-                pass
+        # Seed settlements from settlement_watch.db if table is empty
+        try:
+            cur = conn.execute("SELECT COUNT(*) as cnt FROM settlements")
+            row = cur.fetchone()
+            count = dict(row).get("cnt", 0) if row else 0
+            if count == 0:
+                _seed_settlements(conn)
+        except Exception:
+            pass
+    _init_fts(conn)
+    _backfill_published_ts(conn)
+    _backfill_rss_rollups(conn)
     return conn
 
 
@@ -790,6 +1337,87 @@ def _seed_settlements(conn):
     except Exception:
         pass
 
+# --- Bulk write helpers ---
+
+# Rows per executemany call / Turso pipeline in bulk_upsert
+DB_BULK_CHUNK_SIZE = int(os.getenv("DB_BULK_CHUNK_SIZE", "500"))
+
+
+def _existing_keys(conn, table: str, key: Sequence[str], keys: List[tuple]) -> set:
+    """Return which of `keys` (tuples of key column values) already exist in `table`."""
+    keys = [k for k in keys if None not in k]
+    if not keys:
+        return set()
+    if len(key) == 1:
+        sql = f"select {key[0]} from {table} where {key[0]} in ({','.join(['?'] * len(keys))})"
+        params = [k[0] for k in keys]
+    else:
+        row = "(" + ",".join(["?"] * len(key)) + ")"
+        sql = f"select {','.join(key)} from {table} where ({','.join(key)}) in (values {','.join([row] * len(keys))})"
+        params = [v for k in keys for v in k]
+    cur = conn.execute(sql, tuple(params))
+    return {tuple(r[c] for c in key) if isinstance(r, dict) else tuple(r) for r in cur.fetchall()}
+
+
+def bulk_upsert(
+    table: str,
+    rows: Iterable[Dict[str, Any]],
+    columns: Sequence[str],
+    key: Sequence[str] = ("id",),
+    update: Union[None, Sequence[str], str] = None,
+    chunk_size: Optional[int] = None,
+) -> Dict[str, int]:
+    """
+    Insert many rows with one executemany per chunk.
+
+    Each chunk of `chunk_size` rows is written in a single transaction (a
+    single pipeline on Turso). Conflicts on `key` are skipped when `update`
+    is None, otherwise resolved with `col=excluded.col` for each column in
+    `update` (or `update` verbatim if it is a SET clause string).
+
+    Returns counts of inserted, updated and skipped rows.
+    """
+    chunk_size = chunk_size or DB_BULK_CHUNK_SIZE
+    columns = list(columns)
+    sql = (
+        f"insert into {table}({','.join(columns)}) values({','.join(['?'] * len(columns))}) "
+        f"on conflict({','.join(key)}) do "
+    )
+    if update is None:
+        sql += "nothing"
+    elif isinstance(update, str):
+        sql += "update set " + update
+    else:
+        sql += "update set " + ", ".join(f"{c}=excluded.{c}" for c in update)
+    key_idx = [columns.index(c) for c in key]
+
+    counts = {"inserted": 0, "updated": 0, "skipped": 0}
+    conn = get_conn()
+    rows = iter(rows)
+    while True:
+        chunk = [tuple(r.get(c) for c in columns) for r in itertools.islice(rows, chunk_size)]
+        if not chunk:
+            break
+        chunk_keys = [tuple(values[i] for i in key_idx) for values in chunk]
+        existing = _existing_keys(conn, table, key, chunk_keys) if update is not None else set()
+        if _using_turso:
+            # executemany outside a transaction is one atomic pipeline
+            affected = conn.executemany(sql, chunk).rowcount
+        else:
+            with conn:
+                affected = conn.executemany(sql, chunk).rowcount
+        affected = max(affected, 0)
+        if update is None:
+            inserted = affected
+        else:
+            new_keys = [k for k in chunk_keys if k not in existing]
+            inserted = len(set(k for k in new_keys if None not in k)) + sum(1 for k in new_keys if None in k)
+        counts["inserted"] += inserted
+        counts["updated"] += max(affected - inserted, 0)
+        counts["skipped"] += len(chunk) - affected
+    return counts
+
+
 def upsert_court(code: str, name: str, url: str):
     conn = get_conn()
     with conn:
@@ -799,17 +1427,11 @@ def upsert_court(code: str, name: str, url: str):
             (code, name, url),
         )
 
-def upsert_courts_batch(courts: list):
+def upsert_courts_batch(courts: list) -> Dict[str, int]:
     """Batch upsert multiple courts in a single request (for Turso efficiency)."""
-    conn = get_conn()
-    if _using_turso and hasattr(conn, 'execute_batch'):
-        sql = ("insert into courts(code,name,cmecf_base_url) values(?,?,?) "
-               "on conflict(code) do update set name=excluded.name, cmecf_base_url=excluded.cmecf_base_url")
-        statements = [(sql, (c["code"], c["name"], c["url"])) for c in courts]
-        conn.execute_batch(statements)
-    else:
-        for c in courts:
-            upsert_court(c["code"], c["name"], c["url"])
+    rows = ({"code": c["code"], "name": c["name"], "cmecf_base_url": c["url"]} for c in courts)
+    return bulk_upsert("courts", rows, ["code", "name", "cmecf_base_url"], key=("code",),
+                       update=["name", "cmecf_base_url"])
 
 def upsert_case(case: Dict[str, Any]):
     conn = get_conn()
@@ -827,17 +1449,13 @@ def upsert_case(case: Dict[str, Any]):
             values
         )
 
-def insert_entries(entries: Iterable[Dict[str, Any]]):
-    conn = get_conn()
-    with conn:
-        for e in entries:
-            conn.execute(
-                "insert into docket_entries(id,case_id,entry_no,filed_on,text_raw,text_clean,entry_type,has_document,doc_number,recap_document_id,cmecf_doc_url) "
-                "values(?,?,?,?,?,?,?,?,?,?,?)",
-                (e["id"], e["case_id"], e.get("entry_no"), e.get("filed_on"), e.get("text_raw"),
-                 e.get("text_clean"), e.get("entry_type"), int(e.get("has_document", False)),
-                 e.get("doc_number"), e.get("recap_document_id"), e.get("cmecf_doc_url"))
-            )
+DOCKET_ENTRY_COLUMNS = ["id", "case_id", "entry_no", "filed_on", "text_raw", "text_clean", "entry_type",
+                        "has_document", "doc_number", "recap_document_id", "cmecf_doc_url"]
+
+
+def insert_entries(entries: Iterable[Dict[str, Any]]) -> Dict[str, int]:
+    rows = ({**e, "has_document": int(e.get("has_document", False))} for e in entries)
+    return bulk_upsert("docket_entries", rows, DOCKET_ENTRY_COLUMNS)
 
 def insert_charge(charge: Dict[str, Any]):
     conn = get_conn()
@@ -885,39 +1503,188 @@ def upsert_rss_source(source: Dict[str, Any]):
             (source["id"], source.get("court_code"), source["url"], source.get("label"), source.get("last_polled"))
         )
 
-def upsert_rss_sources_batch(sources: list):
+def upsert_rss_sources_batch(sources: list) -> Dict[str, int]:
     """Batch upsert multiple RSS sources in a single request (for Turso efficiency)."""
-    conn = get_conn()
-    if _using_turso and hasattr(conn, 'execute_batch'):
-        sql = ("insert into rss_sources(id,court_code,url,label,last_polled) values(?,?,?,?,?) "
-               "on conflict(id) do update set court_code=excluded.court_code, url=excluded.url, "
-               "label=excluded.label, last_polled=excluded.last_polled")
-        statements = [(sql, (s["id"], s.get("court_code"), s["url"], s.get("label"), s.get("last_polled"))) for s in sources]
-        conn.execute_batch(statements)
-    else:
-        for s in sources:
-            upsert_rss_source(s)
+    return bulk_upsert("rss_sources", sources, ["id", "court_code", "url", "label", "last_polled"],
+                       update=["court_code", "url", "label", "last_polled"])
 
 def update_rss_source_poll_time(source_id: str, ts: str):
     conn = get_conn()
     with conn:
         conn.execute("update rss_sources set last_polled=? where id=?", (ts, source_id))
 
+def update_rss_sources_poll_state(sources: List[Dict[str, Any]]) -> Dict[str, int]:
+    """Record last_polled and conditional-GET validators (etag/last_modified) for many sources at once."""
+    return bulk_upsert("rss_sources", sources,
+                       ["id", "court_code", "url", "label", "last_polled", "etag", "last_modified"],
+                       update=["last_polled", "etag", "last_modified"])
+
 def list_rss_sources():
     conn = get_conn()
     cur = conn.execute("select * from rss_sources order by label")
     return [dict(r) for r in cur.fetchall()]
 
-def insert_rss_items(items: Iterable[Dict[str, Any]]):
+RSS_ITEM_COLUMNS = ["id", "source_id", "court_code", "case_number", "case_type", "judge_name", "nature_of_suit",
+                    "title", "summary", "link", "published", "created_at", "metadata_json", "published_ts"]
+
+
+# Non RFC 822 / ISO formats seen in feed dates, tried in order
+PUBLISHED_DATE_FORMATS = ("%m/%d/%Y", "%m/%d/%Y %I:%M %p", "%m/%d/%Y %H:%M:%S", "%B %d, %Y", "%b %d, %Y")
+
+
+def published_timestamp(value: Optional[str]) -> Optional[int]:
+    """
+    Epoch seconds (UTC) for a feed timestamp: RSS pubDate (RFC 822), Atom/ISO
+    8601, or the plain dates some state court feeds use. None if unparseable.
+    """
+    from datetime import datetime, timezone
+    from email.utils import parsedate_to_datetime
+
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        dt = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        dt = None
+    if dt is None:
+        try:
+            dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            for fmt in PUBLISHED_DATE_FORMATS:
+                try:
+                    dt = datetime.strptime(value, fmt)
+                    break
+                except ValueError:
+                    continue
+            else:
+                return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return int(dt.timestamp())
+
+
+def _backfill_published_ts(conn):
+    """
+    One-time migration: fill rss_items.published_ts for rows stored before the
+    column existed. Recorded in data_migrations once it has run, so rows whose
+    date can't be parsed (left NULL) aren't rescanned on every init_db.
+    """
+    try:
+        cur = conn.execute("select exists(select 1 from data_migrations where name = 'published_ts') as done")
+        if dict(cur.fetchone())["done"]:
+            return
+        cur = conn.execute("select id, published from rss_items where published_ts is null "
+                           "and published is not null and published != ''")
+        rows = [(r["id"], r["published"]) for r in cur.fetchall()]
+    except Exception:
+        return
+    updates = [(ts, item_id) for item_id, ts in ((i, published_timestamp(p)) for i, p in rows) if ts is not None]
+    for i in range(0, len(updates), DB_BULK_CHUNK_SIZE):
+        chunk = updates[i:i + DB_BULK_CHUNK_SIZE]
+        if _using_turso:
+            conn.executemany("update rss_items set published_ts=? where id=?", chunk)
+        else:
+            with conn:
+                conn.executemany("update rss_items set published_ts=? where id=?", chunk)
+    if updates:
+        # Rollup days are derived from published_ts
+        rebuild_rss_rollups()
+    # New rows get published_ts from insert_rss_items, so this never needs to run again
+    with conn:
+        conn.execute("insert into data_migrations(name) values('published_ts') on conflict(name) do nothing")
+
+
+def insert_rss_items(items: Iterable[Dict[str, Any]]) -> Dict[str, int]:
+    """
+    Insert RSS items, skipping ids that are already stored. The rollups are
+    updated by the rss_items insert trigger, in the same transaction and only
+    for rows that were actually inserted.
+    """
+    items = list(items)
+    for it in items:
+        if "published_ts" not in it:
+            it["published_ts"] = published_timestamp(it.get("published"))
+    return bulk_upsert("rss_items", items, RSS_ITEM_COLUMNS)
+
+def existing_rss_item_ids(ids: List[str]) -> set:
+    """Return which of the given rss_items ids are already stored."""
+    conn = get_conn()
+    found = set()
+    for i in range(0, len(ids), DB_BULK_CHUNK_SIZE):
+        chunk = ids[i:i + DB_BULK_CHUNK_SIZE]
+        cur = conn.execute(f"select id from rss_items where id in ({','.join(['?'] * len(chunk))})", tuple(chunk))
+        found.update(r[0] if not isinstance(r, dict) else r["id"] for r in cur.fetchall())
+    return found
+
+# --- rss_items rollups ---
+
+def _rss_rollup_cell_sql(src: str) -> str:
+    """Rollup cell columns of the rss_items row `src` (NULL dimensions as ''), as SQL."""
+    return (f"coalesce({src}.court_code, ''), coalesce(date({src}.published_ts, 'unixepoch'), ''), "
+            f"coalesce({src}.case_type, ''), coalesce({src}.nature_of_suit, ''), coalesce({src}.judge_name, '')")
+
+
+# Fires once per row actually inserted into rss_items (not for ids skipped by
+# ON CONFLICT DO NOTHING), inside the inserting statement's transaction, so
+# concurrent inserts of the same items can't count them twice.
+RSS_ROLLUP_TRIGGERS = [
+    f"""create trigger if not exists rss_items_rollup_ai after insert on rss_items begin
+        insert into rss_rollup_daily(court_code, day, case_type, nature_of_suit, judge_name,
+                                     filings, first_published, last_published)
+        values({_rss_rollup_cell_sql("new")}, 1,
+               strftime('%Y-%m-%dT%H:%M:%SZ', new.published_ts, 'unixepoch'),
+               strftime('%Y-%m-%dT%H:%M:%SZ', new.published_ts, 'unixepoch'))
+        on conflict(court_code, day, case_type, nature_of_suit, judge_name) do update set
+            filings = filings + 1,
+            first_published = coalesce(min(first_published, excluded.first_published), first_published, excluded.first_published),
+            last_published = coalesce(max(last_published, excluded.last_published), last_published, excluded.last_published);
+        insert into rss_rollup_cases(court_code, day, case_type, nature_of_suit, judge_name, case_number)
+        select {_rss_rollup_cell_sql("new")}, new.case_number
+        where new.case_number is not null and new.case_number != ''
+        on conflict do nothing;
+    end""",
+]
+
+
+def rebuild_rss_rollups() -> Dict[str, int]:
+    """Recompute the rss_items rollup tables from scratch in one transaction."""
     conn = get_conn()
     with conn:
-        for it in items:
-            conn.execute(
-                "insert into rss_items(id,source_id,court_code,case_number,case_type,judge_name,nature_of_suit,title,summary,link,published,created_at,metadata_json) "
-                "values(?,?,?,?,?,?,?,?,?,?,?,?,?) on conflict(id) do nothing",
-                (it["id"], it.get("source_id"), it.get("court_code"), it.get("case_number"), it.get("case_type"),
-                 it.get("judge_name"), it.get("nature_of_suit"), it.get("title"), it.get("summary"), it.get("link"), it.get("published"), it.get("created_at"), it.get("metadata_json"))
-            )
+        conn.execute("delete from rss_rollup_daily")
+        conn.execute("delete from rss_rollup_cases")
+        conn.execute(f"""
+            insert into rss_rollup_daily(court_code, day, case_type, nature_of_suit, judge_name,
+                                         filings, first_published, last_published)
+            select {_rss_rollup_cell_sql("rss_items")}, count(*),
+                   min(strftime('%Y-%m-%dT%H:%M:%SZ', published_ts, 'unixepoch')),
+                   max(strftime('%Y-%m-%dT%H:%M:%SZ', published_ts, 'unixepoch'))
+            from rss_items
+            group by 1, 2, 3, 4, 5
+        """)
+        conn.execute(f"""
+            insert into rss_rollup_cases(court_code, day, case_type, nature_of_suit, judge_name, case_number)
+            select distinct {_rss_rollup_cell_sql("rss_items")}, case_number
+            from rss_items
+            where case_number is not null and case_number != ''
+        """)
+    cur = conn.execute("select (select count(*) from rss_rollup_daily) as cells, "
+                       "(select count(*) from rss_rollup_cases) as cases")
+    row = dict(cur.fetchone())
+    return {"cells": row["cells"], "cases": row["cases"]}
+
+
+def _backfill_rss_rollups(conn):
+    """Populate the rollups for databases created before they existed."""
+    try:
+        cur = conn.execute("select exists(select 1 from rss_rollup_daily) as has_rollups, "
+                           "exists(select 1 from rss_items) as has_items")
+        row = dict(cur.fetchone())
+        if row["has_items"] and not row["has_rollups"]:
+            rebuild_rss_rollups()
+    except Exception:
+        pass
+
 
 def list_rss_items(
     court_code: Optional[str] = None,
@@ -926,8 +1693,14 @@ def list_rss_items(
     nature_of_suit: Optional[str] = None,
     keyword: Optional[str] = None,
     new_only: bool = False,
-    limit: int = 50
+    limit: int = 50,
+    cursor: Optional[str] = None,
 ):
+    """
+    Newest-first RSS items matching the filters. `keyword` uses the
+    rss_items_fts index when available. `cursor` (from rss_items_cursor on the
+    last item of the previous page) continues after that item.
+    """
     conn = get_conn()
     conditions = []
     params = []
@@ -951,58 +1724,84 @@ def list_rss_items(
         params.append(f"%{nature_of_suit}%")
 
     if keyword:
-        conditions.append("(title LIKE ? OR summary LIKE ? OR case_number LIKE ?)")
-        kw = f"%{keyword}%"
-        params.extend([kw, kw, kw])
+        fts = fts_filter("rss_items_fts", "rss_items.rowid", keyword)
+        if fts:
+            conditions.append(fts[0])
+            params.extend(fts[1])
+        else:
+            conditions.append("(title LIKE ? OR summary LIKE ? OR case_number LIKE ?)")
+            kw = f"%{keyword}%"
+            params.extend([kw, kw, kw])
 
     if new_only:
         conditions.append("json_extract(metadata_json, '$.is_new_case') = 1")
 
+    if cursor:
+        created_at, item_id = decode_cursor(cursor)
+        conditions.append("(created_at < ? or (created_at = ? and id < ?))")
+        params.extend([created_at, created_at, item_id])
+
     where_clause = " where " + " and ".join(conditions) if conditions else ""
     params.append(limit)
 
     cur = conn.execute(
-        f"select * from rss_items{where_clause} order by created_at desc limit ?",
+        f"select * from rss_items{where_clause} order by created_at desc, id desc limit ?",
         tuple(params)
     )
     return [dict(r) for r in cur.fetchall()]
 
 
+def rss_items_cursor(item: Dict[str, Any]) -> str:
+    """Cursor continuing list_rss_items after `item`."""
+    return encode_cursor([item.get("created_at"), item.get("id")])
+
+
+def search_rss_items(q: str, limit: int = 50, cursor: Optional[str] = None) -> Dict[str, Any]:
+    """BM25-ranked rss_items search with snippets; see fts_search_page."""
+    return fts_search_page("rss_items_fts", q, ["*"], limit=limit, cursor=cursor, prefix=True)
+
+
 # --- Settlement helpers ---
 
+SETTLEMENT_COLUMNS = ["title", "amount", "amount_formatted", "url", "description", "category", "source",
+                      "pub_date", "claim_url", "claim_deadline", "guid"]
+
+_SETTLEMENT_UPDATE = (
+    "title=excluded.title, amount=excluded.amount, amount_formatted=excluded.amount_formatted, "
+    "url=excluded.url, description=excluded.description, category=excluded.category, "
+    "source=excluded.source, pub_date=excluded.pub_date, "
+    "claim_url=COALESCE(excluded.claim_url, settlements.claim_url), "
+    "claim_deadline=COALESCE(excluded.claim_deadline, settlements.claim_deadline), "
+    "updated_at=CURRENT_TIMESTAMP"
+)
+
+
+def _with_settlement_guid(settlement: Dict[str, Any]) -> Dict[str, Any]:
+    if settlement.get("guid"):
+        return settlement
+    # Generate guid from title + amount
+    title = settlement.get("title", "")[:30]
+    amount = settlement.get("amount", "")
+    source = settlement.get("source", "")
+    return {**settlement, "guid": f"{source}-{title}-{amount}"}
+
+
 def upsert_settlement(settlement: Dict[str, Any]):
     """Insert or update a settlement record."""
-    conn = get_conn()
-    guid = settlement.get("guid")
-    if not guid:
-        # Generate guid from title + amount
-        title = settlement.get("title", "")[:30]
-        amount = settlement.get("amount", "")
-        source = settlement.get("source", "")
-        guid = f"{source}-{title}-{amount}"
+    upsert_settlements_batch([settlement])
 
-    with conn:
-        conn.execute(
-            "INSERT INTO settlements(title, amount, amount_formatted, url, description, category, source, pub_date, claim_url, claim_deadline, guid) "
-            "VALUES(?,?,?,?,?,?,?,?,?,?,?) "
-            "ON CONFLICT(guid) DO UPDATE SET "
-            "title=excluded.title, amount=excluded.amount, amount_formatted=excluded.amount_formatted, "
-            "url=excluded.url, description=excluded.description, category=excluded.category, "
-            "source=excluded.source, pub_date=excluded.pub_date, "
-            "claim_url=COALESCE(excluded.claim_url, settlements.claim_url), "
-            "claim_deadline=COALESCE(excluded.claim_deadline, settlements.claim_deadline), "
-            "updated_at=CURRENT_TIMESTAMP",
-            (settlement.get("title"), settlement.get("amount"), settlement.get("amount_formatted"),
-             settlement.get("url"), settlement.get("description"), settlement.get("category"),
-             settlement.get("source"), settlement.get("pub_date"),
-             settlement.get("claim_url"), settlement.get("claim_deadline"), guid),
-        )
 
+def upsert_settlements_batch(settlements: Iterable[Dict[str, Any]]) -> Dict[str, int]:
+    """Batch upsert multiple settlements (keyed on guid)."""
+    rows = (_with_settlement_guid(s) for s in settlements)
+    return bulk_upsert("settlements", rows, SETTLEMENT_COLUMNS, key=("guid",), update=_SETTLEMENT_UPDATE)
 
-def upsert_settlements_batch(settlements: List[Dict[str, Any]]):
-    """Batch upsert multiple settlements."""
-    for s in settlements:
-        upsert_settlement(s)
+
+SETTLEMENT_STATUS_EXPR = """CASE
+        WHEN claim_deadline IS NOT NULL AND claim_deadline >= date('now') THEN 'active'
+        WHEN claim_deadline IS NOT NULL AND claim_deadline < date('now') THEN 'expired'
+        ELSE 'unknown'
+    END"""
 
 
 def list_settlements_db(
@@ -1028,16 +1827,17 @@ def list_settlements_db(
         conditions.append("amount >= ?")
         params.append(min_amount)
     if q:
-        conditions.append("(title LIKE ? OR description LIKE ?)")
-        kw = f"%{q}%"
-        params.extend([kw, kw])
+        fts = fts_filter("settlements_fts", "settlements.rowid", q)
+        if fts:
+            conditions.append(fts[0])
+            params.extend(fts[1])
+        else:
+            conditions.append("(title LIKE ? OR description LIKE ?)")
+            kw = f"%{q}%"
+            params.extend([kw, kw])
 
     # Status filter on computed is_active
-    status_expr = """CASE
-        WHEN claim_deadline IS NOT NULL AND claim_deadline >= date('now') THEN 'active'
-        WHEN claim_deadline IS NOT NULL AND claim_deadline < date('now') THEN 'expired'
-        ELSE 'unknown'
-    END"""
+    status_expr = SETTLEMENT_STATUS_EXPR
     if status in ("active", "expired", "unknown"):
         conditions.append(f"({status_expr}) = ?")
         params.append(status)
@@ -1051,6 +1851,35 @@ def list_settlements_db(
     return [dict(r) for r in cur.fetchall()]
 
 
+def search_settlements(
+    q: str,
+    category: Optional[str] = None,
+    source: Optional[str] = None,
+    min_amount: Optional[float] = None,
+    status: Optional[str] = None,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Settlements ranked by relevance to `q`, with snippets; see fts_search_page."""
+    conditions = []
+    params: list = []
+    if category:
+        conditions.append("b.category = ?")
+        params.append(category)
+    if source:
+        conditions.append("b.source = ?")
+        params.append(source)
+    if min_amount is not None:
+        conditions.append("b.amount >= ?")
+        params.append(min_amount)
+    status_expr = SETTLEMENT_STATUS_EXPR.replace("claim_deadline", "b.claim_deadline")
+    if status in ("active", "expired", "unknown"):
+        conditions.append(f"({status_expr}) = ?")
+        params.append(status)
+    return fts_search_page("settlements_fts", q, ["*", f"{status_expr} AS is_active"],
+                           " and ".join(conditions), params, limit, cursor, prefix=True)
+
+
 def get_settlement_stats() -> Dict[str, Any]:
     """Get summary stats for settlements."""
     conn = get_conn()
@@ -1214,18 +2043,13 @@ def get_recap_docket_by_id(docket_id: str) -> Optional[Dict[str, Any]]:
     return dict(row) if row else None
 
 
-def insert_recap_parties(parties: Iterable[Dict[str, Any]]):
+def insert_recap_parties(parties: Iterable[Dict[str, Any]]) -> Dict[str, int]:
     """Insert RECAP party records."""
-    conn = get_conn()
-    with conn:
-        for p in parties:
-            conn.execute(
-                "insert into recap_parties(id,docket_id,cl_party_id,name,party_type,extra_info,date_terminated) "
-                "values(?,?,?,?,?,?,?) on conflict(id) do update set "
-                "name=excluded.name, party_type=excluded.party_type, extra_info=excluded.extra_info, date_terminated=excluded.date_terminated",
-                (p["id"], p.get("docket_id"), p.get("cl_party_id"), p.get("name"),
-                 p.get("party_type"), p.get("extra_info"), p.get("date_terminated"))
-            )
+    return bulk_upsert(
+        "recap_parties", parties,
+        ["id", "docket_id", "cl_party_id", "name", "party_type", "extra_info", "date_terminated"],
+        update=["name", "party_type", "extra_info", "date_terminated"],
+    )
 
 
 def get_recap_parties(docket_id: str) -> list:
@@ -1252,18 +2076,13 @@ def search_recap_parties(name: str, court_code: str = None, limit: int = 50) ->
     return [dict(r) for r in cur.fetchall()]
 
 
-def insert_recap_attorneys(attorneys: Iterable[Dict[str, Any]]):
+def insert_recap_attorneys(attorneys: Iterable[Dict[str, Any]]) -> Dict[str, int]:
     """Insert RECAP attorney records."""
-    conn = get_conn()
-    with conn:
-        for a in attorneys:
-            conn.execute(
-                "insert into recap_attorneys(id,docket_id,party_id,cl_attorney_id,name,firm,phone,email,roles) "
-                "values(?,?,?,?,?,?,?,?,?) on conflict(id) do update set "
-                "name=excluded.name, firm=excluded.firm, phone=excluded.phone, email=excluded.email, roles=excluded.roles",
-                (a["id"], a.get("docket_id"), a.get("party_id"), a.get("cl_attorney_id"),
-                 a.get("name"), a.get("firm"), a.get("phone"), a.get("email"), a.get("roles"))
-            )
+    return bulk_upsert(
+        "recap_attorneys", attorneys,
+        ["id", "docket_id", "party_id", "cl_attorney_id", "name", "firm", "phone", "email", "roles"],
+        update=["name", "firm", "phone", "email", "roles"],
+    )
 
 
 def get_recap_attorneys(docket_id: str) -> list:
@@ -1276,19 +2095,14 @@ def get_recap_attorneys(docket_id: str) -> list:
     return [dict(r) for r in cur.fetchall()]
 
 
-def insert_recap_entries(entries: Iterable[Dict[str, Any]]):
+def insert_recap_entries(entries: Iterable[Dict[str, Any]]) -> Dict[str, int]:
     """Insert RECAP docket entry records."""
-    conn = get_conn()
-    with conn:
-        for e in entries:
-            conn.execute(
-                "insert into recap_entries(id,docket_id,cl_entry_id,entry_number,date_filed,description,document_count,pacer_doc_id,recap_document_id) "
-                "values(?,?,?,?,?,?,?,?,?) on conflict(id) do update set "
-                "description=excluded.description, document_count=excluded.document_count",
-                (e["id"], e.get("docket_id"), e.get("cl_entry_id"), e.get("entry_number"),
-                 e.get("date_filed"), e.get("description"), e.get("document_count"),
-                 e.get("pacer_doc_id"), e.get("recap_document_id"))
-            )
+    return bulk_upsert(
+        "recap_entries", entries,
+        ["id", "docket_id", "cl_entry_id", "entry_number", "date_filed", "description",
+         "document_count", "pacer_doc_id", "recap_document_id"],
+        update=["description", "document_count"],
+    )
 
 
 def get_recap_entries(docket_id: str, limit: int = 500) -> list:
@@ -1301,19 +2115,15 @@ def get_recap_entries(docket_id: str, limit: int = 500) -> list:
     return [dict(r) for r in cur.fetchall()]
 
 
-def insert_recap_documents(documents: Iterable[Dict[str, Any]]):
+def insert_recap_documents(documents: Iterable[Dict[str, Any]]) -> Dict[str, int]:
     """Insert RECAP document records."""
-    conn = get_conn()
-    with conn:
-        for d in documents:
-            conn.execute(
-                "insert into recap_documents(id,entry_id,cl_document_id,document_number,attachment_number,description,page_count,filepath_local,is_available,sha1) "
-                "values(?,?,?,?,?,?,?,?,?,?) on conflict(id) do update set "
-                "is_available=excluded.is_available, filepath_local=excluded.filepath_local",
-                (d["id"], d.get("entry_id"), d.get("cl_document_id"), d.get("document_number"),
-                 d.get("attachment_number"), d.get("description"), d.get("page_count"),
-                 d.get("filepath_local"), int(d.get("is_available", False)), d.get("sha1"))
-            )
+    rows = ({**d, "is_available": int(d.get("is_available", False))} for d in documents)
+    return bulk_upsert(
+        "recap_documents", rows,
+        ["id", "entry_id", "cl_document_id", "document_number", "attachment_number", "description",
+         "page_count", "filepath_local", "is_available", "sha1"],
+        update=["is_available", "filepath_local"],
+    )
 
 
 def get_recap_documents(entry_id: str) -> list:
@@ -1335,7 +2145,7 @@ def list_unenriched_cases(limit: int = 100) -> list:
         left join recap_dockets d on r.court_code = d.court_code and r.case_number = d.docket_number
         where r.case_number is not null
           and d.id is null
-        order by r.published desc
+        order by r.published_ts desc
         limit ?
     """, (limit,))
     return [dict(r) for r in cur.fetchall()]
@@ -2325,8 +3135,8 @@ def upsert_state_court_case(case: Dict[str, Any]) -> str:
     values = [case.get(f) for f in fields]
     placeholders = ",".join(["?"] * len(fields))
 
-    with conn:
-        try:
+    try:
+        with conn:
             conn.execute(f"""
                 INSERT INTO state_court_cases ({','.join(fields)})
                 VALUES ({placeholders})
@@ -2341,9 +3151,9 @@ def upsert_state_court_case(case: Dict[str, Any]) -> str:
                     disposition = excluded.disposition,
                     updated_at = excluded.updated_at
             """, tuple(values))
-        except Exception:
-            # Fallback for unique constraint violation
-            pass
+    except Exception:
+        # Fallback for unique constraint violation
+        pass
 
     return case["id"]
 
@@ -2383,18 +3193,15 @@ def get_state_court_case(state: str, county: str, case_number: str) -> Optional[
     return result
 
 
-def search_state_court_cases(
+def _state_court_case_filters(
     state: str = None,
     county: str = None,
     case_type: str = None,
     date_from: str = None,
     date_to: str = None,
-    party_name: str = None,
-    limit: int = 100
-) -> List[Dict]:
-    """Search state court cases."""
-    conn = get_conn()
-
+    party_name: str = None
+):
+    """WHERE conditions and params for state court case searches."""
     conditions = []
     params = []
 
@@ -2416,7 +3223,22 @@ def search_state_court_cases(
     if party_name:
         conditions.append("(case_style LIKE ? OR parties_json LIKE ?)")
         params.extend([f"%{party_name}%", f"%{party_name}%"])
+    return conditions, params
+
 
+def search_state_court_cases(
+    state: str = None,
+    county: str = None,
+    case_type: str = None,
+    date_from: str = None,
+    date_to: str = None,
+    party_name: str = None,
+    limit: int = 100
+) -> List[Dict]:
+    """Search state court cases."""
+    conn = get_conn()
+
+    conditions, params = _state_court_case_filters(state, county, case_type, date_from, date_to, party_name)
     where_clause = " WHERE " + " AND ".join(conditions) if conditions else ""
 
     cur = conn.execute(f"""
@@ -2429,6 +3251,337 @@ def search_state_court_cases(
     return [dict(r) for r in cur.fetchall()]
 
 
+# Rows per query when streaming a full result set (exports)
+EXPORT_PAGE_SIZE = int(os.getenv("EXPORT_PAGE_SIZE", "1000"))
+
+
+def _iter_keyset(
+    select: str,
+    conditions: List[str],
+    params: List[Any],
+    order_col: str,
+    limit: Optional[int] = None,
+    page_size: int = None
+) -> Iterator[Dict]:
+    """
+    Yield the rows of `select` newest first (order_col DESC, NULLs last), a page at a time.
+
+    Pages are keyset queries continuing after the previous page's last
+    (order_col, rowid), so every page costs the same wherever it falls in the
+    result (OFFSET would rescan all earlier rows) and no cursor is left open
+    between pages: each page runs on the calling thread's pooled connection,
+    whichever thread advances the generator.
+
+    `select` must select `rowid AS _rowid` and order_col; _rowid is dropped
+    from the yielded rows.
+    """
+    page_size = page_size or EXPORT_PAGE_SIZE
+    remaining = limit
+    after = None
+    while remaining is None or remaining > 0:
+        page_conditions = list(conditions)
+        page_params = list(params)
+        if after is not None:
+            value, rowid = after
+            if value is None:
+                page_conditions.append(f"({order_col} IS NULL AND rowid < ?)")
+                page_params.append(rowid)
+            else:
+                page_conditions.append(
+                    f"({order_col} < ? OR ({order_col} = ? AND rowid < ?) OR {order_col} IS NULL)"
+                )
+                page_params.extend([value, value, rowid])
+        where_clause = " WHERE " + " AND ".join(page_conditions) if page_conditions else ""
+        size = page_size if remaining is None else min(page_size, remaining)
+
+        # Streamed responses advance the generator after the request scope has
+        # ended, so each page takes (and returns) its own connection
+        with connection_scope():
+            cur = get_conn().execute(f"""
+                {select}
+                {where_clause}
+                ORDER BY {order_col} DESC, rowid DESC
+                LIMIT ?
+            """, tuple(page_params + [size]))
+            rows = cur.fetchall()
+
+        for r in rows:
+            row = dict(r)
+            rowid = row.pop("_rowid")
+            yield row
+        if len(rows) < size:
+            return
+        after = (row.get(order_col), rowid)
+        if remaining is not None:
+            remaining -= len(rows)
+
+
+def iter_state_court_cases(
+    state: str = None,
+    county: str = None,
+    case_type: str = None,
+    date_from: str = None,
+    date_to: str = None,
+    party_name: str = None,
+    limit: int = None,
+    page_size: int = None
+) -> Iterator[Dict]:
+    """Stream state court cases (same filters and order as search_state_court_cases, no row cap)."""
+    conditions, params = _state_court_case_filters(state, county, case_type, date_from, date_to, party_name)
+    return _iter_keyset(
+        "SELECT rowid AS _rowid, * FROM state_court_cases",
+        conditions, params, "date_filed", limit=limit, page_size=page_size
+    )
+
+
+# --- Full-text search (FTS5) ---
+
+# FTS5 index name -> (base table, indexed columns). Each index is an
+# external-content table over the base table's rowid, kept in sync by triggers.
+FTS_INDEXES = {
+    "state_court_cases_fts": ("state_court_cases", ["case_style", "case_number", "judge", "disposition"]),
+    "state_court_opinions_fts": ("state_court_opinions",
+                                 ["case_name", "citation", "docket_number", "judges", "headnotes", "opinion_text"]),
+    "state_court_documents_fts": ("state_court_documents", ["title", "case_number", "description", "extracted_text"]),
+    "rss_items_fts": ("rss_items", ["title", "summary", "case_number"]),
+    "settlements_fts": ("settlements", ["title", "description"]),
+}
+
+FTS_TOKENIZE = "unicode61 remove_diacritics 2"
+FTS_SNIPPET_TOKENS = 16
+
+
+def _fts_ddl(name: str, table: str, columns: List[str]) -> List[str]:
+    """CREATE statements for one FTS index and its sync triggers (each a single statement)."""
+    cols = ", ".join(columns)
+    new_vals = ", ".join(f"new.{c}" for c in columns)
+    old_vals = ", ".join(f"old.{c}" for c in columns)
+    delete = f"insert into {name}({name}, rowid, {cols}) values('delete', old.rowid, {old_vals});"
+    insert = f"insert into {name}(rowid, {cols}) values(new.rowid, {new_vals});"
+    return [
+        f"create virtual table if not exists {name} using fts5({cols}, content='{table}', "
+        f"content_rowid='rowid', tokenize='{FTS_TOKENIZE}', prefix='2 3')",
+        f"create trigger if not exists {name}_ai after insert on {table} begin {insert} end",
+        f"create trigger if not exists {name}_ad after delete on {table} begin {delete} end",
+        f"create trigger if not exists {name}_au after update on {table} begin {delete} {insert} end",
+    ]
+
+
+def _init_fts(conn):
+    """Create FTS indexes and triggers; populate indexes created over existing rows."""
+    try:
+        cur = conn.execute("select name from sqlite_master where type='table' and name like '%_fts'")
+        existing = {r[0] if not isinstance(r, dict) else r["name"] for r in cur.fetchall()}
+    except Exception:
+        return
+    for name, (table, columns) in FTS_INDEXES.items():
+        try:
+            if _using_turso:
+                if conn.execute_script(_fts_ddl(name, table, columns)):
+                    continue
+            else:
+                with conn:
+                    for stmt in _fts_ddl(name, table, columns):
+                        conn.execute(stmt)
+            if name not in existing:
+                with conn:
+                    conn.execute(f"insert into {name}({name}) values('rebuild')")
+        except Exception:
+            pass  # SQLite built without FTS5; searches fall back to LIKE
+
+
+def rebuild_fts(names: Optional[List[str]] = None, optimize: bool = False) -> Dict[str, str]:
+    """
+    Rebuild FTS indexes from their base tables, or merge their b-trees when
+    optimize=True. Returns the action taken per index.
+    """
+    conn = get_conn()
+    command = "optimize" if optimize else "rebuild"
+    done = {}
+    for name in names or list(FTS_INDEXES):
+        if name not in FTS_INDEXES:
+            raise ValueError(f"Unknown FTS index: {name}")
+        with conn:
+            conn.execute(f"insert into {name}({name}) values(?)", (command,))
+        done[name] = command
+    return done
+
+
+def fts_query(q: str, prefix: bool = False) -> Optional[str]:
+    """
+    Translate a user search string into an FTS5 MATCH expression.
+
+    Words are matched as terms (all must match), "double quoted" text as a
+    phrase, a trailing * makes a prefix query, and OR / NOT between terms are
+    kept as operators. prefix=True makes every bare word a prefix query, the
+    closest match to the old LIKE '%kw%' keyword filters. Returns None if
+    nothing searchable remains.
+    """
+    import re
+
+    parts = []
+    for phrase, word in re.findall(r'"([^"]*)"|(\S+)', q or ""):
+        if phrase:
+            terms = re.findall(r"\w+", phrase)
+            if terms:
+                parts.append('"' + " ".join(terms) + '"')
+            continue
+        if word in ("OR", "NOT"):
+            if parts and parts[-1] not in ("OR", "NOT"):
+                parts.append(word)
+            continue
+        terms = re.findall(r"\w+", word)
+        if not terms:
+            continue
+        # Punctuated tokens (case numbers, citations) become phrases of their parts
+        term = '"' + " ".join(terms) + '"'
+        # Implicit prefixes skip very short words, which would match most of the index
+        implicit = prefix and len(terms[-1]) >= 3
+        parts.append(term + "*" if implicit or word.endswith("*") else term)
+    while parts and parts[-1] in ("OR", "NOT"):
+        parts.pop()
+    return " ".join(parts) or None
+
+
+_fts_ready: set = set()
+
+
+def fts_available(name: str) -> bool:
+    """Whether FTS index `name` exists (positive results are cached)."""
+    if name in _fts_ready:
+        return True
+    try:
+        cur = get_conn().execute("select 1 from sqlite_master where type='table' and name=?", (name,))
+        if cur.fetchone():
+            _fts_ready.add(name)
+            return True
+    except Exception:
+        pass
+    return False
+
+
+def fts_filter(name: str, rowid: str, q: str) -> Optional[tuple]:
+    """
+    (condition, params) restricting `rowid` (e.g. "rss_items.rowid") to rows
+    matching keyword filter `q`, or None when the index is unavailable and the
+    caller should fall back to LIKE. An unsearchable `q` matches nothing.
+    """
+    if not fts_available(name):
+        return None
+    match = fts_query(q, prefix=True)
+    if match is None:
+        return "0", []
+    return f"{rowid} in (select rowid from {name} where {name} match ?)", [match]
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Opaque pagination cursor for a keyset position."""
+    import base64
+    import json
+    return base64.urlsafe_b64encode(json.dumps(list(values)).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> list:
+    """Inverse of encode_cursor. Raises ValueError for malformed cursors."""
+    import base64
+    import json
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if not isinstance(values, list):
+        raise ValueError("Invalid cursor")
+    return values
+
+
+def fts_search_page(
+    name: str,
+    q: str,
+    fields: List[str],
+    where: str = "",
+    params: Sequence[Any] = (),
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    prefix: bool = False,
+) -> Dict[str, Any]:
+    """
+    BM25-ranked search of one FTS index, joined back to its base table.
+
+    `fields` are base-table columns to return (aliased as b; entries with a
+    space are used verbatim as expressions), `where` an optional extra
+    condition on b, `prefix` as for fts_query. Each row also gets `score` (higher is
+    better) and `snippet` with matches wrapped in <mark></mark>.
+
+    Returns {"results": rows, "next_cursor": str or None}; pass next_cursor
+    back to continue after the last row. Raises sqlite3.OperationalError if
+    the index doesn't exist, ValueError for a bad cursor.
+    """
+    table, _ = FTS_INDEXES[name]
+    match = fts_query(q, prefix=prefix)
+    if match is None:
+        return {"results": [], "next_cursor": None}
+    conditions = [f"{name} match ?"]
+    args: list = [match]
+    if where:
+        conditions.append(where)
+        args.extend(params)
+    if cursor:
+        # Keyset on (bm25, rowid): bm25 is negative, lower is better
+        rank, rowid = decode_cursor(cursor)
+        conditions.append(f"(bm25({name}) > ? or (bm25({name}) = ? and {name}.rowid > ?))")
+        args.extend([rank, rank, rowid])
+    conn = get_conn()
+    select = ", ".join(f if " " in f else f"b.{f}" for f in fields)
+    cur = conn.execute(f"""
+        select {select},
+               bm25({name}) as _rank,
+               {name}.rowid as _rowid,
+               snippet({name}, -1, '<mark>', '</mark>', '…', {FTS_SNIPPET_TOKENS}) as snippet
+        from {name}
+        join {table} b on b.rowid = {name}.rowid
+        where {" and ".join(conditions)}
+        order by bm25({name}), {name}.rowid
+        limit ?
+    """, (*args, limit))
+    rows = []
+    last = None
+    for r in cur.fetchall():
+        row = dict(r)
+        last = (row.pop("_rank"), row.pop("_rowid"))
+        row["score"] = -last[0]
+        rows.append(row)
+    next_cursor = encode_cursor(last) if last and len(rows) == limit else None
+    return {"results": rows, "next_cursor": next_cursor}
+
+
+def fts_search(
+    name: str,
+    q: str,
+    fields: List[str],
+    where: str = "",
+    params: Sequence[Any] = (),
+    limit: int = 20,
+) -> List[Dict[str, Any]]:
+    """First page of fts_search_page results."""
+    return fts_search_page(name, q, fields, where, params, limit)["results"]
+
+
+def search_state_courts_fulltext(q: str, state: Optional[str] = None, limit: int = 20) -> Dict[str, List[Dict[str, Any]]]:
+    """Ranked full-text search over state court cases, opinions and documents."""
+    where, params = ("b.state = ?", (state,)) if state else ("", ())
+    return {
+        "cases": fts_search("state_court_cases_fts", q,
+                            ["id", "state", "county", "case_number", "case_style", "case_type", "date_filed"],
+                            where, params, limit),
+        "opinions": fts_search("state_court_opinions_fts", q,
+                               ["id", "state", "court", "case_name", "citation", "date_decided"],
+                               where, params, limit),
+        "documents": fts_search("state_court_documents_fts", q,
+                                ["id", "source", "doc_type", "state", "case_number", "title"],
+                                where, params, limit),
+    }
+
+
 def upsert_state_appellate_opinion(opinion: Dict[str, Any]) -> str:
     """Insert or update a state appellate opinion."""
     import uuid
@@ -2453,9 +3606,9 @@ def upsert_state_appellate_opinion(opinion: Dict[str, Any]) -> str:
     placeholders = ",".join(["?"] * len(fields))
 
     # Insert into both state_appellate_opinions and state_court_opinions tables
-    with conn:
-        for table in ["state_appellate_opinions", "state_court_opinions"]:
-            try:
+    for table in ["state_appellate_opinions", "state_court_opinions"]:
+        try:
+            with conn:
                 conn.execute(f"""
                     INSERT INTO {table} ({','.join(fields)})
                     VALUES ({placeholders})
@@ -2463,25 +3616,26 @@ def upsert_state_appellate_opinion(opinion: Dict[str, Any]) -> str:
                         opinion_text = excluded.opinion_text,
                         headnotes = excluded.headnotes
                 """, tuple(values))
-            except Exception as e:
-                import logging
-                logging.error(f"Error inserting into {table}: {e}")
+        except Exception as e:
+            import logging
+            logging.error(f"Error inserting into {table}: {e}")
 
     return opinion["id"]
 
 
-def search_state_appellate_opinions(
+# Columns returned by opinion searches (opinion text is left out)
+_OPINION_LIST_COLUMNS = """id, state, court, case_name, citation, date_decided,
+               docket_number, judges, opinion_type, data_source, source_url"""
+
+
+def _state_appellate_opinion_filters(
     state: str = None,
     court: str = None,
     search: str = None,
     date_from: str = None,
-    date_to: str = None,
-    limit: int = 50,
-    offset: int = 0
-) -> List[Dict]:
-    """Search state appellate opinions."""
-    conn = get_conn()
-
+    date_to: str = None
+):
+    """WHERE conditions and params for state appellate opinion searches."""
     conditions = []
     params = []
 
@@ -2500,12 +3654,26 @@ def search_state_appellate_opinions(
     if date_to:
         conditions.append("date_decided <= ?")
         params.append(date_to)
+    return conditions, params
+
 
+def search_state_appellate_opinions(
+    state: str = None,
+    court: str = None,
+    search: str = None,
+    date_from: str = None,
+    date_to: str = None,
+    limit: int = 50,
+    offset: int = 0
+) -> List[Dict]:
+    """Search state appellate opinions."""
+    conn = get_conn()
+
+    conditions, params = _state_appellate_opinion_filters(state, court, search, date_from, date_to)
     where_clause = " WHERE " + " AND ".join(conditions) if conditions else ""
 
     cur = conn.execute(f"""
-        SELECT id, state, court, case_name, citation, date_decided,
-               docket_number, judges, opinion_type, data_source, source_url
+        SELECT {_OPINION_LIST_COLUMNS}
         FROM state_appellate_opinions
         {where_clause}
         ORDER BY date_decided DESC
@@ -2515,6 +3683,23 @@ def search_state_appellate_opinions(
     return [dict(r) for r in cur.fetchall()]
 
 
+def iter_state_appellate_opinions(
+    state: str = None,
+    court: str = None,
+    search: str = None,
+    date_from: str = None,
+    date_to: str = None,
+    limit: int = None,
+    page_size: int = None
+) -> Iterator[Dict]:
+    """Stream state appellate opinions (same filters, columns and order as the search, no row cap)."""
+    conditions, params = _state_appellate_opinion_filters(state, court, search, date_from, date_to)
+    return _iter_keyset(
+        f"SELECT rowid AS _rowid, {_OPINION_LIST_COLUMNS} FROM state_appellate_opinions",
+        conditions, params, "date_decided", limit=limit, page_size=page_size
+    )
+
+
 def get_state_court_stats(state: str = None) -> Dict[str, Any]:
     """Get state court statistics."""
     conn = get_conn()
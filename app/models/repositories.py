@@ -0,0 +1,411 @@
+"""
+Durable stores for the state-court API records.
+
+Alerts, subscriptions, webhooks, case links, calendar events, verdicts,
+settlements, notes, attorneys/firms and dispositions used to live in
+module-level dicts, so every worker process saw its own copy and
+lost it on restart. Each store is now a table in the main database
+(local SQLite or Turso, through the shared connection pool):
+
+    key     text primary key
+    data    the record as JSON
+    <col>   copies of the fields the endpoints filter and sort on, indexed
+
+Repository implements the mutable-mapping interface the endpoints already
+used (get, [], del, in, len, values, items), plus indexed queries:
+
+    repo.find(state="CA", event_date__gte="2024-01-01", order_by="event_date")
+    repo.page(limit=50, offset=100, case_id="abc")   # -> (records, total)
+
+Records come back as fresh dicts, so changing one does not change the store:
+write it back with repo[key] = record, or use patch()/increment() to update
+fields atomically. Iteration follows insertion order (rowid), and replacing a
+record keeps its position, matching dict semantics.
+"""
+import json
+import operator
+import threading
+from collections.abc import MutableMapping
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from .db import get_conn
+
+# Lookup suffixes accepted by find()/page()/count(): field__gte=value etc.
+_OPERATORS = {"eq": "=", "ne": "!=", "gt": ">", "gte": ">=", "lt": "<", "lte": "<=", "in": "in"}
+
+_COMPARE = {"eq": operator.eq, "gt": operator.gt, "gte": operator.ge, "lt": operator.lt, "lte": operator.le}
+
+_SCALARS = (str, int, float, type(None))
+
+
+def _json_default(value):
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=str)
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
+
+
+def dumps(record: Any) -> str:
+    """Serialize a record (sets become sorted lists, datetimes ISO strings)."""
+    return json.dumps(record, default=_json_default, separators=(",", ":"))
+
+
+class Repository(MutableMapping):
+    """
+    Table-backed mapping of key -> JSON record with indexed fields.
+
+    Subclasses set:
+        table: Table name
+        columns: Top-level record fields copied into indexed columns
+        upper: Columns stored upper-cased (case-insensitive equality)
+        flags: Columns stored as 0/1 by truthiness
+        indexes: Extra composite indexes, as column tuples
+    """
+
+    table: str = ""
+    columns: Tuple[str, ...] = ()
+    upper: Tuple[str, ...] = ()
+    flags: Tuple[str, ...] = ()
+    indexes: Tuple[Tuple[str, ...], ...] = ()
+
+    def __init__(self):
+        self._ready = False
+        self._lock = threading.Lock()
+
+    # -- schema ----------------------------------------------------------
+
+    def _schema(self) -> List[str]:
+        cols = "".join(f", {c}" for c in self.columns)
+        statements = [f"create table if not exists {self.table} (key text primary key, data text not null{cols})"]
+        for col in self.columns:
+            statements.append(f"create index if not exists idx_{self.table}_{col} on {self.table}({col})")
+        for cols in self.indexes:
+            statements.append(
+                f"create index if not exists idx_{self.table}_{'_'.join(cols)} on {self.table}({','.join(cols)})"
+            )
+        statements.append(
+            "create table if not exists repository_versions (name text primary key, version integer not null)"
+        )
+        return statements
+
+    def _conn(self):
+        conn = get_conn()
+        if not self._ready:
+            with self._lock:
+                if not self._ready:
+                    with conn:
+                        for stmt in self._schema():
+                            conn.execute(stmt)
+                    self._ready = True
+        return conn
+
+    # -- column extraction ------------------------------------------------
+
+    def _column_value(self, name: str, value: Any) -> Any:
+        if name in self.flags:
+            return 1 if value else 0
+        if isinstance(value, bool):
+            return int(value)
+        if not isinstance(value, _SCALARS):
+            return dumps(value)
+        if name in self.upper and isinstance(value, str):
+            return value.upper()
+        return value
+
+    def column_values(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """Indexed column values for a record (override for derived fields)."""
+        return {col: self._column_value(col, record.get(col)) for col in self.columns}
+
+    # -- mapping interface --------------------------------------------------
+
+    def _bump(self, conn):
+        conn.execute(
+            "insert into repository_versions(name, version) values(?, 1) "
+            "on conflict(name) do update set version = version + 1",
+            (self.table,),
+        )
+
+    def __setitem__(self, key: str, record: Dict[str, Any]):
+        values = self.column_values(record)
+        names = ["key", "data", *values]
+        updates = ", ".join(f"{n}=excluded.{n}" for n in names[1:])
+        conn = self._conn()
+        with conn:
+            conn.execute(
+                f"insert into {self.table}({','.join(names)}) values({','.join(['?'] * len(names))}) "
+                f"on conflict(key) do update set {updates}",
+                (key, dumps(record), *values.values()),
+            )
+            self._bump(conn)
+
+    def __getitem__(self, key: str) -> Dict[str, Any]:
+        row = self._conn().execute(f"select data from {self.table} where key = ?", (key,)).fetchone()
+        if row is None:
+            raise KeyError(key)
+        return json.loads(row["data"])
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __delitem__(self, key: str):
+        conn = self._conn()
+        with conn:
+            deleted = conn.execute(f"delete from {self.table} where key = ?", (key,)).rowcount
+            self._bump(conn)
+        if deleted == 0:
+            raise KeyError(key)
+
+    def __contains__(self, key: object) -> bool:
+        row = self._conn().execute(f"select 1 as found from {self.table} where key = ?", (key,)).fetchone()
+        return row is not None
+
+    def __len__(self) -> int:
+        return self.count()
+
+    def __iter__(self) -> Iterator[str]:
+        rows = self._conn().execute(f"select key from {self.table} order by rowid").fetchall()
+        return iter([r["key"] for r in rows])
+
+    def keys(self) -> List[str]:
+        return list(self)
+
+    def values(self) -> List[Dict[str, Any]]:
+        return self.find()
+
+    def items(self) -> List[Tuple[str, Dict[str, Any]]]:
+        rows = self._conn().execute(f"select key, data from {self.table} order by rowid").fetchall()
+        return [(r["key"], json.loads(r["data"])) for r in rows]
+
+    # -- atomic field updates ----------------------------------------------
+
+    def patch(self, key: str, fields: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Set top-level fields of a stored record in one statement (no lost
+        updates between workers). Returns the updated record, or None if the
+        key doesn't exist.
+        """
+        if not fields:
+            return self.get(key)
+        paths = []
+        params: List[Any] = []
+        for name, value in fields.items():
+            paths.append("?, json(?)")
+            params += ["$." + json.dumps(name), dumps(value)]
+        sets = [f"data = json_set(data, {', '.join(paths)})"]
+        for name, value in fields.items():
+            if name in self.columns:
+                sets.append(f"{name} = ?")
+                params.append(self._column_value(name, value))
+        return self._update(key, ", ".join(sets), params)
+
+    def increment(self, key: str, field: str, by: int = 1,
+                  fields: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """Atomically add `by` to a numeric field (and set `fields`); returns the updated record."""
+        path = "$." + json.dumps(field)
+        expr = "json_set(data, ?, coalesce(json_extract(data, ?), 0) + ?)"
+        params: List[Any] = [path, path, by]
+        for name, value in (fields or {}).items():
+            expr = f"json_set({expr}, ?, json(?))"
+            params += ["$." + json.dumps(name), dumps(value)]
+        # Counters don't bump version(): caches keyed on it ignore trigger stats
+        return self._update(key, f"data = {expr}", params, bump=False)
+
+    def _update(self, key: str, sets: str, params: List[Any], bump: bool = True) -> Optional[Dict[str, Any]]:
+        conn = self._conn()
+        with conn:
+            updated = conn.execute(f"update {self.table} set {sets} where key = ?", (*params, key)).rowcount
+            if bump:
+                self._bump(conn)
+        return self.get(key) if updated else None
+
+    # -- indexed queries ---------------------------------------------------
+
+    def _where(self, filters: Dict[str, Any]) -> Tuple[str, List[Any]]:
+        clauses: List[str] = []
+        params: List[Any] = []
+        for lookup, value in filters.items():
+            name, _, op = lookup.partition("__")
+            op = op or "eq"
+            if name != "key" and name not in self.columns:
+                raise ValueError(f"{self.table}: '{name}' is not an indexed field")
+            if op not in _OPERATORS:
+                raise ValueError(f"{self.table}: unknown lookup '{op}'")
+            if op == "in":
+                values = [self._column_value(name, v) for v in value]
+                if not values:
+                    clauses.append("0")
+                    continue
+                clauses.append(f"{name} in ({','.join(['?'] * len(values))})")
+                params += values
+            elif value is None and op in ("eq", "ne"):
+                clauses.append(f"{name} is {'not ' if op == 'ne' else ''}null")
+            else:
+                value = self._column_value(name, value)
+                clause = f"{name} {_OPERATORS[op]} ?"
+                # A missing field compares like "" (or 0 against a number), as
+                # the `(record.get(field) or "") >= value` filters did
+                if op != "ne" and _COMPARE[op]("" if isinstance(value, str) else 0, value):
+                    clause = f"({clause} or {name} is null)"
+                clauses.append(clause)
+                params.append(value)
+        return (" where " + " and ".join(clauses)) if clauses else "", params
+
+    def _order(self, order_by: Optional[str], descending: bool) -> str:
+        if not order_by:
+            return " order by rowid"
+        if order_by not in self.columns:
+            raise ValueError(f"{self.table}: cannot order by '{order_by}'")
+        # Missing values sort like "" (as the `or ""` sort keys did); ties keep insertion order
+        return f" order by coalesce({order_by}, '') {'desc' if descending else 'asc'}, rowid"
+
+    def find(
+        self,
+        order_by: Optional[str] = None,
+        descending: bool = False,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        **filters: Any,
+    ) -> List[Dict[str, Any]]:
+        """
+        Records matching every filter.
+
+        Args:
+            order_by: Indexed column to sort on (default: insertion order)
+            descending: Sort order_by descending
+            limit: Maximum records (None = all)
+            offset: Records to skip
+            **filters: column=value or column__op=value (op: eq, ne, gt,
+                gte, lt, lte, in)
+
+        Returns:
+            Matching records
+        """
+        where, params = self._where(filters)
+        sql = f"select data from {self.table}{where}{self._order(order_by, descending)}"
+        if limit is not None or offset:
+            sql += " limit ? offset ?"
+            params += [-1 if limit is None else max(limit, 0), max(offset, 0)]
+        rows = self._conn().execute(sql, tuple(params)).fetchall()
+        return [json.loads(r["data"]) for r in rows]
+
+    def count(self, **filters: Any) -> int:
+        """Number of records matching the filters."""
+        where, params = self._where(filters)
+        row = self._conn().execute(f"select count(*) as n from {self.table}{where}", tuple(params)).fetchone()
+        return int(row["n"]) if row else 0
+
+    def page(
+        self,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        order_by: Optional[str] = None,
+        descending: bool = False,
+        match: Optional[Callable[[Dict[str, Any]], bool]] = None,
+        **filters: Any,
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        One page of matching records plus the total number of matches.
+
+        `match` is an extra Python predicate for conditions the indexes
+        can't express (e.g. substring search); it is applied to the records
+        the indexed filters select.
+        """
+        if match is None:
+            return self.find(order_by, descending, limit, offset, **filters), self.count(**filters)
+        records = [r for r in self.find(order_by, descending, **filters) if match(r)]
+        end = None if limit is None else offset + max(limit, 0)
+        return records[offset:end], len(records)
+
+    def version(self) -> int:
+        """Change counter for this table, bumped by every write except increment(), from any worker."""
+        row = self._conn().execute(
+            "select version from repository_versions where name = ?", (self.table,)
+        ).fetchone()
+        return int(row["version"]) if row else 0
+
+
+class WebhookRepository(Repository):
+    table = "state_court_webhooks"
+    columns = ("enabled",)
+    flags = ("enabled",)
+
+
+class AttorneyRepository(Repository):
+    table = "state_court_attorneys"
+    columns = ("state", "firm_name", "name")
+    upper = ("state",)
+
+
+class LawFirmRepository(Repository):
+    table = "state_court_law_firms"
+    columns = ("name",)
+    upper = ("name",)
+
+
+class AlertRepository(Repository):
+    table = "state_court_alerts"
+    columns = ("type", "active")
+    flags = ("active",)
+
+    def column_values(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        values = super().column_values(record)
+        # Alerts saved without an "active" field count as active
+        values["active"] = self._column_value("active", record.get("active", True))
+        return values
+
+
+class SubscriptionRepository(Repository):
+    table = "state_court_subscriptions"
+    columns = ("user_id", "type", "target_id")
+
+
+class CaseLinkRepository(Repository):
+    table = "state_court_case_links"
+    columns = ("source_case_id", "target_case_id", "link_type")
+
+
+class CalendarRepository(Repository):
+    table = "state_court_calendar"
+    columns = ("case_id", "state", "event_type", "event_date")
+    upper = ("state",)
+    indexes = (("state", "event_date"),)
+
+
+class VerdictRepository(Repository):
+    table = "state_court_verdicts"
+    columns = ("case_id", "state", "verdict_type", "verdict_date", "amount")
+    upper = ("state",)
+
+
+class SettlementRepository(Repository):
+    table = "state_court_settlements"
+    columns = ("case_id", "state", "settlement_date", "amount", "confidential")
+    upper = ("state",)
+    flags = ("confidential",)
+
+
+class ResearchNoteRepository(Repository):
+    table = "state_court_research_notes"
+    columns = ("case_id", "created_at")
+
+
+class DispositionRepository(Repository):
+    table = "state_court_dispositions"
+    columns = ("case_id", "state", "case_type", "disposition_type", "disposition_date")
+    upper = ("state",)
+
+
+class CaseNoteRepository(Repository):
+    table = "state_court_case_notes"
+    columns = ("case_id", "note_type", "completed", "sort_date")
+    flags = ("completed",)
+
+    def column_values(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        values = super().column_values(record)
+        # Listing sorts on due date, falling back to creation time
+        values["sort_date"] = self._column_value("sort_date", record.get("due_date") or record.get("created_at"))
+        return values
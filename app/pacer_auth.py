@@ -15,6 +15,7 @@ import math
 from requests.cookies import create_cookie
 
 from .models.db import get_conn, insert_charge
+from .services.document_store import DocumentStore, DOWNLOAD_CHUNK_BYTES
 from .auth_utils import (
     ExponentialBackoff,
     AuthValidator,
@@ -49,6 +50,9 @@ class PacerClient:
             self.cache_dir.mkdir(parents=True, exist_ok=True)
         except Exception:
             pass
+        # Content-addressed store (with SQLite index) holding the PDFs themselves
+        self.doc_store_dir = Path(os.getenv('PACER_DOC_STORE_DIR') or (self.cache_dir / "store"))
+        self._document_store: Optional[DocumentStore] = None
         # Default headers
         self._default_headers = {
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) CourtRSS/1.0 Safari/605.1.15',
@@ -59,6 +63,13 @@ class PacerClient:
         self.cookie_file = Path(__file__).resolve().parent.parent / ".pacer_cookies.json"
         self._load_cookies()
 
+    @property
+    def document_store(self) -> DocumentStore:
+        """Document store, opened on first use"""
+        if self._document_store is None:
+            self._document_store = DocumentStore(self.doc_store_dir)
+        return self._document_store
+
     def is_configured(self) -> bool:
         """Check if PACER credentials are configured"""
         return bool(self.username and self.password and self.enabled)
@@ -1063,9 +1074,9 @@ class PacerClient:
             return {"host": None, "doc_id": None, "caseid": None, "de_seq_num": None}
 
     def fetch_document(self, court_code: str, doc_url: str) -> Optional[Dict[str, Any]]:
-        """Fetch a document PDF from a doc1 URL, cache locally, and record estimated cost.
+        """Fetch a document PDF from a doc1 URL, cache it in the document store, and record estimated cost.
 
-        Returns a dict: { path, filename, cached, pages_billed, amount_usd }
+        Returns a dict: { path, filename, cached, pages_billed, amount_usd, sha256 }
         """
         if not self.is_configured():
             return None
@@ -1086,39 +1097,23 @@ class PacerClient:
 
         doc_id = parts.get('doc_id') or hashlib.sha256(doc_url.encode()).hexdigest()[:16]
         court_dir = self.cache_dir / court_code
-        try:
-            court_dir.mkdir(parents=True, exist_ok=True)
-        except Exception:
-            pass
         filename = f"{doc_id}.pdf"
         file_path = court_dir / filename
+        store = self.document_store
 
-        # Serve from cache if present
-        try:
-            if file_path.exists() and file_path.stat().st_size > 0:
-                # Validate cache is a real PDF; if not, remove and re-fetch
-                is_pdf = False
-                try:
-                    with open(file_path, 'rb') as f:
-                        sig = f.read(5)
-                        is_pdf = sig == b'%PDF-'
-                except Exception:
-                    is_pdf = False
-                if is_pdf:
-                    return {
-                        "path": str(file_path),
-                        "filename": filename,
-                        "cached": True,
-                        "pages_billed": 0,
-                        "amount_usd": 0.00,
-                    }
-                else:
-                    try:
-                        file_path.unlink(missing_ok=True)
-                    except Exception:
-                        pass
-        except Exception:
-            pass
+        # Serve from the store if indexed; adopt PDFs cached by the old docs/<court>/ layout
+        stored = store.lookup(court_code, doc_id)
+        if stored is None and file_path.exists():
+            stored = store.adopt(court_code, doc_id, file_path, filename)
+        if stored is not None:
+            return {
+                "path": str(stored.path),
+                "filename": stored.filename,
+                "cached": True,
+                "pages_billed": 0,
+                "amount_usd": 0.00,
+                "sha256": stored.sha256,
+            }
 
         # Spending limits
         limits = self.check_spending_limits()
@@ -1140,7 +1135,15 @@ class PacerClient:
                 'User-Agent': 'Mozilla/5.0 (compatible; CourtRSS/1.0)',
                 'Accept': 'application/pdf,application/octet-stream;q=0.9,*/*;q=0.8'
             }
-            return self.session.get(path_url, headers=hdrs, stream=False, allow_redirects=True)
+            return self.session.get(path_url, headers=hdrs, stream=True, allow_redirects=True)
+
+        def is_login_response(resp, peek: int) -> bool:
+            if ('login.jsf' in resp.url) or ('pacer.login.uscourts.gov' in resp.url):
+                return True
+            # Only HTML bodies are read here; PDFs stay unread for streaming
+            if is_pdf_response(resp):
+                return False
+            return 'PACER: Login' in (resp.text[:peek] if hasattr(resp, 'text') else '')
 
         try:
             # Build alternative candidate URLs (handles common intermediate flows)
@@ -1173,13 +1176,15 @@ class PacerClient:
 
             resp = None
             for url in candidates:
+                if resp is not None:
+                    resp.close()
                 if self.use_cso_api:
                     # Ensure CSO token and attach to session before the request
                     self._ensure_cso_token()
                     self._apply_cso_token(url)
                 resp = download_to(url)
                 # If redirected to login, authenticate and retry once for this candidate
-                if ('login.jsf' in resp.url) or ('pacer.login.uscourts.gov' in resp.url) or ('PACER: Login' in (resp.text[:500] if hasattr(resp, 'text') else '')):
+                if is_login_response(resp, 500):
                     if self.use_cso_api:
                         # Re-attach token and retry without interactive login
                         self._apply_cso_token(url)
@@ -1208,9 +1213,10 @@ class PacerClient:
                 print("Document fetch failed after candidates")
                 return None
             # If redirected to login, authenticate and retry once
-            if ('login.jsf' in resp.url) or ('pacer.login.uscourts.gov' in resp.url) or ('PACER: Login' in (resp.text[:200] if hasattr(resp, 'text') else '')):
+            if is_login_response(resp, 200):
                 if not self.authenticate(court_code):
                     return None
+                resp.close()
                 resp = download_to(doc_url)
 
             if resp.status_code != 200:
@@ -1242,24 +1248,15 @@ class PacerClient:
                 except Exception:
                     pass
 
-            # Save content to disk (non-stream mode)
-            tmp_path = file_path.with_suffix('.part')
-            with open(tmp_path, 'wb') as f:
-                f.write(resp.content or b'')
-            size = tmp_path.stat().st_size if tmp_path.exists() else 0
+            # Stream content to a temp file in the store (hashed as it arrives)
+            download = store.download(resp.iter_content(DOWNLOAD_CHUNK_BYTES))
+            size = download.size
 
             # Verify PDF signature
-            is_pdf = False
-            try:
-                with open(tmp_path, 'rb') as t:
-                    sig = t.read(5)
-                    is_pdf = sig == b'%PDF-'
-            except Exception:
-                is_pdf = False
-            if not is_pdf:
+            if not download.is_pdf:
                 # Try to follow an embedded /doc1/ link from HTML content
                 try:
-                    html = (resp.text or '')
+                    html = download.read_text()
                     soup2 = BeautifulSoup(html, 'html.parser')
                     # Prefer iframe src, then anchor href, then form action
                     src = None
@@ -1278,31 +1275,29 @@ class PacerClient:
                         if src.startswith('/') and host_str:
                             src = f"https://{host_str}{src}"
                         resp2 = download_to(src)
-                        with open(tmp_path, 'wb') as f:
-                            f.write(resp2.content or b'')
-                        size = tmp_path.stat().st_size if tmp_path.exists() else 0
-                        with open(tmp_path, 'rb') as t:
-                            sig = t.read(5)
-                            is_pdf = sig == b'%PDF-'
+                        store.discard(download)
+                        download = store.download(resp2.iter_content(DOWNLOAD_CHUNK_BYTES))
+                        size = download.size
                 except Exception:
                     pass
 
-            if not is_pdf:
+            if not download.is_pdf:
                 # Keep the HTML for debugging and do not cache as PDF
                 debug_path = file_path.with_suffix('.html')
                 try:
-                    tmp_path.replace(debug_path)
+                    court_dir.mkdir(parents=True, exist_ok=True)
+                    download.path.replace(debug_path)
                 except Exception:
-                    pass
+                    store.discard(download)
                 print("Downloaded content is not a PDF; saved HTML for inspection.")
                 return None
 
-            tmp_path.replace(file_path)
-
             # Estimate cost
             pages = self._estimate_pdf_pages_from_size(size)
             cost = min(pages * 0.10, 3.00)
 
+            stored = store.commit(court_code, doc_id, download, filename, pages=pages)
+
             charge_id = hashlib.sha256(f"{court_code}-{doc_id}-{datetime.utcnow().isoformat()}".encode()).hexdigest()
             insert_charge({
                 "id": charge_id,
@@ -1318,11 +1313,12 @@ class PacerClient:
             })
 
             return {
-                "path": str(file_path),
+                "path": str(stored.path),
                 "filename": filename,
                 "cached": False,
                 "pages_billed": pages,
                 "amount_usd": cost,
+                "sha256": stored.sha256,
             }
 
         except Exception as e:
@@ -0,0 +1,221 @@
+"""Compiled index for state court case alerts.
+
+Matching a case against every alert one by one costs O(alerts) per case.
+AlertIndex instead groups active alerts by type once:
+
+- case alerts: hash map case_id -> alerts
+- case_type alerts: hash map upper-cased case type -> alerts
+- party / keyword alerts: one Aho-Corasick automaton over all lowercased
+  names and keywords, so a case's text is scanned once whatever the number
+  of alerts
+
+The index is rebuilt (lazily, on the next check) whenever alerts are created,
+updated or deleted, in this process or another one sharing the alert store.
+Matching semantics are the same as the per-alert checks it replaces:
+substring match for party names within the case style and for keywords
+within "<case_style> <summary>", exact match for case IDs and
+case-insensitive exact match for case types.
+"""
+import threading
+from collections import deque
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+
+class AhoCorasick:
+    """Multi-pattern substring matcher (Aho-Corasick automaton)."""
+
+    def __init__(self, patterns: Iterable[str]):
+        self.patterns: List[str] = []
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[int]] = [[]]  # Patterns ending exactly at a node
+        self._dict_link: List[int] = [0]   # Nearest proper suffix node with output (0 = none)
+
+        for pattern in patterns:
+            self._add(pattern)
+        self._link()
+
+    def __len__(self) -> int:
+        return len(self.patterns)
+
+    def _add(self, pattern: str):
+        node = 0
+        for ch in pattern:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+                self._dict_link.append(0)
+            node = nxt
+        self._out[node].append(len(self.patterns))
+        self.patterns.append(pattern)
+
+    def _link(self):
+        """Breadth-first pass computing failure and output (dictionary) links."""
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                state = self._fail[node]
+                while state and ch not in self._goto[state]:
+                    state = self._fail[state]
+                fail = self._goto[state].get(ch, 0)
+                self._fail[child] = fail if fail != child else 0
+                fail = self._fail[child]
+                self._dict_link[child] = fail if self._out[fail] else self._dict_link[fail]
+
+    def first_ends(self, text: str) -> Dict[int, int]:
+        """Map each pattern found in text to the end offset of its first occurrence."""
+        found: Dict[int, int] = {}
+        if not self.patterns:
+            return found
+
+        goto, fail, out, dict_link = self._goto, self._fail, self._out, self._dict_link
+        visited = set()
+        node = 0
+        for end, ch in enumerate(text, 1):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+
+            # Report this node and its output chain, once per node: a node
+            # already visited reported everything on its chain earlier
+            hit = node if out[node] else dict_link[node]
+            while hit and hit not in visited:
+                visited.add(hit)
+                for pattern_id in out[hit]:
+                    found.setdefault(pattern_id, end)
+                hit = dict_link[hit]
+        return found
+
+
+class AlertIndex:
+    """Active alerts grouped for constant-cost matching per case."""
+
+    def __init__(self, alerts: Iterable[Dict[str, Any]]):
+        """Build the index.
+
+        Args:
+            alerts: Alert dicts (inactive ones are skipped); their order sets
+                the order in which matches are reported
+        """
+        self._order: Dict[str, int] = {}
+        self._by_case_id: Dict[Any, List[str]] = {}
+        self._by_case_type: Dict[str, List[str]] = {}
+        self._unhashable: List[Tuple[Any, str]] = []
+        # pattern text -> (party alert ids, keyword alert ids)
+        texts: Dict[str, Tuple[List[str], List[str]]] = {}
+
+        for position, alert in enumerate(alerts):
+            if not alert.get("active"):
+                continue
+            alert_id = alert.get("id")
+            criteria = alert.get("criteria") or {}
+            alert_type = alert.get("type", "case")
+            self._order[alert_id] = position
+
+            if alert_type == "case" and criteria.get("case_id"):
+                case_id = criteria["case_id"]
+                try:
+                    self._by_case_id.setdefault(case_id, []).append(alert_id)
+                except TypeError:
+                    self._unhashable.append((case_id, alert_id))
+            elif alert_type == "party" and criteria.get("party_name"):
+                texts.setdefault(str(criteria["party_name"]).lower(), ([], []))[0].append(alert_id)
+            elif alert_type == "keyword" and criteria.get("keyword"):
+                texts.setdefault(str(criteria["keyword"]).lower(), ([], []))[1].append(alert_id)
+            elif alert_type == "case_type" and criteria.get("case_type"):
+                self._by_case_type.setdefault(str(criteria["case_type"]).upper(), []).append(alert_id)
+
+        self._matcher = AhoCorasick(texts.keys())
+        self._pattern_alerts = [texts[pattern] for pattern in self._matcher.patterns]
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def match(self, case: Dict[str, Any]) -> List[str]:
+        """IDs of the active alerts triggered by a case, in alert order."""
+        matched = set()
+
+        case_id = case.get("id")
+        try:
+            matched.update(self._by_case_id.get(case_id, ()))
+        except TypeError:
+            pass
+        for criteria_id, alert_id in self._unhashable:
+            if case_id == criteria_id:
+                matched.add(alert_id)
+
+        case_type = case.get("case_type") or ""
+        matched.update(self._by_case_type.get(str(case_type).upper(), ()))
+
+        if self._matcher:
+            style = (case.get("case_style") or "").lower()
+            searchable = f"{case.get('case_style', '')} {case.get('summary', '')}".lower()
+            # The keyword text starts with the case style, so one scan serves
+            # both: party names must end within the case style part
+            style_end = len(style) if style and searchable.startswith(style) else 0
+            for pattern_id, end in self._matcher.first_ends(searchable).items():
+                party_ids, keyword_ids = self._pattern_alerts[pattern_id]
+                matched.update(keyword_ids)
+                if party_ids and end <= style_end:
+                    matched.update(party_ids)
+            if style and not style_end:
+                # Lowercasing the joined text changed the case style part
+                # (context-dependent case mappings); scan it on its own
+                for pattern_id in self._matcher.first_ends(style):
+                    matched.update(self._pattern_alerts[pattern_id][0])
+
+        return sorted(matched, key=self._order.__getitem__)
+
+    def match_batch(self, cases: Iterable[Dict[str, Any]]) -> List[List[str]]:
+        """Triggered alert IDs for each case of a batch."""
+        return [self.match(case) for case in cases]
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "active_alerts": len(self._order),
+            "case_ids": len(self._by_case_id) + len(self._unhashable),
+            "case_types": len(self._by_case_type),
+            "patterns": len(self._matcher),
+        }
+
+
+class LazyAlertIndex:
+    """AlertIndex over a changing alert collection, rebuilt on first use after a change."""
+
+    def __init__(self, source: Callable[[], Iterable[Dict[str, Any]]],
+                 version: Optional[Callable[[], Any]] = None):
+        """
+        Args:
+            source: Returns the current alerts (called on rebuild)
+            version: Returns a value that changes whenever the alerts do,
+                including changes made by other processes (checked on every get)
+        """
+        self._source = source
+        self._version = version
+        self._built_version: Any = None
+        self._index: Optional[AlertIndex] = None
+        self._lock = threading.Lock()
+        self.rebuilds = 0
+
+    def invalidate(self):
+        """Alerts changed; rebuild before the next match."""
+        with self._lock:
+            self._index = None
+
+    def get(self) -> AlertIndex:
+        version = self._version() if self._version is not None else None
+        index = self._index
+        if index is not None and version == self._built_version:
+            return index
+        with self._lock:
+            if self._index is None or version != self._built_version:
+                self._index = AlertIndex(list(self._source()))
+                self._built_version = version
+                self.rebuilds += 1
+            return self._index
@@ -0,0 +1,361 @@
+"""Append-only, time-segmented audit log.
+
+Audit events are written on every data access, so appending must cost the
+request next to nothing:
+
+- append() stores the event in an in-memory ring buffer of recent events
+  and queues it; a background writer thread inserts queued events in
+  batches (one executemany per segment)
+- events live in one table per UTC day (state_court_audit_YYYYMMDD) in the
+  main database, each indexed on (entity_id, timestamp), (user_id,
+  timestamp) and timestamp
+- retention drops whole day tables older than AUDIT_RETENTION_DAYS instead
+  of deleting rows one by one
+
+Queries read the segments newest (or oldest) first and stop as soon as the
+requested page is filled; time-bounded queries skip segments outside the
+range. Reads flush this process's queue first, so a worker always sees its
+own writes.
+"""
+import itertools
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+from ..models.db import get_conn, release_conn
+from ..models.repositories import dumps
+
+logger = logging.getLogger(__name__)
+
+AUDIT_SEGMENT_PREFIX = "state_court_audit_"
+AUDIT_RETENTION_DAYS = int(os.getenv("AUDIT_RETENTION_DAYS", "30"))  # 0 = keep everything
+AUDIT_RING_SIZE = int(os.getenv("AUDIT_RING_SIZE", "10000"))
+AUDIT_QUEUE_SIZE = int(os.getenv("AUDIT_QUEUE_SIZE", "100000"))
+AUDIT_FLUSH_INTERVAL = float(os.getenv("AUDIT_FLUSH_INTERVAL", "0.5"))
+AUDIT_BATCH_SIZE = int(os.getenv("AUDIT_BATCH_SIZE", "500"))
+
+# Event fields copied into columns; the full event is stored as JSON in `data`
+COLUMNS = ("id", "event_type", "entity_type", "entity_id", "action", "user_id", "timestamp")
+FILTERS = ("event_type", "entity_type", "entity_id", "action", "user_id")
+
+_DAY = re.compile(r"^(\d{4})-(\d{2})-(\d{2})")
+_SEGMENT = re.compile(rf"^{AUDIT_SEGMENT_PREFIX}(\d{{8}})$")
+
+
+def segment_day(timestamp: Optional[str]) -> str:
+    """YYYYMMDD segment key for an ISO timestamp (today, UTC, if it has none)."""
+    match = _DAY.match(timestamp or "")
+    if match:
+        return "".join(match.groups())
+    return datetime.utcnow().strftime("%Y%m%d")
+
+
+def _column(value: Any) -> Any:
+    if value is None or (isinstance(value, (str, int, float)) and not isinstance(value, bool)):
+        return value
+    return dumps(value)
+
+
+class AuditLog:
+    """Audit events in day segments, written asynchronously in batches."""
+
+    def __init__(
+        self,
+        retention_days: int = AUDIT_RETENTION_DAYS,
+        ring_size: int = AUDIT_RING_SIZE,
+        queue_size: int = AUDIT_QUEUE_SIZE,
+        flush_interval: float = AUDIT_FLUSH_INTERVAL,
+        batch_size: int = AUDIT_BATCH_SIZE,
+        connect: Callable[[], Any] = get_conn,
+    ):
+        """
+        Args:
+            retention_days: Day segments kept (0 = keep everything)
+            ring_size: Recent events kept in memory for recent()
+            queue_size: Unwritten events held before new ones are dropped
+            flush_interval: Seconds between background writes
+            batch_size: Queued events that trigger an early write
+            connect: Returns the database connection to use
+        """
+        self.retention_days = retention_days
+        self.queue_size = max(1, queue_size)
+        self.flush_interval = flush_interval
+        self.batch_size = max(1, batch_size)
+        self._connect = connect
+        self._ring: Deque[Dict[str, Any]] = deque(maxlen=max(1, ring_size))
+        self._pending: Deque[Dict[str, Any]] = deque()
+        self._cond = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._segments: set = set()  # Segments created (or seen) by this process
+        self._writer: Optional[threading.Thread] = None
+        self._closed = False
+        self._stats = {
+            "appended": 0,
+            "written": 0,
+            "dropped": 0,
+            "write_errors": 0,
+            "flushes": 0,
+            "flush_seconds": 0.0,
+            "segments_dropped": 0,
+        }
+
+    # -- writes ------------------------------------------------------------
+
+    def append(self, event: Dict[str, Any]):
+        """Record an event; returns without touching the database."""
+        with self._cond:
+            self._stats["appended"] += 1
+            self._ring.append(event)
+            if len(self._pending) >= self.queue_size:
+                self._stats["dropped"] += 1
+            else:
+                self._pending.append(event)
+            if len(self._pending) >= self.batch_size:
+                self._cond.notify()
+            if self._writer is None and not self._closed:
+                self._writer = threading.Thread(target=self._run, name="audit-log-writer", daemon=True)
+                self._writer.start()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                if not self._closed and len(self._pending) < self.batch_size:
+                    self._cond.wait(self.flush_interval)
+                closed = self._closed
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Audit log flush failed")
+            finally:
+                release_conn()  # Don't keep a pooled connection between flushes
+            if closed:
+                return
+
+    def flush(self) -> int:
+        """Write queued events now; returns the number written."""
+        with self._write_lock:
+            with self._cond:
+                batch = list(self._pending)
+                self._pending.clear()
+            if not batch:
+                return 0
+
+            started = time.perf_counter()
+            batch.sort(key=lambda e: segment_day(e.get("timestamp")))
+            written = 0
+            try:
+                conn = self._connect()
+                for day, events in itertools.groupby(batch, key=lambda e: segment_day(e.get("timestamp"))):
+                    events = list(events)
+                    self._write(conn, day, events)
+                    written += len(events)
+            except Exception:
+                # Put the unwritten events back (oldest first) for the next flush
+                unwritten = batch[written:]
+                with self._cond:
+                    room = max(self.queue_size - len(self._pending), 0)
+                    self._pending.extendleft(reversed(unwritten[:room]))
+                    self._stats["dropped"] += len(unwritten) - min(room, len(unwritten))
+                    self._stats["write_errors"] += 1
+                    self._stats["written"] += written
+                raise
+
+            with self._cond:
+                self._stats["written"] += written
+                self._stats["flushes"] += 1
+                self._stats["flush_seconds"] += time.perf_counter() - started
+            return written
+
+    def _write(self, conn, day: str, events: List[Dict[str, Any]]):
+        table = AUDIT_SEGMENT_PREFIX + day
+        new_segment = day not in self._segments
+        rows = [(*(_column(e.get(c)) for c in COLUMNS), dumps(e)) for e in events]
+        try:
+            with conn:
+                if new_segment:
+                    for stmt in self._segment_schema(table):
+                        conn.execute(stmt)
+                conn.executemany(
+                    f"insert into {table}({','.join(COLUMNS)}, data) "
+                    f"values({','.join(['?'] * (len(COLUMNS) + 1))})",
+                    rows,
+                )
+        except Exception:
+            # The segment may have been dropped by another worker; recreate next time
+            self._segments.discard(day)
+            raise
+        if new_segment:
+            self._segments.add(day)
+            self.enforce_retention()
+
+    @staticmethod
+    def _segment_schema(table: str) -> List[str]:
+        return [
+            f"create table if not exists {table} (seq integer primary key autoincrement, "
+            f"{', '.join(c + ' text' for c in COLUMNS)}, data text not null)",
+            f"create index if not exists idx_{table}_entity on {table}(entity_id, timestamp)",
+            f"create index if not exists idx_{table}_user on {table}(user_id, timestamp)",
+            f"create index if not exists idx_{table}_timestamp on {table}(timestamp)",
+        ]
+
+    def enforce_retention(self, now: Optional[datetime] = None) -> List[str]:
+        """Drop day segments older than the retention window; returns the dropped days."""
+        if self.retention_days <= 0:
+            return []
+        cutoff = ((now or datetime.utcnow()) - timedelta(days=self.retention_days)).strftime("%Y%m%d")
+        expired = [day for day in self.segments() if day < cutoff]
+        if expired:
+            conn = self._connect()
+            with conn:
+                for day in expired:
+                    conn.execute(f"drop table if exists {AUDIT_SEGMENT_PREFIX}{day}")
+            self._segments.difference_update(expired)
+            with self._cond:
+                self._stats["segments_dropped"] += len(expired)
+            logger.info("Dropped %d expired audit log segment(s)", len(expired))
+        return expired
+
+    def close(self, timeout: float = 5.0):
+        """Stop the writer after a final flush."""
+        with self._cond:
+            self._closed = True
+            writer = self._writer
+            self._cond.notify()
+        if writer is not None:
+            writer.join(timeout)
+        else:
+            self.flush()
+
+    # -- reads -------------------------------------------------------------
+
+    def segments(self) -> List[str]:
+        """Existing segment days (YYYYMMDD), oldest first."""
+        rows = self._connect().execute(
+            "select name from sqlite_master where type = 'table' and name like ?",
+            (AUDIT_SEGMENT_PREFIX + "%",),
+        ).fetchall()
+        days = []
+        for row in rows:
+            match = _SEGMENT.match(row["name"])
+            if match:
+                days.append(match.group(1))
+        return sorted(days)
+
+    def _where(self, since: Optional[str], filters: Dict[str, Any]):
+        clauses, params = [], []
+        for name, value in filters.items():
+            if name not in FILTERS:
+                raise ValueError(f"Unsupported audit log filter '{name}'")
+            clauses.append(f"{name} = ?")
+            params.append(_column(value))
+        if since:
+            clauses.append("timestamp >= ?")
+            params.append(since)
+        return (" where " + " and ".join(clauses)) if clauses else "", params
+
+    def _scan(self, since: Optional[str], descending: bool = False) -> List[str]:
+        """Flush pending writes, then list the segments a query has to read."""
+        try:
+            self.flush()
+        except Exception:
+            logger.warning("Audit log flush before read failed", exc_info=True)
+        days = self.segments()
+        if since:
+            first = segment_day(since)
+            days = [day for day in days if day >= first]
+        return days[::-1] if descending else days
+
+    def find(
+        self,
+        descending: bool = False,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        since: Optional[str] = None,
+        **filters: Any,
+    ) -> List[Dict[str, Any]]:
+        """
+        Events matching the filters, ordered by timestamp.
+
+        Args:
+            descending: Newest first
+            limit: Maximum events (None = all)
+            offset: Events to skip
+            since: Only events at or after this ISO timestamp
+            **filters: Equality filters on event_type, entity_type,
+                entity_id, action or user_id
+
+        Returns:
+            Matching events
+        """
+        where, params = self._where(since, filters)
+        # Ties keep append order either way (as the stable sort they replace did)
+        order = f" order by timestamp {'desc' if descending else 'asc'}, seq"
+        wanted = None if limit is None else max(offset, 0) + max(limit, 0)
+        events: List[Dict[str, Any]] = []
+        conn = self._connect()
+        for day in self._scan(since, descending):
+            sql = f"select data from {AUDIT_SEGMENT_PREFIX}{day}{where}{order}"
+            if wanted is not None:
+                sql += f" limit {wanted - len(events)}"
+            events.extend(json.loads(r["data"]) for r in conn.execute(sql, tuple(params)).fetchall())
+            if wanted is not None and len(events) >= wanted:
+                break
+        return events[max(offset, 0):wanted]
+
+    def count(self, since: Optional[str] = None, **filters: Any) -> int:
+        """Number of events matching the filters."""
+        where, params = self._where(since, filters)
+        conn = self._connect()
+        total = 0
+        for day in self._scan(since):
+            row = conn.execute(f"select count(*) as n from {AUDIT_SEGMENT_PREFIX}{day}{where}", tuple(params)).fetchone()
+            total += int(row["n"]) if row else 0
+        return total
+
+    def counts(self, column: str, since: Optional[str] = None, **filters: Any) -> Dict[Any, int]:
+        """Events per distinct value of a filterable column."""
+        if column not in FILTERS:
+            raise ValueError(f"Unsupported audit log column '{column}'")
+        where, params = self._where(since, filters)
+        conn = self._connect()
+        totals: Dict[Any, int] = {}
+        for day in self._scan(since):
+            rows = conn.execute(
+                f"select {column} as value, count(*) as n from {AUDIT_SEGMENT_PREFIX}{day}{where} group by {column}",
+                tuple(params),
+            ).fetchall()
+            for row in rows:
+                totals[row["value"]] = totals.get(row["value"], 0) + int(row["n"])
+        return totals
+
+    def recent(self, limit: int = 100, **filters: Any) -> List[Dict[str, Any]]:
+        """Newest events appended by this process, from memory (no database access)."""
+        with self._cond:
+            ring = list(self._ring)
+        events = []
+        for event in reversed(ring):
+            if all(event.get(name) == value for name, value in filters.items()):
+                events.append(event)
+                if len(events) >= limit:
+                    break
+        return events
+
+    def stats(self) -> Dict[str, Any]:
+        """Write counters, queue depth and ring buffer size."""
+        with self._cond:
+            stats = dict(self._stats)
+            stats.update({
+                "pending": len(self._pending),
+                "recent_buffered": len(self._ring),
+                "ring_size": self._ring.maxlen,
+                "queue_size": self.queue_size,
+            })
+        stats["flush_seconds"] = round(stats["flush_seconds"], 3)
+        stats["retention_days"] = self.retention_days
+        return stats
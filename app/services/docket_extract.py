@@ -0,0 +1,387 @@
+"""Single-pass metadata extraction for docket/RSS text.
+
+All pattern tables used by rss_ingest, app.analytics and motion_tracker are
+compiled once at import. Ordered category tables ("first category that
+matches anywhere wins") are reduced to substring checks on the lowercased
+text wherever a pattern is a plain literal, which avoids re-scanning the text
+with a case-insensitive regex once per category.
+"""
+import re
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+
+NATURE_OF_SUIT_CATEGORIES = {
+    "Civil Rights": r"civil rights|discrimination|§\s*1983|civil liberties",
+    "Employment": r"employment|wrongful termination|EEOC|workplace|labor",
+    "Contract": r"contract|breach|agreement|warranty",
+    "Intellectual Property": r"patent|trademark|copyright|IP|infringement",
+    "Securities": r"securities|SEC|stock|insider trading",
+    "Bankruptcy": r"bankruptcy|debtor|creditor|chapter \d+",
+    "Habeas Corpus": r"habeas corpus|writ|detention",
+    "Immigration": r"immigration|deportation|asylum|visa",
+    "Personal Injury": r"personal injury|negligence|tort|malpractice",
+    "Real Property": r"real property|foreclosure|eviction|landlord",
+    "Antitrust": r"antitrust|monopoly|price fixing",
+    "Consumer": r"consumer|FDCPA|TCPA|fair credit",
+}
+
+DOCUMENT_TYPE_PATTERNS = {
+    "Complaint": r"\[Complaint\]|Complaint filed",
+    "Motion": r"\[Motion|MOTION",
+    "Order": r"\[Order\]|ORDER",
+    "Answer": r"\[Answer\]",
+    "Brief": r"\[Brief\]|BRIEF",
+    "Notice": r"\[Notice\]|NOTICE",
+    "Petition": r"\[Petition\]",
+    "Application": r"\[Application\]",
+    "Stipulation": r"\[Stipulation\]",
+    "Declaration": r"\[Declaration\]",
+    "Affidavit": r"\[Affidavit\]",
+    "Subpoena": r"\[Subpoena\]",
+    "Summons": r"\[Summons\]",
+    "Judgment": r"\[Judgment\]|JUDGMENT",
+    "Opinion": r"\[Opinion\]",
+    "Transcript": r"\[Transcript\]|-Transcript\]",
+    "Certificate": r"\[Certificate",
+    "Waiver": r"Waiver of Service",
+    "Extension": r"Extension of Time",
+}
+
+# Motion type patterns (case-insensitive)
+MOTION_PATTERNS = {
+    'mtd': [
+        r'motion to dismiss',
+        r'motion for dismissal',
+        r'12\(b\)\(\d+\) motion',
+    ],
+    'msj': [
+        r'motion for summary judgment',
+        r'summary judgment motion',
+        r'cross.?motion for summary judgment',
+    ],
+    'msl': [
+        r'motion to seal',
+        r'motion for leave to seal',
+    ],
+    'mtc': [
+        r'motion to compel',
+        r'motion for order compelling',
+    ],
+    'mpi': [
+        r'motion for preliminary injunction',
+        r'motion for temporary restraining order',
+        r'tro motion',
+    ],
+    'mtq': [
+        r'motion to quash',
+    ],
+    'mts': [
+        r'motion to strike',
+    ],
+    'mtl': [
+        r'motion in limine',
+        r'motions in limine',
+    ],
+    'mtv': [
+        r'motion for new trial',
+        r'motion to vacate',
+        r'motion for reconsideration',
+    ],
+    'mca': [
+        r'motion for class certification',
+        r'motion to certify class',
+    ],
+    'mtr': [
+        r'motion to remand',
+    ],
+    'mtt': [
+        r'motion to transfer',
+        r'motion for change of venue',
+    ],
+}
+
+# Judge mentions, tried in order; the first mention that isn't a false positive wins
+JUDGE_PATTERNS = [
+    r"(?:Judge|J\.|Magistrate Judge|Chief Judge|District Judge)\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)",
+    r"(?:Hon\.|Honorable)\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)",
+    r"Before:\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)",
+    r"Assigned to:\s*(?:Judge|Magistrate Judge)\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)",
+]
+JUDGE_FALSE_POSITIVES = {"Court", "States", "United", "Federal"}
+
+NOS_LABELS = {
+    "190": "Contract Other",
+    "195": "Contract Product Liability",
+    "315": "Airplane Product Liability",
+    "365": "Personal Injury Product Liability",
+    "440": "Civil Rights Other",
+    "442": "Employment Civil Rights",
+    "443": "Housing/Accommodations",
+    "530": "Habeas Corpus",
+    "820": "Copyright",
+    "830": "Patent",
+    "840": "Trademark",
+    "850": "Securities/Commodities/Exchange",
+}
+
+# Substring checks for classify_event_type, in priority order
+EVENT_TYPE_KEYWORDS = [
+    ("case_opening", ("complaint", "case opened", "indictment")),
+    ("assignment", ("assigned to", "case assigned")),
+    ("motion", ("motion",)),
+    ("order", ("order",)),
+    ("judgment", ("judgment",)),
+    ("notice", ("notice", "summons")),
+    ("transfer", ("transfer",)),
+]
+
+CASE_NUMBER_RE = re.compile(r"\b\d+:\d{2}-(cv|cr|bk|ap|mc|md)-\d{3,6}\b", re.IGNORECASE)
+CASE_NUMBER_PARTS_RE = re.compile(r"^(?:(\d+):)?(\d{2})-(cv|cr|bk|ap|mc|md)-(\d{3,6})(?:-(\d+))?$", re.IGNORECASE)
+CASE_TYPE_RE = re.compile(r"-(cv|cr|bk|ap|mc|md)-", re.IGNORECASE)
+NOS_CODE_RE = re.compile(r"Nature of Suit\s*:?\s*(\d{3})", re.IGNORECASE)
+NOS_SHORT_RE = re.compile(r"\bNOS\s*(\d{3})\b")
+CAUSE_RE = re.compile(r"Cause(?: of Action)?\s*:?\s*([0-9A-Za-z:./\- ]{3,20})", re.IGNORECASE)
+CAUSE_STATUTE_RE = re.compile(r"\b(\d{2}:\d{3,4})\b")
+PARTIES_PREFIX_RE = re.compile(r"^\s*\d+:\d{2}-(cv|cr|bk|ap|mc|md)-\d{3,6}(?:-\d+)?\s+", re.IGNORECASE)
+PARTIES_SPLIT_RE = re.compile(r"\s+(v\.?|vs\.?|versus)\s+", re.IGNORECASE)
+DOC_NUMBER_RE = re.compile(r"\bDoc(?:ument)?\s*#\s*(\d+)\b", re.IGNORECASE)
+DOC_NUMBER_LONG_RE = re.compile(r"\bdocument number\s*(\d+)\b", re.IGNORECASE)
+ENTRY_NUMBER_RE = re.compile(r"[#&]?entry[-_=](\d+)", re.IGNORECASE)
+DOC1_URL_RE = re.compile(r"https?://[^\s\"']+/doc1/[^\s\"'<>]+")
+
+
+_REGEX_META = set(".^$*+?{}[]()|")
+
+
+def _as_literal(pattern: str) -> Optional[str]:
+    """The plain string an alternative matches, or None if it uses regex syntax."""
+    out = []
+    chars = iter(pattern)
+    for ch in chars:
+        if ch == "\\":
+            nxt = next(chars, "")
+            if not nxt or nxt.isalnum():
+                return None
+            out.append(nxt)
+        elif ch in _REGEX_META:
+            return None
+        else:
+            out.append(ch)
+    return "".join(out)
+
+
+class CategoryMatcher:
+    """Ordered, case-insensitive pattern table compiled for one pass per text.
+
+    match(text) returns the first key (in table order) whose pattern matches
+    anywhere in text, identical to looping re.search(..., re.IGNORECASE) over
+    the table. Literal alternatives (most of them) are checked as substrings
+    of the lowercased text, which for ASCII input is exactly what IGNORECASE
+    matches; only alternatives using regex syntax are searched as regexes.
+    Non-ASCII text goes through a named-group alternation of the full table.
+    """
+
+    def __init__(self, table: Sequence[Tuple[str, str]]):
+        self.keys = [k for k, _ in table]
+        self._checks = []
+        for _, pattern in table:
+            literals, rest = [], []
+            for alt in pattern.split("|"):
+                lit = _as_literal(alt)
+                if lit is None:
+                    rest.append(alt)
+                else:
+                    literals.append(lit.lower())
+            regex = re.compile("|".join(rest), re.IGNORECASE) if rest else None
+            self._checks.append((tuple(literals), regex))
+        groups = [f"(?P<g{i}>{pattern})" for i, (_, pattern) in enumerate(table)]
+        # _prefix[n] matches any of the first n categories
+        self._prefix = [None] + [re.compile("|".join(groups[:n]), re.IGNORECASE)
+                                 for n in range(1, len(groups) + 1)]
+
+    def match(self, text: str) -> Optional[str]:
+        if not text:
+            return None
+        if text.isascii():
+            lowered = text.lower()
+            for key, (literals, regex) in zip(self.keys, self._checks):
+                for lit in literals:
+                    if lit in lowered:
+                        return key
+                if regex is not None and regex.search(text):
+                    return key
+            return None
+        best = None
+        limit = len(self.keys)
+        while limit:
+            m = self._prefix[limit].search(text)
+            if not m:
+                break
+            best = limit = int(m.lastgroup[1:])
+        return self.keys[best] if best is not None else None
+
+
+class DocketExtractor:
+    """Precompiled extractors for every docket-text field."""
+
+    def __init__(self):
+        self._nos_category = CategoryMatcher(list(NATURE_OF_SUIT_CATEGORIES.items()))
+        self._document_type = CategoryMatcher(list(DOCUMENT_TYPE_PATTERNS.items()))
+        self._motion_type = CategoryMatcher(
+            [(k, "|".join(v)) for k, v in MOTION_PATTERNS.items()]
+        )
+        # Per-type regexes for callers that test one motion type
+        self.motion_patterns = {k: re.compile("|".join(v), re.IGNORECASE) for k, v in MOTION_PATTERNS.items()}
+        self._judge = [re.compile(p) for p in JUDGE_PATTERNS]
+
+    # -- individual fields --------------------------------------------------
+
+    @staticmethod
+    def case_number(text: str) -> Optional[str]:
+        if not text:
+            return None
+        m = CASE_NUMBER_RE.search(text)
+        return m.group(0) if m else None
+
+    @staticmethod
+    def case_number_parts(case_number: Optional[str]) -> Optional[dict]:
+        if not case_number:
+            return None
+        # Supports optional defendant index suffix like -3 in criminal cases
+        m = CASE_NUMBER_PARTS_RE.match(case_number)
+        if not m:
+            return None
+        office, yy, ctype, seq, d_idx = m.groups()
+        year = int("20" + yy) if len(yy) == 2 else int(yy)
+        parts = {"office": office, "year": year, "type": ctype.lower(), "sequence": int(seq)}
+        if office and office.isdigit():
+            parts["division_number"] = int(office)
+        if d_idx:
+            parts["defendant_index"] = int(d_idx)
+        return parts
+
+    @staticmethod
+    def case_type(case_number: Optional[str]) -> Optional[str]:
+        if not case_number:
+            return None
+        m = CASE_TYPE_RE.search(case_number)
+        return m.group(1).lower() if m else None
+
+    def judge_name(self, text: str) -> Optional[str]:
+        if not text:
+            return None
+        for regex in self._judge:
+            match = regex.search(text)
+            if match:
+                name = match.group(1).strip()
+                if name and len(name) > 3 and name not in JUDGE_FALSE_POSITIVES:
+                    return name
+        return None
+
+    def nature_of_suit(self, text: str) -> Optional[str]:
+        return self._nos_category.match(text)
+
+    def document_type(self, text: str) -> str:
+        if not text:
+            return "Unknown"
+        return self._document_type.match(text) or "Other"
+
+    def motion_type(self, text: str) -> Optional[str]:
+        return self._motion_type.match(text)
+
+    @staticmethod
+    def nos_code(text: str) -> Optional[dict]:
+        if not text:
+            return None
+        m = NOS_CODE_RE.search(text) or NOS_SHORT_RE.search(text)
+        if not m:
+            return None
+        code = m.group(1)
+        return {"code": code, "label": NOS_LABELS.get(code)}
+
+    @staticmethod
+    def cause_of_action(text: str) -> Optional[str]:
+        if not text:
+            return None
+        m = CAUSE_RE.search(text)
+        if m:
+            return m.group(1).strip()
+        m2 = CAUSE_STATUTE_RE.search(text)
+        return m2.group(1) if m2 else None
+
+    @staticmethod
+    def parties(title: str) -> Optional[dict]:
+        if not title:
+            return None
+        # Strip leading case number (with optional defendant index) and trailing section after names
+        t = PARTIES_PREFIX_RE.sub("", title)
+        m = PARTIES_SPLIT_RE.split(t)
+        if len(m) >= 3:
+            left = m[0].split(" - ")[0].strip()
+            right = " ".join(m[2:]).split(" - ")[0].strip()
+            return {"plaintiffs": [left], "defendants": [right]}
+        return None
+
+    @staticmethod
+    def doc_number(text: str) -> Optional[int]:
+        if not text:
+            return None
+        m = DOC_NUMBER_RE.search(text) or DOC_NUMBER_LONG_RE.search(text)
+        return int(m.group(1)) if m else None
+
+    @staticmethod
+    def event_type(text: str) -> Optional[str]:
+        if not text:
+            return None
+        t = text.lower()
+        for event, needles in EVENT_TYPE_KEYWORDS:
+            if any(n in t for n in needles):
+                return event
+        return "docket_event"
+
+    @staticmethod
+    def entry_number(link: str) -> Optional[int]:
+        if not link:
+            return None
+        m = ENTRY_NUMBER_RE.search(link)
+        return int(m.group(1)) if m else None
+
+    @staticmethod
+    def doc1_url(text: str) -> Optional[str]:
+        if not text:
+            return None
+        m = DOC1_URL_RE.search(text)
+        return m.group(0) if m else None
+
+    # -- all fields ---------------------------------------------------------
+
+    def extract(self, title: str, summary: str, link: str = "") -> Dict[str, Any]:
+        """Every field for one feed entry, building the combined text once."""
+        title = title or ""
+        summary = summary or ""
+        combined = title + " " + summary
+        cn = self.case_number(title) or self.case_number(summary) or None
+        doc_no = self.doc_number(combined)
+        entry_no = self.entry_number(link)
+        event_type = self.event_type(combined)
+        has_numbers = (doc_no is not None) or (entry_no is not None)
+        return {
+            "case_number": cn,
+            "case_type": self.case_type(cn),
+            "case_parts": self.case_number_parts(cn),
+            "judge_name": self.judge_name(title) or self.judge_name(summary),
+            "nature_of_suit": self.nature_of_suit(combined),
+            "nos": self.nos_code(summary),
+            "cause_of_action": self.cause_of_action(summary),
+            "parties": self.parties(title),
+            "doc_number": doc_no,
+            "event_type": event_type,
+            "is_new_case": bool((doc_no == 1) or (entry_no == 1) or (not has_numbers and event_type == "case_opening")),
+            "docket_entry_number": entry_no,
+            "doc1_url": self.doc1_url(link or '') or self.doc1_url(summary),
+            "document_type": self.document_type(summary),
+            "motion_type": self.motion_type(combined),
+        }
+
+
+extractor = DocketExtractor()
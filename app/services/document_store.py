@@ -0,0 +1,413 @@
+"""Content-addressed store for downloaded PACER documents.
+
+PDFs are stored once per distinct content under objects/<sha[:2]>/<sha>.pdf
+and looked up through a local SQLite index:
+
+    blobs      sha256 -> size, pages, created_at, last_access
+    documents  (court_code, doc_id) -> sha256, filename, last_access
+
+Cache checks are an index lookup plus one stat of the blob, downloads are
+streamed to a temp file while being hashed and renamed into place only once
+complete, identical documents share a single blob, and the least recently
+used blobs are evicted whenever the store grows past its size cap.
+"""
+import hashlib
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Size cap for stored documents; eviction trims to STORE_LOW_WATERMARK of it
+DOC_STORE_MAX_MB = int(os.getenv("PACER_DOC_STORE_MAX_MB", "5120"))
+STORE_LOW_WATERMARK = 0.9
+
+# Bytes requested per read when streaming a download to disk
+DOWNLOAD_CHUNK_BYTES = 256 * 1024
+
+# last_access is only rewritten when older than this (seconds), so cache
+# hits don't turn into a write per request
+ACCESS_RESOLUTION = 60.0
+
+PDF_MAGIC = b'%PDF-'
+
+SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS blobs (
+        sha256 TEXT PRIMARY KEY,
+        size INTEGER NOT NULL,
+        pages INTEGER,
+        created_at REAL NOT NULL,
+        last_access REAL NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_blobs_last_access ON blobs(last_access)",
+    """
+    CREATE TABLE IF NOT EXISTS documents (
+        court_code TEXT NOT NULL,
+        doc_id TEXT NOT NULL,
+        sha256 TEXT NOT NULL REFERENCES blobs(sha256),
+        filename TEXT NOT NULL,
+        created_at REAL NOT NULL,
+        last_access REAL NOT NULL,
+        PRIMARY KEY (court_code, doc_id)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_documents_sha256 ON documents(sha256)",
+]
+
+
+@dataclass
+class StoredDocument:
+    """A document in the store."""
+    court_code: str
+    doc_id: str
+    sha256: str
+    filename: str
+    size: int
+    pages: Optional[int]
+    path: Path
+
+
+@dataclass
+class Download:
+    """A streamed download sitting in a temp file, not yet in the store."""
+    path: Path
+    sha256: str
+    size: int
+    is_pdf: bool
+
+    def read_text(self, limit: int = 2_000_000) -> str:
+        """Leading bytes of the download decoded as text (for HTML responses)."""
+        with open(self.path, 'rb') as f:
+            return f.read(limit).decode('utf-8', errors='replace')
+
+
+class DocumentStore:
+    """Content-addressed PDF store with a SQLite index and LRU eviction."""
+
+    def __init__(self, root: Path, max_bytes: int = DOC_STORE_MAX_MB * 1024 * 1024):
+        """Open (creating if needed) a store.
+
+        Args:
+            root: Directory holding objects/, tmp/ and the index
+            max_bytes: Size cap for stored blobs (0 = unlimited)
+        """
+        self.root = Path(root)
+        self.objects_dir = self.root / "objects"
+        self.tmp_dir = self.root / "tmp"
+        self.index_path = self.root / "index.sqlite3"
+        self.max_bytes = max_bytes
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        self.tmp_dir.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.index_path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        for statement in SCHEMA:
+            self._conn.execute(statement)
+        self._conn.commit()
+
+        row = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()
+        self.total_bytes = int(row[0])
+        self.hits = 0
+        self.misses = 0
+        self.dedup_hits = 0
+        self.evictions = 0
+        self.evicted_bytes = 0
+
+        # Leftovers from interrupted downloads
+        for stale in self.tmp_dir.glob("*.part"):
+            try:
+                stale.unlink()
+            except OSError:
+                pass
+
+    def blob_path(self, sha256: str) -> Path:
+        return self.objects_dir / sha256[:2] / f"{sha256}.pdf"
+
+    def lookup(self, court_code: str, doc_id: str) -> Optional[StoredDocument]:
+        """Index lookup for a cached document; refreshes its LRU position."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                """
+                SELECT d.sha256, d.filename, d.last_access AS doc_access,
+                       b.size, b.pages, b.last_access AS blob_access
+                FROM documents d JOIN blobs b ON b.sha256 = d.sha256
+                WHERE d.court_code = ? AND d.doc_id = ?
+                """,
+                (court_code, doc_id),
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+
+            path = self.blob_path(row['sha256'])
+            if not path.exists():
+                # Deleted outside the store or evicted by another process:
+                # forget it so the document is downloaded again
+                logger.warning(f"Document store blob {row['sha256']} is missing; dropping it from the index")
+                self._conn.execute("DELETE FROM documents WHERE sha256 = ?", (row['sha256'],))
+                self._delete_blob(row['sha256'])
+                self._conn.commit()
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            if now - row['doc_access'] > ACCESS_RESOLUTION or now - row['blob_access'] > ACCESS_RESOLUTION:
+                self._conn.execute(
+                    "UPDATE documents SET last_access = ? WHERE court_code = ? AND doc_id = ?",
+                    (now, court_code, doc_id),
+                )
+                self._conn.execute(
+                    "UPDATE blobs SET last_access = ? WHERE sha256 = ?", (now, row['sha256'])
+                )
+                self._conn.commit()
+
+        return StoredDocument(
+            court_code=court_code,
+            doc_id=doc_id,
+            sha256=row['sha256'],
+            filename=row['filename'],
+            size=row['size'],
+            pages=row['pages'],
+            path=path,
+        )
+
+    def download(self, chunks: Iterable[bytes]) -> Download:
+        """Stream chunks into a temp file, hashing as they arrive."""
+        digest = hashlib.sha256()
+        size = 0
+        head = b''
+        fd, tmp_name = tempfile.mkstemp(suffix=".part", dir=str(self.tmp_dir))
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                for chunk in chunks:
+                    if not chunk:
+                        continue
+                    if len(head) < len(PDF_MAGIC):
+                        head += chunk[:len(PDF_MAGIC) - len(head)]
+                    digest.update(chunk)
+                    f.write(chunk)
+                    size += len(chunk)
+                f.flush()
+                os.fsync(f.fileno())
+        except BaseException:
+            self.discard_path(Path(tmp_name))
+            raise
+        return Download(path=Path(tmp_name), sha256=digest.hexdigest(), size=size, is_pdf=head == PDF_MAGIC)
+
+    def discard(self, download: Download):
+        """Drop a download that won't be stored."""
+        self.discard_path(download.path)
+
+    @staticmethod
+    def discard_path(path: Path):
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
+    def commit(
+        self,
+        court_code: str,
+        doc_id: str,
+        download: Download,
+        filename: str,
+        pages: Optional[int] = None,
+    ) -> StoredDocument:
+        """Move a finished download into the store (deduplicating by content).
+
+        Args:
+            court_code: Court the document belongs to
+            doc_id: PACER document id
+            download: Result of download()
+            filename: Name to serve the document under
+            pages: Page count, if known
+
+        Returns:
+            The stored document
+        """
+        now = time.time()
+        path = self.blob_path(download.sha256)
+        with self._lock:
+            exists = self._conn.execute(
+                "SELECT 1 FROM blobs WHERE sha256 = ?", (download.sha256,)
+            ).fetchone() is not None
+
+            if exists and path.exists():
+                self.dedup_hits += 1
+                self.discard(download)
+            else:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                os.replace(download.path, path)
+
+            if not exists:
+                self._conn.execute(
+                    "INSERT INTO blobs (sha256, size, pages, created_at, last_access) VALUES (?, ?, ?, ?, ?)",
+                    (download.sha256, download.size, pages, now, now),
+                )
+                self.total_bytes += download.size
+            else:
+                self._conn.execute(
+                    "UPDATE blobs SET last_access = ? WHERE sha256 = ?", (now, download.sha256)
+                )
+
+            previous = self._conn.execute(
+                "SELECT sha256 FROM documents WHERE court_code = ? AND doc_id = ?",
+                (court_code, doc_id),
+            ).fetchone()
+            self._conn.execute(
+                """
+                INSERT OR REPLACE INTO documents
+                    (court_code, doc_id, sha256, filename, created_at, last_access)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (court_code, doc_id, download.sha256, filename, now, now),
+            )
+            if previous is not None and previous['sha256'] != download.sha256:
+                self._drop_if_unreferenced(previous['sha256'])
+            self._conn.commit()
+
+            if self.max_bytes and self.total_bytes > self.max_bytes:
+                self._evict(int(self.max_bytes * STORE_LOW_WATERMARK), keep=download.sha256)
+
+        return StoredDocument(
+            court_code=court_code,
+            doc_id=doc_id,
+            sha256=download.sha256,
+            filename=filename,
+            size=download.size,
+            pages=pages,
+            path=path,
+        )
+
+    def adopt(self, court_code: str, doc_id: str, file_path: Path, filename: str,
+              pages: Optional[int] = None) -> Optional[StoredDocument]:
+        """Move a PDF cached outside the store (the old docs/<court>/ layout) into it.
+
+        Files that aren't PDFs (error pages saved by older versions) are
+        deleted, so they aren't hashed again on every request.
+        """
+        try:
+            with open(file_path, 'rb') as f:
+                download = self.download(iter(lambda: f.read(DOWNLOAD_CHUNK_BYTES), b''))
+        except OSError:
+            return None
+        if not download.is_pdf:
+            self.discard(download)
+            self.discard_path(file_path)
+            return None
+        stored = self.commit(court_code, doc_id, download, filename, pages=pages)
+        self.discard_path(file_path)
+        return stored
+
+    def remove(self, court_code: str, doc_id: str) -> bool:
+        """Forget a document (its blob goes too if nothing else references it)."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT sha256 FROM documents WHERE court_code = ? AND doc_id = ?",
+                (court_code, doc_id),
+            ).fetchone()
+            if row is None:
+                return False
+            self._conn.execute(
+                "DELETE FROM documents WHERE court_code = ? AND doc_id = ?", (court_code, doc_id)
+            )
+            self._drop_if_unreferenced(row['sha256'])
+            self._conn.commit()
+        return True
+
+    def evict(self, target_bytes: Optional[int] = None) -> int:
+        """Evict least recently used blobs until the store fits target_bytes.
+
+        Returns:
+            Number of blobs evicted
+        """
+        if target_bytes is None:
+            target_bytes = int(self.max_bytes * STORE_LOW_WATERMARK) if self.max_bytes else self.total_bytes
+        with self._lock:
+            return self._evict(target_bytes)
+
+    def _evict(self, target_bytes: int, keep: Optional[str] = None) -> int:
+        evicted = 0
+        rows = self._conn.execute(
+            "SELECT sha256, size FROM blobs ORDER BY last_access ASC"
+        )
+        victims = []
+        remaining = self.total_bytes
+        for row in rows:
+            if remaining <= target_bytes:
+                break
+            if row['sha256'] == keep:
+                continue
+            victims.append(row['sha256'])
+            remaining -= row['size']
+
+        for sha256 in victims:
+            self._conn.execute("DELETE FROM documents WHERE sha256 = ?", (sha256,))
+            size = self._delete_blob(sha256)
+            self.evicted_bytes += size
+            evicted += 1
+        if victims:
+            self._conn.commit()
+            self.evictions += evicted
+            logger.info(f"Document store evicted {evicted} blobs; now {self.total_bytes} bytes")
+        return evicted
+
+    def _drop_if_unreferenced(self, sha256: str):
+        referenced = self._conn.execute(
+            "SELECT 1 FROM documents WHERE sha256 = ? LIMIT 1", (sha256,)
+        ).fetchone()
+        if referenced is None:
+            self._delete_blob(sha256)
+
+    def _delete_blob(self, sha256: str) -> int:
+        row = self._conn.execute("SELECT size FROM blobs WHERE sha256 = ?", (sha256,)).fetchone()
+        if row is None:
+            return 0
+        self._conn.execute("DELETE FROM blobs WHERE sha256 = ?", (sha256,))
+        self.total_bytes -= row['size']
+        self.discard_path(self.blob_path(sha256))
+        return row['size']
+
+    def stats(self) -> Dict[str, Any]:
+        """Index size, capacity and hit/dedup/eviction counters."""
+        with self._lock:
+            blobs = self._conn.execute("SELECT COUNT(*) FROM blobs").fetchone()[0]
+            documents, logical_bytes = self._conn.execute(
+                """
+                SELECT COUNT(*), COALESCE(SUM(b.size), 0)
+                FROM documents d JOIN blobs b ON b.sha256 = d.sha256
+                """
+            ).fetchone()
+            oldest = self._conn.execute("SELECT MIN(last_access) FROM blobs").fetchone()[0]
+            lookups = self.hits + self.misses
+            return {
+                'root': str(self.root),
+                'documents': documents,
+                'blobs': blobs,
+                'total_bytes': self.total_bytes,
+                'max_bytes': self.max_bytes,
+                'usage': round(self.total_bytes / self.max_bytes, 4) if self.max_bytes else None,
+                'dedup_saved_bytes': logical_bytes - self.total_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'dedup_hits': self.dedup_hits,
+                'evictions': self.evictions,
+                'evicted_bytes': self.evicted_bytes,
+                'oldest_access': oldest,
+            }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,214 @@
+"""
+Incremental serializers for streamed data exports.
+
+Each writer turns an iterator of row dicts into an iterator of byte chunks
+for a StreamingResponse, so an export's memory use stays flat however many
+rows it has:
+
+- csv: header from the first row's columns (sorted), nested values as JSON
+- ndjson: one JSON object per line
+- json: a {"<key>": [...], "count": n} document written row by row
+- xml: <root><item>...</item></root>, None values left out
+- parquet: one row group per EXPORT_PARQUET_ROW_GROUP rows (needs pyarrow)
+
+Rows are encoded one at a time but yielded in chunks of about
+EXPORT_CHUNK_BYTES: the server advances sync iterators on a thread pool,
+so one chunk per row would cost a thread hop per row. Any of them can be
+wrapped in gzip_chunks for compressed downloads.
+"""
+import csv
+import io
+import json
+import logging
+import os
+import zlib
+from itertools import chain, islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+EXPORT_CHUNK_BYTES = int(os.getenv("EXPORT_CHUNK_BYTES", str(64 * 1024)))
+EXPORT_PARQUET_ROW_GROUP = int(os.getenv("EXPORT_PARQUET_ROW_GROUP", "10000"))
+EXPORT_GZIP_LEVEL = int(os.getenv("EXPORT_GZIP_LEVEL", "6"))
+
+# format -> (media type, file extension)
+FORMATS = {
+    "json": ("application/json", "json"),
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "csv": ("text/csv", "csv"),
+    "xml": ("application/xml", "xml"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+
+_pyarrow = None
+
+
+def _get_pyarrow():
+    """Lazy import of pyarrow (and its parquet module)."""
+    global _pyarrow
+    if _pyarrow is None:
+        try:
+            import pyarrow
+            import pyarrow.parquet
+            _pyarrow = pyarrow
+        except ImportError:
+            logger.warning("pyarrow not installed. Parquet export will not be available.")
+    return _pyarrow
+
+
+def parquet_available() -> bool:
+    return _get_pyarrow() is not None
+
+
+def _cell(value: Any) -> Any:
+    """Flatten nested values to JSON text for tabular formats."""
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    return value
+
+
+def _chunked(pieces: Iterable[str]) -> Iterator[bytes]:
+    """Join encoded pieces into chunks of about EXPORT_CHUNK_BYTES."""
+    buffer: List[str] = []
+    size = 0
+    for piece in pieces:
+        buffer.append(piece)
+        size += len(piece)
+        if size >= EXPORT_CHUNK_BYTES:
+            yield "".join(buffer).encode("utf-8")
+            buffer, size = [], 0
+    if buffer:
+        yield "".join(buffer).encode("utf-8")
+
+
+def csv_chunks(rows: Iterable[Dict[str, Any]]) -> Iterator[bytes]:
+    """CSV with a header row; nothing at all for an empty export."""
+    rows = iter(rows)
+    first = next(rows, None)
+    if first is None:
+        return
+
+    fieldnames = sorted(first.keys())
+    output = io.StringIO()
+    writer = csv.DictWriter(output, fieldnames=fieldnames, extrasaction="ignore")
+    writer.writeheader()
+    for row in chain([first], rows):
+        writer.writerow({k: _cell(v) for k, v in row.items()})
+        if output.tell() >= EXPORT_CHUNK_BYTES:
+            yield output.getvalue().encode("utf-8")
+            output.seek(0)
+            output.truncate()
+    if output.tell():
+        yield output.getvalue().encode("utf-8")
+
+
+def ndjson_chunks(rows: Iterable[Dict[str, Any]]) -> Iterator[bytes]:
+    """Newline-delimited JSON, one row per line."""
+    return _chunked(json.dumps(row, default=str) + "\n" for row in rows)
+
+
+def json_chunks(rows: Iterable[Dict[str, Any]], key: str,
+                extra: Optional[Dict[str, Any]] = None) -> Iterator[bytes]:
+    """A JSON document {"<key>": [rows...], "count": n, **extra}, one row per line."""
+    def pieces():
+        count = 0
+        yield "{" + json.dumps(key) + ": ["
+        for row in rows:
+            yield ("\n" if not count else ",\n") + json.dumps(row, default=str)
+            count += 1
+        tail = {"count": count, **(extra or {})}
+        yield "\n], " + json.dumps(tail)[1:] + "\n"
+    return _chunked(pieces())
+
+
+def _xml_escape(value: Any) -> str:
+    return str(value).replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+def xml_chunks(rows: Iterable[Dict[str, Any]], root: str, item: str) -> Iterator[bytes]:
+    """XML document with one <item> element per row and one child per non-None column."""
+    def pieces():
+        yield f'<?xml version="1.0" encoding="UTF-8"?>\n<{root}>\n'
+        for row in rows:
+            fields = "".join(
+                f"    <{k}>{_xml_escape(v)}</{k}>\n" for k, v in row.items() if v is not None
+            )
+            yield f"  <{item}>\n{fields}  </{item}>\n"
+        yield f"</{root}>\n"
+    return _chunked(pieces())
+
+
+class _Drain(io.RawIOBase):
+    """Write-only file collecting bytes until drained (parquet writer sink)."""
+
+    def __init__(self):
+        super().__init__()
+        self._parts: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._parts.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._parts)
+        self._parts = []
+        return data
+
+
+def parquet_chunks(rows: Iterable[Dict[str, Any]],
+                   row_group_size: int = None) -> Iterator[bytes]:
+    """
+    Parquet file written one row group at a time (string columns, named
+    after the first row's columns, sorted). Nothing for an empty export.
+
+    Raises:
+        RuntimeError: pyarrow is not installed
+    """
+    pa = _get_pyarrow()
+    if pa is None:
+        raise RuntimeError("Parquet export requires pyarrow")
+
+    row_group_size = row_group_size or EXPORT_PARQUET_ROW_GROUP
+    rows = iter(rows)
+    sink = _Drain()
+    writer = None
+    columns: List[str] = []
+    schema = None
+
+    while True:
+        batch = list(islice(rows, row_group_size))
+        if not batch:
+            break
+        if writer is None:
+            columns = sorted(batch[0].keys())
+            schema = pa.schema([(c, pa.string()) for c in columns])
+            writer = pa.parquet.ParquetWriter(sink, schema)
+        arrays = [
+            pa.array([None if row.get(c) is None else str(_cell(row.get(c))) for row in batch], pa.string())
+            for c in columns
+        ]
+        writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+        yield sink.drain()
+
+    if writer is not None:
+        writer.close()
+        yield sink.drain()
+
+
+def gzip_chunks(chunks: Iterable[bytes], level: int = None) -> Iterator[bytes]:
+    """Compress a chunk stream into a gzip file, incrementally."""
+    compressor = zlib.compressobj(EXPORT_GZIP_LEVEL if level is None else level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
@@ -10,59 +10,8 @@ import uuid
 from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 
+from .docket_extract import extractor
 
-# Motion type patterns (case-insensitive)
-MOTION_PATTERNS = {
-    'mtd': [
-        r'motion to dismiss',
-        r'motion for dismissal',
-        r'12\(b\)\(\d+\) motion',
-    ],
-    'msj': [
-        r'motion for summary judgment',
-        r'summary judgment motion',
-        r'cross.?motion for summary judgment',
-    ],
-    'msl': [
-        r'motion to seal',
-        r'motion for leave to seal',
-    ],
-    'mtc': [
-        r'motion to compel',
-        r'motion for order compelling',
-    ],
-    'mpi': [
-        r'motion for preliminary injunction',
-        r'motion for temporary restraining order',
-        r'tro motion',
-    ],
-    'mtq': [
-        r'motion to quash',
-    ],
-    'mts': [
-        r'motion to strike',
-    ],
-    'mtl': [
-        r'motion in limine',
-        r'motions in limine',
-    ],
-    'mtv': [
-        r'motion for new trial',
-        r'motion to vacate',
-        r'motion for reconsideration',
-    ],
-    'mca': [
-        r'motion for class certification',
-        r'motion to certify class',
-    ],
-    'mtr': [
-        r'motion to remand',
-    ],
-    'mtt': [
-        r'motion to transfer',
-        r'motion for change of venue',
-    ],
-}
 
 # Outcome patterns
 OUTCOME_PATTERNS = {
@@ -119,12 +68,8 @@ class MotionTracker:
     """
 
     def __init__(self):
-        # Compile patterns for efficiency
-        self._motion_patterns = {}
-        for motion_type, patterns in MOTION_PATTERNS.items():
-            self._motion_patterns[motion_type] = re.compile(
-                '|'.join(patterns), re.IGNORECASE
-            )
+        # Compile patterns for efficiency (motion types are compiled once in docket_extract)
+        self._motion_patterns = extractor.motion_patterns
 
         self._outcome_patterns = {}
         for outcome, patterns in OUTCOME_PATTERNS.items():
@@ -143,11 +88,7 @@ class MotionTracker:
         if 'motion' not in text_lower and 'tro' not in text_lower:
             return None
 
-        for motion_type, pattern in self._motion_patterns.items():
-            if pattern.search(text):
-                return motion_type
-
-        return None
+        return extractor.motion_type(text)
 
     def detect_outcome(self, text: str) -> Optional[str]:
         """Detect motion outcome from order text."""
@@ -3,6 +3,11 @@
 Uses Tesseract OCR to extract text from scanned/image-based PDFs
 when native text extraction fails.
 
+Pages are rasterized a few at a time inside worker processes (never the
+whole document up front), each page gets a single Tesseract pass that
+yields both text and word confidences, and results stream back in page
+order so extraction can stop early once enough text has been recovered.
+
 Requirements:
     - System: tesseract, poppler (brew install tesseract poppler)
     - Python: pytesseract, pdf2image, Pillow
@@ -10,12 +15,18 @@ Requirements:
 import logging
 import tempfile
 import os
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
-from typing import Optional, List, Tuple
+from typing import Dict, Iterator, Optional, List, Tuple
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
+# Worker processes running Tesseract (1 = OCR in the calling process)
+OCR_WORKERS = int(os.getenv("OCR_WORKERS", str(min(4, os.cpu_count() or 1))))
+# Pages rasterized per worker task; only this many page images exist per worker
+OCR_PAGE_WINDOW = int(os.getenv("OCR_PAGE_WINDOW", "2"))
+
 # Lazy imports for optional dependencies
 _pytesseract = None
 _pdf2image = None
@@ -68,6 +79,8 @@ class OCRResult:
     pages_processed: int
     method: str  # 'tesseract'
     errors: Optional[List[str]] = None
+    page_count: int = 0  # Pages in the PDF (0 if unknown)
+    stopped_early: bool = False  # Stopped once the target was reached
 
     def is_high_quality(self, threshold: float = 0.7) -> bool:
         """Check if OCR result is high quality.
@@ -81,6 +94,109 @@ class OCRResult:
         return self.confidence >= threshold
 
 
+@dataclass
+class OCRPage:
+    """OCR output for a single page."""
+    page_number: int  # 1-based
+    text: str
+    confidence: Optional[float]  # 0.0 to 1.0, None if no words were recognized
+    error: Optional[str] = None
+
+
+def _page_text(data: Dict[str, list]) -> Tuple[str, List[float]]:
+    """Rebuild page text and word confidences from image_to_data output.
+
+    Words are joined by spaces, lines by newlines and paragraphs by blank
+    lines, which is how image_to_string lays out the same recognition.
+    """
+    paragraphs: List[List[str]] = []
+    confidences: List[float] = []
+    current_par = current_line = None
+
+    for i, word in enumerate(data.get('text', [])):
+        try:
+            conf = float(data['conf'][i])
+        except (TypeError, ValueError):
+            conf = -1.0
+        if conf >= 0:
+            confidences.append(conf)
+
+        word = (word or '').strip()
+        if not word:
+            continue
+
+        par = (data['block_num'][i], data['par_num'][i])
+        line = par + (data['line_num'][i],)
+        if par != current_par:
+            paragraphs.append([word])
+        elif line != current_line:
+            paragraphs[-1].append('\n' + word)
+        else:
+            paragraphs[-1].append(' ' + word)
+        current_par, current_line = par, line
+
+    return '\n\n'.join(''.join(words) for words in paragraphs), confidences
+
+
+def _init_ocr_worker():
+    """Keep each Tesseract process single-threaded; parallelism comes from the pool."""
+    os.environ.setdefault('OMP_THREAD_LIMIT', '1')
+
+
+def _ocr_window(
+    pdf_path: str,
+    first_page: int,
+    last_page: int,
+    dpi: int,
+    language: str,
+    config: str,
+) -> List[OCRPage]:
+    """Rasterize and OCR pages first_page..last_page (runs in a worker process)."""
+    pytesseract = _get_pytesseract()
+    convert_from_path = _get_pdf2image()
+
+    try:
+        images = convert_from_path(
+            pdf_path,
+            dpi=dpi,
+            first_page=first_page,
+            last_page=last_page,
+            grayscale=True,
+        )
+    except Exception as e:
+        return [
+            OCRPage(page_number=n, text='', confidence=None, error=f"Error rasterizing page {n}: {e}")
+            for n in range(first_page, last_page + 1)
+        ]
+
+    pages = []
+    # Pop images as they are processed so each page is released right away
+    images.reverse()
+    page_number = first_page
+    while images:
+        image = images.pop()
+        try:
+            data = pytesseract.image_to_data(
+                image,
+                lang=language,
+                config=config,
+                output_type=pytesseract.Output.DICT,
+            )
+            text, confs = _page_text(data)
+            confidence = sum(confs) / len(confs) / 100.0 if confs else None
+            pages.append(OCRPage(page_number=page_number, text=text, confidence=confidence))
+        except Exception as e:
+            pages.append(OCRPage(
+                page_number=page_number, text='', confidence=None,
+                error=f"Error on page {page_number}: {e}",
+            ))
+        finally:
+            image.close()
+        page_number += 1
+
+    return pages
+
+
 class OCRExtractor:
     """OCR extraction for scanned PDFs using Tesseract."""
 
@@ -90,15 +206,25 @@ class OCRExtractor:
     # Tesseract configuration for legal documents
     TESSERACT_CONFIG = '--oem 3 --psm 6'  # LSTM engine, assume uniform block of text
 
-    def __init__(self, dpi: int = 300, language: str = 'eng'):
+    def __init__(
+        self,
+        dpi: int = 300,
+        language: str = 'eng',
+        workers: int = OCR_WORKERS,
+        page_window: int = OCR_PAGE_WINDOW,
+    ):
         """Initialize OCR extractor.
 
         Args:
             dpi: DPI for PDF to image conversion (higher = better quality but slower)
             language: Tesseract language code
+            workers: Worker processes running OCR (1 = in-process)
+            page_window: Pages rasterized at a time by each worker
         """
         self.dpi = dpi
         self.language = language
+        self.workers = max(1, workers)
+        self.page_window = max(1, page_window)
 
     def is_available(self) -> bool:
         """Check if OCR dependencies are available.
@@ -173,18 +299,86 @@ class OCRExtractor:
             logger.error(f"Error detecting scanned PDF: {e}")
             return False
 
+    def page_count(self, pdf_path: str) -> int:
+        """Number of pages in a PDF.
+
+        Raises:
+            Exception: pdfinfo could not read the file (corrupt or not a PDF)
+        """
+        from pdf2image import pdfinfo_from_path
+        return int(pdfinfo_from_path(pdf_path)['Pages'])
+
+    def iter_pages(
+        self,
+        pdf_path: str,
+        max_pages: Optional[int] = None,
+        page_count: Optional[int] = None,
+    ) -> Iterator[OCRPage]:
+        """OCR a PDF page by page, yielding results in page order.
+
+        Pages are split into windows of page_window pages and fanned out to
+        a process pool. At most two windows per worker are in flight, so
+        memory stays bounded however long the document is. Closing the
+        generator early cancels the windows not yet started.
+
+        Args:
+            pdf_path: Path to PDF file
+            max_pages: Maximum pages to process (None = all)
+            page_count: Pages in the PDF, if already known
+
+        Yields:
+            OCRPage for each page
+        """
+        if page_count is None:
+            page_count = self.page_count(pdf_path)
+        last_page = min(page_count, max_pages) if max_pages else page_count
+        windows = [
+            (first, min(first + self.page_window - 1, last_page))
+            for first in range(1, last_page + 1, self.page_window)
+        ]
+        args = (self.dpi, self.language, self.TESSERACT_CONFIG)
+
+        if self.workers == 1 or len(windows) <= 1:
+            for first, last in windows:
+                yield from _ocr_window(pdf_path, first, last, *args)
+            return
+
+        max_in_flight = self.workers * 2
+        pending = []
+        with ProcessPoolExecutor(
+            max_workers=min(self.workers, len(windows)),
+            initializer=_init_ocr_worker,
+        ) as pool:
+            try:
+                for first, last in windows:
+                    pending.append(pool.submit(_ocr_window, pdf_path, first, last, *args))
+                    if len(pending) >= max_in_flight:
+                        yield from pending.pop(0).result()
+                while pending:
+                    yield from pending.pop(0).result()
+            finally:
+                for future in pending:
+                    future.cancel()
+
     def extract_with_tesseract(
         self,
         pdf_path: str,
-        max_pages: Optional[int] = None
+        max_pages: Optional[int] = None,
+        target_chars: Optional[int] = None,
+        target_confidence: float = 0.0,
     ) -> OCRResult:
         """Extract text from PDF using Tesseract OCR.
 
-        Converts PDF pages to images and runs Tesseract on each.
+        Streams pages through iter_pages. When target_chars is set,
+        extraction stops as soon as that much text has been recovered at an
+        average confidence of at least target_confidence, skipping the rest
+        of the document.
 
         Args:
             pdf_path: Path to PDF file
             max_pages: Maximum pages to process (None = all)
+            target_chars: Stop once this many characters are extracted (None = never)
+            target_confidence: Minimum average confidence for an early stop
 
         Returns:
             OCRResult with extracted text and confidence
@@ -205,55 +399,45 @@ class OCRExtractor:
         all_text = []
         confidences = []
         pages_processed = 0
+        total_chars = 0
+        stopped_early = False
+        page_count = 0
 
         try:
-            # Convert PDF to images
-            logger.info(f"Converting PDF to images at {self.dpi} DPI...")
-            images = convert_from_path(
-                pdf_path,
-                dpi=self.dpi,
-                first_page=1,
-                last_page=max_pages,
+            page_count = self.page_count(pdf_path)
+            pages_wanted = min(page_count, max_pages) if max_pages else page_count
+            logger.info(
+                f"OCR {page_count} pages at {self.dpi} DPI "
+                f"({self.workers} workers, {self.page_window} pages/window)..."
             )
 
-            for i, image in enumerate(images):
-                try:
-                    # Run OCR on this page
-                    page_data = pytesseract.image_to_data(
-                        image,
-                        lang=self.language,
-                        config=self.TESSERACT_CONFIG,
-                        output_type=pytesseract.Output.DICT
-                    )
-
-                    # Extract text and calculate confidence
-                    page_text = pytesseract.image_to_string(
-                        image,
-                        lang=self.language,
-                        config=self.TESSERACT_CONFIG
-                    )
-
-                    # Calculate average confidence for this page
-                    page_confs = [
-                        int(c) for c in page_data['conf']
-                        if c != '-1' and str(c).isdigit()
-                    ]
-                    if page_confs:
-                        page_confidence = sum(page_confs) / len(page_confs) / 100.0
-                        confidences.append(page_confidence)
-
-                    all_text.append(page_text)
+            pages = self.iter_pages(pdf_path, max_pages=max_pages, page_count=page_count)
+            try:
+                for page in pages:
+                    if page.error:
+                        logger.warning(page.error)
+                        errors.append(page.error)
+                        continue
+
+                    if page.confidence is not None:
+                        confidences.append(page.confidence)
+                    all_text.append(page.text)
+                    total_chars += len(page.text)
                     pages_processed += 1
 
                     logger.debug(
-                        f"Page {i+1}: {len(page_text)} chars, "
-                        f"confidence={page_confidence:.2f}" if page_confs else f"Page {i+1}: {len(page_text)} chars"
+                        f"Page {page.page_number}: {len(page.text)} chars, "
+                        f"confidence={page.confidence:.2f}" if page.confidence is not None
+                        else f"Page {page.page_number}: {len(page.text)} chars"
                     )
 
-                except Exception as e:
-                    error_msg = f"Error on page {i+1}: {e}"
-                    logger.warning(error_msg)
-                    errors.append(error_msg)
+                    if target_chars and total_chars >= target_chars:
+                        confidence = sum(confidences) / len(confidences) if confidences else 0.0
+                        if confidence >= target_confidence:
+                            stopped_early = page.page_number < pages_wanted
+                            break
+            finally:
+                pages.close()
 
             # Calculate overall confidence
             overall_confidence = sum(confidences) / len(confidences) if confidences else 0.0
@@ -263,6 +447,7 @@ class OCRExtractor:
             logger.info(
                 f"OCR complete: {pages_processed} pages, "
                 f"{len(combined_text)} chars, confidence={overall_confidence:.2f}"
+                + (" (stopped early)" if stopped_early else "")
             )
 
             return OCRResult(
@@ -271,6 +456,8 @@ class OCRExtractor:
                 pages_processed=pages_processed,
                 method='tesseract',
                 errors=errors if errors else None,
+                page_count=page_count,
+                stopped_early=stopped_early,
             )
 
         except Exception as e:
@@ -281,13 +468,16 @@ class OCRExtractor:
                 pages_processed=pages_processed,
                 method='tesseract',
                 errors=[str(e)],
+                page_count=page_count,
             )
 
     def extract(
         self,
         pdf_path: str,
         force_ocr: bool = False,
-        max_pages: Optional[int] = None
+        max_pages: Optional[int] = None,
+        target_chars: Optional[int] = None,
+        target_confidence: float = 0.0,
     ) -> OCRResult:
         """Extract text from PDF, using OCR if needed.
 
@@ -298,6 +488,8 @@ class OCRExtractor:
             pdf_path: Path to PDF file
             force_ocr: Always use OCR even if native extraction works
             max_pages: Maximum pages to OCR (None = all)
+            target_chars: Stop OCR once this many characters are extracted
+            target_confidence: Minimum average confidence for an early stop
 
         Returns:
             OCRResult with extracted text
@@ -324,7 +516,12 @@ class OCRExtractor:
 
         # Run OCR
         logger.info(f"Running OCR on {'forced' if force_ocr else 'scanned'} PDF: {pdf_path}")
-        return self.extract_with_tesseract(pdf_path, max_pages)
+        return self.extract_with_tesseract(
+            pdf_path,
+            max_pages,
+            target_chars=target_chars,
+            target_confidence=target_confidence,
+        )
 
 
 # Module-level singleton
@@ -357,6 +554,8 @@ def extract_text_ocr(pdf_path: str, force: bool = False) -> Tuple[str, dict]:
         'ocr_confidence': result.confidence,
         'ocr_method': result.method,
         'ocr_pages_processed': result.pages_processed,
+        'ocr_page_count': result.page_count,
+        'ocr_stopped_early': result.stopped_early,
     }
 
     if result.errors:
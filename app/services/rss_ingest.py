@@ -1,14 +1,17 @@
 
-import hashlib, uuid, datetime, re, json, os, logging
-from typing import List, Dict, Any, Optional
+import hashlib, uuid, datetime, re, json, os, logging, threading
+from collections import OrderedDict
+from typing import List, Dict, Any, Iterable, Optional
 from xml.etree import ElementTree as ET
 
 import requests
-from ..models.db import insert_rss_items, upsert_rss_source, update_rss_source_poll_time
+from ..models.db import (insert_rss_items, upsert_rss_source, update_rss_source_poll_time, existing_rss_item_ids,
+                         published_timestamp)
 from ..pacer_auth import pacer_client
 from bs4 import BeautifulSoup
 from .doc_discovery import get_discovery_service
 from .doc_discovery_config import get_discovery_config
+from .docket_extract import extractor
 
 logger = logging.getLogger(__name__)
 
@@ -21,167 +24,46 @@ def fetch_rss(url: str) -> str:
     resp.raise_for_status()
     return resp.text
 
+# Field extractors; the compiled patterns live in docket_extract
+
 def parse_case_number(text: str) -> Optional[str]:
-    if not text:
-        return None
-    m = re.search(r"\b\d+:\d{2}-(cv|cr|bk|ap|mc|md)-\d{3,6}\b", text, flags=re.IGNORECASE)
-    return m.group(0) if m else None
+    return extractor.case_number(text)
 
 def parse_case_number_parts(case_number: Optional[str]) -> Optional[dict]:
-    if not case_number:
-        return None
-    # Supports optional defendant index suffix like -3 in criminal cases
-    m = re.match(r"^(?:(\d+):)?(\d{2})-(cv|cr|bk|ap|mc|md)-(\d{3,6})(?:-(\d+))?$", case_number, flags=re.IGNORECASE)
-    if not m:
-        return None
-    office, yy, ctype, seq, d_idx = m.groups()
-    year = int("20" + yy) if len(yy) == 2 else int(yy)
-    parts = {"office": office, "year": year, "type": ctype.lower(), "sequence": int(seq)}
-    if office and office.isdigit():
-        parts["division_number"] = int(office)
-    if d_idx:
-        parts["defendant_index"] = int(d_idx)
-    return parts
+    return extractor.case_number_parts(case_number)
 
 def extract_case_type(case_number: Optional[str]) -> Optional[str]:
     """Extract case type from case number (cv, cr, bk, ap, mc, md)"""
-    if not case_number:
-        return None
-    m = re.search(r"-(cv|cr|bk|ap|mc|md)-", case_number, flags=re.IGNORECASE)
-    return m.group(1).lower() if m else None
+    return extractor.case_type(case_number)
 
 def extract_judge_name(text: str) -> Optional[str]:
     """Extract judge name from title or summary"""
-    if not text:
-        return None
-
-    # Common patterns for judge mentions
-    patterns = [
-        r"(?:Judge|J\.|Magistrate Judge|Chief Judge|District Judge)\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)",
-        r"(?:Hon\.|Honorable)\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)",
-        r"Before:\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)",
-        r"Assigned to:\s*(?:Judge|Magistrate Judge)\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)",
-    ]
-
-    for pattern in patterns:
-        match = re.search(pattern, text)
-        if match:
-            name = match.group(1).strip()
-            # Filter out common false positives
-            if name and len(name) > 3 and name not in ["Court", "States", "United", "Federal"]:
-                return name
-
-    return None
+    return extractor.judge_name(text)
 
 def extract_nature_of_suit(summary: str) -> Optional[str]:
     """Extract nature of suit from summary (employment, contract, civil rights, etc)"""
-    if not summary:
-        return None
-
-    # Common case categories
-    categories = {
-        "Civil Rights": r"civil rights|discrimination|§\s*1983|civil liberties",
-        "Employment": r"employment|wrongful termination|EEOC|workplace|labor",
-        "Contract": r"contract|breach|agreement|warranty",
-        "Intellectual Property": r"patent|trademark|copyright|IP|infringement",
-        "Securities": r"securities|SEC|stock|insider trading",
-        "Bankruptcy": r"bankruptcy|debtor|creditor|chapter \d+",
-        "Habeas Corpus": r"habeas corpus|writ|detention",
-        "Immigration": r"immigration|deportation|asylum|visa",
-        "Personal Injury": r"personal injury|negligence|tort|malpractice",
-        "Real Property": r"real property|foreclosure|eviction|landlord",
-        "Antitrust": r"antitrust|monopoly|price fixing",
-        "Consumer": r"consumer|FDCPA|TCPA|fair credit",
-    }
-
-    for category, pattern in categories.items():
-        if re.search(pattern, summary, re.IGNORECASE):
-            return category
-
-    return None
+    return extractor.nature_of_suit(summary)
 
 def parse_nos_code(text: str) -> Optional[dict]:
-    if not text:
-        return None
-    m = re.search(r"Nature of Suit\s*:?\s*(\d{3})", text, re.IGNORECASE) or re.search(r"\bNOS\s*(\d{3})\b", text)
-    if not m:
-        return None
-    code = m.group(1)
-    labels = {
-        "190": "Contract Other",
-        "195": "Contract Product Liability",
-        "315": "Airplane Product Liability",
-        "365": "Personal Injury Product Liability",
-        "440": "Civil Rights Other",
-        "442": "Employment Civil Rights",
-        "443": "Housing/Accommodations",
-        "530": "Habeas Corpus",
-        "820": "Copyright",
-        "830": "Patent",
-        "840": "Trademark",
-        "850": "Securities/Commodities/Exchange",
-    }
-    return {"code": code, "label": labels.get(code)}
+    return extractor.nos_code(text)
 
 def parse_cause_of_action(text: str) -> Optional[str]:
-    if not text:
-        return None
-    m = re.search(r"Cause(?: of Action)?\s*:?\s*([0-9A-Za-z:./\- ]{3,20})", text, re.IGNORECASE)
-    if m:
-        return m.group(1).strip()
-    m2 = re.search(r"\b(\d{2}:\d{3,4})\b", text)
-    return m2.group(1) if m2 else None
+    return extractor.cause_of_action(text)
 
 def parse_parties(title: str) -> Optional[dict]:
-    if not title:
-        return None
-    # Strip leading case number (with optional defendant index) and trailing section after names
-    t = re.sub(r"^\s*\d+:\d{2}-(cv|cr|bk|ap|mc|md)-\d{3,6}(?:-\d+)?\s+", "", title, flags=re.IGNORECASE)
-    # Split on common vs patterns
-    m = re.split(r"\s+(v\.?|vs\.?|versus)\s+", t, flags=re.IGNORECASE)
-    if len(m) >= 3:
-        left = m[0].split(" - ")[0].strip()
-        right = " ".join(m[2:]).split(" - ")[0].strip()
-        return {"plaintiffs": [left], "defendants": [right]}
-    return None
+    return extractor.parties(title)
 
 def parse_doc_number(text: str) -> Optional[int]:
-    if not text:
-        return None
-    m = re.search(r"\bDoc(?:ument)?\s*#\s*(\d+)\b", text, re.IGNORECASE) or re.search(r"\bdocument number\s*(\d+)\b", text, re.IGNORECASE)
-    return int(m.group(1)) if m else None
+    return extractor.doc_number(text)
 
 def classify_event_type(text: str) -> Optional[str]:
-    if not text:
-        return None
-    t = text.lower()
-    if "complaint" in t or "case opened" in t or "indictment" in t:
-        return "case_opening"
-    if "assigned to" in t or "case assigned" in t:
-        return "assignment"
-    if "motion" in t:
-        return "motion"
-    if "order" in t:
-        return "order"
-    if "judgment" in t:
-        return "judgment"
-    if "notice" in t or "summons" in t:
-        return "notice"
-    if "transfer" in t:
-        return "transfer"
-    return "docket_event"
+    return extractor.event_type(text)
 
 def parse_entry_number_from_link(link: str) -> Optional[int]:
-    if not link:
-        return None
-    m = re.search(r"[#&]?entry[-_=](\d+)", link, re.IGNORECASE)
-    return int(m.group(1)) if m else None
+    return extractor.entry_number(link)
 
 def extract_doc1_url(text: str) -> Optional[str]:
-    if not text:
-        return None
-    m = re.search(r"https?://[^\s\"']+/doc1/[^\s\"'<>]+", text)
-    return m.group(0) if m else None
+    return extractor.doc1_url(text)
 
 def should_fetch_outside() -> bool:
     return os.getenv("RSS_FETCH_OUTSIDE", "false").lower() == "true"
@@ -216,108 +98,135 @@ def fetch_outside_excerpt(link: str) -> Optional[str]:
         return None
     return None
 
-def parse_rss(xml_text: str, source_id: str, court_code: Optional[str]) -> List[Dict[str, Any]]:
-    root = ET.fromstring(xml_text)
-    items = []
+class SeenItems:
+    """Bounded per-source LRU of item ids already stored, backed by rss_items.
+
+    Lets parse_rss skip the metadata extractors for items that were ingested
+    on a previous poll (most of a steady-state CM/ECF feed).
+    """
+
+    def __init__(self, max_per_source: int = 2000):
+        self.max_per_source = max_per_source
+        self._by_source: Dict[str, "OrderedDict[str, None]"] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.db_hits = 0
+        self.misses = 0
+
+    def _remember(self, source_id: str, ids: Iterable[str]) -> None:
+        lru = self._by_source.setdefault(source_id, OrderedDict())
+        for item_id in ids:
+            lru[item_id] = None
+            lru.move_to_end(item_id)
+        while len(lru) > self.max_per_source:
+            lru.popitem(last=False)
+
+    def filter_new(self, source_id: str, ids: List[str]) -> set:
+        """Return the subset of ids not seen before (checks memory, then the database)."""
+        with self._lock:
+            lru = self._by_source.get(source_id) or {}
+            unknown = [i for i in ids if i not in lru]
+            if lru:
+                for i in ids:
+                    if i in lru:
+                        lru.move_to_end(i)
+            self.hits += len(ids) - len(unknown)
+        if not unknown:
+            return set()
+        stored = existing_rss_item_ids(unknown)
+        with self._lock:
+            self._remember(source_id, stored)
+            self.db_hits += len(stored)
+            self.misses += len(set(unknown) - stored)
+        return set(unknown) - stored
+
+    def mark(self, items: Iterable[Dict[str, Any]]) -> None:
+        """Record stored items as seen."""
+        by_source: Dict[str, List[str]] = {}
+        for it in items:
+            by_source.setdefault(it.get("source_id"), []).append(it["id"])
+        with self._lock:
+            for source_id, ids in by_source.items():
+                self._remember(source_id, ids)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "db_hits": self.db_hits, "misses": self.misses,
+                    "sources": len(self._by_source),
+                    "tracked_ids": sum(len(v) for v in self._by_source.values())}
+
+
+seen_items = SeenItems(int(os.getenv("RSS_SEEN_CACHE_PER_SOURCE", "2000")))
+
+def incremental_enabled() -> bool:
+    return os.getenv("RSS_INCREMENTAL", "true").lower() == "true"
+
+def _build_item(item_id: str, title: str, summary: str, link: str, pub: str,
+                source_id: str, court_code: Optional[str]) -> Dict[str, Any]:
+    """Run the metadata extractors over one feed entry."""
+    fields = extractor.extract(title, summary, link)
+    meta = {k: fields[k] for k in (
+        "case_parts", "nos", "cause_of_action", "parties", "doc_number", "event_type",
+        "is_new_case", "docket_entry_number", "doc1_url", "document_type", "motion_type",
+    )}
+    return {
+        "id": item_id,
+        "source_id": source_id,
+        "court_code": court_code,
+        "case_number": fields["case_number"],
+        "case_type": fields["case_type"],
+        "judge_name": fields["judge_name"],
+        "nature_of_suit": fields["nature_of_suit"],
+        "title": title,
+        "summary": summary,
+        "link": link,
+        "published": pub,
+        "published_ts": published_timestamp(pub),
+        "created_at": datetime.datetime.utcnow().isoformat(),
+        "metadata_json": json.dumps(meta, ensure_ascii=False)
+    }
 
+def _feed_entries(root) -> List[tuple]:
+    """(title, summary, link, pub) for each RSS item, or Atom entry as a fallback."""
     channel = root.find("channel")
     if channel is not None:
-        for it in channel.findall("item"):
-            title = (it.findtext("title") or "").strip()
-            summary = (it.findtext("description") or "").strip()
-            link = (it.findtext("link") or "").strip()
-            pub = (it.findtext("pubDate") or "").strip()
-            cn = parse_case_number(title) or parse_case_number(summary) or None
-            case_type = extract_case_type(cn)
-            judge_name = extract_judge_name(title) or extract_judge_name(summary)
-            nature_of_suit = extract_nature_of_suit(title + " " + summary)
-            parts = parse_case_number_parts(cn)
-            nos = parse_nos_code(summary)
-            cause = parse_cause_of_action(summary)
-            parties = parse_parties(title)
-            doc_no = parse_doc_number(title + " " + summary)
-            event_type = classify_event_type(title + " " + summary)
-            entry_no = parse_entry_number_from_link(link)
-            has_numbers = (doc_no is not None) or (entry_no is not None)
-            is_new = bool((doc_no == 1) or (entry_no == 1) or (not has_numbers and event_type == "case_opening"))
-            item_id = hashlib.sha256((title + link + pub).encode("utf-8")).hexdigest()
-            meta = {
-                "case_parts": parts,
-                "nos": nos,
-                "cause_of_action": cause,
-                "parties": parties,
-                "doc_number": doc_no,
-                "event_type": event_type,
-                "is_new_case": is_new,
-                "docket_entry_number": entry_no,
-                "doc1_url": extract_doc1_url(link or '') or extract_doc1_url(summary or ''),
-            }
-            items.append({
-                "id": item_id,
-                "source_id": source_id,
-                "court_code": court_code,
-                "case_number": cn,
-                "case_type": case_type,
-                "judge_name": judge_name,
-                "nature_of_suit": nature_of_suit,
-                "title": title,
-                "summary": summary,
-                "link": link,
-                "published": pub,
-                "created_at": datetime.datetime.utcnow().isoformat(),
-                "metadata_json": json.dumps(meta, ensure_ascii=False)
-            })
-        return items
+        return [
+            ((it.findtext("title") or "").strip(),
+             (it.findtext("description") or "").strip(),
+             (it.findtext("link") or "").strip(),
+             (it.findtext("pubDate") or "").strip())
+            for it in channel.findall("item")
+        ]
 
     # Atom fallback (rare for CM/ECF)
     ns = {"atom":"http://www.w3.org/2005/Atom"}
+    entries = []
     for entry in root.findall("atom:entry", ns):
         title = (entry.findtext("atom:title", default="", namespaces=ns) or "").strip()
         summary = (entry.findtext("atom:summary", default="", namespaces=ns) or "").strip()
         link_el = entry.find("atom:link", ns)
         link = link_el.get("href") if link_el is not None else ""
         pub = (entry.findtext("atom:updated", default="", namespaces=ns) or "").strip()
-        cn = parse_case_number(title) or parse_case_number(summary) or None
-        case_type = extract_case_type(cn)
-        judge_name = extract_judge_name(title) or extract_judge_name(summary)
-        nature_of_suit = extract_nature_of_suit(title + " " + summary)
-        parts = parse_case_number_parts(cn)
-        nos = parse_nos_code(summary)
-        cause = parse_cause_of_action(summary)
-        parties = parse_parties(title)
-        doc_no = parse_doc_number(title + " " + summary)
-        event_type = classify_event_type(title + " " + summary)
-        entry_no = parse_entry_number_from_link(link)
-        has_numbers = (doc_no is not None) or (entry_no is not None)
-        is_new = bool((doc_no == 1) or (entry_no == 1) or (not has_numbers and event_type == "case_opening"))
+        entries.append((title, summary, link, pub))
+    return entries
+
+def parse_rss(xml_text: str, source_id: str, court_code: Optional[str],
+              incremental: bool = False) -> List[Dict[str, Any]]:
+    """Parse a feed into rss_items rows.
+
+    With incremental=True only entries whose id is not already in the seen
+    set (memory LRU, then rss_items) are returned, and the extractors run
+    only on those.
+    """
+    root = ET.fromstring(xml_text)
+    entries = []
+    for title, summary, link, pub in _feed_entries(root):
         item_id = hashlib.sha256((title + link + pub).encode("utf-8")).hexdigest()
-        meta = {
-            "case_parts": parts,
-            "nos": nos,
-            "cause_of_action": cause,
-            "parties": parties,
-            "doc_number": doc_no,
-            "event_type": event_type,
-            "is_new_case": is_new,
-            "docket_entry_number": entry_no,
-            "doc1_url": extract_doc1_url(link or '') or extract_doc1_url(summary or ''),
-        }
-        items.append({
-            "id": item_id,
-            "source_id": source_id,
-            "court_code": court_code,
-            "case_number": cn,
-            "case_type": case_type,
-            "judge_name": judge_name,
-            "nature_of_suit": nature_of_suit,
-            "title": title,
-            "summary": summary,
-            "link": link,
-            "published": pub,
-            "created_at": datetime.datetime.utcnow().isoformat(),
-            "metadata_json": json.dumps(meta, ensure_ascii=False)
-        })
-    return items
+        entries.append((item_id, title, summary, link, pub))
+    if incremental and entries:
+        new_ids = seen_items.filter_new(source_id, [e[0] for e in entries])
+        entries = [e for e in entries if e[0] in new_ids]
+    return [_build_item(*e, source_id, court_code) for e in entries]
 
 def subscribe(court_code: str, url: str, label: str | None = None) -> Dict[str, Any]:
     sid = str(uuid.uuid5(uuid.NAMESPACE_URL, url))
@@ -326,7 +235,15 @@ def subscribe(court_code: str, url: str, label: str | None = None) -> Dict[str,
 
 def poll(source: Dict[str, Any]) -> int:
     xml_text = fetch_rss(source["url"])
-    items = parse_rss(xml_text, source["id"], source.get("court_code"))
+    items = parse_rss(xml_text, source["id"], source.get("court_code"), incremental=incremental_enabled())
+    enrich_items(items)
+    insert_rss_items(items)
+    seen_items.mark(items)
+    update_rss_source_poll_time(source["id"], datetime.datetime.utcnow().isoformat())
+    return len(items)
+
+def enrich_items(items: List[Dict[str, Any]]) -> None:
+    """Outside-page excerpts and document discovery for freshly parsed items (mutates in place)."""
     # Optional enrichment from public outside pages (no PACER login)
     if should_fetch_outside():
         for it in items:
@@ -425,6 +342,3 @@ def poll(source: Dict[str, Any]) -> int:
                     fetched += 1
             except Exception:
                 continue
-    insert_rss_items(items)
-    update_rss_source_poll_time(source["id"], datetime.datetime.utcnow().isoformat())
-    return len(items)
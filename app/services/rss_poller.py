@@ -0,0 +1,184 @@
+"""Concurrent RSS polling engine for CM/ECF court feeds.
+
+Fetches many feeds at once on a bounded thread pool, with a per-host
+concurrency cap, per-source timeouts, jittered start times and conditional
+GET (ETag / If-Modified-Since validators stored on rss_sources). Parsed items
+from every feed are written with a single bulk insert at the end of the sweep.
+"""
+import datetime
+import logging
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from ..models.db import insert_rss_items, release_conn, update_rss_sources_poll_state
+from . import rss_ingest
+
+logger = logging.getLogger(__name__)
+
+RSS_POLL_WORKERS = int(os.getenv("RSS_POLL_WORKERS", "32"))
+RSS_POLL_PER_HOST = int(os.getenv("RSS_POLL_PER_HOST", "2"))
+RSS_POLL_CONNECT_TIMEOUT = float(os.getenv("RSS_POLL_CONNECT_TIMEOUT", "5"))
+RSS_POLL_READ_TIMEOUT = float(os.getenv("RSS_POLL_READ_TIMEOUT", "15"))
+RSS_POLL_JITTER = float(os.getenv("RSS_POLL_JITTER", "0.5"))
+
+USER_AGENT = "Mozilla/5.0 (compatible; CourtRSS/1.0)"
+
+
+class RSSPoller:
+    """Polls a set of RSS sources concurrently.
+
+    Each worker fetches and parses one feed; enrichment (outside excerpts,
+    document discovery) and the database writes run on the calling thread
+    once all fetches have finished.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = RSS_POLL_WORKERS,
+        per_host: int = RSS_POLL_PER_HOST,
+        connect_timeout: float = RSS_POLL_CONNECT_TIMEOUT,
+        read_timeout: float = RSS_POLL_READ_TIMEOUT,
+        jitter: float = RSS_POLL_JITTER,
+        incremental: Optional[bool] = None,
+    ):
+        self.max_workers = max(1, max_workers)
+        self.per_host = max(1, per_host)
+        self.timeout = (connect_timeout, read_timeout)
+        self.jitter = max(0.0, jitter)
+        self.incremental = rss_ingest.incremental_enabled() if incremental is None else incremental
+        self.session = requests.Session()
+        # One urllib3 pool per court host; ~94 district courts
+        adapter = HTTPAdapter(pool_connections=128, pool_maxsize=self.per_host)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers["User-Agent"] = USER_AGENT
+        self._host_limits: Dict[str, threading.BoundedSemaphore] = {}
+        self._host_lock = threading.Lock()
+
+    def _host_limit(self, url: str) -> threading.BoundedSemaphore:
+        host = urlparse(url).netloc.lower()
+        with self._host_lock:
+            sem = self._host_limits.get(host)
+            if sem is None:
+                sem = self._host_limits[host] = threading.BoundedSemaphore(self.per_host)
+            return sem
+
+    def fetch(self, source: Dict[str, Any]) -> Dict[str, Any]:
+        """Fetch and parse one source. Never raises; errors are reported in the result."""
+        url = source["url"]
+        result: Dict[str, Any] = {
+            "source_id": source["id"],
+            "court_code": source.get("court_code"),
+            "status": "ok",
+            "http_status": None,
+            "latency_ms": None,
+            "items": 0,
+            "etag": source.get("etag"),
+            "last_modified": source.get("last_modified"),
+        }
+        if self.jitter:
+            # Spread requests out so a sweep doesn't hit every court in the same instant
+            time.sleep(random.uniform(0, self.jitter))
+
+        started = time.monotonic()
+        try:
+            if url.startswith("file://"):
+                xml_text = rss_ingest.fetch_rss(url)
+            else:
+                headers = {}
+                if source.get("etag"):
+                    headers["If-None-Match"] = source["etag"]
+                if source.get("last_modified"):
+                    headers["If-Modified-Since"] = source["last_modified"]
+                with self._host_limit(url):
+                    resp = self.session.get(url, headers=headers, timeout=self.timeout)
+                result["http_status"] = resp.status_code
+                if resp.status_code == 304:
+                    result["status"] = "not_modified"
+                    return result
+                resp.raise_for_status()
+                xml_text = resp.text
+                result["etag"] = resp.headers.get("ETag") or result["etag"]
+                result["last_modified"] = resp.headers.get("Last-Modified") or result["last_modified"]
+            result["parsed"] = rss_ingest.parse_rss(xml_text, source["id"], source.get("court_code"),
+                                                    incremental=self.incremental)
+            result["items"] = len(result["parsed"])
+        except Exception as e:
+            result["status"] = "error"
+            result["error"] = str(e)
+        finally:
+            result["latency_ms"] = round((time.monotonic() - started) * 1000, 1)
+            release_conn()  # Seen-item lookups check a connection out on this pool thread
+        return result
+
+    def poll(self, sources: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Poll every source, store new items, and return per-source results plus totals."""
+        started = time.monotonic()
+        if not sources:
+            return {"polled_sources": 0, "items_ingested": 0, "items_new": 0, "not_modified": 0,
+                    "errors": 0, "results": []}
+
+        workers = min(self.max_workers, len(sources))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="rss-poll") as pool:
+            results = list(pool.map(self.fetch, sources))
+
+        now = datetime.datetime.utcnow().isoformat()
+        all_items: List[Dict[str, Any]] = []
+        polled: List[Dict[str, Any]] = []
+        for source, res in zip(sources, results):
+            parsed = res.pop("parsed", None)
+            if parsed:
+                try:
+                    rss_ingest.enrich_items(parsed)
+                except Exception as e:
+                    logger.error(f"Enrichment failed for {res['court_code']}: {e}")
+                all_items.extend(parsed)
+            if res["status"] != "error":
+                polled.append({**source, "last_polled": now,
+                               "etag": res.pop("etag"), "last_modified": res.pop("last_modified")})
+            else:
+                res.pop("etag", None)
+                res.pop("last_modified", None)
+
+        counts = insert_rss_items(all_items) if all_items else {"inserted": 0, "updated": 0, "skipped": 0}
+        rss_ingest.seen_items.mark(all_items)
+        if polled:
+            update_rss_sources_poll_state(polled)
+
+        errors = sum(1 for r in results if r["status"] == "error")
+        latencies = sorted(r["latency_ms"] for r in results)
+        return {
+            "polled_sources": len(sources),
+            "items_ingested": len(all_items),
+            "items_new": counts["inserted"],
+            "not_modified": sum(1 for r in results if r["status"] == "not_modified"),
+            "errors": errors,
+            "duration_ms": round((time.monotonic() - started) * 1000, 1),
+            "latency_ms_p50": latencies[len(latencies) // 2],
+            "latency_ms_max": latencies[-1],
+            "results": results,
+        }
+
+
+_poller: Optional[RSSPoller] = None
+
+
+def get_poller() -> RSSPoller:
+    """Shared poller (keeps its HTTP connection pool between sweeps)."""
+    global _poller
+    if _poller is None:
+        _poller = RSSPoller()
+    return _poller
+
+
+def poll_sources(sources: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Poll sources concurrently with the shared poller."""
+    return get_poller().poll(sources)
@@ -0,0 +1,552 @@
+"""Asynchronous webhook delivery.
+
+Events for webhook subscribers are never sent on the request thread:
+
+- enqueue()/publish() insert deliveries into the webhook_deliveries table
+  (the persistent outbound queue, shared by all workers) and return
+- a dispatcher thread claims due deliveries and hands them to a bounded
+  worker pool; each endpoint (scheme + host) has at most
+  WEBHOOK_ENDPOINT_CONCURRENCY requests in flight, so one slow subscriber
+  can't take every worker
+- deliveries due for the same webhook are sent together, one POST with a
+  "batch" envelope, and a queued event with the same coalesce key replaces
+  the undelivered one instead of adding another
+- requests go through one pooled HTTP session (keep-alive connection reuse)
+- failures are retried with ExponentialBackoff per endpoint; while an
+  endpoint is backing off none of its deliveries are attempted, and after
+  WEBHOOK_MAX_ATTEMPTS a delivery is marked failed
+
+Claims carry a lease, so deliveries held by a worker that died are picked
+up again once the lease expires.
+"""
+import hashlib
+import hmac
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional
+from urllib.parse import urlsplit
+
+from ..auth_utils import ExponentialBackoff
+from ..models.db import get_conn, release_conn
+
+logger = logging.getLogger(__name__)
+
+WEBHOOK_WORKERS = int(os.getenv("WEBHOOK_WORKERS", "8"))
+WEBHOOK_ENDPOINT_CONCURRENCY = int(os.getenv("WEBHOOK_ENDPOINT_CONCURRENCY", "2"))
+WEBHOOK_BATCH_SIZE = int(os.getenv("WEBHOOK_BATCH_SIZE", "50"))
+WEBHOOK_MAX_ATTEMPTS = int(os.getenv("WEBHOOK_MAX_ATTEMPTS", "8"))
+WEBHOOK_TIMEOUT = float(os.getenv("WEBHOOK_TIMEOUT", "10"))
+WEBHOOK_POLL_INTERVAL = float(os.getenv("WEBHOOK_POLL_INTERVAL", "1"))
+WEBHOOK_BACKOFF_INITIAL = float(os.getenv("WEBHOOK_BACKOFF_INITIAL", "2"))
+WEBHOOK_BACKOFF_MAX = float(os.getenv("WEBHOOK_BACKOFF_MAX", "300"))
+WEBHOOK_KEEP_DELIVERED_HOURS = float(os.getenv("WEBHOOK_KEEP_DELIVERED_HOURS", "24"))
+
+# A claim outlives the request timeout by a wide margin before others may retake it
+LEASE_SECONDS = WEBHOOK_TIMEOUT * 3 + 30
+PURGE_INTERVAL = 600
+USER_AGENT = "SettlementWatch-Webhooks/1.0"
+
+SCHEMA = [
+    """create table if not exists webhook_deliveries (
+        id integer primary key autoincrement,
+        webhook_id text not null,
+        url text not null,
+        event text,
+        coalesce_key text,
+        payload text not null,
+        status text not null default 'pending',
+        attempts integer not null default 0,
+        next_attempt_at real not null,
+        claim text,
+        lease_until real,
+        last_error text,
+        response_status integer,
+        created_at text,
+        finished_at real
+    )""",
+    "create index if not exists idx_webhook_deliveries_due on webhook_deliveries(status, next_attempt_at)",
+    "create index if not exists idx_webhook_deliveries_webhook on webhook_deliveries(webhook_id, status, id)",
+    "create index if not exists idx_webhook_deliveries_claim on webhook_deliveries(claim)",
+    "create index if not exists idx_webhook_deliveries_coalesce on webhook_deliveries(webhook_id, coalesce_key, status)",
+]
+
+# Due: pending and not before its retry time, or claimed by a worker whose lease ran out
+_DUE = "((status = 'pending' and next_attempt_at <= ?) or (status = 'sending' and lease_until < ?))"
+
+
+def endpoint_key(url: str) -> str:
+    """Concurrency / backoff bucket for a webhook URL (scheme and host)."""
+    parts = urlsplit(url or "")
+    return f"{parts.scheme}://{parts.netloc}".lower()
+
+
+def subscribed(webhook: Dict[str, Any], event: str, state: Optional[str] = None) -> bool:
+    """Whether an enabled webhook wants an event (for a given state, if any)."""
+    if not webhook.get("enabled", True):
+        return False
+    events = webhook.get("events") or []
+    if event not in events and "all" not in events:
+        return False
+    states = webhook.get("states", "all")
+    if state is None or states == "all" or not states:
+        return True
+    return state.upper() in [str(s).upper() for s in states]
+
+
+def sign(secret: str, body: bytes) -> str:
+    """X-Webhook-Signature value: hex HMAC-SHA256 of the request body."""
+    return "sha256=" + hmac.new(secret.encode("utf-8"), body, hashlib.sha256).hexdigest()
+
+
+class _Endpoint:
+    """In-process delivery state and counters for one endpoint."""
+
+    def __init__(self):
+        self.in_flight = 0
+        self.backoff = ExponentialBackoff(initial_delay=WEBHOOK_BACKOFF_INITIAL, max_delay=WEBHOOK_BACKOFF_MAX)
+        self.retry_at = 0.0
+        self.requests = 0
+        self.delivered = 0
+        self.failed_requests = 0
+        self.last_status: Optional[int] = None
+        self.last_error: Optional[str] = None
+        self.latencies: Deque[float] = deque(maxlen=100)
+
+    def stats(self) -> Dict[str, Any]:
+        latencies = sorted(self.latencies)
+        return {
+            "in_flight": self.in_flight,
+            "requests": self.requests,
+            "events_delivered": self.delivered,
+            "failed_requests": self.failed_requests,
+            "last_status": self.last_status,
+            "last_error": self.last_error,
+            "backoff_seconds": round(max(self.retry_at - time.time(), 0.0), 1),
+            "latency_ms_p50": round(latencies[len(latencies) // 2] * 1000, 1) if latencies else None,
+            "latency_ms_max": round(latencies[-1] * 1000, 1) if latencies else None,
+        }
+
+
+class WebhookDispatcher:
+    """Persistent webhook queue with a bounded delivery pool."""
+
+    def __init__(
+        self,
+        resolve: Callable[[str], Optional[Dict[str, Any]]],
+        on_delivered: Optional[Callable[[str, int], None]] = None,
+        workers: int = WEBHOOK_WORKERS,
+        endpoint_concurrency: int = WEBHOOK_ENDPOINT_CONCURRENCY,
+        batch_size: int = WEBHOOK_BATCH_SIZE,
+        max_attempts: int = WEBHOOK_MAX_ATTEMPTS,
+        timeout: float = WEBHOOK_TIMEOUT,
+        poll_interval: float = WEBHOOK_POLL_INTERVAL,
+        connect: Callable[[], Any] = get_conn,
+        session: Any = None,
+    ):
+        """
+        Args:
+            resolve: Returns the current webhook record for an ID (None if deleted)
+            on_delivered: Called with (webhook_id, events delivered) after a success
+            workers: Maximum concurrent deliveries
+            endpoint_concurrency: Maximum concurrent deliveries per endpoint
+            batch_size: Maximum events per request
+            max_attempts: Attempts before a delivery is marked failed
+            timeout: HTTP timeout in seconds
+            poll_interval: Seconds between queue scans when idle
+            connect: Returns the database connection to use
+            session: HTTP session (default: a pooled requests.Session)
+        """
+        self.resolve = resolve
+        self.on_delivered = on_delivered
+        self.workers = max(1, workers)
+        self.endpoint_concurrency = max(1, endpoint_concurrency)
+        self.batch_size = max(1, batch_size)
+        self.max_attempts = max(1, max_attempts)
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self._connect = connect
+        self._session = session
+        self._ready = False
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._endpoints: Dict[str, _Endpoint] = {}
+        self._in_flight = 0
+        self._last_purge = 0.0
+        self._stats = {
+            "enqueued": 0,
+            "coalesced": 0,
+            "requests": 0,
+            "batched_requests": 0,
+            "events_delivered": 0,
+            "failed_requests": 0,
+            "retries_scheduled": 0,
+            "dead_lettered": 0,
+        }
+
+    # -- queue ----------------------------------------------------------------
+
+    def _conn(self):
+        conn = self._connect()
+        if not self._ready:
+            with self._lock:
+                if not self._ready:
+                    with conn:
+                        for stmt in SCHEMA:
+                            conn.execute(stmt)
+                    self._ready = True
+        return conn
+
+    def enqueue(
+        self,
+        webhook: Dict[str, Any],
+        event: str,
+        payload: Dict[str, Any],
+        coalesce_key: Optional[str] = None,
+    ) -> Optional[int]:
+        """
+        Queue one event for a webhook.
+
+        Args:
+            webhook: Webhook record (id and url)
+            event: Event name
+            payload: JSON body for the event
+            coalesce_key: Replace an undelivered event with the same key
+                for this webhook instead of queueing another
+
+        Returns:
+            Delivery ID (None when the event was merged into a queued one)
+        """
+        body = json.dumps(payload, default=str)
+        conn = self._conn()
+        with conn:
+            if coalesce_key is not None:
+                merged = conn.execute(
+                    "update webhook_deliveries set payload = ?, event = ? "
+                    "where webhook_id = ? and coalesce_key = ? and status = 'pending'",
+                    (body, event, webhook["id"], coalesce_key),
+                ).rowcount
+                if merged > 0:
+                    with self._lock:
+                        self._stats["coalesced"] += 1
+                    return None
+            delivery_id = conn.execute(
+                "insert into webhook_deliveries(webhook_id, url, event, coalesce_key, payload, "
+                "next_attempt_at, created_at) values(?, ?, ?, ?, ?, ?, ?)",
+                (webhook["id"], webhook["url"], event, coalesce_key, body, time.time(),
+                 datetime.utcnow().isoformat()),
+            ).lastrowid
+        with self._lock:
+            self._stats["enqueued"] += 1
+        self.start()
+        self._wake.set()
+        return delivery_id
+
+    def publish(
+        self,
+        webhooks: Iterable[Dict[str, Any]],
+        event: str,
+        data: Dict[str, Any],
+        state: Optional[str] = None,
+        coalesce_key: Optional[str] = None,
+    ) -> int:
+        """Queue an event for every subscribed webhook; returns how many were queued."""
+        queued = 0
+        for webhook in webhooks:
+            if not subscribed(webhook, event, state):
+                continue
+            payload = {
+                "event": event,
+                "webhook_id": webhook["id"],
+                "timestamp": datetime.utcnow().isoformat(),
+                "data": data,
+            }
+            self.enqueue(webhook, event, payload, coalesce_key=coalesce_key)
+            queued += 1
+        return queued
+
+    def cancel(self, webhook_id: str) -> int:
+        """Drop undelivered events for a webhook; returns how many."""
+        conn = self._conn()
+        with conn:
+            return max(conn.execute(
+                "update webhook_deliveries set status = 'cancelled', finished_at = ? "
+                "where webhook_id = ? and status = 'pending'",
+                (time.time(), webhook_id),
+            ).rowcount, 0)
+
+    # -- dispatch loop ----------------------------------------------------------
+
+    def start(self):
+        """Start the dispatcher thread (no-op if running)."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopping.clear()
+            self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="webhook-delivery")
+            self._thread = threading.Thread(target=self._run, name="webhook-dispatcher", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 10.0):
+        """Stop dispatching; waits for in-flight deliveries up to `timeout`."""
+        self._stopping.set()
+        self._wake.set()
+        thread, pool = self._thread, self._pool
+        if thread is not None:
+            thread.join(timeout)
+        if pool is not None:
+            pool.shutdown(wait=True)
+        self._thread = None
+
+    def _run(self):
+        while not self._stopping.is_set():
+            try:
+                self.dispatch_due()
+                if time.time() - self._last_purge > PURGE_INTERVAL:
+                    self.purge()
+            except Exception:
+                logger.exception("Webhook dispatch failed")
+            finally:
+                release_conn()  # Don't keep a pooled connection while idle
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+
+    def _endpoint(self, key: str) -> _Endpoint:
+        endpoint = self._endpoints.get(key)
+        if endpoint is None:
+            endpoint = self._endpoints[key] = _Endpoint()
+        return endpoint
+
+    def dispatch_due(self) -> int:
+        """Claim due deliveries and submit them to the pool; returns batches submitted."""
+        with self._lock:
+            capacity = self.workers - self._in_flight
+        if capacity <= 0:
+            return 0
+
+        now = time.time()
+        conn = self._conn()
+        rows = conn.execute(
+            f"select webhook_id, url, min(id) as first_id from webhook_deliveries where {_DUE} "
+            f"group by webhook_id order by first_id limit ?",
+            (now, now, capacity * 4),
+        ).fetchall()
+
+        submitted = 0
+        for row in rows:
+            key = endpoint_key(row["url"])
+            with self._lock:
+                endpoint = self._endpoint(key)
+                if (self._in_flight >= self.workers or endpoint.in_flight >= self.endpoint_concurrency
+                        or endpoint.retry_at > now):
+                    continue
+                endpoint.in_flight += 1
+                self._in_flight += 1
+            deliveries = self._claim(conn, row["webhook_id"], now)
+            if not deliveries:
+                self._release(endpoint)
+                continue
+            self._pool.submit(self._deliver, row["webhook_id"], key, deliveries)
+            submitted += 1
+        return submitted
+
+    def _claim(self, conn, webhook_id: str, now: float) -> List[Dict[str, Any]]:
+        claim = uuid.uuid4().hex
+        with conn:
+            conn.execute(
+                "update webhook_deliveries set status = 'sending', claim = ?, lease_until = ? "
+                f"where id in (select id from webhook_deliveries where webhook_id = ? and {_DUE} "
+                "order by id limit ?)",
+                (claim, now + LEASE_SECONDS, webhook_id, now, now, self.batch_size),
+            )
+        rows = conn.execute(
+            "select id, url, event, payload, attempts from webhook_deliveries where claim = ? order by id",
+            (claim,),
+        ).fetchall()
+        return [dict(r) for r in rows]
+
+    def _release(self, endpoint: _Endpoint):
+        with self._lock:
+            endpoint.in_flight -= 1
+            self._in_flight -= 1
+        self._wake.set()
+
+    # -- delivery ---------------------------------------------------------------
+
+    def _http(self):
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    import requests
+                    from requests.adapters import HTTPAdapter
+
+                    session = requests.Session()
+                    adapter = HTTPAdapter(pool_connections=self.workers, pool_maxsize=self.endpoint_concurrency)
+                    session.mount("https://", adapter)
+                    session.mount("http://", adapter)
+                    session.headers["User-Agent"] = USER_AGENT
+                    self._session = session
+        return self._session
+
+    def _deliver(self, webhook_id: str, key: str, deliveries: List[Dict[str, Any]]):
+        endpoint = self._endpoints[key]
+        ids = [d["id"] for d in deliveries]
+        try:
+            webhook = self.resolve(webhook_id)
+            if webhook is None or not webhook.get("enabled", True):
+                self._finish(ids, "cancelled", error="webhook deleted or disabled")
+                return
+
+            payloads = [json.loads(d["payload"]) for d in deliveries]
+            if len(payloads) == 1:
+                body_obj, event = payloads[0], deliveries[0]["event"]
+            else:
+                body_obj, event = {"event": "batch", "webhook_id": webhook_id, "count": len(payloads),
+                                   "events": payloads}, "batch"
+            body = json.dumps(body_obj, default=str).encode("utf-8")
+            headers = {
+                "Content-Type": "application/json",
+                "X-Webhook-Event": event,
+                "X-Webhook-Delivery": ",".join(str(i) for i in ids),
+            }
+            if webhook.get("secret"):
+                headers["X-Webhook-Signature"] = sign(webhook["secret"], body)
+
+            started = time.perf_counter()
+            status, error = None, None
+            try:
+                response = self._http().post(webhook.get("url") or deliveries[0]["url"], data=body,
+                                             headers=headers, timeout=self.timeout)
+                status = response.status_code
+                response.close()
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+            elapsed = time.perf_counter() - started
+
+            ok = status is not None and 200 <= status < 300
+            with self._lock:
+                endpoint.requests += 1
+                endpoint.latencies.append(elapsed)
+                endpoint.last_status = status
+                self._stats["requests"] += 1
+                if len(ids) > 1:
+                    self._stats["batched_requests"] += 1
+                if ok:
+                    endpoint.delivered += len(ids)
+                    endpoint.last_error = None
+                    endpoint.backoff.reset()
+                    endpoint.retry_at = 0.0
+                    self._stats["events_delivered"] += len(ids)
+                else:
+                    error = error or f"HTTP {status}"
+                    endpoint.failed_requests += 1
+                    endpoint.last_error = error
+                    self._stats["failed_requests"] += 1
+
+            if ok:
+                self._finish(ids, "delivered", response_status=status)
+                if self.on_delivered is not None:
+                    self.on_delivered(webhook_id, len(ids))
+                return
+
+            # Client errors other than timeouts / rate limits won't succeed on retry
+            if status is None or status >= 500 or status in (408, 429):
+                with self._lock:
+                    delay = endpoint.backoff.next_delay()
+                    endpoint.retry_at = time.time() + delay
+                self._retry(deliveries, error, status, delay)
+            else:
+                self._retry(deliveries, error, status, None)
+        except Exception:
+            logger.exception("Webhook delivery to %s failed", key)
+            self._retry(deliveries, "dispatcher error", None, WEBHOOK_BACKOFF_INITIAL)
+        finally:
+            self._release(endpoint)
+            release_conn()
+
+    def _finish(self, ids: List[int], status: str, error: Optional[str] = None,
+                response_status: Optional[int] = None):
+        conn = self._conn()
+        with conn:
+            conn.executemany(
+                "update webhook_deliveries set status = ?, attempts = attempts + 1, last_error = ?, "
+                "response_status = ?, finished_at = ?, claim = null, lease_until = null where id = ?",
+                [(status, error, response_status, time.time(), i) for i in ids],
+            )
+
+    def _retry(self, deliveries: List[Dict[str, Any]], error: str, response_status: Optional[int],
+               delay: Optional[float]):
+        """Reschedule after `delay` seconds, or fail outright (delay None / attempts used up)."""
+        retry, dead = [], []
+        for d in deliveries:
+            (dead if delay is None or d["attempts"] + 1 >= self.max_attempts else retry).append(d["id"])
+        if dead:
+            self._finish(dead, "failed", error=error, response_status=response_status)
+        if retry:
+            conn = self._conn()
+            with conn:
+                conn.executemany(
+                    "update webhook_deliveries set status = 'pending', attempts = attempts + 1, "
+                    "next_attempt_at = ?, last_error = ?, response_status = ?, claim = null, "
+                    "lease_until = null where id = ?",
+                    [(time.time() + delay, error, response_status, i) for i in retry],
+                )
+        with self._lock:
+            self._stats["retries_scheduled"] += len(retry)
+            self._stats["dead_lettered"] += len(dead)
+
+    # -- housekeeping / metrics ---------------------------------------------------
+
+    def purge(self) -> int:
+        """Delete finished deliveries older than WEBHOOK_KEEP_DELIVERED_HOURS."""
+        self._last_purge = time.time()
+        cutoff = self._last_purge - WEBHOOK_KEEP_DELIVERED_HOURS * 3600
+        conn = self._conn()
+        with conn:
+            return max(conn.execute(
+                "delete from webhook_deliveries where status in ('delivered', 'cancelled') and finished_at < ?",
+                (cutoff,),
+            ).rowcount, 0)
+
+    def deliveries(self, webhook_id: str, status: Optional[str] = None, limit: int = 50) -> List[Dict[str, Any]]:
+        """Most recent deliveries for a webhook."""
+        sql = ("select id, event, status, attempts, last_error, response_status, created_at, "
+               "next_attempt_at, finished_at from webhook_deliveries where webhook_id = ?")
+        params: List[Any] = [webhook_id]
+        if status:
+            sql += " and status = ?"
+            params.append(status)
+        sql += " order by id desc limit ?"
+        params.append(limit)
+        return [dict(r) for r in self._conn().execute(sql, tuple(params)).fetchall()]
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth by status, delivery counters and per-endpoint metrics."""
+        rows = self._conn().execute(
+            "select status, count(*) as n from webhook_deliveries group by status"
+        ).fetchall()
+        with self._lock:
+            stats = dict(self._stats)
+            endpoints = {key: endpoint.stats() for key, endpoint in self._endpoints.items()}
+            in_flight = self._in_flight
+        return {
+            "queue": {r["status"]: int(r["n"]) for r in rows},
+            "counters": stats,
+            "in_flight": in_flight,
+            "workers": self.workers,
+            "endpoint_concurrency": self.endpoint_concurrency,
+            "batch_size": self.batch_size,
+            "running": self._thread is not None and self._thread.is_alive(),
+            "endpoints": endpoints,
+        }
@@ -168,6 +168,34 @@ def cmd_stats(args):
                 print(f"  {cat}: {count}")
 
 
+def cmd_rollups(args):
+    """Rebuild the materialized analytics rollups from rss_items."""
+    from app.models.db import init_db, rebuild_rss_rollups
+
+    init_db()
+    counts = rebuild_rss_rollups()
+    print(f"Rebuilt rss_items rollups: {counts['cells']} cells, {counts['cases']} case entries")
+
+
+def cmd_fts(args):
+    """Rebuild or optimize the full-text search indexes."""
+    from app.models.db import init_db, rebuild_fts
+
+    init_db()
+    done = rebuild_fts(args.index or None, optimize=args.optimize)
+    for name, action in done.items():
+        print(f"  {name}: {action}")
+
+
+def cmd_ml_stats(args):
+    """Build the historical-stats snapshot used by the ML feature extractors."""
+    from ml.features.stats_snapshot import build_snapshot
+
+    header = build_snapshot(path=args.output, db_path=args.db)
+    counts = ", ".join(f"{n} {table}" for table, n in header['counts'].items())
+    print(f"Wrote stats snapshot (format {header['format']}) from {header['source']}: {counts}")
+
+
 def cmd_serve(args):
     """Start the API server."""
     import uvicorn
@@ -185,6 +213,9 @@ Examples:
   python manage.py dork --quick --import
   python manage.py scrape --state alaska
   python manage.py stats -v
+  python manage.py rebuild-rollups
+  python manage.py fts --optimize
+  python manage.py ml-stats
   python manage.py serve --port 8000
         """
     )
@@ -224,6 +255,22 @@ Examples:
     stats_parser.add_argument('-v', '--verbose', action='store_true', help='Verbose output')
     stats_parser.set_defaults(func=cmd_stats)
 
+    # Rollups command
+    rollups_parser = subparsers.add_parser('rebuild-rollups', help='Rebuild analytics rollup tables')
+    rollups_parser.set_defaults(func=cmd_rollups)
+
+    # FTS command
+    fts_parser = subparsers.add_parser('fts', help='Rebuild full-text search indexes')
+    fts_parser.add_argument('--index', action='append', help='Index to process (repeatable, default all)')
+    fts_parser.add_argument('--optimize', action='store_true', help='Merge index segments instead of rebuilding')
+    fts_parser.set_defaults(func=cmd_fts)
+
+    # ML stats snapshot command
+    ml_stats_parser = subparsers.add_parser('ml-stats', help='Build the ML historical-stats snapshot')
+    ml_stats_parser.add_argument('--output', help='Snapshot file (default: models dir)')
+    ml_stats_parser.add_argument('--db', help='Database path (default: ML config db_path)')
+    ml_stats_parser.set_defaults(func=cmd_ml_stats)
+
     # Serve command
     serve_parser = subparsers.add_parser('serve', help='Start API server')
     serve_parser.add_argument('--host', default='0.0.0.0', help='Host to bind')
@@ -8,6 +8,7 @@ from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Dict, List, Optional
 import json
+import os
 
 
 # Project paths
@@ -247,6 +248,10 @@ class FeatureConfig:
         ]
     })
 
+    # Defendant / judge name matching (see features/name_index.py)
+    name_match_cache_size: int = 4096
+    name_fuzzy_threshold: float = 0.6
+
 
 @dataclass
 class TrainingConfig:
@@ -269,6 +274,55 @@ class TrainingConfig:
     target_auc: float = 0.70
     target_mape: float = 0.50
 
+    # Worker processes for train_all (1 = train models sequentially)
+    n_workers: int = 4
+
+    # Incremental retraining: trees added to each ensemble on a warm start,
+    # the largest fraction of new rows still handled by warm start rather
+    # than a full retrain, and the consecutive warm starts after which a
+    # model is retrained from scratch (bounding its tree count and the age
+    # of its carried-forward CV metrics)
+    warm_start_estimators: int = 50
+    warm_start_max_growth: float = 0.25
+    warm_start_max_runs: int = 3
+
+    # Feature matrices kept in the on-disk feature cache
+    feature_cache_entries: int = 3
+
+
+def _env_int(name: str, default: int) -> int:
+    return int(os.getenv(name, str(default)))
+
+
+def _env_flag(name: str, default: bool) -> bool:
+    return os.getenv(name, "1" if default else "0").lower() in ("1", "true", "yes", "on")
+
+
+@dataclass
+class InferenceConfig:
+    """Configuration for serving: model preloading and ONNX Runtime sessions."""
+    # Load every model when the API process starts instead of on first request
+    preload: bool = field(default_factory=lambda: _env_flag("ML_PRELOAD", True))
+
+    # ONNX Runtime threading (0 = onnxruntime default)
+    intra_op_threads: int = field(default_factory=lambda: _env_int("ML_ORT_INTRA_OP_THREADS", 0))
+    inter_op_threads: int = field(default_factory=lambda: _env_int("ML_ORT_INTER_OP_THREADS", 0))
+
+    # "disable", "basic", "extended" or "all"
+    graph_optimization_level: str = field(
+        default_factory=lambda: os.getenv("ML_ORT_GRAPH_OPT_LEVEL", "all")
+    )
+    # "sequential" or "parallel"
+    execution_mode: str = field(default_factory=lambda: os.getenv("ML_ORT_EXECUTION_MODE", "sequential"))
+
+    # Memory arena / pattern planning (disable to lower idle footprint)
+    enable_cpu_mem_arena: bool = field(default_factory=lambda: _env_flag("ML_ORT_CPU_MEM_ARENA", True))
+    enable_mem_pattern: bool = field(default_factory=lambda: _env_flag("ML_ORT_MEM_PATTERN", True))
+
+    # Prediction result cache (0 entries disables it)
+    cache_max_entries: int = field(default_factory=lambda: _env_int("ML_CACHE_SIZE", 10_000))
+    cache_ttl_seconds: float = field(default_factory=lambda: float(os.getenv("ML_CACHE_TTL", "600")))
+
 
 @dataclass
 class MLConfig:
@@ -285,10 +339,15 @@ class MLConfig:
     # Training config
     training: TrainingConfig = field(default_factory=TrainingConfig)
 
+    # Serving config
+    inference: InferenceConfig = field(default_factory=InferenceConfig)
+
     # Paths
     model_version: str = MODEL_VERSION
     models_dir: Path = CURRENT_MODEL_DIR
     db_path: Path = DB_PATH
+    stats_snapshot_path: Path = CURRENT_MODEL_DIR / "historical_stats.snap"
+    feature_cache_dir: Path = DATA_DIR / "feature_cache"
 
     def to_dict(self) -> dict:
         """Convert config to dictionary."""
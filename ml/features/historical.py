@@ -3,6 +3,10 @@ Historical feature extraction from database.
 
 Computes data-driven multipliers and statistics from historical case data
 to replace hand-coded multipliers with empirically derived values.
+
+In serving, the statistics are read from a precomputed snapshot file
+(see stats_snapshot.py, built with `manage.py ml-stats`) and the database
+is only queried when no snapshot exists.
 """
 from typing import Dict, List, Optional, Tuple
 import sqlite3
@@ -11,6 +15,8 @@ from pathlib import Path
 from functools import lru_cache
 
 from .base import BaseFeatureExtractor, FeatureSet
+from .name_index import NameIndex
+from .stats_snapshot import SnapshotHandle, StatsSnapshot
 from ..config import MLConfig, default_config, DB_PATH
 
 
@@ -34,7 +40,9 @@ class HistoricalFeatureExtractor(BaseFeatureExtractor):
     def __init__(
         self,
         config: Optional[MLConfig] = None,
-        db_path: Optional[Path] = None
+        db_path: Optional[Path] = None,
+        snapshot_path: Optional[Path] = None,
+        use_snapshot: bool = True,
     ):
         """
         Initialize the historical feature extractor.
@@ -42,11 +50,24 @@ class HistoricalFeatureExtractor(BaseFeatureExtractor):
         Args:
             config: ML configuration
             db_path: Path to database (uses config default if not provided)
+            snapshot_path: Stats snapshot file (uses config default if not provided)
+            use_snapshot: Read stats from the snapshot when it exists; False
+                always computes them from the database
         """
         super().__init__()
         self.config = config or default_config
         self.db_path = db_path or self.config.db_path
 
+        # Precomputed stats, hot-reloaded when the file is rebuilt
+        self._snapshot: Optional[SnapshotHandle] = None
+        if use_snapshot:
+            self._snapshot = SnapshotHandle(snapshot_path or self.config.stats_snapshot_path)
+        self._snapshot_generation = 0
+
+        # Incremented whenever cached stats are dropped, so callers caching
+        # results derived from them know to invalidate
+        self.stats_version = 0
+
         # Cache for computed statistics
         self._court_stats: Optional[Dict] = None
         self._nos_stats: Optional[Dict] = None
@@ -54,6 +75,10 @@ class HistoricalFeatureExtractor(BaseFeatureExtractor):
         self._judge_stats: Optional[Dict] = None
         self._national_median: Optional[float] = None
 
+        # Name indexes over defendant / judge stats (rebuilt on refresh)
+        self._defendant_index: Optional[NameIndex] = None
+        self._judge_index: Optional[NameIndex] = None
+
         self._fitted = True
 
     def _get_connection(self) -> sqlite3.Connection:
@@ -62,8 +87,25 @@ class HistoricalFeatureExtractor(BaseFeatureExtractor):
         conn.row_factory = sqlite3.Row
         return conn
 
-    @lru_cache(maxsize=1)
+    def _sync_snapshot(self) -> Optional[StatsSnapshot]:
+        """Current snapshot, dropping cached stats if it was rebuilt or removed."""
+        if self._snapshot is None:
+            return None
+        snapshot = self._snapshot.get()
+        if self._snapshot.generation != self._snapshot_generation:
+            self._snapshot_generation = self._snapshot.generation
+            self.refresh_cache()
+        return snapshot
+
     def _compute_national_median(self) -> float:
+        """National median settlement amount."""
+        snapshot = self._sync_snapshot()
+        if snapshot is not None:
+            return snapshot.national_median
+        return self._query_national_median()
+
+    @lru_cache(maxsize=1)
+    def _query_national_median(self) -> float:
         """Compute national median settlement amount."""
         conn = self._get_connection()
         cursor = conn.cursor()
@@ -85,8 +127,12 @@ class HistoricalFeatureExtractor(BaseFeatureExtractor):
 
     def _compute_court_stats(self) -> Dict[str, Dict]:
         """Compute statistics by court."""
+        snapshot = self._sync_snapshot()
         if self._court_stats is not None:
             return self._court_stats
+        if snapshot is not None:
+            self._court_stats = snapshot.tables['court']
+            return self._court_stats
 
         conn = self._get_connection()
         cursor = conn.cursor()
@@ -124,8 +170,12 @@ class HistoricalFeatureExtractor(BaseFeatureExtractor):
 
     def _compute_nos_stats(self) -> Dict[str, Dict]:
         """Compute statistics by nature of suit."""
+        snapshot = self._sync_snapshot()
         if self._nos_stats is not None:
             return self._nos_stats
+        if snapshot is not None:
+            self._nos_stats = snapshot.tables['nos']
+            return self._nos_stats
 
         conn = self._get_connection()
         cursor = conn.cursor()
@@ -161,8 +211,12 @@ class HistoricalFeatureExtractor(BaseFeatureExtractor):
 
     def _compute_defendant_stats(self) -> Dict[str, Dict]:
         """Compute statistics by defendant."""
+        snapshot = self._sync_snapshot()
         if self._defendant_stats is not None:
             return self._defendant_stats
+        if snapshot is not None:
+            self._defendant_stats = snapshot.tables['defendant']
+            return self._defendant_stats
 
         conn = self._get_connection()
         cursor = conn.cursor()
@@ -193,8 +247,12 @@ class HistoricalFeatureExtractor(BaseFeatureExtractor):
 
     def _compute_judge_stats(self) -> Dict[str, Dict]:
         """Compute statistics by judge (if judge data exists)."""
+        snapshot = self._sync_snapshot()
         if self._judge_stats is not None:
             return self._judge_stats
+        if snapshot is not None:
+            self._judge_stats = snapshot.tables['judge']
+            return self._judge_stats
 
         conn = self._get_connection()
         cursor = conn.cursor()
@@ -242,6 +300,16 @@ class HistoricalFeatureExtractor(BaseFeatureExtractor):
         self._judge_stats = stats
         return stats
 
+    def _name_index(self, stats: Dict[str, Dict], kind: str) -> NameIndex:
+        """Build a NameIndex over stats keys using the configured cache/threshold."""
+        features = self.config.features
+        return NameIndex(
+            stats.keys(),
+            kind=kind,
+            cache_size=features.name_match_cache_size,
+            fuzzy_threshold=features.name_fuzzy_threshold,
+        )
+
     def _find_defendant_match(self, defendant: str) -> Optional[Dict]:
         """
         Find best matching defendant in historical data.
@@ -256,18 +324,11 @@ class HistoricalFeatureExtractor(BaseFeatureExtractor):
             return None
 
         defendant_stats = self._compute_defendant_stats()
-        defendant_lower = defendant.lower()
-
-        # Exact match
-        if defendant_lower in defendant_stats:
-            return defendant_stats[defendant_lower]
+        if self._defendant_index is None:
+            self._defendant_index = self._name_index(defendant_stats, 'entity')
 
-        # Partial match - find defendants that contain search term or vice versa
-        for db_defendant, stats in defendant_stats.items():
-            if defendant_lower in db_defendant or db_defendant in defendant_lower:
-                return stats
-
-        return None
+        name = self._defendant_index.match(defendant)
+        return defendant_stats[name] if name is not None else None
 
     def _find_judge_match(self, judge: str) -> Optional[Dict]:
         """
@@ -283,22 +344,11 @@ class HistoricalFeatureExtractor(BaseFeatureExtractor):
             return None
 
         judge_stats = self._compute_judge_stats()
-        judge_lower = judge.lower()
-
-        # Exact match
-        if judge_lower in judge_stats:
-            return judge_stats[judge_lower]
+        if self._judge_index is None:
+            self._judge_index = self._name_index(judge_stats, 'person')
 
-        # Partial match on last name
-        for db_judge, stats in judge_stats.items():
-            # Check if last word (last name) matches
-            search_parts = judge_lower.split()
-            db_parts = db_judge.split()
-            if search_parts and db_parts:
-                if search_parts[-1] == db_parts[-1]:
-                    return stats
-
-        return None
+        name = self._judge_index.match(judge)
+        return judge_stats[name] if name is not None else None
 
     def extract(
         self,
@@ -385,6 +435,84 @@ class HistoricalFeatureExtractor(BaseFeatureExtractor):
             }
         )
 
+    def extract_batch(self, records: List[Dict]) -> np.ndarray:
+        """
+        Extract historical features for many records in one pass.
+
+        Statistics are loaded once, each distinct court / NOS / defendant /
+        judge is looked up once, and the log transforms run over whole
+        columns.
+
+        Args:
+            records: List of dicts with extract() keyword arguments
+
+        Returns:
+            2D numpy array of shape (n_records, 11), row-for-row identical
+            to extract()
+        """
+        court_stats = self._compute_court_stats()
+        nos_stats = self._compute_nos_stats()
+        national_median = self._compute_national_median()
+
+        court_memo: Dict[str, tuple] = {}
+        nos_memo: Dict[str, tuple] = {}
+        defendant_memo: Dict[Optional[str], tuple] = {}
+        judge_memo: Dict[Optional[str], tuple] = {}
+
+        n = len(records)
+        raw = np.zeros((n, 11), dtype=np.float64)
+
+        for i, record in enumerate(records):
+            court = (record.get('court') or '').lower()
+            if court not in court_memo:
+                data = court_stats.get(court, {})
+                court_memo[court] = (
+                    data.get('multiplier', 1.0),
+                    data.get('median_settlement', national_median),
+                    data.get('case_count', 0),
+                )
+            raw[i, 0], raw[i, 1], raw[i, 2] = court_memo[court]
+
+            nos = (record.get('nos') or '').lower()
+            if nos not in nos_memo:
+                data = nos_stats.get(nos, {})
+                nos_memo[nos] = (
+                    data.get('median_settlement', national_median),
+                    data.get('case_count', 0),
+                )
+            raw[i, 7], raw[i, 8] = nos_memo[nos]
+
+            defendant = record.get('defendant')
+            if defendant not in defendant_memo:
+                data = self._find_defendant_match(defendant) or {}
+                defendant_memo[defendant] = (
+                    data.get('total_paid', 0),
+                    data.get('avg_settlement', 0),
+                    data.get('case_count', 0),
+                )
+            raw[i, 4], raw[i, 5], raw[i, 6] = defendant_memo[defendant]
+
+            judge = record.get('judge')
+            if judge not in judge_memo:
+                data = self._find_judge_match(judge) or {}
+                judge_memo[judge] = (
+                    data.get('mtd_grant_rate', 0.5),
+                    data.get('total_cases', 0),
+                )
+            raw[i, 9], raw[i, 10] = judge_memo[judge]
+
+        # Court dismissal rate: same default as extract()
+        raw[:, 3] = 0.3
+
+        # Log-scale the dollar columns (defendant amounts stay 0 when unknown)
+        raw[:, 1] = np.log10(raw[:, 1] + 1)
+        raw[:, 7] = np.log10(raw[:, 7] + 1)
+        for col in (4, 5):
+            paid = raw[:, col]
+            raw[:, col] = np.where(paid > 0, np.log10(np.maximum(paid, 0) + 1), 0.0)
+
+        return raw
+
     def get_feature_names(self) -> List[str]:
         """Get list of feature names."""
         return [
@@ -415,10 +543,23 @@ class HistoricalFeatureExtractor(BaseFeatureExtractor):
         """Get judge's historical motion grant rates."""
         return self._find_judge_match(judge)
 
+    def export_stats(self) -> Dict:
+        """All statistics in the historical_stats.json / snapshot layout."""
+        return {
+            'national_median': self._compute_national_median(),
+            'court_stats': dict(self._compute_court_stats()),
+            'nos_stats': dict(self._compute_nos_stats()),
+            'defendant_stats': dict(self._compute_defendant_stats()),
+            'judge_stats': dict(self._compute_judge_stats()),
+        }
+
     def refresh_cache(self):
         """Clear cached statistics to force recomputation."""
         self._court_stats = None
         self._nos_stats = None
         self._defendant_stats = None
         self._judge_stats = None
-        self._compute_national_median.cache_clear()
+        self._defendant_index = None
+        self._judge_index = None
+        self._query_national_median.cache_clear()
+        self.stats_version += 1
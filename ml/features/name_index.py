@@ -0,0 +1,263 @@
+"""
+Name index for defendant and judge lookups.
+
+Replaces the linear substring scans over every known defendant / judge with
+prebuilt lookup structures:
+
+- exact lowercase names
+- normalized keys (punctuation and corporate suffixes stripped)
+- token -> candidate buckets
+- last-name buckets (judges)
+- trigram postings for substring and fuzzy matches
+
+An index is built once per statistics refresh; recent queries are served
+from an LRU cache. Pure Python so it can be used by the ONNX predictor
+without pulling in scikit-learn.
+"""
+from collections import defaultdict
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Set
+import re
+
+
+# Tokens that don't distinguish one company from another
+ENTITY_STOPWORDS = {
+    'the', 'inc', 'incorporated', 'corp', 'corporation', 'co', 'company',
+    'llc', 'llp', 'lp', 'ltd', 'limited', 'plc', 'na', 'et', 'al',
+}
+
+# Titles and generational suffixes that surround a judge's name
+PERSON_STOPWORDS = {
+    'hon', 'honorable', 'judge', 'chief', 'magistrate', 'district', 'senior',
+    'justice', 'the', 'jr', 'sr', 'ii', 'iii', 'iv',
+}
+
+# Token / trigram buckets larger than this are too common to seed fuzzy matches
+MAX_CANDIDATE_BUCKET = 2000
+# Number of rarest query trigrams whose postings seed fuzzy candidates
+FUZZY_SEED_TRIGRAMS = 3
+# Start positions scanned when looking for indexed names inside a long query
+MAX_SUBSTRING_SCAN = 128
+# Shortest name (or query) that takes part in a containment match; shorter
+# ones ("a", "us") are inside almost everything
+MIN_CONTAINMENT_LENGTH = 4
+
+_DOTS = re.compile(r"\.")
+_NON_WORD = re.compile(r"[^\w&]+")
+
+
+def name_tokens(name: str, stopwords: Set[str] = ENTITY_STOPWORDS) -> List[str]:
+    """Lowercase, strip punctuation ("N.A." -> "na") and drop stopwords."""
+    text = _NON_WORD.sub(' ', _DOTS.sub('', (name or '').lower()))
+    return [t for t in text.split() if t not in stopwords]
+
+
+def trigrams(text: str) -> Set[str]:
+    """Set of character trigrams of a string (empty for strings under 3 chars)."""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class NameIndex:
+    """
+    Prebuilt index over a fixed set of names.
+
+    Two matching modes:
+    - 'entity' (defendants): exact, normalized key, substring containment
+      (either direction, as the old linear scan did, but only for names and
+      queries of MIN_CONTAINMENT_LENGTH or more), then fuzzy trigram / token
+      similarity.
+    - 'person' (judges): exact, then last-name bucket with given names and
+      initials used to pick between namesakes.
+
+    Where several names qualify, the best-scoring one is returned; ties go
+    to the name that came first in the input.
+    """
+
+    def __init__(
+        self,
+        names: Iterable[str],
+        kind: str = 'entity',
+        cache_size: int = 4096,
+        fuzzy_threshold: float = 0.6,
+    ):
+        """
+        Build the index.
+
+        Args:
+            names: Names to index (already lowercased stats keys)
+            kind: 'entity' or 'person'
+            cache_size: LRU size for recent queries
+            fuzzy_threshold: Minimum similarity for a fuzzy entity match
+        """
+        if kind not in ('entity', 'person'):
+            raise ValueError(f"Unknown name index kind: {kind}")
+
+        self.kind = kind
+        self.fuzzy_threshold = fuzzy_threshold
+        self._names: List[str] = []
+        self._exact: Dict[str, int] = {}
+        self._by_key: Dict[str, int] = {}
+        self._by_token: Dict[str, List[int]] = defaultdict(list)
+        self._by_last: Dict[str, List[int]] = defaultdict(list)
+        self._by_trigram: Dict[str, List[int]] = defaultdict(list)
+        self._tokens: List[Set[str]] = []
+        self._given: List[List[str]] = []
+        self._grams: List[Set[str]] = []
+
+        for name in names:
+            self._add(name)
+
+        self._max_len = max((len(name) for name in self._names), default=0)
+
+        # Position of each name in (trigram count, input order)
+        order = sorted(range(len(self._names)), key=lambda idx: (len(self._grams[idx]), idx))
+        self._rank: List[int] = [0] * len(order)
+        for position, idx in enumerate(order):
+            self._rank[idx] = position
+
+        self.match = lru_cache(maxsize=cache_size)(self._match)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def _add(self, name: str):
+        idx = len(self._names)
+        self._names.append(name)
+        self._exact.setdefault(name, idx)
+
+        if self.kind == 'person':
+            tokens = name_tokens(name, PERSON_STOPWORDS)
+            self._given.append(tokens[:-1])
+            self._tokens.append(set())
+            self._grams.append(set())
+            if tokens:
+                self._by_last[tokens[-1]].append(idx)
+            return
+
+        tokens = name_tokens(name)
+        self._tokens.append(set(tokens))
+        self._given.append([])
+        if tokens:
+            self._by_key.setdefault(' '.join(tokens), idx)
+        for token in set(tokens):
+            self._by_token[token].append(idx)
+
+        grams = trigrams(name)
+        self._grams.append(grams)
+        for gram in grams:
+            self._by_trigram[gram].append(idx)
+
+    def _match(self, query: Optional[str]) -> Optional[str]:
+        """Best matching indexed name for a query, or None."""
+        if not query:
+            return None
+        query = query.lower()
+        if query in self._exact:
+            return query
+        if self.kind == 'person':
+            return self._match_person(query)
+        return self._match_entity(query)
+
+    def _match_entity(self, query: str) -> Optional[str]:
+        tokens = name_tokens(query)
+        if tokens:
+            idx = self._by_key.get(' '.join(tokens))
+            if idx is not None:
+                return self._names[idx]
+
+        # Containment in either direction (what the old linear scan checked).
+        # One trigram set then contains the other, so the closest match is
+        # simply the one nearest in length: the longest name inside the query
+        # or the shortest name around it.
+        query_grams = trigrams(query)
+        q = len(query_grams)
+        contained = []
+
+        # Names inside the query: every indexed name is an exact key, so
+        # look up the query's substrings directly (MIN_CONTAINMENT_LENGTH and up)
+        inner = [self._exact[sub] for sub in self._substrings(query) if sub in self._exact]
+        if inner:
+            contained.append(max(inner, key=lambda idx: (len(self._grams[idx]), -idx)))
+
+        # Names around the query: intersect trigram postings, rarest first
+        survivors = set()
+        if len(query) >= MIN_CONTAINMENT_LENGTH:
+            postings = sorted((self._by_trigram.get(gram, ()) for gram in query_grams), key=len)
+            survivors = set(postings[0])
+            for posting in postings[1:]:
+                if not survivors:
+                    break
+                survivors.intersection_update(posting)
+        for idx in sorted(survivors, key=self._rank.__getitem__):
+            if query in self._names[idx]:
+                contained.append(idx)
+                break
+
+        if contained:
+            def containment_score(idx: int):
+                g = len(self._grams[idx])
+                return (2.0 * min(q, g) / (q + g) if q + g else 1.0, -idx)
+
+            return self._names[max(contained, key=containment_score)]
+
+        # Fuzzy: candidates share a selective token or one of the rarest trigrams
+        query_tokens = set(tokens)
+        candidates: Set[int] = set()
+        for token in query_tokens:
+            bucket = self._by_token.get(token, ())
+            if len(bucket) <= MAX_CANDIDATE_BUCKET:
+                candidates.update(bucket)
+        rare = sorted((self._by_trigram.get(gram, ()) for gram in query_grams), key=len)
+        for posting in rare[:FUZZY_SEED_TRIGRAMS]:
+            if len(posting) <= MAX_CANDIDATE_BUCKET:
+                candidates.update(posting)
+
+        best, best_score = None, self.fuzzy_threshold
+        for idx in sorted(candidates):
+            candidate_tokens = self._tokens[idx]
+            union = len(query_tokens | candidate_tokens)
+            jaccard = len(query_tokens & candidate_tokens) / union if union else 0.0
+            score = max(self._similarity(query_grams, idx), jaccard)
+            if score >= best_score and (best is None or score > best_score):
+                best, best_score = idx, score
+        return self._names[best] if best is not None else None
+
+    def _substrings(self, text: str) -> Iterable[str]:
+        """Substrings of text from MIN_CONTAINMENT_LENGTH up to the longest indexed name."""
+        for i in range(min(len(text), MAX_SUBSTRING_SCAN)):
+            for j in range(i + MIN_CONTAINMENT_LENGTH, min(len(text), i + self._max_len) + 1):
+                yield text[i:j]
+
+    def _similarity(self, query_grams: Set[str], idx: int) -> float:
+        """Dice coefficient over character trigrams."""
+        grams = self._grams[idx]
+        total = len(query_grams) + len(grams)
+        return 2.0 * len(query_grams & grams) / total if total else 0.0
+
+    def _match_person(self, query: str) -> Optional[str]:
+        tokens = name_tokens(query, PERSON_STOPWORDS)
+        if not tokens:
+            return None
+        bucket = self._by_last.get(tokens[-1])
+        if not bucket:
+            return None
+
+        given = tokens[:-1]
+
+        def score(idx: int) -> int:
+            total = 0
+            for q, g in zip(given, self._given[idx]):
+                if q == g:
+                    total += 2
+                elif q[0] == g[0] and (len(q) == 1 or len(g) == 1):
+                    total += 1  # initial
+                else:
+                    total -= 1
+            return total
+
+        best = max(bucket, key=lambda idx: (score(idx), -idx))
+        return self._names[best]
+
+    def cache_info(self):
+        """LRU statistics for recent queries."""
+        return self.match.cache_info()
@@ -143,19 +143,36 @@ class FeaturePipeline(BaseFeatureExtractor):
         """
         Extract features for multiple records.
 
+        Structured and historical features are built column-wise for the
+        whole batch; text features are only analyzed for records that carry
+        complaint text, everything else gets the default text row.
+
         Args:
             records: List of dicts with feature extraction inputs
 
         Returns:
             2D numpy array of shape (n_records, n_features)
         """
-        feature_matrix = []
+        if not records:
+            return np.zeros((0, self.get_feature_count()))
+
+        blocks = [self.structured.extract_batch(records)]
 
-        for record in records:
-            features = self.extract(**record)
-            feature_matrix.append(features.values)
+        if self.text is not None:
+            default_row = self.text._get_default_features().values
+            text_block = np.tile(default_row, (len(records), 1))
+            for i, record in enumerate(records):
+                if record.get('complaint_text') or record.get('complaint_features'):
+                    text_block[i] = self.text.extract(
+                        complaint_text=record.get('complaint_text'),
+                        complaint_features=record.get('complaint_features'),
+                    ).values
+            blocks.append(text_block)
+
+        if self.historical is not None:
+            blocks.append(self.historical.extract_batch(records))
 
-        return np.array(feature_matrix)
+        return np.hstack(blocks)
 
     def get_feature_names(self) -> List[str]:
         """Get list of all feature names in order."""
@@ -0,0 +1,310 @@
+"""
+Precomputed historical-stats snapshot.
+
+The court / NOS / defendant / judge statistics behind HistoricalFeatureExtractor
+(and the ONNX predictor's copy of them) come from heavy GROUP BY queries over
+case_outcomes. This module writes them once, offline, into a compact binary
+file that serving processes memory-map instead of querying SQLite.
+
+File layout (little-endian):
+
+    magic   8 bytes   b"HSTATSNP"
+    format  uint32    SNAPSHOT_FORMAT
+    hlen    uint32    length of the JSON header
+    header  hlen      JSON: metadata, national median, per-table string
+                      tables (names) and column descriptors
+    data    ...       8-byte aligned raw column arrays, offsets relative to
+                      the start of the data section
+
+Writes go to a temp file and are renamed into place, so a reader that reloads
+on mtime change never sees a partial file.
+"""
+from collections.abc import Mapping
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+import json
+import os
+import struct
+import threading
+import time
+
+import numpy as np
+
+
+SNAPSHOT_MAGIC = b"HSTATSNP"
+SNAPSHOT_FORMAT = 1
+SNAPSHOT_FILENAME = "historical_stats.snap"
+
+# How often (seconds) a SnapshotHandle re-stats the file looking for a new build
+SNAPSHOT_CHECK_INTERVAL = 2.0
+
+_PREAMBLE = struct.Struct("<8sII")
+
+# Column layout per table; the stats dicts returned to callers use these keys
+TABLE_COLUMNS: Dict[str, List[tuple]] = {
+    'court': [
+        ('case_count', '<i8'),
+        ('avg_settlement', '<f8'),
+        ('median_settlement', '<f8'),
+        ('multiplier', '<f8'),
+    ],
+    'nos': [
+        ('case_count', '<i8'),
+        ('avg_settlement', '<f8'),
+        ('median_settlement', '<f8'),
+    ],
+    'defendant': [
+        ('case_count', '<i8'),
+        ('total_paid', '<f8'),
+        ('avg_settlement', '<f8'),
+    ],
+    'judge': [
+        ('total_cases', '<i8'),
+        ('mtd_grant_rate', '<f8'),
+        ('sj_grant_rate', '<f8'),
+        ('dismissal_rate', '<f8'),
+        ('settlement_rate', '<f8'),
+    ],
+}
+
+
+def _align(n: int) -> int:
+    return (n + 7) & ~7
+
+
+class StatsTable(Mapping):
+    """
+    Read-only name -> stats dict mapping backed by memory-mapped columns.
+
+    Only the string table is materialized; each lookup builds a small dict
+    from one row of the column arrays.
+    """
+
+    def __init__(self, names: List[str], columns: Dict[str, np.ndarray]):
+        self._names = names
+        self._index = {name: i for i, name in enumerate(names)}
+        self._columns = columns
+
+    def __getitem__(self, name: str) -> Dict[str, Any]:
+        i = self._index[name]
+        return {col: values[i].item() for col, values in self._columns.items()}
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._names)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __contains__(self, name) -> bool:
+        return name in self._index
+
+
+class StatsSnapshot:
+    """A loaded snapshot file."""
+
+    def __init__(self, path: Path, header: Dict[str, Any], tables: Dict[str, StatsTable]):
+        self.path = path
+        self.header = header
+        self.tables = tables
+
+    @property
+    def national_median(self) -> float:
+        return float(self.header['national_median'])
+
+    @property
+    def created_at(self) -> str:
+        return self.header.get('created_at', '')
+
+    def as_stats(self) -> Dict[str, Any]:
+        """Stats in the same shape as historical_stats.json."""
+        return {
+            'national_median': self.national_median,
+            'court_stats': self.tables['court'],
+            'nos_stats': self.tables['nos'],
+            'defendant_stats': self.tables['defendant'],
+            'judge_stats': self.tables['judge'],
+        }
+
+
+def write_snapshot(stats: Dict[str, Any], path: Path, source: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Write stats to a snapshot file atomically.
+
+    Args:
+        stats: Dict with national_median and court/nos/defendant/judge_stats
+            (name -> stats dict), as produced by HistoricalFeatureExtractor
+        path: Destination file
+        source: Where the stats came from (recorded in the header)
+
+    Returns:
+        The header that was written
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    tables = {}
+    blobs = []
+    offset = 0
+    for table, columns in TABLE_COLUMNS.items():
+        rows = stats.get(f'{table}_stats') or {}
+        names = list(rows.keys())
+        descriptors = {}
+        for col, dtype in columns:
+            values = np.array([rows[name].get(col, 0) or 0 for name in names], dtype=dtype)
+            data = values.tobytes()
+            descriptors[col] = {'dtype': dtype, 'offset': offset, 'length': len(names)}
+            blobs.append((offset, data))
+            offset = _align(offset + len(data))
+        tables[table] = {'names': names, 'columns': descriptors}
+
+    header = {
+        'format': SNAPSHOT_FORMAT,
+        'created_at': datetime.now().isoformat(),
+        'source': source,
+        'national_median': float(stats.get('national_median') or 0.0),
+        'counts': {table: len(info['names']) for table, info in tables.items()},
+        'tables': tables,
+    }
+    header_bytes = json.dumps(header, separators=(',', ':')).encode('utf-8')
+    data_start = _align(_PREAMBLE.size + len(header_bytes))
+
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, 'wb') as f:
+        f.write(_PREAMBLE.pack(SNAPSHOT_MAGIC, SNAPSHOT_FORMAT, len(header_bytes)))
+        f.write(header_bytes)
+        for blob_offset, data in blobs:
+            f.seek(data_start + blob_offset)
+            f.write(data)
+        f.truncate(data_start + offset)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+    return header
+
+
+def load_snapshot(path: Path) -> StatsSnapshot:
+    """
+    Memory-map a snapshot file.
+
+    Raises:
+        ValueError: If the file is not a snapshot or has an unsupported format
+    """
+    path = Path(path)
+    with open(path, 'rb') as f:
+        preamble = f.read(_PREAMBLE.size)
+        if len(preamble) < _PREAMBLE.size:
+            raise ValueError(f"{path} is not a stats snapshot")
+        magic, fmt, header_len = _PREAMBLE.unpack(preamble)
+        if magic != SNAPSHOT_MAGIC:
+            raise ValueError(f"{path} is not a stats snapshot")
+        if fmt != SNAPSHOT_FORMAT:
+            raise ValueError(f"Unsupported stats snapshot format {fmt} (expected {SNAPSHOT_FORMAT})")
+        header = json.loads(f.read(header_len).decode('utf-8'))
+
+    data_start = _align(_PREAMBLE.size + header_len)
+    size = path.stat().st_size
+    buffer = np.memmap(path, dtype=np.uint8, mode='r') if size > data_start else None
+
+    tables = {}
+    for table, info in header['tables'].items():
+        columns = {}
+        for col, desc in info['columns'].items():
+            dtype = np.dtype(desc['dtype'])
+            if desc['length'] == 0 or buffer is None:
+                columns[col] = np.empty(0, dtype=dtype)
+                continue
+            start = data_start + desc['offset']
+            end = start + desc['length'] * dtype.itemsize
+            columns[col] = buffer[start:end].view(dtype)
+        tables[table] = StatsTable(info['names'], columns)
+
+    for table in TABLE_COLUMNS:
+        tables.setdefault(table, StatsTable([], {}))
+
+    return StatsSnapshot(path, header, tables)
+
+
+class SnapshotHandle:
+    """
+    Current snapshot for a path, reloaded when the file changes.
+
+    get() re-stats the file at most every check_interval seconds and reloads
+    it when its mtime or size changed. generation increments on every
+    (re)load or removal so callers can drop caches derived from the old
+    snapshot. A file that fails to load leaves the previous snapshot in place.
+    """
+
+    def __init__(self, path: Path, check_interval: float = SNAPSHOT_CHECK_INTERVAL):
+        self.path = Path(path)
+        self.check_interval = check_interval
+        self.generation = 0
+        self.error: Optional[str] = None
+        self._snapshot: Optional[StatsSnapshot] = None
+        self._signature = None
+        self._checked_at = float('-inf')
+        self._lock = threading.Lock()
+
+    def get(self) -> Optional[StatsSnapshot]:
+        """Return the current snapshot (None if no file), reloading if it changed."""
+        now = time.monotonic()
+        if now - self._checked_at < self.check_interval:
+            return self._snapshot
+
+        with self._lock:
+            if now - self._checked_at < self.check_interval:
+                return self._snapshot
+            self._checked_at = now
+
+            try:
+                st = self.path.stat()
+                signature = (st.st_mtime_ns, st.st_size, st.st_ino)
+            except OSError:
+                signature = None
+
+            if signature == self._signature:
+                return self._snapshot
+
+            if signature is None:
+                self._snapshot = None
+                self._signature = None
+                self.generation += 1
+                return None
+
+            try:
+                self._snapshot = load_snapshot(self.path)
+                self.error = None
+            except (OSError, ValueError) as e:
+                self.error = str(e)
+                return self._snapshot
+            self._signature = signature
+            self.generation += 1
+            return self._snapshot
+
+
+def build_snapshot(
+    path: Optional[Path] = None,
+    db_path: Optional[Path] = None,
+    config=None,
+) -> Dict[str, Any]:
+    """
+    Compute historical stats from the database and write a snapshot.
+
+    Args:
+        path: Output file (defaults to config.stats_snapshot_path)
+        db_path: Database to read (defaults to config.db_path)
+        config: ML configuration
+
+    Returns:
+        Header of the written snapshot
+    """
+    from ..config import default_config
+    from .historical import HistoricalFeatureExtractor
+
+    config = config or default_config
+    path = Path(path) if path else config.stats_snapshot_path
+
+    extractor = HistoricalFeatureExtractor(config, db_path=db_path, use_snapshot=False)
+    stats = extractor.export_stats()
+    return write_snapshot(stats, path, source=str(extractor.db_path))
@@ -74,8 +74,29 @@ class StructuredFeatureExtractor(BaseFeatureExtractor):
         # Defendant type encoder
         self.defendant_type_encoder.fit(self.DEFENDANT_TYPES)
 
+        self._lookups = None
         self._fitted = True
 
+    def _lookup_tables(self) -> Dict[str, Dict[str, int]]:
+        """
+        Label -> code tables built from the fitted encoders.
+
+        LabelEncoder codes are positions in the sorted classes_ array, so a
+        dict lookup gives the same value as transform() without the
+        per-call validation overhead.
+        """
+        if self._lookups is None:
+            self._lookups = {
+                name: {label: i for i, label in enumerate(encoder.classes_)}
+                for name, encoder in (
+                    ('court', self.court_encoder),
+                    ('nos', self.nos_encoder),
+                    ('nos_category', self.nos_category_encoder),
+                    ('defendant_type', self.defendant_type_encoder),
+                )
+            }
+        return self._lookups
+
     def _classify_defendant_type(self, defendant: str) -> str:
         """
         Classify defendant into a type based on name patterns.
@@ -318,6 +339,63 @@ class StructuredFeatureExtractor(BaseFeatureExtractor):
             }
         )
 
+    def extract_batch(self, records: List[Dict]) -> np.ndarray:
+        """
+        Extract structured features for many records in one pass.
+
+        Each distinct court / NOS / defendant string is normalized once and
+        encoded through the pre-built lookup tables; the binary flags are
+        built as whole columns.
+
+        Args:
+            records: List of dicts with extract() keyword arguments
+
+        Returns:
+            2D numpy array of shape (n_records, 7), row-for-row identical
+            to extract()
+        """
+        lookups = self._lookup_tables()
+        court_codes, nos_codes, nos_cat_codes, defendant_codes = (
+            lookups['court'], lookups['nos'], lookups['nos_category'], lookups['defendant_type']
+        )
+
+        court_memo: Dict[Any, int] = {}
+        nos_memo: Dict[Any, tuple] = {}
+        defendant_memo: Dict[Any, int] = {}
+
+        n = len(records)
+        features = np.zeros((n, 7), dtype=np.float64)
+
+        for i, record in enumerate(records):
+            court = record.get('court')
+            if court not in court_memo:
+                normalized = self._normalize_court(court)
+                court_memo[court] = court_codes.get(normalized, court_codes['unknown'])
+            features[i, 0] = court_memo[court]
+
+            nos = record.get('nos')
+            if nos not in nos_memo:
+                nos_code, nos_category = self._normalize_nos(nos)
+                nos_memo[nos] = (
+                    nos_codes.get(nos_code, nos_codes['unknown']),
+                    nos_cat_codes.get(nos_category, nos_cat_codes['unknown']),
+                )
+            features[i, 1], features[i, 2] = nos_memo[nos]
+
+            defendant = record.get('defendant')
+            if defendant not in defendant_memo:
+                defendant_type = self._classify_defendant_type(defendant)
+                defendant_memo[defendant] = defendant_codes.get(
+                    defendant_type, defendant_codes['unknown']
+                )
+            features[i, 3] = defendant_memo[defendant]
+
+        features[:, 4] = [1.0 if r.get('class_action') else 0.0 for r in records]
+        features[:, 5] = [1.0 if r.get('pro_se') else 0.0 for r in records]
+        features[:, 6] = [1.0 if r.get('mdl') else 0.0 for r in records]
+
+        return features
+
     def get_feature_names(self) -> List[str]:
         """Get list of feature names."""
         return [
@@ -347,4 +425,5 @@ class StructuredFeatureExtractor(BaseFeatureExtractor):
         self.nos_encoder = encoders['nos']
         self.nos_category_encoder = encoders['nos_category']
         self.defendant_type_encoder = encoders['defendant_type']
+        self._lookups = None
         self._fitted = True
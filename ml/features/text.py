@@ -2,9 +2,9 @@
 Text feature extraction from complaint documents.
 
 Wraps the existing ComplaintAnalyzer to extract ML-ready features
-from complaint text.
+from complaint text, either whole or streamed in chunks / PDF pages.
 """
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterable, List, Optional, Any
 import numpy as np
 import sys
 from pathlib import Path
@@ -13,7 +13,7 @@ from .base import BaseFeatureExtractor, FeatureSet
 
 # Add parent directory to path for analytics import
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
-from analytics.complaint_analyzer import ComplaintAnalyzer, ComplaintFeatures
+from analytics.complaint_analyzer import ComplaintAnalyzer, ComplaintFeatures, iter_document_text
 
 
 class TextFeatureExtractor(BaseFeatureExtractor):
@@ -136,6 +136,28 @@ class TextFeatureExtractor(BaseFeatureExtractor):
         # Return default features if no input
         return self._get_default_features()
 
+    def extract_stream(self, chunks: Iterable[str], title: str = "") -> FeatureSet:
+        """
+        Extract features from complaint text supplied in pieces.
+
+        The text is analyzed incrementally, so memory stays bounded however
+        long the document is; results match extract() on the joined text.
+
+        Args:
+            chunks: Consecutive pieces of complaint text (e.g. PDF pages)
+            title: Case title
+
+        Returns:
+            FeatureSet with extracted features
+        """
+        stream = self.analyzer.stream(title=title)
+        for chunk in chunks:
+            stream.feed(chunk)
+
+        if not stream.chars_seen:
+            return self._get_default_features()
+        return self._extract_from_features(stream.finish())
+
     def _get_default_features(self) -> FeatureSet:
         """Return default feature set when no text is available."""
         # Default values representing "unknown" state
@@ -210,9 +232,4 @@ class TextFeatureExtractor(BaseFeatureExtractor):
         if not path.exists():
             raise FileNotFoundError(f"Complaint file not found: {filepath}")
 
-        # Read file content
-        # TODO: Add PDF extraction support
-        with open(path, 'r', encoding='utf-8', errors='ignore') as f:
-            text = f.read()
-
-        return self.extract(complaint_text=text, title=path.name)
+        return self.extract_stream(iter_document_text(path), title=path.name)
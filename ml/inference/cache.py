@@ -0,0 +1,128 @@
+"""
+Prediction result cache.
+
+A thread-safe LRU with per-entry TTL used by the predictors (and the
+/v1/predict/case endpoint) to skip recomputing identical requests. Callers
+build keys from normalized inputs plus a model (or data) version, so
+reloaded models, statistics or source tables never serve stale entries.
+"""
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Tuple
+import hashlib
+import threading
+import time
+
+
+_MISSING = object()
+
+
+class PredictionCache:
+    """Size-bounded LRU cache with a TTL and hit/miss counters."""
+
+    def __init__(self, max_entries: int = 10_000, ttl_seconds: float = 600.0):
+        """
+        Args:
+            max_entries: Maximum cached results (0 disables the cache)
+            ttl_seconds: Lifetime of an entry (0 = no expiry)
+        """
+        self.max_entries = max(0, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Cached value for key, or default on a miss / expired entry."""
+        if not self.enabled:
+            return default
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+            expires, value = entry
+            if expires and expires < time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any):
+        """Store a value, evicting the least recently used entries if full."""
+        if not self.enabled:
+            return
+        expires = time.monotonic() + self.ttl_seconds if self.ttl_seconds else 0.0
+        with self._lock:
+            self._entries[key] = (expires, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Cached value for key, computing and storing it on a miss."""
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = compute()
+            self.set(key, value)
+        return value
+
+    def clear(self):
+        """Drop every entry (models or stats were reloaded)."""
+        with self._lock:
+            if self._entries:
+                self.invalidations += 1
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current size."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'enabled': self.enabled,
+                'size': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl_seconds': self.ttl_seconds,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'invalidations': self.invalidations,
+            }
+
+
+def files_signature(*parts: Any, paths=()) -> str:
+    """
+    Short hash identifying a model version: the given parts plus the name,
+    size and mtime of each existing file in paths.
+    """
+    digest = hashlib.sha1()
+    for part in parts:
+        digest.update(repr(part).encode('utf-8'))
+    for path in sorted(paths):
+        try:
+            st = path.stat()
+        except OSError:
+            continue
+        digest.update(f"{path.name}:{st.st_size}:{st.st_mtime_ns}".encode('utf-8'))
+    return digest.hexdigest()[:16]
+
+
+def cache_from_config(config=None) -> PredictionCache:
+    """PredictionCache sized from config.inference."""
+    from ..config import default_config
+
+    settings = (config or default_config).inference
+    return PredictionCache(settings.cache_max_entries, settings.cache_ttl_seconds)
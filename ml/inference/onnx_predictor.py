@@ -11,6 +11,10 @@ import json
 
 import numpy as np
 
+from ..features.stats_snapshot import SnapshotHandle, SNAPSHOT_FILENAME
+from .cache import cache_from_config, files_signature
+from .registry import track_load
+
 # Lazy import onnxruntime
 _ort = None
 def get_ort():
@@ -52,25 +56,49 @@ class ONNXPredictionOutput:
         return result
 
 
+# Every ONNX graph the predictor can use (value/duration are quantile models)
+ONNX_MODELS = [
+    'dismissal', 'resolution',
+    'value_q25', 'value_q50', 'value_q75',
+    'duration_q25', 'duration_q50', 'duration_q75',
+]
+
+_GRAPH_OPT_LEVELS = {
+    'disable': 'ORT_DISABLE_ALL',
+    'basic': 'ORT_ENABLE_BASIC',
+    'extended': 'ORT_ENABLE_EXTENDED',
+    'all': 'ORT_ENABLE_ALL',
+}
+
+
 class ONNXPredictor:
     """
     Lightweight predictor using ONNX models.
     """
 
-    def __init__(self, model_dir: Optional[Path] = None):
-        """Initialize with model directory."""
+    def __init__(self, model_dir: Optional[Path] = None, config=None):
+        """Initialize with model directory and (optional) ML configuration."""
+        from ..config import CURRENT_MODEL_DIR, default_config
         if model_dir is None:
-            from ..config import CURRENT_MODEL_DIR
             model_dir = CURRENT_MODEL_DIR
 
         self.model_dir = Path(model_dir)
         self.onnx_dir = self.model_dir / "onnx"
+        self.config = config or default_config
 
-        # Lazy-loaded sessions
+        # Lazy-loaded sessions, with per-model load time / memory
         self._sessions: Dict[str, Any] = {}
+        self.load_stats: Dict[str, Dict[str, Any]] = {}
+
+        # Raw model outputs per feature row, cleared when stats are reloaded
+        self.cache = cache_from_config(self.config)
 
         # Load metadata
         self._load_metadata()
+        self.version_hash = files_signature(
+            self.metadata.get("version"),
+            paths=[self.onnx_dir / f"{name}.onnx" for name in ONNX_MODELS],
+        )
 
     def _load_metadata(self):
         """Load model metadata, encoder mappings, and historical stats."""
@@ -89,13 +117,51 @@ class ONNXPredictor:
         else:
             self.encoder_mappings = None
 
-        # Load historical stats for realistic predictions
+        # Load historical stats for realistic predictions. The binary snapshot
+        # (memory-mapped, hot-reloaded when rebuilt) takes precedence over
+        # the JSON export.
         stats_path = self.model_dir / "historical_stats.json"
         if stats_path.exists():
             with open(stats_path) as f:
-                self.historical_stats = json.load(f)
+                self._json_stats = json.load(f)
         else:
-            self.historical_stats = None
+            self._json_stats = None
+        self._stats_snapshot = SnapshotHandle(self.model_dir / SNAPSHOT_FILENAME)
+        self._stats_generation = -1
+        self.historical_stats = None
+
+        # Defendant name index is built from historical_stats on first lookup
+        self._defendant_index = None
+        self._refresh_stats()
+
+    def _refresh_stats(self):
+        """Switch to a rebuilt (or removed) stats snapshot if the file changed."""
+        snapshot = self._stats_snapshot.get()
+        if self._stats_snapshot.generation == self._stats_generation:
+            return
+        self._stats_generation = self._stats_snapshot.generation
+        self.historical_stats = snapshot.as_stats() if snapshot is not None else self._json_stats
+        self._defendant_index = None
+        self.cache.clear()
+
+    def _session_options(self):
+        """ONNX Runtime session options from config.inference."""
+        ort = get_ort()
+        settings = self.config.inference
+        options = ort.SessionOptions()
+        if settings.intra_op_threads:
+            options.intra_op_num_threads = settings.intra_op_threads
+        if settings.inter_op_threads:
+            options.inter_op_num_threads = settings.inter_op_threads
+        level = _GRAPH_OPT_LEVELS.get(settings.graph_optimization_level, 'ORT_ENABLE_ALL')
+        options.graph_optimization_level = getattr(ort.GraphOptimizationLevel, level)
+        options.execution_mode = (
+            ort.ExecutionMode.ORT_PARALLEL if settings.execution_mode == 'parallel'
+            else ort.ExecutionMode.ORT_SEQUENTIAL
+        )
+        options.enable_cpu_mem_arena = settings.enable_cpu_mem_arena
+        options.enable_mem_pattern = settings.enable_mem_pattern
+        return options
 
     def _get_session(self, model_name: str):
         """Get or create ONNX inference session."""
@@ -103,14 +169,23 @@ class ONNXPredictor:
             model_path = self.onnx_dir / f"{model_name}.onnx"
             if model_path.exists():
                 ort = get_ort()
-                self._sessions[model_name] = ort.InferenceSession(
-                    str(model_path),
-                    providers=['CPUExecutionProvider']
-                )
+                with track_load(self.load_stats, model_name, model_path):
+                    self._sessions[model_name] = ort.InferenceSession(
+                        str(model_path),
+                        sess_options=self._session_options(),
+                        providers=['CPUExecutionProvider']
+                    )
             else:
                 return None
         return self._sessions[model_name]
 
+    def load_all(self) -> Dict[str, Dict[str, Any]]:
+        """Create every available ONNX session now; returns per-model load stats."""
+        for model_name in ONNX_MODELS:
+            self._get_session(model_name)
+        self._refresh_stats()
+        return self.load_stats
+
     def _extract_features(
         self,
         court: Optional[str] = None,
@@ -128,101 +203,112 @@ class ONNXPredictor:
         [0-6]  Structured features from encoders
         [7-17] Historical features from database stats
         """
-        features = np.zeros(18, dtype=np.float32)
+        return self._extract_features_batch([{
+            'court': court, 'nos': nos, 'defendant': defendant,
+            'class_action': class_action, 'pro_se': pro_se, 'mdl': mdl,
+        }])
 
-        # === STRUCTURED FEATURES (0-6) ===
-        # These must match StructuredFeatureExtractor exactly
+    def _extract_features_batch(self, records: List[Dict[str, Any]]) -> np.ndarray:
+        """
+        Build the (n_records, 18) float32 feature matrix in one pass.
 
-        # [0] court_encoded - normalize and encode
-        court_normalized = self._normalize_court(court)
-        if self.encoder_mappings:
-            features[0] = float(self.encoder_mappings['court'].get(court_normalized,
-                               self.encoder_mappings['court'].get('unknown', 0)))
-        else:
-            features[0] = 0.0
-
-        # [1] nos_encoded - normalize to 3-digit code and encode
-        nos_code, nos_category = self._normalize_nos(nos)
-        if self.encoder_mappings:
-            features[1] = float(self.encoder_mappings['nos'].get(nos_code,
-                               self.encoder_mappings['nos'].get('unknown', 0)))
-            # [2] nos_category_encoded
-            features[2] = float(self.encoder_mappings['nos_category'].get(nos_category,
-                               self.encoder_mappings['nos_category'].get('unknown', 0)))
-        else:
-            features[1] = 0.0
-            features[2] = 0.0
-
-        # [3] defendant_type_encoded
-        defendant_type = self._classify_defendant_type(defendant)
-        if self.encoder_mappings:
-            features[3] = float(self.encoder_mappings['defendant_type'].get(defendant_type,
-                               self.encoder_mappings['defendant_type'].get('unknown', 0)))
-        else:
-            features[3] = 0.0
+        Court / NOS / defendant strings are normalized and looked up once per
+        distinct value; binary flags and log transforms are filled in as
+        whole columns.
+        """
+        self._refresh_stats()
 
-        # [4-6] Binary features
-        features[4] = 1.0 if class_action else 0.0
-        features[5] = 1.0 if pro_se else 0.0
-        features[6] = 1.0 if mdl else 0.0
+        n = len(records)
+        features = np.zeros((n, 18), dtype=np.float32)
+        # Float64 staging for the court/NOS columns so log10 matches the scalar path
+        hist = np.zeros((n, 5), dtype=np.float64)
 
-        # === HISTORICAL FEATURES (7-17) ===
-        # These match HistoricalFeatureExtractor
-        court_lower = court_normalized
+        mappings = self.encoder_mappings
+        stats = self.historical_stats
         national_median = 110_000_000.0
-
-        if self.historical_stats:
-            stats = self.historical_stats
+        if stats:
             national_median = stats.get('national_median', national_median)
+        court_stats = stats.get('court_stats', {}) if stats else {}
+        nos_stats = stats.get('nos_stats', {}) if stats else {}
+
+        def encode(table: str, label: str) -> float:
+            values = mappings[table]
+            return float(values.get(label, values.get('unknown', 0)))
+
+        court_memo: Dict[Any, tuple] = {}
+        nos_memo: Dict[Any, tuple] = {}
+        defendant_memo: Dict[Any, tuple] = {}
+
+        for i, record in enumerate(records):
+            # === STRUCTURED FEATURES (0-6) ===
+            # These must match StructuredFeatureExtractor exactly
+            court = record.get('court')
+            if court not in court_memo:
+                court_normalized = self._normalize_court(court)
+                court_data = court_stats.get(court_normalized, {})
+                court_memo[court] = (
+                    encode('court', court_normalized) if mappings else 0.0,
+                    court_data.get('multiplier', 1.0),
+                    court_data.get('median_settlement', national_median),
+                    float(court_data.get('case_count', 0)),
+                )
+            features[i, 0], hist[i, 0], hist[i, 1], hist[i, 2] = court_memo[court]
+
+            nos = record.get('nos')
+            if nos not in nos_memo:
+                nos_code, nos_category = self._normalize_nos(nos)
+                nos_data = nos_stats.get((nos or '').lower(), {})
+                nos_memo[nos] = (
+                    encode('nos', nos_code) if mappings else 0.0,
+                    encode('nos_category', nos_category) if mappings else 0.0,
+                    nos_data.get('median_settlement', national_median) if nos_data else national_median,
+                    float(nos_data.get('case_count', 0)) if nos_data else 0.0,
+                )
+            features[i, 1], features[i, 2], hist[i, 3], hist[i, 4] = nos_memo[nos]
+
+            defendant = record.get('defendant')
+            if defendant not in defendant_memo:
+                defendant_data = self._find_defendant_stats(defendant)
+                if defendant_data:
+                    defendant_features = (
+                        np.log10(defendant_data.get('total_paid', 0) + 1),
+                        np.log10(defendant_data.get('avg_settlement', 0) + 1),
+                        float(defendant_data.get('case_count', 0)),
+                    )
+                else:
+                    defendant_features = (0.0, 0.0, 0.0)
+                defendant_memo[defendant] = (
+                    encode('defendant_type', self._classify_defendant_type(defendant)) if mappings else 0.0,
+                ) + defendant_features
+            features[i, 3], features[i, 11], features[i, 12], features[i, 13] = defendant_memo[defendant]
 
-            # Court features [7-10]
-            court_data = stats.get('court_stats', {}).get(court_lower, {})
-            features[7] = court_data.get('multiplier', 1.0)  # jurisdiction_multiplier
-            court_median = court_data.get('median_settlement', national_median)
-            features[8] = np.log10(court_median + 1)  # court_median_settlement_log
-            features[9] = float(court_data.get('case_count', 0))  # court_case_count
-            features[10] = 0.3  # court_dismissal_rate (default)
-
-            # Defendant features [11-13]
-            defendant_data = self._find_defendant_stats(defendant)
-            if defendant_data:
-                features[11] = np.log10(defendant_data.get('total_paid', 0) + 1)
-                features[12] = np.log10(defendant_data.get('avg_settlement', 0) + 1)
-                features[13] = float(defendant_data.get('case_count', 0))
-            else:
-                features[11] = 0.0  # defendant_total_paid_log
-                features[12] = 0.0  # defendant_avg_settlement_log
-                features[13] = 0.0  # defendant_case_count
-
-            # NOS features [14-15]
-            nos_lower = (nos or '').lower()
-            nos_data = stats.get('nos_stats', {}).get(nos_lower, {})
-            if nos_data:
-                features[14] = np.log10(nos_data.get('median_settlement', national_median) + 1)
-                features[15] = float(nos_data.get('case_count', 0))
-            else:
-                features[14] = np.log10(national_median + 1)
-                features[15] = 0.0
+        # [4-6] Binary features
+        features[:, 4] = [1.0 if r.get('class_action') else 0.0 for r in records]
+        features[:, 5] = [1.0 if r.get('pro_se') else 0.0 for r in records]
+        features[:, 6] = [1.0 if r.get('mdl') else 0.0 for r in records]
 
+        # === HISTORICAL FEATURES (7-17) ===
+        # These match HistoricalFeatureExtractor
+        if stats:
+            features[:, 7] = hist[:, 0]                        # jurisdiction_multiplier
+            features[:, 8] = np.log10(hist[:, 1] + 1)          # court_median_settlement_log
+            features[:, 9] = hist[:, 2]                        # court_case_count
+            features[:, 10] = 0.3                              # court_dismissal_rate (default)
+            # [11-13] defendant features filled in per distinct defendant above
+            features[:, 14] = np.log10(hist[:, 3] + 1)         # nos_median_settlement_log
+            features[:, 15] = hist[:, 4]                       # nos_case_count
             # Judge features [16-17] - defaults since judge rarely provided
-            features[16] = 0.5  # judge_mtd_rate (neutral default)
-            features[17] = 0.0  # judge_case_count
-
+            features[:, 16] = 0.5
+            features[:, 17] = 0.0
         else:
             # Fallback defaults matching training distribution
-            features[7] = 1.0   # jurisdiction_multiplier
-            features[8] = np.log10(national_median + 1)  # ~8.04
-            features[9] = 0.0
-            features[10] = 0.3
-            features[11] = 0.0
-            features[12] = 0.0
-            features[13] = 0.0
-            features[14] = np.log10(national_median + 1)
-            features[15] = 0.0
-            features[16] = 0.5
-            features[17] = 0.0
-
-        return features.reshape(1, -1)
+            features[:, 7] = 1.0
+            features[:, 8] = np.log10(national_median + 1)  # ~8.04
+            features[:, 10] = 0.3
+            features[:, 14] = np.log10(national_median + 1)
+            features[:, 16] = 0.5
+
+        return features
 
     def _normalize_court(self, court: Optional[str]) -> str:
         """Normalize court code to lowercase standard form."""
@@ -375,57 +461,154 @@ class ONNXPredictor:
         return 'small_company'
 
     def _find_defendant_stats(self, defendant: Optional[str]) -> Optional[Dict]:
-        """Find defendant in historical stats with fuzzy matching."""
+        """Find defendant in historical stats via the prebuilt name index."""
         if not self.historical_stats or not defendant:
             return None
 
-        defendant_lower = defendant.lower()
         defendant_stats = self.historical_stats.get('defendant_stats', {})
+        if self._defendant_index is None:
+            from ..config import default_config
+            from ..features.name_index import NameIndex
+            self._defendant_index = NameIndex(
+                defendant_stats.keys(),
+                kind='entity',
+                cache_size=default_config.features.name_match_cache_size,
+                fuzzy_threshold=default_config.features.name_fuzzy_threshold,
+            )
+
+        name = self._defendant_index.match(defendant)
+        return defendant_stats[name] if name is not None else None
+
+    def _run_session(self, model_name: str, X: np.ndarray):
+        """Run one ONNX session over a feature matrix (None if the model is missing)."""
+        session = self._get_session(model_name)
+        if session is None:
+            return None
+        input_name = session.get_inputs()[0].name
+        return session.run(None, {input_name: X})
+
+    def _positive_probabilities(self, output, n: int) -> np.ndarray:
+        """
+        Probability of the positive class for each row of a classifier output.
+
+        Handles the various ONNX output formats: a 2D probability tensor,
+        a list of per-row dicts (ZipMap), or a single label/score tensor.
+        """
+        if len(output) > 1:
+            probs = output[1]
+            # ONNX classifiers return probabilities as 2D array: [[prob_0, prob_1], ...]
+            if hasattr(probs, 'shape') and len(probs.shape) == 2:
+                col = 1 if probs.shape[1] > 1 else 0
+                return np.asarray(probs[:, col], dtype=np.float64)
+            if hasattr(probs, '__len__') and len(probs) > 0:
+                values = []
+                for row in probs:
+                    if isinstance(row, dict):
+                        values.append(float(row.get(1, row.get('1', 0.5))))
+                    elif hasattr(row, '__len__') and len(row) > 1:
+                        values.append(float(row[1]))
+                    else:
+                        values.append(float(row))
+                return np.asarray(values, dtype=np.float64)
+            return np.full(n, 0.5)
+        return self._scalar_column(output[0], n)
+
+    def _scalar_column(self, arr, n: int) -> np.ndarray:
+        """First value of each row of an ONNX output, as a float vector."""
+        if hasattr(arr, 'shape'):
+            return np.asarray(arr, dtype=np.float64).reshape(n, -1)[:, 0]
+        return np.asarray([self._extract_scalar([row]) for row in arr], dtype=np.float64)
+
+    def _class_probabilities(self, output, pred_idx: np.ndarray, n_classes: int) -> List[List[float]]:
+        """Per-row class probability lists from a classifier output."""
+        def one_hot(idx):
+            return [1.0 if j == idx else 0.0 for j in range(n_classes)]
+
+        if len(output) > 1:
+            raw_probs = output[1]
+            # Handle 2D array [[p0, p1, ...], ...]
+            if hasattr(raw_probs, 'shape') and len(raw_probs.shape) == 2:
+                width = min(raw_probs.shape[1], n_classes)
+                return np.asarray(raw_probs[:, :width], dtype=np.float64).tolist()
+            if hasattr(raw_probs, '__len__') and len(raw_probs) > 0:
+                rows = []
+                for idx, row in zip(pred_idx, raw_probs):
+                    if isinstance(row, dict):
+                        rows.append([float(row.get(j, row.get(str(j), 0.0))) for j in range(n_classes)])
+                    elif hasattr(row, '__len__'):
+                        rows.append([float(row[j]) for j in range(min(len(row), n_classes))])
+                    else:
+                        rows.append(one_hot(idx))
+                return rows
+        return [one_hot(idx) for idx in pred_idx]
+
+    def _dismissal_batch(self, X: np.ndarray) -> Optional[np.ndarray]:
+        """Dismissal probabilities for every row, or None if the model is missing."""
+        output = self._run_session("dismissal", X)
+        if output is None:
+            return None
+        return self._positive_probabilities(output, len(X))
+
+    def _quantile_batch(self, prefix: str, X: np.ndarray) -> Dict[str, np.ndarray]:
+        """Run the q25/q50/q75 sessions for a model; returns low/mid/high vectors."""
+        results = {}
+        for quantile, name in [(25, 'low'), (50, 'mid'), (75, 'high')]:
+            output = self._run_session(f"{prefix}_q{quantile}", X)
+            if output is not None:
+                results[name] = self._scalar_column(output[0], len(X))
+        return results
 
-        # Exact match
-        if defendant_lower in defendant_stats:
-            return defendant_stats[defendant_lower]
+    def _cache_key(self, kind: str, row: np.ndarray) -> tuple:
+        """Prediction cache key: model version, result kind and feature row."""
+        return (self.version_hash, kind, row.tobytes())
 
-        # Partial match - find defendants that contain search term or vice versa
-        for db_name, stats in defendant_stats.items():
-            if defendant_lower in db_name or db_name in defendant_lower:
-                return stats
+    def _model_outputs(self, X: np.ndarray) -> List[tuple]:
+        """
+        Raw (dismissal probability, value, duration) outputs for each row.
 
-        return None
+        Rows whose features (and model version) were seen recently come from
+        the prediction cache; the ONNX sessions run once over the rest.
+        """
+        keys = [self._cache_key("outputs", row) for row in X]
+        results = [self.cache.get(key) for key in keys]
+        missing = [i for i, result in enumerate(results) if result is None]
+        if not missing:
+            return results
+
+        X_missing = X[missing]
+        dismissal_failed = False
+        try:
+            dismissal = self._dismissal_batch(X_missing)
+        except Exception:
+            dismissal, dismissal_failed = None, True
+        value = self._quantile_batch("value", X_missing)
+        duration = self._quantile_batch("duration", X_missing)
+
+        for j, i in enumerate(missing):
+            results[i] = (
+                float(dismissal[j]) if dismissal is not None else None,
+                {name: np.expm1(col[j]) for name, col in value.items()},
+                {name: float(col[j]) for name, col in duration.items()},
+            )
+            # A session error may be transient: don't pin the missing output for the TTL
+            if not dismissal_failed:
+                self.cache.set(keys[i], results[i])
+        return results
 
     def predict_dismissal(self, **kwargs) -> Dict[str, Any]:
         """Predict dismissal probability."""
-        session = self._get_session("dismissal")
-        if session is None:
+        if self._get_session("dismissal") is None:
             return {"error": "Dismissal model not available"}
 
         X = self._extract_features(**kwargs)
 
-        # Run inference
-        input_name = session.get_inputs()[0].name
-        output = session.run(None, {input_name: X})
-
-        # Get probability - handle various ONNX output formats
         try:
-            if len(output) > 1:
-                probs = output[1]
-                # ONNX classifiers return probabilities as 2D array: [[prob_0, prob_1]]
-                if hasattr(probs, 'shape') and len(probs.shape) == 2:
-                    prob = float(probs[0, 1]) if probs.shape[1] > 1 else float(probs[0, 0])
-                elif hasattr(probs, '__len__') and len(probs) > 0:
-                    first = probs[0]
-                    if isinstance(first, dict):
-                        prob = float(first.get(1, first.get('1', 0.5)))
-                    elif hasattr(first, '__len__') and len(first) > 1:
-                        prob = float(first[1])
-                    else:
-                        prob = float(first)
-                else:
-                    prob = 0.5
-            else:
-                prob = float(output[0].flat[0]) if hasattr(output[0], 'flat') else float(output[0][0])
+            prob = self.cache.get_or_compute(
+                self._cache_key("dismissal", X[0]),
+                lambda: float(self._dismissal_batch(X)[0]),
+            )
         except Exception as e:
-            return {"error": f"Error parsing ONNX output: {e}", "raw_output_types": [str(type(o)) for o in output]}
+            return {"error": f"Error parsing ONNX output: {e}"}
 
         return {
             "probability": prob,
@@ -449,15 +632,11 @@ class ONNXPredictor:
         """Predict settlement value range."""
         X = self._extract_features(**kwargs)
 
-        results = {}
-        for quantile, name in [(25, 'low'), (50, 'mid'), (75, 'high')]:
-            session = self._get_session(f"value_q{quantile}")
-            if session:
-                input_name = session.get_inputs()[0].name
-                output = session.run(None, {input_name: X})
-                # Inverse log transform
-                log_value = self._extract_scalar(output[0])
-                results[name] = np.expm1(log_value)
+        # Inverse log transform
+        results = dict(self.cache.get_or_compute(
+            self._cache_key("value", X[0]),
+            lambda: {name: np.expm1(col[0]) for name, col in self._quantile_batch("value", X).items()},
+        ))
 
         if not results:
             return {"error": "Value model not available"}
@@ -466,36 +645,18 @@ class ONNXPredictor:
 
     def predict_resolution(self, **kwargs) -> Dict[str, Any]:
         """Predict resolution path."""
-        session = self._get_session("resolution")
-        if session is None:
+        if self._get_session("resolution") is None:
             return {"error": "Resolution model not available"}
 
         X = self._extract_features(**kwargs)
-
-        input_name = session.get_inputs()[0].name
-        output = session.run(None, {input_name: X})
+        output = self._run_session("resolution", X)
 
         # Get class and probabilities
         classes = ['dismissal', 'settlement']  # Simplified
         try:
-            pred_idx = int(self._extract_scalar(output[0]))
-            if len(output) > 1:
-                raw_probs = output[1]
-                # Handle 2D array [[p0, p1, ...]]
-                if hasattr(raw_probs, 'shape') and len(raw_probs.shape) == 2:
-                    probs = [float(raw_probs[0, i]) for i in range(min(raw_probs.shape[1], len(classes)))]
-                elif hasattr(raw_probs, '__len__') and len(raw_probs) > 0:
-                    first = raw_probs[0]
-                    if isinstance(first, dict):
-                        probs = [float(first.get(i, first.get(str(i), 0.0))) for i in range(len(classes))]
-                    elif hasattr(first, '__len__'):
-                        probs = [float(first[i]) for i in range(min(len(first), len(classes)))]
-                    else:
-                        probs = [1.0, 0.0] if pred_idx == 0 else [0.0, 1.0]
-                else:
-                    probs = [1.0, 0.0] if pred_idx == 0 else [0.0, 1.0]
-            else:
-                probs = [1.0, 0.0] if pred_idx == 0 else [0.0, 1.0]
+            pred_idx = self._scalar_column(output[0], len(X)).astype(int)
+            probs = self._class_probabilities(output, pred_idx, len(classes))[0]
+            pred_idx = int(pred_idx[0])
         except Exception as e:
             return {"error": f"Resolution prediction error: {e}"}
 
@@ -508,13 +669,10 @@ class ONNXPredictor:
         """Predict case duration."""
         X = self._extract_features(**kwargs)
 
-        results = {}
-        for quantile, name in [(25, 'low'), (50, 'mid'), (75, 'high')]:
-            session = self._get_session(f"duration_q{quantile}")
-            if session:
-                input_name = session.get_inputs()[0].name
-                output = session.run(None, {input_name: X})
-                results[name] = self._extract_scalar(output[0])
+        results = dict(self.cache.get_or_compute(
+            self._cache_key("duration", X[0]),
+            lambda: {name: float(col[0]) for name, col in self._quantile_batch("duration", X).items()},
+        ))
 
         if not results:
             return {"error": "Duration model not available"}
@@ -528,6 +686,41 @@ class ONNXPredictor:
         Uses dismissal model as primary signal and derives other outcomes
         to ensure logical consistency across all predictions.
         """
+        return self.predict_batch([kwargs])[0]
+
+    def predict_batch(self, records: List[Dict[str, Any]]) -> List[ONNXPredictionOutput]:
+        """
+        Full prediction for many cases at once.
+
+        Builds one feature matrix for the batch and runs each ONNX session
+        (dismissal, value and duration quantiles) once over the rows not in
+        the prediction cache; the coherent outcome logic is then applied per
+        case.
+
+        Args:
+            records: List of dicts with the same keyword arguments as predict()
+
+        Returns:
+            List of ONNXPredictionOutput, in the same order as records
+        """
+        if not records:
+            return []
+
+        X = self._extract_features_batch(records)
+
+        return [
+            self._build_output(kwargs, dismissal_prob, dict(value), dict(duration))
+            for kwargs, (dismissal_prob, value, duration) in zip(records, self._model_outputs(X))
+        ]
+
+    def _build_output(
+        self,
+        kwargs: Dict[str, Any],
+        dismissal_prob: Optional[float],
+        value: Dict[str, float],
+        duration: Dict[str, float],
+    ) -> ONNXPredictionOutput:
+        """Assemble one case's coherent prediction from raw model outputs."""
         output = ONNXPredictionOutput(model_version=self.metadata.get("version", "v1.0.0"))
 
         # Extract case characteristics for conditioning
@@ -536,12 +729,9 @@ class ONNXPredictor:
         defendant = (kwargs.get('defendant') or '').lower()
         class_action = kwargs.get('class_action', False)
 
-        # === PRIMARY: Dismissal Probability ===
-        dismissal = self.predict_dismissal(**kwargs)
-        if "probability" in dismissal:
-            dismissal_prob = dismissal["probability"]
+        if dismissal_prob is not None:
             output.dismissal_probability = dismissal_prob
-            output.dismissal_confidence = dismissal.get("confidence_interval_95", [0, 0])
+            output.dismissal_confidence = [max(0, dismissal_prob - 0.1), min(1, dismissal_prob + 0.1)]
         else:
             dismissal_prob = 0.3  # Default prior
 
@@ -557,21 +747,18 @@ class ONNXPredictor:
 
         # === CONDITIONAL VALUE ESTIMATE ===
         # Only meaningful if case doesn't get dismissed
-        if outcome_probs.get('settlement', 0) > 0.1:
-            value = self.predict_value(**kwargs)
-            if "error" not in value:
-                # Adjust value based on dismissal risk (expected value)
-                survival_prob = 1 - dismissal_prob
-                output.value_estimate = {
-                    'low': value['low'] * survival_prob,
-                    'mid': value['mid'] * survival_prob,
-                    'high': value['high'],  # Keep high as potential upside
-                    'if_survives': value.copy()  # Raw values if case survives MTD
-                }
+        if outcome_probs.get('settlement', 0) > 0.1 and value:
+            # Adjust value based on dismissal risk (expected value)
+            survival_prob = 1 - dismissal_prob
+            output.value_estimate = {
+                'low': value['low'] * survival_prob,
+                'mid': value['mid'] * survival_prob,
+                'high': value['high'],  # Keep high as potential upside
+                'if_survives': value.copy()  # Raw values if case survives MTD
+            }
 
         # === DURATION ===
-        duration = self.predict_duration(**kwargs)
-        if "error" not in duration:
+        if duration:
             # Adjust duration based on likely outcome
             if dismissal_prob > 0.6:
                 # High dismissal risk = shorter expected duration
@@ -15,6 +15,8 @@ from ..models.dismissal import DismissalModel
 from ..models.value import ValueModel
 from ..models.resolution import ResolutionModel
 from ..models.duration import DurationModel
+from .cache import cache_from_config, files_signature
+from .registry import track_load
 
 
 @dataclass
@@ -113,6 +115,10 @@ class PredictionOutput:
         return "\n".join(lines)
 
 
+# Model files (<name>.pkl) the predictor can load
+MODEL_NAMES = ['dismissal', 'value', 'resolution', 'duration']
+
+
 class CasePredictor:
     """
     Unified predictor for legal case outcomes.
@@ -151,6 +157,18 @@ class CasePredictor:
         # Model version
         self._version = MODEL_VERSION
 
+        # Per-model load time / memory
+        self.load_stats: Dict[str, Dict[str, Any]] = {}
+
+        # Per-model results by feature row; keys include a hash of the model
+        # files, and the cache is cleared when historical stats are reloaded
+        self.cache = cache_from_config(self.config)
+        self.version_hash = files_signature(
+            self._version,
+            paths=[self.model_dir / f"{name}.pkl" for name in MODEL_NAMES],
+        )
+        self._stats_version: Optional[int] = None
+
     def _load_pipeline(self) -> FeaturePipeline:
         """Load or create feature pipeline."""
         if self._pipeline is not None:
@@ -181,8 +199,9 @@ class CasePredictor:
 
         model_path = self.model_dir / "dismissal.pkl"
         if model_path.exists():
-            self._dismissal_model = DismissalModel(self.config.dismissal)
-            self._dismissal_model.load(model_path)
+            with track_load(self.load_stats, 'dismissal', model_path):
+                self._dismissal_model = DismissalModel(self.config.dismissal)
+                self._dismissal_model.load(model_path)
             return self._dismissal_model
         return None
 
@@ -193,8 +212,9 @@ class CasePredictor:
 
         model_path = self.model_dir / "value.pkl"
         if model_path.exists():
-            self._value_model = ValueModel(self.config.value)
-            self._value_model.load(model_path)
+            with track_load(self.load_stats, 'value', model_path):
+                self._value_model = ValueModel(self.config.value)
+                self._value_model.load(model_path)
             return self._value_model
         return None
 
@@ -205,8 +225,9 @@ class CasePredictor:
 
         model_path = self.model_dir / "resolution.pkl"
         if model_path.exists():
-            self._resolution_model = ResolutionModel(self.config.resolution)
-            self._resolution_model.load(model_path)
+            with track_load(self.load_stats, 'resolution', model_path):
+                self._resolution_model = ResolutionModel(self.config.resolution)
+                self._resolution_model.load(model_path)
             return self._resolution_model
         return None
 
@@ -217,8 +238,9 @@ class CasePredictor:
 
         model_path = self.model_dir / "duration.pkl"
         if model_path.exists():
-            self._duration_model = DurationModel(self.config.duration)
-            self._duration_model.load(model_path)
+            with track_load(self.load_stats, 'duration', model_path):
+                self._duration_model = DurationModel(self.config.duration)
+                self._duration_model.load(model_path)
             return self._duration_model
         return None
 
@@ -277,8 +299,7 @@ class CasePredictor:
             court=court, nos=nos, defendant=defendant, judge=judge, **kwargs
         )
 
-        results = model.predict_with_confidence(X, feature_names)
-        result = results[0]
+        result = self._predict_rows('dismissal', model, X, feature_names)[0]
 
         # Calculate 95% CI (approximate)
         prob = result.prediction
@@ -315,8 +336,7 @@ class CasePredictor:
             class_action=class_action, **kwargs
         )
 
-        results = model.predict_with_confidence(X, feature_names)
-        result = results[0]
+        result = self._predict_rows('value', model, X, feature_names)[0]
 
         return {
             'low': result.low,
@@ -347,8 +367,7 @@ class CasePredictor:
             court=court, nos=nos, defendant=defendant, **kwargs
         )
 
-        results = model.predict_with_confidence(X, feature_names)
-        result = results[0]
+        result = self._predict_rows('resolution', model, X, feature_names)[0]
 
         return {
             'predicted_outcome': result.prediction,
@@ -378,8 +397,7 @@ class CasePredictor:
             court=court, nos=nos, defendant=defendant, **kwargs
         )
 
-        results = model.predict_with_confidence(X, feature_names)
-        result = results[0]
+        result = self._predict_rows('duration', model, X, feature_names)[0]
 
         return {
             'low': result.low,
@@ -430,63 +448,135 @@ class CasePredictor:
             judge=judge,
         )
 
+        results = self._run_models(X, feature_names)
+        return self._build_output(
+            len(feature_names), **{name: rows[0] for name, rows in results.items()}
+        )
+
+    def predict_batch(self, records: List[Dict[str, Any]]) -> List[PredictionOutput]:
+        """
+        Full case prediction for many cases at once.
+
+        Builds one feature matrix for the whole batch and runs each model
+        once over it, instead of one extract/predict round trip per case.
+
+        Args:
+            records: List of dicts with the same keyword arguments as predict()
+
+        Returns:
+            List of PredictionOutput, in the same order as records
+        """
+        if not records:
+            return []
+
+        pipeline = self._load_pipeline()
+        X = pipeline.extract_batch(records)
+        feature_names = pipeline.get_feature_names()
+
+        results = self._run_models(X, feature_names)
+        return [
+            self._build_output(
+                len(feature_names), **{name: rows[i] for name, rows in results.items()}
+            )
+            for i in range(len(records))
+        ]
+
+    def _run_models(self, X: np.ndarray, feature_names: List[str]) -> Dict[str, list]:
+        """
+        Run every available model once over a feature matrix.
+
+        Returns:
+            Dict of model name -> list of PredictionResult (one per row)
+        """
+        results = {}
+        loaders = [
+            ('dismissal', self._load_dismissal_model),
+            ('value', self._load_value_model),
+            ('resolution', self._load_resolution_model),
+            ('duration', self._load_duration_model),
+        ]
+        for name, loader in loaders:
+            model = loader()
+            if model is not None:
+                results[name] = self._predict_rows(name, model, X, feature_names)
+        return results
+
+    def _predict_rows(self, name: str, model, X: np.ndarray, feature_names: List[str]) -> list:
+        """
+        One model's PredictionResults for every row of X.
+
+        Rows seen recently are served from the prediction cache; the model
+        runs once over the remaining rows.
+        """
+        historical = self._load_pipeline().historical
+        if historical is not None and historical.stats_version != self._stats_version:
+            self._stats_version = historical.stats_version
+            self.cache.clear()
+
+        keys = [(self.version_hash, name, row.tobytes()) for row in X]
+        results = [self.cache.get(key) for key in keys]
+        missing = [i for i, result in enumerate(results) if result is None]
+        if missing:
+            computed = model.predict_with_confidence(X[missing], feature_names)
+            for i, result in zip(missing, computed):
+                self.cache.set(keys[i], result)
+                results[i] = result
+        return results
+
+    def _build_output(
+        self,
+        feature_count: int,
+        dismissal=None,
+        value=None,
+        resolution=None,
+        duration=None,
+    ) -> PredictionOutput:
+        """Combine per-model PredictionResults for one case into a PredictionOutput."""
         output = PredictionOutput(
             model_version=self._version,
-            feature_count=len(feature_names),
+            feature_count=feature_count,
         )
 
         all_key_factors = []
         confidences = []
 
         # Dismissal prediction
-        dismissal_model = self._load_dismissal_model()
-        if dismissal_model is not None:
-            results = dismissal_model.predict_with_confidence(X, feature_names)
-            result = results[0]
-            output.dismissal_probability = result.prediction
-            ci_width = (1 - result.confidence) * 0.2
+        if dismissal is not None:
+            output.dismissal_probability = dismissal.prediction
+            ci_width = (1 - dismissal.confidence) * 0.2
             output.dismissal_confidence_interval_95 = [
-                max(0, result.prediction - ci_width),
-                min(1, result.prediction + ci_width)
+                max(0, dismissal.prediction - ci_width),
+                min(1, dismissal.prediction + ci_width)
             ]
-            all_key_factors.extend(result.key_factors)
-            confidences.append(result.confidence)
+            all_key_factors.extend(dismissal.key_factors)
+            confidences.append(dismissal.confidence)
 
         # Value prediction
-        value_model = self._load_value_model()
-        if value_model is not None:
-            results = value_model.predict_with_confidence(X, feature_names)
-            result = results[0]
+        if value is not None:
             output.value_estimate = {
-                'low': result.low,
-                'mid': result.mid,
-                'high': result.high,
+                'low': value.low,
+                'mid': value.mid,
+                'high': value.high,
             }
-            all_key_factors.extend(result.key_factors)
-            confidences.append(result.confidence)
+            all_key_factors.extend(value.key_factors)
+            confidences.append(value.confidence)
 
         # Resolution prediction
-        resolution_model = self._load_resolution_model()
-        if resolution_model is not None:
-            results = resolution_model.predict_with_confidence(X, feature_names)
-            result = results[0]
-            output.predicted_outcome = result.prediction
-            output.outcome_probabilities = result.probabilities or {}
-            all_key_factors.extend(result.key_factors)
-            confidences.append(result.confidence)
+        if resolution is not None:
+            output.predicted_outcome = resolution.prediction
+            output.outcome_probabilities = dict(resolution.probabilities or {})
+            all_key_factors.extend(resolution.key_factors)
+            confidences.append(resolution.confidence)
 
         # Duration prediction
-        duration_model = self._load_duration_model()
-        if duration_model is not None:
-            results = duration_model.predict_with_confidence(X, feature_names)
-            result = results[0]
+        if duration is not None:
             output.predicted_duration_days = {
-                'low': result.low,
-                'mid': result.mid,
-                'high': result.high,
+                'low': duration.low,
+                'mid': duration.mid,
+                'high': duration.high,
             }
-            all_key_factors.extend(result.key_factors)
-            confidences.append(result.confidence)
+            all_key_factors.extend(duration.key_factors)
+            confidences.append(duration.confidence)
 
         # Aggregate key factors (deduplicate)
         seen = set()
@@ -509,6 +599,23 @@ class CasePredictor:
 
         return output
 
+    def load_all(self) -> Dict[str, Dict[str, Any]]:
+        """Load the feature pipeline and every available model now."""
+        with track_load(self.load_stats, 'pipeline'):
+            pipeline = self._load_pipeline()
+            if pipeline.historical is not None:
+                # Pull historical stats (snapshot or DB) into memory too;
+                # if that fails they load on the first prediction instead
+                try:
+                    pipeline.historical.extract_batch([{}])
+                except Exception:
+                    pass
+        self._load_dismissal_model()
+        self._load_value_model()
+        self._load_resolution_model()
+        self._load_duration_model()
+        return self.load_stats
+
     def is_available(self) -> Dict[str, bool]:
         """Check which models are available."""
         return {
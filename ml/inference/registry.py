@@ -0,0 +1,170 @@
+"""
+Model registry for the API.
+
+Owns the process-wide predictor instance (ONNX when models are exported,
+scikit-learn otherwise), preloads every model at startup when configured
+to, and reports per-model load times and memory for /v1/ml/status.
+"""
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+import os
+import threading
+import time
+
+
+def rss_bytes() -> Optional[int]:
+    """Resident set size of this process, or None if it can't be read."""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except Exception:
+        pass
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except Exception:
+        return None
+
+
+@contextmanager
+def track_load(stats: Dict[str, Dict[str, Any]], name: str, path: Optional[Path] = None):
+    """
+    Record load time and memory for one model into stats[name].
+
+    memory_delta_bytes is the change in process RSS while loading, which
+    approximates the model's in-memory footprint.
+    """
+    rss_before = rss_bytes()
+    started = time.perf_counter()
+    yield
+    rss_after = rss_bytes()
+    stats[name] = {
+        'load_ms': round((time.perf_counter() - started) * 1000, 1),
+        'file_bytes': path.stat().st_size if path is not None and path.exists() else None,
+        'memory_delta_bytes': (
+            rss_after - rss_before if rss_before is not None and rss_after is not None else None
+        ),
+        'loaded_at': time.time(),
+    }
+
+
+class ModelRegistry:
+    """
+    Process-wide predictor with optional eager loading.
+
+    get() resolves the backend once and hands out the same predictor to every
+    request, so model deserialization and ONNX session creation happen at
+    most once per process (at startup when preload is enabled).
+    """
+
+    def __init__(self, model_dir: Optional[Path] = None, config=None):
+        from ..config import default_config
+
+        self.model_dir = model_dir
+        self.config = config or default_config
+        self._predictor = None
+        self._backend: Optional[str] = None
+        self._resolved = False
+        self._lock = threading.RLock()
+        self.preload_state: Dict[str, Any] = {'status': 'not_started'}
+
+    def _create(self) -> Tuple[Any, Optional[str]]:
+        """Pick a backend: ONNX first (lightweight), scikit-learn as fallback."""
+        try:
+            from .onnx_predictor import ONNXPredictor
+            predictor = ONNXPredictor(self.model_dir, config=self.config)
+            if any(predictor.is_available().values()):
+                return predictor, "onnx"
+        except Exception:
+            pass
+
+        try:
+            from .predictor import CasePredictor
+            return CasePredictor(self.model_dir, config=self.config), "sklearn"
+        except ImportError:
+            pass
+
+        return None, None
+
+    def get(self) -> Tuple[Any, Optional[str]]:
+        """Return (predictor, backend), creating the predictor on first use."""
+        if self._resolved:
+            return self._predictor, self._backend
+        with self._lock:
+            if not self._resolved:
+                self._predictor, self._backend = self._create()
+                self._resolved = True
+        return self._predictor, self._backend
+
+    def preload(self) -> Dict[str, Any]:
+        """Create the predictor and load every available model now."""
+        started = time.perf_counter()
+        self.preload_state = {'status': 'loading', 'started_at': time.time()}
+        try:
+            with self._lock:
+                predictor, backend = self.get()
+                if predictor is not None:
+                    predictor.load_all()
+            self.preload_state = {
+                'status': 'done' if predictor is not None else 'unavailable',
+                'backend': backend,
+                'duration_ms': round((time.perf_counter() - started) * 1000, 1),
+            }
+        except Exception as e:
+            self.preload_state = {'status': 'error', 'error': str(e)}
+        return self.preload_state
+
+    def preload_async(self) -> threading.Thread:
+        """Preload on a background thread so process startup isn't blocked."""
+        thread = threading.Thread(target=self.preload, name="ml-preload", daemon=True)
+        thread.start()
+        return thread
+
+    def reload(self):
+        """
+        Drop the current predictor (and its prediction cache); the next
+        get() loads models afresh.
+        """
+        with self._lock:
+            self._predictor = None
+            self._backend = None
+            self._resolved = False
+
+    def status(self) -> Dict[str, Any]:
+        """Model availability, load stats and process memory."""
+        from ..config import MODEL_VERSION
+
+        predictor, backend = self.get()
+        if predictor is not None:
+            models = predictor.is_available()
+            load_stats = dict(predictor.load_stats)
+            cache = predictor.cache.stats()
+        else:
+            models = {m: False for m in ['dismissal', 'value', 'resolution', 'duration']}
+            load_stats = {}
+            cache = None
+
+        return {
+            "version": MODEL_VERSION,
+            "backend": backend or "none",
+            "models": models,
+            "loaded": load_stats,
+            "preload": {**self.preload_state, "enabled": self.config.inference.preload},
+            "cache": cache,
+            "process_rss_bytes": rss_bytes(),
+        }
+
+
+_registry: Optional[ModelRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_registry() -> ModelRegistry:
+    """Shared registry for the API process."""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = ModelRegistry()
+    return _registry
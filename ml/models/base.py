@@ -273,3 +273,39 @@ class BaseModel(ABC):
             metrics=metrics,
             description=description,
         )
+
+    def _continue_estimator(self, estimator, extra_estimators: int):
+        """
+        Prepare a fitted tree ensemble for warm-start training.
+
+        With warm_start set, the next fit() keeps the existing trees and only
+        adds extra_estimators new ones, instead of refitting from scratch.
+        """
+        estimator.set_params(
+            warm_start=True,
+            n_estimators=estimator.n_estimators + extra_estimators,
+        )
+        return estimator
+
+    @staticmethod
+    def _previous_cv(previous: 'BaseModel', metric: str) -> tuple:
+        """
+        (mean, std, samples) of a CV metric recorded by a previous model.
+
+        Warm starts skip cross-validation (it would refit every fold from
+        scratch), so they carry the last full training run's scores forward.
+        `samples` is the size of the run they were computed on; less than
+        training_samples means the scores are stale.
+        """
+        metadata = previous.metadata
+        metrics = metadata.metrics if metadata else {}
+        samples = metrics.get('cv_samples', metadata.training_samples if metadata else 0)
+        return metrics.get(f'{metric}_mean', 0.0), metrics.get(f'{metric}_std', 0.0), samples
+
+    @staticmethod
+    def _warm_start_count(previous: Optional['BaseModel']) -> int:
+        """Consecutive warm starts behind a model continued from previous (0 if trained from scratch)."""
+        if previous is None:
+            return 0
+        hyperparameters = previous.metadata.hyperparameters if previous.metadata else {}
+        return hyperparameters.get('warm_starts', 0) + 1
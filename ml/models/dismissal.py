@@ -58,6 +58,8 @@ class DismissalModel(BaseModel):
         y: np.ndarray,
         feature_names: Optional[List[str]] = None,
         cv_folds: int = 5,
+        warm_start: Optional['DismissalModel'] = None,
+        extra_estimators: int = 50,
         **kwargs
     ) -> 'DismissalModel':
         """
@@ -68,20 +70,32 @@ class DismissalModel(BaseModel):
             y: Binary target (1 = granted, 0 = denied)
             feature_names: Names of features
             cv_folds: Number of CV folds for calibration
+            warm_start: Previously trained model to continue from; new trees
+                are added to its ensemble and cross-validation is skipped
+                (ignored when calibrating, which refits from scratch)
+            extra_estimators: Trees added when warm starting
             **kwargs: Additional arguments
 
         Returns:
             self for method chaining
         """
+        # Calibrate if requested and enough samples per class
+        min_class_count = min(np.sum(y == 0), np.sum(y == 1))
+        calibrate = self.config.calibrate and min_class_count >= cv_folds
+
+        if calibrate or warm_start is None or warm_start.base_model is None:
+            warm_start = None
+
         # Create base model
-        self.base_model = self._create_base_model()
+        if warm_start is not None:
+            self.base_model = self._continue_estimator(warm_start.base_model, extra_estimators)
+        else:
+            self.base_model = self._create_base_model()
 
         # Fit base model
         self.base_model.fit(X, y)
 
-        # Calibrate if requested and enough samples per class
-        min_class_count = min(np.sum(y == 0), np.sum(y == 1))
-        if self.config.calibrate and min_class_count >= cv_folds:
+        if calibrate:
             # Use cross-validation based calibration
             self.calibrated_model = CalibratedClassifierCV(
                 estimator=self._create_base_model(),
@@ -95,17 +109,21 @@ class DismissalModel(BaseModel):
             self.model = self.base_model
 
         # Compute metrics
-        min_class_count = min(np.sum(y == 0), np.sum(y == 1))
         effective_cv = min(cv_folds, min_class_count, len(y) // 2)
-        if effective_cv >= 2:
-            cv_scores = cross_val_score(
-                self._create_base_model(), X, y,
-                cv=effective_cv,
-                scoring='roc_auc'
-            )
+        if warm_start is not None:
+            cv_auc_mean, cv_auc_std, cv_samples = self._previous_cv(warm_start, 'cv_auc')
         else:
-            # Not enough samples for CV, use training score
-            cv_scores = np.array([0.5])
+            if effective_cv >= 2:
+                cv_scores = cross_val_score(
+                    self._create_base_model(), X, y,
+                    cv=effective_cv,
+                    scoring='roc_auc'
+                )
+            else:
+                # Not enough samples for CV, use training score
+                cv_scores = np.array([0.5])
+            cv_auc_mean, cv_auc_std = float(cv_scores.mean()), float(cv_scores.std())
+            cv_samples = len(y)
 
         # Create metadata
         self.metadata = self._create_metadata(
@@ -114,15 +132,18 @@ class DismissalModel(BaseModel):
             training_samples=len(y),
             feature_names=feature_names or [],
             hyperparameters={
-                'n_estimators': self.config.n_estimators,
+                'n_estimators': self.base_model.n_estimators,
                 'learning_rate': self.config.learning_rate,
                 'max_depth': self.config.max_depth,
                 'calibrated': self.config.calibrate,
                 'calibration_method': self.config.calibration_method,
+                'warm_start': warm_start is not None,
+                'warm_starts': self._warm_start_count(warm_start),
             },
             metrics={
-                'cv_auc_mean': float(cv_scores.mean()),
-                'cv_auc_std': float(cv_scores.std()),
+                'cv_auc_mean': cv_auc_mean,
+                'cv_auc_std': cv_auc_std,
+                'cv_samples': cv_samples,
                 'positive_rate': float(y.mean()),
             },
             description="Motion to dismiss grant probability model"
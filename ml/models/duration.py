@@ -65,6 +65,8 @@ class DurationModel(BaseModel):
         y: np.ndarray,
         feature_names: Optional[List[str]] = None,
         cv_folds: int = 5,
+        warm_start: Optional['DurationModel'] = None,
+        extra_estimators: int = 50,
         **kwargs
     ) -> 'DurationModel':
         """
@@ -75,6 +77,9 @@ class DurationModel(BaseModel):
             y: Duration in days
             feature_names: Names of features
             cv_folds: Number of CV folds
+            warm_start: Previously trained model to continue from; new trees
+                are added to its ensembles and cross-validation is skipped
+            extra_estimators: Trees added per ensemble when warm starting
             **kwargs: Additional arguments
 
         Returns:
@@ -85,7 +90,11 @@ class DurationModel(BaseModel):
 
         # Train model for each quantile
         for quantile in self.config.quantiles:
-            model = self._create_quantile_model(quantile)
+            previous = warm_start.quantile_models.get(quantile) if warm_start else None
+            if previous is not None:
+                model = self._continue_estimator(previous, extra_estimators)
+            else:
+                model = self._create_quantile_model(quantile)
             model.fit(X, y_clipped)
             self.quantile_models[quantile] = model
 
@@ -93,12 +102,17 @@ class DurationModel(BaseModel):
         self.model = self.quantile_models.get(0.5)
 
         # Compute metrics
-        cv_scores = cross_val_score(
-            self._create_quantile_model(0.5),
-            X, y_clipped,
-            cv=min(cv_folds, len(y) // 2),
-            scoring='neg_mean_absolute_error'
-        )
+        if warm_start is not None:
+            cv_mae_mean, cv_mae_std, cv_samples = self._previous_cv(warm_start, 'cv_mae')
+        else:
+            cv_scores = cross_val_score(
+                self._create_quantile_model(0.5),
+                X, y_clipped,
+                cv=min(cv_folds, len(y) // 2),
+                scoring='neg_mean_absolute_error'
+            )
+            cv_mae_mean, cv_mae_std = float(-cv_scores.mean()), float(cv_scores.std())
+            cv_samples = len(y)
 
         # Create metadata
         self.metadata = self._create_metadata(
@@ -107,16 +121,19 @@ class DurationModel(BaseModel):
             training_samples=len(y),
             feature_names=feature_names or [],
             hyperparameters={
-                'n_estimators': self.config.n_estimators,
+                'n_estimators': max(m.n_estimators for m in self.quantile_models.values()),
                 'learning_rate': self.config.learning_rate,
                 'max_depth': self.config.max_depth,
                 'quantiles': self.config.quantiles,
                 'min_duration': self.config.min_duration,
                 'max_duration': self.config.max_duration,
+                'warm_start': warm_start is not None,
+                'warm_starts': self._warm_start_count(warm_start),
             },
             metrics={
-                'cv_mae_mean': float(-cv_scores.mean()),
-                'cv_mae_std': float(cv_scores.std()),
+                'cv_mae_mean': cv_mae_mean,
+                'cv_mae_std': cv_mae_std,
+                'cv_samples': cv_samples,
                 'mean_duration': float(y.mean()),
                 'median_duration': float(np.median(y)),
             },
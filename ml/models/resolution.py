@@ -4,6 +4,7 @@ Resolution path classification model.
 Predicts the likely outcome path: dismissal, settlement, judgment, or trial.
 """
 from typing import Dict, List, Optional
+import warnings
 import numpy as np
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.model_selection import cross_val_score
@@ -60,6 +61,8 @@ class ResolutionModel(BaseModel):
         y: np.ndarray,
         feature_names: Optional[List[str]] = None,
         cv_folds: int = 5,
+        warm_start: Optional['ResolutionModel'] = None,
+        extra_estimators: int = 50,
         **kwargs
     ) -> 'ResolutionModel':
         """
@@ -70,6 +73,10 @@ class ResolutionModel(BaseModel):
             y: Resolution labels (strings or encoded)
             feature_names: Names of features
             cv_folds: Number of CV folds
+            warm_start: Previously trained model to continue from; new trees
+                are added to its ensemble and cross-validation is skipped
+                (ignored if the set of classes changed)
+            extra_estimators: Trees added when warm starting
             **kwargs: Additional arguments
 
         Returns:
@@ -83,17 +90,35 @@ class ResolutionModel(BaseModel):
             y_encoded = y
             self._class_names = self.config.classes
 
+        # Trees from a previous model can only be reused for the same classes
+        if warm_start is not None and (
+            warm_start.model is None or warm_start._class_names != self._class_names
+        ):
+            warm_start = None
+
         # Create and train model
-        self.model = self._create_model()
-        self.model.fit(X, y_encoded)
+        if warm_start is not None:
+            self.model = self._continue_estimator(warm_start.model, extra_estimators)
+        else:
+            self.model = self._create_model()
+        with warnings.catch_warnings():
+            # New trees are fit on the full dataset, so "balanced" class
+            # weights are still computed from every row
+            warnings.filterwarnings('ignore', message='class_weight presets', category=UserWarning)
+            self.model.fit(X, y_encoded)
 
         # Compute metrics
-        cv_scores = cross_val_score(
-            self._create_model(),
-            X, y_encoded,
-            cv=min(cv_folds, len(y) // 2),
-            scoring='accuracy'
-        )
+        if warm_start is not None:
+            cv_accuracy_mean, cv_accuracy_std, cv_samples = self._previous_cv(warm_start, 'cv_accuracy')
+        else:
+            cv_scores = cross_val_score(
+                self._create_model(),
+                X, y_encoded,
+                cv=min(cv_folds, len(y) // 2),
+                scoring='accuracy'
+            )
+            cv_accuracy_mean, cv_accuracy_std = float(cv_scores.mean()), float(cv_scores.std())
+            cv_samples = len(y)
 
         # Class distribution
         unique, counts = np.unique(y_encoded, return_counts=True)
@@ -109,14 +134,17 @@ class ResolutionModel(BaseModel):
             training_samples=len(y),
             feature_names=feature_names or [],
             hyperparameters={
-                'n_estimators': self.config.n_estimators,
+                'n_estimators': self.model.n_estimators,
                 'max_depth': self.config.max_depth,
                 'class_weight': self.config.class_weight,
                 'classes': self._class_names,
+                'warm_start': warm_start is not None,
+                'warm_starts': self._warm_start_count(warm_start),
             },
             metrics={
-                'cv_accuracy_mean': float(cv_scores.mean()),
-                'cv_accuracy_std': float(cv_scores.std()),
+                'cv_accuracy_mean': cv_accuracy_mean,
+                'cv_accuracy_std': cv_accuracy_std,
+                'cv_samples': cv_samples,
                 'n_classes': len(self._class_names),
                 'class_distribution': class_distribution,
             },
@@ -3,14 +3,19 @@ Training module for ML models.
 
 Provides:
 - ModelTrainer: Training orchestration
-- evaluate: Model evaluation utilities
+- evaluate: Model evaluation utilities and inference benchmarks
 """
 from .trainer import ModelTrainer
-from .evaluate import evaluate_model, cross_validate_model, generate_report
+from .evaluate import (
+    evaluate_model, cross_validate_model, generate_report,
+    run_benchmarks, format_benchmark_report,
+)
 
 __all__ = [
     'ModelTrainer',
     'evaluate_model',
     'cross_validate_model',
     'generate_report',
+    'run_benchmarks',
+    'format_benchmark_report',
 ]
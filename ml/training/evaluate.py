@@ -1,9 +1,20 @@
 """
 Model evaluation utilities.
 
-Provides metrics computation, cross-validation, and report generation.
+Provides metrics computation, cross-validation, and report generation,
+plus an inference benchmark (latency, throughput, feature extraction time
+and memory per backend) with a JSON report that can be diffed across commits.
 """
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Callable, Dict, List, Optional, Any, Sequence, Tuple
+import gc
+import os
+import platform
+import random
+import resource
+import sqlite3
+import subprocess
+import time
+import tracemalloc
 import numpy as np
 from sklearn.model_selection import cross_val_score, StratifiedKFold, KFold
 from sklearn.metrics import (
@@ -337,3 +348,533 @@ def generate_report(
             json.dump(report_data, f, indent=2)
 
     return report_text
+
+
+# ---------------------------------------------------------------------------
+# Inference benchmarks
+# ---------------------------------------------------------------------------
+
+BENCHMARK_FORMAT = 1
+LATENCY_PERCENTILES = (50, 90, 95, 99)
+DEFAULT_BATCH_SIZES = (1, 8, 32, 128)
+BENCHMARK_MODELS = ['dismissal', 'value', 'resolution', 'duration']
+
+_COMPLAINT_TEMPLATE = """
+UNITED STATES DISTRICT COURT
+{court} DISTRICT
+
+JOHN DOE, individually and on behalf of all others similarly situated,
+Plaintiff,
+v.
+{defendant},
+Defendant.
+
+CLASS ACTION COMPLAINT AND DEMAND FOR JURY TRIAL
+
+Plaintiff brings this action against {defendant} for violations of the
+Securities Exchange Act of 1934, 15 U.S.C. 78j(b), the Fair Labor Standards
+Act, 29 U.S.C. 201 et seq., and for breach of contract, negligence and
+unjust enrichment. Plaintiff seeks compensatory damages in excess of
+$5,000,000, punitive damages, restitution and injunctive relief.
+
+COUNT I - VIOLATION OF SECTION 10(b) OF THE EXCHANGE ACT
+COUNT II - NEGLIGENCE
+COUNT III - BREACH OF CONTRACT
+"""
+
+
+def latency_summary(seconds: Sequence[float]) -> Dict[str, float]:
+    """
+    Summarize timings as latency percentiles.
+
+    Args:
+        seconds: Individual call durations (seconds)
+
+    Returns:
+        Dict with count, mean, min, max and p50/p90/p95/p99 in milliseconds
+    """
+    if not seconds:
+        return {'count': 0}
+    ms = np.asarray(seconds, dtype=np.float64) * 1000
+    summary = {
+        'count': int(ms.size),
+        'mean_ms': round(float(ms.mean()), 4),
+        'min_ms': round(float(ms.min()), 4),
+        'max_ms': round(float(ms.max()), 4),
+    }
+    for pct in LATENCY_PERCENTILES:
+        summary[f'p{pct}_ms'] = round(float(np.percentile(ms, pct)), 4)
+    return summary
+
+
+def _time_calls(fn: Callable[[Any], Any], args: Sequence[Any], repeat: int) -> List[float]:
+    """Time fn(arg) for every arg, repeat passes; returns per-call seconds."""
+    timings = []
+    for _ in range(repeat):
+        for arg in args:
+            started = time.perf_counter()
+            fn(arg)
+            timings.append(time.perf_counter() - started)
+    return timings
+
+
+def _batches(items: Sequence[Any], size: int) -> List[Sequence[Any]]:
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def _timed_batches(
+    fn: Callable[[Any], Any],
+    items: Sequence[Any],
+    batch_sizes: Sequence[int],
+    repeat: int,
+) -> Dict[str, Any]:
+    """Per-batch latency and throughput of fn over items for each batch size."""
+    results = {}
+    for size in batch_sizes:
+        batches = _batches(items, size)
+        timings = _time_calls(fn, batches, repeat)
+        total_items = len(items) * repeat
+        results[str(size)] = {
+            'batch_latency': latency_summary(timings),
+            'per_item_ms': round(sum(timings) * 1000 / total_items, 4) if total_items else None,
+            'throughput_per_s': round(total_items / sum(timings), 1) if sum(timings) else None,
+        }
+    return results
+
+
+def measure_peak_memory(fn: Callable[[], Any]) -> Dict[str, Optional[int]]:
+    """
+    Peak memory while running fn once.
+
+    traced_peak_bytes covers Python and numpy allocations (tracemalloc);
+    native allocations inside onnxruntime / BLAS are only visible in the
+    process RSS, reported before and after.
+    """
+    from ..inference.registry import rss_bytes
+
+    gc.collect()
+    rss_before = rss_bytes()
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    rss_after = rss_bytes()
+    return {
+        'traced_peak_bytes': peak,
+        'rss_before_bytes': rss_before,
+        'rss_after_bytes': rss_after,
+    }
+
+
+def benchmark_records(
+    records: Optional[List[Dict[str, Any]]] = None,
+    n: int = 200,
+    seed: int = 42,
+    config=None,
+) -> List[Dict[str, Any]]:
+    """
+    Case records to benchmark with.
+
+    Args:
+        records: Real cases (e.g. ModelTrainer.case_records); sampled down to n
+        n: Number of records
+        seed: Random seed for sampling / synthesis
+        config: ML configuration (synthetic records draw courts and NOS from it)
+
+    Returns:
+        List of predictor keyword-argument dicts
+    """
+    rng = random.Random(seed)
+    if records:
+        if len(records) > n:
+            records = rng.sample(records, n)
+        return list(records)
+
+    from ..config import default_config
+    features = (config or default_config).features
+    defendants = ['Google LLC', 'Bank of America, N.A.', 'Acme Widgets Inc', 'City of Chicago',
+                  'Pfizer Inc', 'Main Street Diner LLC', 'Wells Fargo & Co', None]
+    return [
+        {
+            'court': rng.choice(features.court_codes),
+            'nos': rng.choice(list(features.nos_categories)),
+            'defendant': rng.choice(defendants),
+            'class_action': rng.random() < 0.3,
+            'judge': None,
+        }
+        for _ in range(n)
+    ]
+
+
+def benchmark_feature_extraction(
+    pipeline,
+    records: List[Dict[str, Any]],
+    repeat: int = 3,
+    complaint_texts: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    """
+    Time each feature extractor, per record and batched.
+
+    Args:
+        pipeline: FeaturePipeline (its structured / historical extractors are timed)
+        records: Case records
+        repeat: Timed passes over the records
+        complaint_texts: Complaint texts for the text extractor (a synthetic
+            complaint per record if not given)
+
+    Returns:
+        Dict of extractor name -> single-record latency and batch timing, or
+        {'skipped': reason} if its data isn't available (e.g. the historical
+        extractor on a database without case_outcomes)
+    """
+    from ..features.text import TextFeatureExtractor
+
+    results = {}
+    extractors = [('structured', pipeline.structured), ('historical', pipeline.historical)]
+    for name, extractor in extractors:
+        if extractor is None:
+            continue
+        try:
+            extractor.extract_batch(records[:1])  # load lookups / stats outside the timings
+        except sqlite3.Error as e:
+            results[name] = {'skipped': str(e)}
+            continue
+        single = _time_calls(lambda record: extractor.extract(**record), records, repeat)
+        batch = _time_calls(extractor.extract_batch, [records], repeat)
+        results[name] = {
+            'single': latency_summary(single),
+            'batch': latency_summary(batch),
+            'batch_per_item_ms': round(min(batch) * 1000 / len(records), 4) if records else None,
+        }
+
+    if complaint_texts is None:
+        complaint_texts = [
+            _COMPLAINT_TEMPLATE.format(
+                court=(record.get('court') or 'central').upper(),
+                defendant=record.get('defendant') or 'ACME CORPORATION',
+            )
+            for record in records
+        ]
+    text = pipeline.text or TextFeatureExtractor()
+    single = _time_calls(lambda body: text.extract(complaint_text=body), complaint_texts, repeat)
+    results['text'] = {
+        'single': latency_summary(single),
+        'mean_chars': int(np.mean([len(t) for t in complaint_texts])) if complaint_texts else 0,
+    }
+
+    skipped = [name for name, result in results.items() if 'skipped' in result]
+    if skipped:
+        results['pipeline'] = {'skipped': f"{', '.join(skipped)} extractor skipped"}
+        return results
+    full = _time_calls(pipeline.extract_batch, [records], repeat)
+    results['pipeline'] = {
+        'batch': latency_summary(full),
+        'batch_per_item_ms': round(min(full) * 1000 / len(records), 4) if records else None,
+    }
+    return results
+
+
+def _model_runners(predictor, backend: str, records: List[Dict[str, Any]]):
+    """
+    Feature matrix for records plus a callable per model that runs only
+    that model over a slice of it.
+    """
+    if backend == 'onnx':
+        X = predictor._extract_features_batch(records)
+        runners = {
+            'dismissal': predictor._dismissal_batch,
+            'value': lambda batch: predictor._quantile_batch('value', batch),
+            'resolution': lambda batch: predictor._run_session('resolution', batch),
+            'duration': lambda batch: predictor._quantile_batch('duration', batch),
+        }
+        available = predictor.is_available()
+        return X, {name: fn for name, fn in runners.items() if available.get(name)}
+
+    pipeline = predictor._load_pipeline()
+    X = pipeline.extract_batch(records)
+    feature_names = pipeline.get_feature_names()
+    loaders = {
+        'dismissal': predictor._load_dismissal_model,
+        'value': predictor._load_value_model,
+        'resolution': predictor._load_resolution_model,
+        'duration': predictor._load_duration_model,
+    }
+    runners = {}
+    for name, loader in loaders.items():
+        model = loader()
+        if model is not None:
+            runners[name] = lambda batch, model=model: model.predict_with_confidence(batch, feature_names)
+    return X, runners
+
+
+def benchmark_predictor(
+    predictor,
+    backend: str,
+    records: List[Dict[str, Any]],
+    batch_sizes: Sequence[int] = DEFAULT_BATCH_SIZES,
+    repeat: int = 3,
+    warmup: int = 5,
+) -> Dict[str, Any]:
+    """
+    Benchmark one predictor backend.
+
+    Measures, with the prediction cache disabled:
+    - end-to-end predict() latency per case and predict_batch() latency and
+      throughput per batch size (feature extraction included)
+    - per-model inference on a precomputed feature matrix, single row and
+      batched (feature extraction excluded)
+    - model load times and peak memory of a full batched pass
+
+    Args:
+        predictor: CasePredictor or ONNXPredictor
+        backend: 'sklearn' or 'onnx'
+        records: Case records
+        batch_sizes: Batch sizes to time
+        repeat: Timed passes over the records
+        warmup: Untimed predictions first (session init, caches)
+
+    Returns:
+        Dict of benchmark results
+    """
+    from ..inference.cache import PredictionCache
+
+    predictor.cache = PredictionCache(max_entries=0)
+
+    load_started = time.perf_counter()
+    predictor.load_all()
+    load_ms = (time.perf_counter() - load_started) * 1000
+
+    for record in records[:warmup]:
+        predictor.predict(**record)
+
+    single = _time_calls(lambda record: predictor.predict(**record), records, repeat)
+    results = {
+        'load_ms': round(load_ms, 1),
+        'models_loaded': {name: stats.get('load_ms') for name, stats in predictor.load_stats.items()},
+        'end_to_end': {
+            'single': {
+                'latency': latency_summary(single),
+                'throughput_per_s': round(len(single) / sum(single), 1) if sum(single) else None,
+            },
+            'batched': _timed_batches(predictor.predict_batch, records, batch_sizes, repeat),
+        },
+        'models': {},
+    }
+
+    X, runners = _model_runners(predictor, backend, records)
+    rows = [X[i:i + 1] for i in range(len(X))]
+    for name, run in runners.items():
+        run(X[:1])
+        single = _time_calls(run, rows, repeat)
+        results['models'][name] = {
+            'single': latency_summary(single),
+            'batched': _timed_batches(run, X, batch_sizes, repeat),
+        }
+
+    largest = max(batch_sizes)
+    results['memory'] = measure_peak_memory(
+        lambda: [predictor.predict_batch(batch) for batch in _batches(records, largest)]
+    )
+    results['memory']['batch_size'] = largest
+    return results
+
+
+def _environment() -> Dict[str, Any]:
+    """Versions and hardware the benchmark ran on."""
+    env = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'numpy': np.__version__,
+    }
+    for module in ('sklearn', 'onnxruntime'):
+        try:
+            env[module] = __import__(module).__version__
+        except ImportError:
+            env[module] = None
+    try:
+        env['git_commit'] = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True, timeout=5,
+            cwd=Path(__file__).resolve().parent,
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        env['git_commit'] = None
+    return env
+
+
+def run_benchmarks(
+    records: Optional[List[Dict[str, Any]]] = None,
+    model_dir: Optional[Path] = None,
+    backends: Sequence[str] = ('sklearn', 'onnx'),
+    n_samples: int = 200,
+    batch_sizes: Sequence[int] = DEFAULT_BATCH_SIZES,
+    repeat: int = 3,
+    config=None,
+    output_path: Optional[Path] = None,
+) -> Dict[str, Any]:
+    """
+    Benchmark feature extraction and every available backend.
+
+    Args:
+        records: Case records (synthetic ones are generated if not given)
+        model_dir: Trained model directory (defaults to the current version)
+        backends: Backends to benchmark ('sklearn', 'onnx')
+        n_samples: Records to benchmark with
+        batch_sizes: Batch sizes for batched inference
+        repeat: Timed passes per measurement
+        config: ML configuration
+        output_path: Write the JSON report here
+
+    Returns:
+        Benchmark report (JSON-serializable, keys sorted when written)
+    """
+    from ..config import default_config
+    from ..features.pipeline import FeaturePipeline
+
+    config = config or default_config
+    records = benchmark_records(records, n=n_samples, config=config)
+    batch_sizes = sorted(set(batch_sizes))
+
+    report = {
+        'format': BENCHMARK_FORMAT,
+        'generated_at': datetime.now().isoformat(),
+        'environment': _environment(),
+        'settings': {
+            'samples': len(records),
+            'batch_sizes': batch_sizes,
+            'repeat': repeat,
+            'model_dir': str(model_dir) if model_dir else str(config.models_dir),
+        },
+        'feature_extraction': benchmark_feature_extraction(
+            FeaturePipeline(config=config, include_text=False, include_historical=True),
+            records, repeat=repeat,
+        ),
+        'backends': {},
+    }
+
+    for backend in backends:
+        try:
+            if backend == 'onnx':
+                from ..inference.onnx_predictor import ONNXPredictor
+                predictor = ONNXPredictor(model_dir, config=config)
+            elif backend == 'sklearn':
+                from ..inference.predictor import CasePredictor
+                predictor = CasePredictor(model_dir, config=config)
+            else:
+                raise ValueError(f"Unknown backend: {backend}")
+        except ImportError as e:
+            report['backends'][backend] = {'error': str(e)}
+            continue
+
+        if not any(predictor.is_available().values()):
+            report['backends'][backend] = {'error': 'No trained models'}
+            continue
+        report['backends'][backend] = benchmark_predictor(
+            predictor, backend, records, batch_sizes=batch_sizes, repeat=repeat
+        )
+
+    report['comparison'] = _compare_backends(report['backends'], batch_sizes)
+    report['peak_rss_bytes'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+    if output_path:
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(output_path, 'w') as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+
+    return report
+
+
+def _compare_backends(backends: Dict[str, Any], batch_sizes: Sequence[int]) -> Dict[str, Any]:
+    """ONNX speedup over scikit-learn (throughput ratio) per batch size."""
+    sklearn_results, onnx_results = backends.get('sklearn', {}), backends.get('onnx', {})
+    if 'end_to_end' not in sklearn_results or 'end_to_end' not in onnx_results:
+        return {}
+
+    def speedup(base, other):
+        if not base or not other:
+            return None
+        return round(other / base, 3)
+
+    comparison = {
+        'single_speedup': speedup(
+            sklearn_results['end_to_end']['single']['throughput_per_s'],
+            onnx_results['end_to_end']['single']['throughput_per_s'],
+        ),
+        'batched_speedup': {},
+    }
+    for size in batch_sizes:
+        key = str(size)
+        comparison['batched_speedup'][key] = speedup(
+            sklearn_results['end_to_end']['batched'][key]['throughput_per_s'],
+            onnx_results['end_to_end']['batched'][key]['throughput_per_s'],
+        )
+    return comparison
+
+
+def format_benchmark_report(report: Dict[str, Any]) -> str:
+    """Human-readable summary of a run_benchmarks() report."""
+    settings = report['settings']
+    lines = [
+        "=" * 60,
+        "INFERENCE BENCHMARK",
+        f"Generated: {report['generated_at']}  commit: {report['environment'].get('git_commit')}",
+        f"Samples: {settings['samples']}  repeat: {settings['repeat']}",
+        "=" * 60,
+        "",
+        "## FEATURE EXTRACTION (per item)",
+        "-" * 40,
+    ]
+    for name, result in report['feature_extraction'].items():
+        if 'skipped' in result:
+            lines.append(f"  {name:<11} skipped: {result['skipped']}")
+            continue
+        single = result.get('single', {})
+        batch = result.get('batch_per_item_ms')
+        line = f"  {name:<11}"
+        if single:
+            line += f" single p50 {single['p50_ms']:.3f} ms  p99 {single['p99_ms']:.3f} ms"
+        if batch is not None:
+            line += f"  batched {batch:.4f} ms"
+        lines.append(line)
+    lines.append("")
+
+    for backend, result in report['backends'].items():
+        lines.append(f"## {backend.upper()} BACKEND")
+        lines.append("-" * 40)
+        if 'error' in result:
+            lines.append(f"  Error: {result['error']}")
+            lines.append("")
+            continue
+        single = result['end_to_end']['single']
+        lines.append(f"  Load: {result['load_ms']:.0f} ms")
+        lines.append(
+            f"  predict():  p50 {single['latency']['p50_ms']:.3f} ms  "
+            f"p99 {single['latency']['p99_ms']:.3f} ms  {single['throughput_per_s']:,.0f}/s"
+        )
+        for size, batch in result['end_to_end']['batched'].items():
+            lines.append(
+                f"  batch {size:>4}: p50 {batch['batch_latency']['p50_ms']:.3f} ms/batch  "
+                f"{batch['per_item_ms']:.4f} ms/item  {batch['throughput_per_s']:,.0f}/s"
+            )
+        for name, model in result['models'].items():
+            lines.append(f"  {name:<11} single p50 {model['single']['p50_ms']:.3f} ms")
+        memory = result['memory']
+        lines.append(f"  Peak traced memory: {memory['traced_peak_bytes'] / 1e6:.1f} MB "
+                     f"(batch size {memory['batch_size']})")
+        lines.append("")
+
+    comparison = report.get('comparison')
+    if comparison:
+        lines.append("## ONNX vs SKLEARN (throughput ratio, >1 = ONNX faster)")
+        lines.append("-" * 40)
+        lines.append(f"  single: {comparison['single_speedup']}")
+        for size, ratio in comparison['batched_speedup'].items():
+            lines.append(f"  batch {size:>4}: {ratio}")
+        lines.append("")
+
+    return "\n".join(lines)
@@ -3,8 +3,14 @@ Training orchestration for ML models.
 
 Handles data loading, feature extraction, model training, and saving.
 """
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
 from typing import Dict, List, Optional, Tuple, Any
+import hashlib
+import io
+import os
 import sqlite3
+import time
 import numpy as np
 import pandas as pd
 from pathlib import Path
@@ -13,18 +19,57 @@ import json
 
 from ..config import MLConfig, default_config, CURRENT_MODEL_DIR
 from ..features.pipeline import FeaturePipeline
+from ..features.historical import HistoricalFeatureExtractor
 from ..models.dismissal import DismissalModel
 from ..models.value import ValueModel
 from ..models.resolution import ResolutionModel
 from ..models.duration import DurationModel
 
 
+# Model name -> (model class, ModelTrainer method), in training order
+MODEL_TRAINERS = {
+    'dismissal': (DismissalModel, 'train_dismissal_model'),
+    'value': (ValueModel, 'train_value_model'),
+    'resolution': (ResolutionModel, 'train_resolution_model'),
+    'duration': (DurationModel, 'train_duration_model'),
+}
+
+
+def _train_in_worker(
+    config: MLConfig,
+    db_path: Path,
+    output_dir: Path,
+    name: str,
+    df: pd.DataFrame,
+    features: Tuple[np.ndarray, List[str]],
+    save: bool,
+    warm_start,
+):
+    """
+    Train one model in a worker process.
+
+    Returns:
+        Tuple of (model, captured output, seconds)
+    """
+    trainer = ModelTrainer(config, db_path=db_path, output_dir=output_dir)
+    output = io.StringIO()
+    started = time.perf_counter()
+    with redirect_stdout(output):
+        model = trainer.train_model(name, df, save=save, features=features, warm_start=warm_start)
+    return model, output.getvalue(), time.perf_counter() - started
+
+
 class ModelTrainer:
     """
     Orchestrates training of all ML models.
 
     Loads data from the database, extracts features, trains models,
     and saves artifacts to the models directory.
+
+    train_all() extracts the feature matrix once (cached on disk by a hash
+    of the training data), trains the four models in parallel worker
+    processes, and with incremental=True continues the previous models
+    (warm start) when the only change since the last run is new rows.
     """
 
     def __init__(
@@ -51,6 +96,10 @@ class ModelTrainer:
             include_text=False,
             include_historical=True,
         )
+        # Train on live database stats, never a possibly stale snapshot
+        self.pipeline.historical = HistoricalFeatureExtractor(
+            self.config, db_path=self.db_path, use_snapshot=False
+        )
         self._data_cache: Optional[pd.DataFrame] = None
 
     def _get_connection(self) -> sqlite3.Connection:
@@ -91,6 +140,7 @@ class ModelTrainer:
                 source
             FROM case_outcomes
             WHERE settlement_amount > 0
+            ORDER BY id
         """
 
         df = pd.read_sql_query(query, conn)
@@ -99,20 +149,73 @@ class ModelTrainer:
         self._data_cache = df
         return df
 
-    def _prepare_features(
-        self,
-        df: pd.DataFrame,
-        include_text: bool = False
-    ) -> Tuple[np.ndarray, List[str]]:
+    def data_hash(self, df: pd.DataFrame) -> str:
         """
-        Prepare feature matrix from dataframe.
+        Hash identifying a training data snapshot.
+
+        Covers every row and column of df plus the feature configuration.
+        It does not cover the historical statistics: those are computed over
+        every case_outcomes row (not only settlement_amount > 0) and
+        judge_profiles, see stats_hash.
+        """
+        digest = hashlib.sha1()
+        digest.update(self.config.model_version.encode('utf-8'))
+        digest.update(json.dumps(self.config.features.__dict__, sort_keys=True, default=str).encode('utf-8'))
+        digest.update(json.dumps(list(df.columns)).encode('utf-8'))
+        digest.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+        return digest.hexdigest()[:16]
+
+    def stats_hash(self) -> str:
+        """Hash of the historical statistics the features are extracted with."""
+        stats = self.pipeline.historical.export_stats()
+        digest = hashlib.sha1(json.dumps(stats, sort_keys=True, default=str).encode('utf-8'))
+        return digest.hexdigest()[:16]
+
+    def prepare_features(self, df: pd.DataFrame) -> Tuple[np.ndarray, List[str]]:
+        """
+        Feature matrix for df, read from the on-disk cache when this exact
+        data snapshot was extracted before with the same historical statistics.
+
+        Returns:
+            Tuple of (feature_matrix, feature_names)
+        """
+        cache_dir = Path(self.config.feature_cache_dir)
+        cache_path = cache_dir / f"features-{self.data_hash(df)}-{self.stats_hash()}.npz"
+
+        if cache_path.exists():
+            try:
+                with np.load(cache_path, allow_pickle=False) as data:
+                    X, feature_names = data['X'], [str(n) for n in data['feature_names']]
+                os.utime(cache_path)
+                print(f"Loaded cached features from {cache_path}")
+                return X, feature_names
+            except (OSError, KeyError, ValueError):
+                pass  # Corrupt or partial file: re-extract
+
+        X, feature_names = self._prepare_features(df)
+
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_name(f".{cache_path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, X=X, feature_names=np.array(feature_names))
+        os.replace(tmp_path, cache_path)
+
+        # Keep only the most recently used matrices
+        cached = sorted(cache_dir.glob("features-*.npz"), key=lambda p: p.stat().st_mtime, reverse=True)
+        for stale in cached[self.config.training.feature_cache_entries:]:
+            stale.unlink(missing_ok=True)
+
+        return X, feature_names
+
+    def case_records(self, df: pd.DataFrame) -> List[Dict[str, Any]]:
+        """
+        Predictor keyword arguments (court, nos, defendant, ...) for each row.
 
         Args:
             df: DataFrame with case data
-            include_text: Whether to include text features
 
         Returns:
-            Tuple of (feature_matrix, feature_names)
+            List of dicts accepted by FeaturePipeline.extract_batch and predict()
         """
         records = []
         for _, row in df.iterrows():
@@ -125,6 +228,24 @@ class ModelTrainer:
                 'judge': None,  # Would need to join with docket entries
             }
             records.append(record)
+        return records
+
+    def _prepare_features(
+        self,
+        df: pd.DataFrame,
+        include_text: bool = False
+    ) -> Tuple[np.ndarray, List[str]]:
+        """
+        Prepare feature matrix from dataframe.
+
+        Args:
+            df: DataFrame with case data
+            include_text: Whether to include text features
+
+        Returns:
+            Tuple of (feature_matrix, feature_names)
+        """
+        records = self.case_records(df)
 
         # Use the trainer's pipeline (consistent configuration)
         X = self.pipeline.extract_batch(records)
@@ -221,6 +342,8 @@ class ModelTrainer:
         self,
         df: Optional[pd.DataFrame] = None,
         save: bool = True,
+        features: Optional[Tuple[np.ndarray, List[str]]] = None,
+        warm_start: Optional[DismissalModel] = None,
     ) -> DismissalModel:
         """
         Train the dismissal probability model.
@@ -228,6 +351,8 @@ class ModelTrainer:
         Args:
             df: Training data (loads from DB if not provided)
             save: Whether to save the trained model
+            features: Precomputed (feature_matrix, feature_names) for df
+            warm_start: Previously trained model to continue training
 
         Returns:
             Trained DismissalModel
@@ -238,7 +363,7 @@ class ModelTrainer:
         print(f"Training dismissal model on {len(df)} cases...")
 
         # Prepare features and target
-        X, feature_names = self._prepare_features(df)
+        X, feature_names = features if features is not None else self._prepare_features(df)
         y = self._prepare_dismissal_target(df)
 
         # Filter out NaN values
@@ -251,7 +376,8 @@ class ModelTrainer:
 
         # Train model
         model = DismissalModel(self.config.dismissal)
-        model.fit(X, y, feature_names=feature_names)
+        model.fit(X, y, feature_names=feature_names, **self._warm_start_args(warm_start))
+        self._report_warm_start(model, warm_start)
 
         print(f"  CV AUC: {model.metadata.metrics.get('cv_auc_mean', 0):.3f}")
 
@@ -267,6 +393,8 @@ class ModelTrainer:
         self,
         df: Optional[pd.DataFrame] = None,
         save: bool = True,
+        features: Optional[Tuple[np.ndarray, List[str]]] = None,
+        warm_start: Optional[ValueModel] = None,
     ) -> ValueModel:
         """
         Train the settlement value model.
@@ -274,6 +402,8 @@ class ModelTrainer:
         Args:
             df: Training data
             save: Whether to save
+            features: Precomputed (feature_matrix, feature_names) for df
+            warm_start: Previously trained model to continue training
 
         Returns:
             Trained ValueModel
@@ -284,7 +414,7 @@ class ModelTrainer:
         print(f"Training value model on {len(df)} cases...")
 
         # Prepare features and target
-        X, feature_names = self._prepare_features(df)
+        X, feature_names = features if features is not None else self._prepare_features(df)
         y = self._prepare_value_target(df)
 
         # Filter out invalid values
@@ -298,7 +428,8 @@ class ModelTrainer:
 
         # Train model
         model = ValueModel(self.config.value)
-        model.fit(X, y, feature_names=feature_names)
+        model.fit(X, y, feature_names=feature_names, **self._warm_start_args(warm_start))
+        self._report_warm_start(model, warm_start)
 
         print(f"  CV MAE: ${model.metadata.metrics.get('cv_mae_mean', 0)/1e6:.2f}M")
 
@@ -314,6 +445,8 @@ class ModelTrainer:
         self,
         df: Optional[pd.DataFrame] = None,
         save: bool = True,
+        features: Optional[Tuple[np.ndarray, List[str]]] = None,
+        warm_start: Optional[ResolutionModel] = None,
     ) -> ResolutionModel:
         """
         Train the resolution path model.
@@ -321,6 +454,8 @@ class ModelTrainer:
         Args:
             df: Training data
             save: Whether to save
+            features: Precomputed (feature_matrix, feature_names) for df
+            warm_start: Previously trained model to continue training
 
         Returns:
             Trained ResolutionModel
@@ -331,7 +466,7 @@ class ModelTrainer:
         print(f"Training resolution model on {len(df)} cases...")
 
         # Prepare features and target
-        X, feature_names = self._prepare_features(df)
+        X, feature_names = features if features is not None else self._prepare_features(df)
         y = self._prepare_resolution_target(df)
 
         # Filter out NaN features
@@ -348,7 +483,8 @@ class ModelTrainer:
 
         # Train model
         model = ResolutionModel(self.config.resolution)
-        model.fit(X, y, feature_names=feature_names)
+        model.fit(X, y, feature_names=feature_names, **self._warm_start_args(warm_start))
+        self._report_warm_start(model, warm_start)
 
         print(f"  CV Accuracy: {model.metadata.metrics.get('cv_accuracy_mean', 0):.1%}")
 
@@ -364,6 +500,8 @@ class ModelTrainer:
         self,
         df: Optional[pd.DataFrame] = None,
         save: bool = True,
+        features: Optional[Tuple[np.ndarray, List[str]]] = None,
+        warm_start: Optional[DurationModel] = None,
     ) -> DurationModel:
         """
         Train the duration prediction model.
@@ -371,6 +509,8 @@ class ModelTrainer:
         Args:
             df: Training data
             save: Whether to save
+            features: Precomputed (feature_matrix, feature_names) for df
+            warm_start: Previously trained model to continue training
 
         Returns:
             Trained DurationModel
@@ -381,7 +521,7 @@ class ModelTrainer:
         print(f"Training duration model on {len(df)} cases...")
 
         # Prepare features and target
-        X, feature_names = self._prepare_features(df)
+        X, feature_names = features if features is not None else self._prepare_features(df)
         y = self._prepare_duration_target(df)
 
         # Filter out invalid values - but y should be valid from synthesis
@@ -401,7 +541,8 @@ class ModelTrainer:
 
         # Train model
         model = DurationModel(self.config.duration)
-        model.fit(X, y, feature_names=feature_names)
+        model.fit(X, y, feature_names=feature_names, **self._warm_start_args(warm_start))
+        self._report_warm_start(model, warm_start)
 
         print(f"  CV MAE: {model.metadata.metrics.get('cv_mae_mean', 0):.0f} days")
 
@@ -413,42 +554,189 @@ class ModelTrainer:
 
         return model
 
+    def _warm_start_args(self, warm_start) -> Dict[str, Any]:
+        """fit() keyword arguments for continuing a previously trained model."""
+        if warm_start is None:
+            return {}
+        return {
+            'warm_start': warm_start,
+            'extra_estimators': self.config.training.warm_start_estimators,
+        }
+
+    def _report_warm_start(self, model, warm_start):
+        """Log whether fit() continued warm_start or (e.g. when calibrating) trained from scratch."""
+        if warm_start is None:
+            return
+        if not model.metadata.hyperparameters.get('warm_start'):
+            print("  Warm start not applicable; trained from scratch")
+            return
+        base = warm_start.metadata.training_samples if warm_start.metadata else 0
+        print(f"  Warm start from model trained on {base} cases "
+              f"({model.metadata.hyperparameters['n_estimators']} trees, "
+              f"CV metrics from the {model.metadata.metrics.get('cv_samples', 0)}-case run)")
+
+    def train_model(
+        self,
+        name: str,
+        df: Optional[pd.DataFrame] = None,
+        save: bool = True,
+        features: Optional[Tuple[np.ndarray, List[str]]] = None,
+        warm_start=None,
+    ):
+        """
+        Train one model by name.
+
+        Args:
+            name: 'dismissal', 'value', 'resolution' or 'duration'
+            df: Training data (loads from DB if not provided)
+            save: Whether to save the trained model
+            features: Precomputed (feature_matrix, feature_names) for df
+            warm_start: Previously trained model to continue training
+
+        Returns:
+            Trained model (None if there was nothing to train on)
+        """
+        if name not in MODEL_TRAINERS:
+            raise ValueError(f"Unknown model: {name}")
+        train = getattr(self, MODEL_TRAINERS[name][1])
+        return train(df, save=save, features=features, warm_start=warm_start)
+
+    def load_previous_models(self, feature_names: List[str]) -> Dict[str, Any]:
+        """
+        Saved models in output_dir that were trained on the given feature set.
+
+        Returns:
+            Dict of model_name: model
+        """
+        models = {}
+        for name, (model_class, _) in MODEL_TRAINERS.items():
+            path = self.output_dir / f"{name}.pkl"
+            if not path.exists():
+                continue
+            model = model_class(getattr(self.config, name)).load(path)
+            if model.metadata and model.metadata.feature_names == feature_names:
+                models[name] = model
+        return models
+
+    def _previous_run(self) -> Dict[str, Any]:
+        """Metadata written by the last train_all() into output_dir."""
+        metadata_path = self.output_dir / "metadata.json"
+        if not metadata_path.exists():
+            return {}
+        with open(metadata_path) as f:
+            return json.load(f)
+
+    def _appended_rows(self, df: pd.DataFrame, previous: Dict[str, Any]) -> Optional[int]:
+        """
+        Rows added since the previous run, if that is the only change.
+
+        Training data is ordered by id, so when the first training_samples
+        rows still hash to the previous data_hash, everything else is new.
+
+        Returns:
+            Number of new rows, or None if earlier rows changed
+        """
+        base = previous.get('training_samples', 0)
+        if not previous.get('data_hash') or not 0 < base <= len(df):
+            return None
+        if self.data_hash(df.iloc[:base]) != previous['data_hash']:
+            return None
+        return len(df) - base
+
+    def _train_models(
+        self,
+        df: pd.DataFrame,
+        features: Tuple[np.ndarray, List[str]],
+        save: bool,
+        warm_starts: Dict[str, Any],
+        n_workers: int,
+    ) -> Dict[str, Any]:
+        """Train every model, in worker processes when n_workers > 1."""
+        names = list(MODEL_TRAINERS)
+        models = {}
+
+        if n_workers > 1:
+            with ProcessPoolExecutor(max_workers=min(n_workers, len(names))) as pool:
+                futures = {
+                    name: pool.submit(
+                        _train_in_worker, self.config, self.db_path, self.output_dir,
+                        name, df, features, save, warm_starts.get(name),
+                    )
+                    for name in names
+                }
+                # Print each model's output as a block, in the usual order
+                for name in names:
+                    model, output, seconds = futures[name].result()
+                    print(output, end='')
+                    print(f"  Trained in {seconds:.1f}s\n")
+                    models[name] = model
+        else:
+            for name in names:
+                models[name] = self.train_model(
+                    name, df, save=save, features=features, warm_start=warm_starts.get(name)
+                )
+                print()
+
+        return {name: model for name, model in models.items() if model is not None}
+
     def train_all(
         self,
         save: bool = True,
+        incremental: bool = False,
+        n_workers: Optional[int] = None,
     ) -> Dict[str, Any]:
         """
         Train all models.
 
         Args:
             save: Whether to save models
+            incremental: Continue the saved models (warm start) when the only
+                change since the last run is new rows; falls back to a full
+                retrain when earlier rows changed or too many rows were added,
+                and per model after warm_start_max_runs consecutive warm starts
+            n_workers: Worker processes (defaults to config.training.n_workers;
+                1 trains sequentially in this process)
 
         Returns:
             Dict of model_name: model
         """
         # Ensure output directory exists
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        if n_workers is None:
+            n_workers = self.config.training.n_workers
 
         # Load data once
         df = self.load_training_data()
         print(f"Loaded {len(df)} training cases\n")
 
-        # Train all models
-        models = {}
-
-        models['dismissal'] = self.train_dismissal_model(df, save=save)
-        print()
-
-        models['value'] = self.train_value_model(df, save=save)
-        print()
-
-        models['resolution'] = self.train_resolution_model(df, save=save)
-        print()
+        # Extract features once, shared by every model
+        features = self.prepare_features(df)
+        data_hash = self.data_hash(df)
+
+        warm_starts = {}
+        if incremental:
+            previous = self._previous_run()
+            new_rows = self._appended_rows(df, previous)
+            if new_rows == 0:
+                models = self.load_previous_models(features[1])
+                if models and set(models) == set(previous.get('models', [])):
+                    print("Training data unchanged since the last run; models are up to date")
+                    return models
+            elif new_rows is not None and (
+                new_rows <= previous['training_samples'] * self.config.training.warm_start_max_growth
+            ):
+                warm_starts = {
+                    name: model for name, model in self.load_previous_models(features[1]).items()
+                    if model.metadata.hyperparameters.get('warm_starts', 0) < self.config.training.warm_start_max_runs
+                }
+                print(f"{new_rows} new cases since the last run; warm starting: "
+                      f"{', '.join(warm_starts) or 'none'}\n")
+            else:
+                print("Training data changed since the last run; retraining from scratch\n")
 
-        duration_model = self.train_duration_model(df, save=save)
-        if duration_model:
-            models['duration'] = duration_model
-        print()
+        # Train all models
+        started = time.perf_counter()
+        models = self._train_models(df, features, save, warm_starts, n_workers)
 
         # Save feature pipeline
         if save:
@@ -463,7 +751,13 @@ class ModelTrainer:
                 'version': self.config.model_version,
                 'trained_at': datetime.now().isoformat(),
                 'training_samples': len(df),
+                'data_hash': data_hash,
                 'models': list(models.keys()),
+                'warm_started': [
+                    name for name, model in models.items()
+                    if model.metadata and model.metadata.hyperparameters.get('warm_start')
+                ],
+                'training_seconds': round(time.perf_counter() - started, 1),
                 'feature_count': self.pipeline.get_feature_count(),
             }
             with open(self.output_dir / "metadata.json", 'w') as f:
@@ -22,8 +22,14 @@ Usage:
     # Train models
     python predict_case.py train --all
 
+    # Retrain after new cases arrived (warm start from the saved models)
+    python predict_case.py train --all --incremental
+
     # Evaluate models
     python predict_case.py evaluate --model dismissal
+
+    # Benchmark inference latency (sklearn vs ONNX) and write a JSON report
+    python predict_case.py benchmark --output bench.json
 """
 import argparse
 import sys
@@ -250,7 +256,7 @@ def cmd_train(args):
     trainer = get_trainer()
 
     if args.all:
-        trainer.train_all(save=True)
+        trainer.train_all(save=True, incremental=args.incremental, n_workers=args.workers)
     else:
         df = trainer.load_training_data()
         print(f"Loaded {len(df)} training cases\n")
@@ -348,6 +354,36 @@ def cmd_evaluate(args):
     return 0
 
 
+def cmd_benchmark(args):
+    """Benchmark feature extraction and inference per backend."""
+    from ml.training.evaluate import run_benchmarks, format_benchmark_report
+
+    records = None
+    if not args.synthetic:
+        try:
+            trainer = get_trainer()
+            records = trainer.case_records(trainer.load_training_data())
+        except Exception as e:
+            print(f"Could not load cases from the database ({e}); using synthetic cases")
+
+    batch_sizes = [int(size) for size in args.batch_sizes.split(',') if size.strip()]
+    backends = ['sklearn', 'onnx'] if args.backend == 'all' else [args.backend]
+
+    report = run_benchmarks(
+        records=records,
+        backends=backends,
+        n_samples=args.samples,
+        batch_sizes=batch_sizes,
+        repeat=args.repeat,
+        output_path=args.output,
+    )
+
+    print(format_benchmark_report(report))
+    if args.output:
+        print(f"Report written to {args.output}")
+    return 0
+
+
 def cmd_status(args):
     """Check model status."""
     print(f"Model Directory: {CURRENT_MODEL_DIR}")
@@ -375,6 +411,7 @@ Examples:
   python predict_case.py dismissal --court nysd --nos securities --judge "Smith"
   python predict_case.py value --court cacd --nos "data breach" --class-action
   python predict_case.py train --all
+  python predict_case.py benchmark --output bench.json
   python predict_case.py evaluate --all
         """
     )
@@ -423,6 +460,10 @@ Examples:
     train_parser.add_argument('--all', action='store_true', help='Train all models')
     train_parser.add_argument('--model', type=str, choices=['dismissal', 'value', 'resolution', 'duration'],
                               help='Specific model to train')
+    train_parser.add_argument('--incremental', action='store_true',
+                              help='Warm start from saved models when only new cases were added')
+    train_parser.add_argument('--workers', type=int, default=None,
+                              help='Worker processes for --all (1 = sequential)')
     train_parser.set_defaults(func=cmd_train)
 
     # Evaluate command
@@ -432,6 +473,19 @@ Examples:
                              help='Specific model to evaluate')
     eval_parser.set_defaults(func=cmd_evaluate)
 
+    # Benchmark command
+    bench_parser = subparsers.add_parser('benchmark', help='Benchmark inference latency and memory')
+    bench_parser.add_argument('--backend', type=str, choices=['all', 'sklearn', 'onnx'], default='all',
+                              help='Backend(s) to benchmark')
+    bench_parser.add_argument('--samples', type=int, default=200, help='Number of cases')
+    bench_parser.add_argument('--batch-sizes', type=str, default='1,8,32,128',
+                              help='Comma-separated batch sizes')
+    bench_parser.add_argument('--repeat', type=int, default=3, help='Timed passes per measurement')
+    bench_parser.add_argument('--synthetic', action='store_true',
+                              help='Use synthetic cases instead of the training data')
+    bench_parser.add_argument('--output', type=str, help='Write JSON report to this path')
+    bench_parser.set_defaults(func=cmd_benchmark)
+
     # Status command
     status_parser = subparsers.add_parser('status', help='Check model status')
     status_parser.set_defaults(func=cmd_status)
@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: docket metadata extraction.
+
+Compares the precompiled single-pass engine (app/services/docket_extract.py)
+with the previous per-call re.search implementations on a corpus of feed
+items (docs/feeds/**/*.xml by default), and checks both produce identical
+fields.
+
+Usage:
+    python scripts/bench_extraction.py [--repeat 5] [FEED.xml ...]
+"""
+import argparse
+import glob
+import re
+import sys
+import time
+from pathlib import Path
+from xml.etree import ElementTree as ET
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from app.services.docket_extract import extractor  # noqa: E402
+
+
+# --- Previous implementations (uncompiled, one re.search per pattern per call) ---
+
+def legacy_case_number(text):
+    if not text:
+        return None
+    m = re.search(r"\b\d+:\d{2}-(cv|cr|bk|ap|mc|md)-\d{3,6}\b", text, flags=re.IGNORECASE)
+    return m.group(0) if m else None
+
+
+def legacy_case_number_parts(case_number):
+    if not case_number:
+        return None
+    m = re.match(r"^(?:(\d+):)?(\d{2})-(cv|cr|bk|ap|mc|md)-(\d{3,6})(?:-(\d+))?$", case_number, flags=re.IGNORECASE)
+    if not m:
+        return None
+    office, yy, ctype, seq, d_idx = m.groups()
+    year = int("20" + yy) if len(yy) == 2 else int(yy)
+    parts = {"office": office, "year": year, "type": ctype.lower(), "sequence": int(seq)}
+    if office and office.isdigit():
+        parts["division_number"] = int(office)
+    if d_idx:
+        parts["defendant_index"] = int(d_idx)
+    return parts
+
+
+def legacy_case_type(case_number):
+    if not case_number:
+        return None
+    m = re.search(r"-(cv|cr|bk|ap|mc|md)-", case_number, flags=re.IGNORECASE)
+    return m.group(1).lower() if m else None
+
+
+def legacy_judge_name(text):
+    if not text:
+        return None
+    patterns = [
+        r"(?:Judge|J\.|Magistrate Judge|Chief Judge|District Judge)\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)",
+        r"(?:Hon\.|Honorable)\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)",
+        r"Before:\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)",
+        r"Assigned to:\s*(?:Judge|Magistrate Judge)\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)",
+    ]
+    for pattern in patterns:
+        match = re.search(pattern, text)
+        if match:
+            name = match.group(1).strip()
+            if name and len(name) > 3 and name not in ["Court", "States", "United", "Federal"]:
+                return name
+    return None
+
+
+def legacy_nature_of_suit(summary):
+    if not summary:
+        return None
+    categories = {
+        "Civil Rights": r"civil rights|discrimination|§\s*1983|civil liberties",
+        "Employment": r"employment|wrongful termination|EEOC|workplace|labor",
+        "Contract": r"contract|breach|agreement|warranty",
+        "Intellectual Property": r"patent|trademark|copyright|IP|infringement",
+        "Securities": r"securities|SEC|stock|insider trading",
+        "Bankruptcy": r"bankruptcy|debtor|creditor|chapter \d+",
+        "Habeas Corpus": r"habeas corpus|writ|detention",
+        "Immigration": r"immigration|deportation|asylum|visa",
+        "Personal Injury": r"personal injury|negligence|tort|malpractice",
+        "Real Property": r"real property|foreclosure|eviction|landlord",
+        "Antitrust": r"antitrust|monopoly|price fixing",
+        "Consumer": r"consumer|FDCPA|TCPA|fair credit",
+    }
+    for category, pattern in categories.items():
+        if re.search(pattern, summary, re.IGNORECASE):
+            return category
+    return None
+
+
+def legacy_nos_code(text):
+    if not text:
+        return None
+    m = re.search(r"Nature of Suit\s*:?\s*(\d{3})", text, re.IGNORECASE) or re.search(r"\bNOS\s*(\d{3})\b", text)
+    if not m:
+        return None
+    code = m.group(1)
+    labels = {
+        "190": "Contract Other", "195": "Contract Product Liability", "315": "Airplane Product Liability",
+        "365": "Personal Injury Product Liability", "440": "Civil Rights Other",
+        "442": "Employment Civil Rights", "443": "Housing/Accommodations", "530": "Habeas Corpus",
+        "820": "Copyright", "830": "Patent", "840": "Trademark", "850": "Securities/Commodities/Exchange",
+    }
+    return {"code": code, "label": labels.get(code)}
+
+
+def legacy_cause_of_action(text):
+    if not text:
+        return None
+    m = re.search(r"Cause(?: of Action)?\s*:?\s*([0-9A-Za-z:./\- ]{3,20})", text, re.IGNORECASE)
+    if m:
+        return m.group(1).strip()
+    m2 = re.search(r"\b(\d{2}:\d{3,4})\b", text)
+    return m2.group(1) if m2 else None
+
+
+def legacy_parties(title):
+    if not title:
+        return None
+    t = re.sub(r"^\s*\d+:\d{2}-(cv|cr|bk|ap|mc|md)-\d{3,6}(?:-\d+)?\s+", "", title, flags=re.IGNORECASE)
+    m = re.split(r"\s+(v\.?|vs\.?|versus)\s+", t, flags=re.IGNORECASE)
+    if len(m) >= 3:
+        left = m[0].split(" - ")[0].strip()
+        right = " ".join(m[2:]).split(" - ")[0].strip()
+        return {"plaintiffs": [left], "defendants": [right]}
+    return None
+
+
+def legacy_doc_number(text):
+    if not text:
+        return None
+    m = re.search(r"\bDoc(?:ument)?\s*#\s*(\d+)\b", text, re.IGNORECASE) or re.search(r"\bdocument number\s*(\d+)\b", text, re.IGNORECASE)
+    return int(m.group(1)) if m else None
+
+
+def legacy_event_type(text):
+    if not text:
+        return None
+    t = text.lower()
+    if "complaint" in t or "case opened" in t or "indictment" in t:
+        return "case_opening"
+    if "assigned to" in t or "case assigned" in t:
+        return "assignment"
+    if "motion" in t:
+        return "motion"
+    if "order" in t:
+        return "order"
+    if "judgment" in t:
+        return "judgment"
+    if "notice" in t or "summons" in t:
+        return "notice"
+    if "transfer" in t:
+        return "transfer"
+    return "docket_event"
+
+
+def legacy_entry_number(link):
+    if not link:
+        return None
+    m = re.search(r"[#&]?entry[-_=](\d+)", link, re.IGNORECASE)
+    return int(m.group(1)) if m else None
+
+
+def legacy_doc1_url(text):
+    if not text:
+        return None
+    m = re.search(r"https?://[^\s\"']+/doc1/[^\s\"'<>]+", text)
+    return m.group(0) if m else None
+
+
+def legacy_document_type(summary):
+    if not summary:
+        return "Unknown"
+    patterns = {
+        "Complaint": r"\[Complaint\]|Complaint filed", "Motion": r"\[Motion|MOTION",
+        "Order": r"\[Order\]|ORDER", "Answer": r"\[Answer\]", "Brief": r"\[Brief\]|BRIEF",
+        "Notice": r"\[Notice\]|NOTICE", "Petition": r"\[Petition\]", "Application": r"\[Application\]",
+        "Stipulation": r"\[Stipulation\]", "Declaration": r"\[Declaration\]", "Affidavit": r"\[Affidavit\]",
+        "Subpoena": r"\[Subpoena\]", "Summons": r"\[Summons\]", "Judgment": r"\[Judgment\]|JUDGMENT",
+        "Opinion": r"\[Opinion\]", "Transcript": r"\[Transcript\]|-Transcript\]",
+        "Certificate": r"\[Certificate", "Waiver": r"Waiver of Service", "Extension": r"Extension of Time",
+    }
+    for doc_type, pattern in patterns.items():
+        if re.search(pattern, summary, re.IGNORECASE):
+            return doc_type
+    return "Other"
+
+
+def legacy_motion_type(text):
+    from app.services.docket_extract import MOTION_PATTERNS
+    if not text:
+        return None
+    for motion_type, patterns in MOTION_PATTERNS.items():
+        if re.search("|".join(patterns), text, re.IGNORECASE):
+            return motion_type
+    return None
+
+
+def legacy_extract(title, summary, link):
+    combined = title + " " + summary
+    cn = legacy_case_number(title) or legacy_case_number(summary) or None
+    doc_no = legacy_doc_number(combined)
+    entry_no = legacy_entry_number(link)
+    event_type = legacy_event_type(combined)
+    has_numbers = (doc_no is not None) or (entry_no is not None)
+    return {
+        "case_number": cn,
+        "case_type": legacy_case_type(cn),
+        "case_parts": legacy_case_number_parts(cn),
+        "judge_name": legacy_judge_name(title) or legacy_judge_name(summary),
+        "nature_of_suit": legacy_nature_of_suit(combined),
+        "nos": legacy_nos_code(summary),
+        "cause_of_action": legacy_cause_of_action(summary),
+        "parties": legacy_parties(title),
+        "doc_number": doc_no,
+        "event_type": event_type,
+        "is_new_case": bool((doc_no == 1) or (entry_no == 1) or (not has_numbers and event_type == "case_opening")),
+        "docket_entry_number": entry_no,
+        "doc1_url": legacy_doc1_url(link or '') or legacy_doc1_url(summary),
+        "document_type": legacy_document_type(summary),
+        "motion_type": legacy_motion_type(combined),
+    }
+
+
+def load_corpus(paths):
+    entries = []
+    for path in paths:
+        try:
+            root = ET.parse(path).getroot()
+        except ET.ParseError:
+            continue
+        for it in root.iter("item"):
+            entries.append((
+                (it.findtext("title") or "").strip(),
+                (it.findtext("description") or "").strip(),
+                (it.findtext("link") or "").strip(),
+            ))
+    return entries
+
+
+def bench(fn, entries, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for title, summary, link in entries:
+            fn(title, summary, link)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("feeds", nargs="*", help="RSS files (default: docs/feeds/**/*.xml)")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    paths = args.feeds or sorted(glob.glob(str(ROOT / "docs" / "feeds" / "**" / "*.xml"), recursive=True))
+    entries = load_corpus(paths)
+    if not entries:
+        print("No feed items found")
+        return 1
+
+    mismatches = sum(1 for e in entries if legacy_extract(*e) != extractor.extract(*e))
+
+    legacy = bench(legacy_extract, entries, args.repeat)
+    engine = bench(extractor.extract, entries, args.repeat)
+    print(f"Corpus: {len(entries)} items from {len(paths)} feeds (best of {args.repeat})")
+    print(f"  legacy per-call re.search: {legacy * 1000:8.1f} ms  ({legacy / len(entries) * 1e6:6.1f} us/item)")
+    print(f"  compiled single-pass:      {engine * 1000:8.1f} ms  ({engine / len(entries) * 1e6:6.1f} us/item)")
+    print(f"  speedup: {legacy / engine:.2f}x   mismatches: {mismatches}")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())